@@ -1,5 +1,7 @@
-from flask import Flask, render_template, url_for, send_from_directory, abort, request, redirect
-import pandas as pd
+from flask import Flask, render_template, url_for, send_from_directory, abort, request, redirect, jsonify, g, make_response
+import functools
+import numpy as np
+import glob
 import json
 from datetime import datetime, timezone, timedelta
 import re
@@ -8,56 +10,22 @@ import random
 import requests
 import time
 from blog_data import blog_posts
-from services.tour_builder import build_food_tour, generate_restaurant_slug
+from services.tour_builder import build_food_tour
 from services.menu_suggestions import get_tour_menu_suggestions
 from services.premium_tour_builder import build_premium_tour
-# Load restaurant data from New Master List
-OUTSCRAPER_FILE = 'New Master List - Sheet1.csv'
-
-# Format phone numbers to local Philippine format
-def format_phone_number(phone):
-    if not phone or pd.isna(phone):
-        return None
-    
-    # Convert to string and remove any non-digit characters
-    phone_str = str(phone).strip()
-    digits = ''.join(filter(str.isdigit, phone_str))
-    
-    # Case 1: 12 digits (mobile numbers with country code 63)
-    if len(digits) == 12:
-        # +63 966 627 1522 → 0966 627 1522
-        local_digits = digits[2:]  # Remove 63, get 9666271522
-        return f"0{local_digits[:3]} {local_digits[3:6]} {local_digits[6:]}"
-    
-    # Case 2: 11 digits (Metro Manila landlines with country code 63)
-    elif len(digits) == 11:
-        # +63283746879 → (02) 8374 6879
-        local_digits = digits[2:]  # Remove 63, get 283746879
-        return f"(02) {local_digits[1:5]} {local_digits[5:]}"
-    
-    # For any other format, return as is
-    else:
-        return phone_str
-
-restaurants_df = pd.read_csv(OUTSCRAPER_FILE)
-
-# Load the restaurant photo mapping
-def load_restaurant_image_mapping():
-    """Load the mapping of restaurant names to local image files"""
-    try:
-        photo_results = pd.read_csv('restaurant_photo_results.csv')
-        # Create a mapping of restaurant name to local filename
-        mapping = {}
-        for _, row in photo_results.iterrows():
-            if row['download_status'] == 'downloaded':
-                mapping[row['restaurant_name']] = row['filename']
-        return mapping
-    except (FileNotFoundError, Exception) as e:
-        print(f"Warning: Could not load restaurant image mapping: {e}")
-        return {}
-
-# Load the image mapping once when app starts
-RESTAURANT_IMAGE_MAPPING = load_restaurant_image_mapping()
+from services.catalog import CatalogStore, RestaurantCatalog
+from services.dependencies import facet_key, list_key, list_name
+from services.hours import NO_TRANSITION, get_current_day, parse_working_hours, is_currently_open, get_time_until_open, ph_now
+from services.fields import format_phone_number, is_missing
+from services.images import ImageManifestStore
+from services.pagecache import CachedPage, PageCache, normalize_args
+from services.preload import PRELOAD_STATE, memory_usage
+from services import sqlstore
+from services.snapshot import SnapshotCache, code_fingerprint
+from services.slugs import area_slug, cuisine_slug, generate_restaurant_slug, is_plausible_area_slug
+from services.suggest import KINDS as SUGGEST_KINDS, SUGGEST_LIMIT
+# Load restaurant data from New Master List (QC_DATA_FILE points workers at another copy)
+OUTSCRAPER_FILE = os.environ.get('QC_DATA_FILE', 'New Master List - Sheet1.csv')
 
 def get_restaurant_image_url(restaurant_name, fallback_photo_url, alt_tag=None, street=None):
     """
@@ -67,6 +35,8 @@ def get_restaurant_image_url(restaurant_name, fallback_photo_url, alt_tag=None,
     2. Check for webp image using sanitized street address in restaurant_cards_webp (fallback)
     3. Fall back to original photo URL
     
+    The folders are read once into IMAGE_MANIFEST, so this does no filesystem work per card.
+    
     Args:
         restaurant_name: Name of the restaurant
         fallback_photo_url: Original photo URL from CSV
@@ -77,74 +47,11 @@ def get_restaurant_image_url(restaurant_name, fallback_photo_url, alt_tag=None,
         tuple: (image_url, alt_tag)
     """
     try:
-        # Priority 1: Check if we have a local downloaded image by restaurant name (most specific)
-        if restaurant_name:
-            # Try exact match first
-            if restaurant_name in RESTAURANT_IMAGE_MAPPING:
-                local_filename = RESTAURANT_IMAGE_MAPPING[restaurant_name]
-                local_url = url_for('static', filename=f'images/restaurant_cards/{local_filename}')
-                
-                # Generate alt tag if not provided
-                if not alt_tag:
-                    alt_tag = f"{restaurant_name} restaurant in Quezon City - exterior view and dining atmosphere"
-                
-                return local_url, alt_tag
-            
-            # Try case-insensitive match
-            restaurant_name_lower = restaurant_name.lower().strip()
-            for mapped_name, local_filename in RESTAURANT_IMAGE_MAPPING.items():
-                if mapped_name.lower().strip() == restaurant_name_lower:
-                    local_url = url_for('static', filename=f'images/restaurant_cards/{local_filename}')
-                    
-                    # Generate alt tag if not provided
-                    if not alt_tag:
-                        alt_tag = f"{restaurant_name} restaurant in Quezon City - exterior view and dining atmosphere"
-                    
-                    return local_url, alt_tag
-        
-        # Priority 2: Check restaurant_cards folder directly by sanitized restaurant name
-        if restaurant_name:
-            sanitized_name = sanitize_filename_for_lookup(restaurant_name)
-            # Try common extensions
-            for ext in ['.webp', '.jpg', '.png', '.jpeg']:
-                potential_filename = sanitized_name + ext
-                potential_path = os.path.join('static', 'images', 'restaurant_cards', potential_filename)
-                if os.path.exists(potential_path):
-                    local_url = url_for('static', filename=f'images/restaurant_cards/{potential_filename}')
-                    if not alt_tag:
-                        alt_tag = f"{restaurant_name} restaurant in Quezon City - exterior view and dining atmosphere"
-                    return local_url, alt_tag
-            
-            # Also try checking if any file contains the restaurant name (for variations)
-            try:
-                restaurant_cards_dir = os.path.join('static', 'images', 'restaurant_cards')
-                if os.path.exists(restaurant_cards_dir):
-                    restaurant_name_lower = restaurant_name.lower().replace(' ', '_').replace('-', '_')
-                    for filename in os.listdir(restaurant_cards_dir):
-                        filename_lower = filename.lower()
-                        # Check if filename contains key parts of restaurant name
-                        name_parts = [part for part in restaurant_name_lower.split() if len(part) > 3]
-                        if any(part in filename_lower for part in name_parts):
-                            # Additional check: make sure it's a reasonable match
-                            if filename_lower.endswith(('.webp', '.jpg', '.png', '.jpeg')):
-                                local_url = url_for('static', filename=f'images/restaurant_cards/{filename}')
-                                if not alt_tag:
-                                    alt_tag = f"{restaurant_name} restaurant in Quezon City - exterior view and dining atmosphere"
-                                return local_url, alt_tag
-            except Exception as e:
-                pass  # Continue to next priority
-        
-        # Priority 3: Check for street-based webp in restaurant_cards_webp (fallback if no name match)
-        if street:
-            street_filename = sanitize_filename_for_lookup(street) + '.webp'
-            street_path = os.path.join('static', 'images', 'restaurant_cards_webp', street_filename)
-            
-            if os.path.exists(street_path):
-                local_url = url_for('static', filename=f'images/restaurant_cards_webp/{street_filename}')
-                if not alt_tag:
-                    alt_tag = f"{restaurant_name} restaurant in Quezon City"
-                print(f"✓ Found webp for {restaurant_name}: {street_filename}")
-                return local_url, alt_tag
+        static_path, kind = IMAGE_MANIFEST.get().resolve(restaurant_name, street)
+        if kind == 'card':
+            return url_for('static', filename=static_path), alt_tag or f"{restaurant_name} restaurant in Quezon City - exterior view and dining atmosphere"
+        if kind == 'street':
+            return url_for('static', filename=static_path), alt_tag or f"{restaurant_name} restaurant in Quezon City"
     except Exception as e:
         print(f"Warning: Error in get_restaurant_image_url for {restaurant_name}: {e}")
     
@@ -154,31 +61,9 @@ def get_restaurant_image_url(restaurant_name, fallback_photo_url, alt_tag=None,
     
     return fallback_photo_url or '', alt_tag
 
-def sanitize_filename_for_lookup(name):
-    """Convert restaurant name to the same format used in image filenames"""
-    import re
-    # Remove special characters and spaces
-    name = re.sub(r'[^\w\s-]', '', name)
-    # Replace spaces with underscores
-    name = re.sub(r'\s+', '_', name)
-    # Convert to lowercase
-    name = name.lower()
-    # Remove multiple underscores
-    name = re.sub(r'_+', '_', name)
-    # Remove leading/trailing underscores
-    name = name.strip('_')
-    return name
-
-def generate_restaurant_slug(name):
-    """Generate a clean slug from restaurant name"""
-    slug = name.lower().replace(' ', '-').replace('&', 'and').replace("'", '').replace('"', '').replace(',', '').replace('.', '')
-    # Remove multiple hyphens
-    slug = '-'.join(filter(None, slug.split('-')))
-    return slug
-
 def parse_about_data(about_str):
     """Parse the about column JSON data into structured information"""
-    if pd.isna(about_str) or not about_str:
+    if is_missing(about_str) or not about_str:
         return {}
     
     try:
@@ -216,52 +101,63 @@ def extract_price_range_from_about(about_str):
     
     return '₱₱'  # Default to moderate
 
-# Create restaurant slugs and data dictionary
-restaurants_data = {}
-for idx, row in restaurants_df.iterrows():
-    # Generate slug from restaurant name (using name_for_emails for display, name for slug generation)
-    display_name = row.get('name_for_emails', row['name'])
-    slug = generate_restaurant_slug(row['name'])
-    
-    # Store restaurant data
-    restaurants_data[slug] = {
-        'name': display_name,  # Use name_for_emails for display
-        'slug': slug,
-        'address': row.get('street', ''),
-        'phone': format_phone_number(row.get('+63', '')) if pd.notna(row.get('+63', '')) and row.get('+63', '') else '',
-        'website': row.get('site', ''),
-        'rating': row.get('rating', 0),
-        'reviews': row.get('reviews', 0),
-        'latitude': row.get('latitude', ''),
-        'longitude': row.get('longitude', ''),
-        'category': row.get('category', ''),
-        'subtypes': row.get('subtypes', ''),
-        'cuisine_type': row.get('subtypes', '').split(',')[0].strip() if pd.notna(row.get('subtypes', '')) else '',
-        'photos_count': row.get('photos_count', 0),
-        'photo': row.get('photo', ''),
-        'reviews_link': row.get('reviews_link', ''),
-        'area_service': row.get('area_service', ''),
-        'city': row.get('city', 'Quezon City'),
-        'state': row.get('state', 'Metro Manila'),
-        'country': row.get('country', 'Philippines'),
-        'about_data': parse_about_data(row.get('about', '')),
-        'price_range': extract_price_range_from_about(row.get('about', ''))
-    }
+# Detail-page data of each row
+def build_restaurant_details(restaurants_df):
+    """Detail-page data of every row of the raw master list, in its order"""
+    details = []
+    # Rows share a handful of about strings - parse each distinct one once (the results are shared, read-only)
+    about_cache = {}
+    for idx, row in restaurants_df.iterrows():
+        # Generate slug from restaurant name (using name_for_emails for display, name for slug generation)
+        display_name = row.get('name_for_emails', row['name'])
+        slug = generate_restaurant_slug(row['name'])
+        about = row.get('about', '')
+        if isinstance(about, str):
+            if about not in about_cache:
+                about_cache[about] = (parse_about_data(about), extract_price_range_from_about(about))
+            about_data, price_range = about_cache[about]
+        else:
+            about_data, price_range = parse_about_data(about), extract_price_range_from_about(about)
+    
+        # Store restaurant data
+        restaurant = {
+            'name': display_name,  # Use name_for_emails for display
+            'slug': slug,
+            'address': row.get('street', ''),
+            'phone': format_phone_number(row.get('+63', '')) if not is_missing(row.get('+63', '')) and row.get('+63', '') else '',
+            'website': row.get('site', ''),
+            'rating': row.get('rating', 0),
+            'reviews': row.get('reviews', 0),
+            'latitude': row.get('latitude', ''),
+            'longitude': row.get('longitude', ''),
+            'category': row.get('category', ''),
+            'subtypes': row.get('subtypes', ''),
+            'cuisine_type': row.get('subtypes', '').split(',')[0].strip() if not is_missing(row.get('subtypes', '')) else '',
+            'photos_count': row.get('photos_count', 0),
+            'photo': row.get('photo', ''),
+            'reviews_link': row.get('reviews_link', ''),
+            'area_service': row.get('area_service', ''),
+            'city': row.get('city', 'Quezon City'),
+            'state': row.get('state', 'Metro Manila'),
+            'country': row.get('country', 'Philippines'),
+            'about_data': about_data,
+            'price_range': price_range
+        }
+        # Cuisine and area for the page title and description, when the row has them
+        for key, column in (('cuisine', 'type'), ('area', 'SEO Area')):
+            if not is_missing(row.get(column)) and row.get(column):
+                restaurant[key] = row[column]
+        details.append(restaurant)
+    return details
 
 app = Flask(__name__)
 
-# Initialize empty defaults
-PROCESSED_DF = pd.DataFrame()
-ALL_CUISINES = []
-AREA_COUNTS = {}
-CUISINE_COUNTS = {}
-
 # Add int function to Jinja2 environment
 app.jinja_env.globals['int'] = int
 
 def rating_to_stars(rating):
     """Convert numerical rating to star display"""
-    if pd.isna(rating) or rating == 0:
+    if is_missing(rating) or rating == 0:
         return {'full': 0, 'half': 0, 'empty': 5}
     
     rating = float(rating)
@@ -302,27 +198,10 @@ def restaurant_slug(name):
 
 # Get the absolute path to the data file
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_FILE = os.path.join(BASE_DIR, 'New Master List - Sheet1.csv')
+DATA_FILE = os.path.join(BASE_DIR, OUTSCRAPER_FILE)
 
-def parse_working_hours(hours_str):
-    if pd.isna(hours_str):
-        return {}
-    try:
-        # Convert string to proper JSON format if needed
-        if isinstance(hours_str, str):
-            hours_str = hours_str.replace("'", '"')
-        hours_dict = json.loads(hours_str)
-        
-        # Clean up the hours format
-        cleaned_hours = {}
-        for day, hours in hours_dict.items():
-            if hours and isinstance(hours, str):
-                # Remove any spaces between time and AM/PM
-                hours = re.sub(r'(\d)(?:\s+)(AM|PM)', r'\1\2', hours)
-                cleaned_hours[day] = hours
-        return cleaned_hours
-    except:
-        return {}
+# Card images are indexed once and re-indexed when the image folders or photo mapping change
+IMAGE_MANIFEST = ImageManifestStore(app.static_folder, os.path.join(BASE_DIR, 'restaurant_photo_results.csv'))
 
 def extract_service_options_from_about(about_str):
     """Extract service options from about data"""
@@ -423,48 +302,8 @@ def extract_offerings_from_about(about_str):
     
     return offerings
 
-def get_current_day():
-    # Use Filipino time (UTC+8)
-    ph_time = datetime.utcnow().replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=8)))
-    return ph_time.strftime('%A')  # Returns the current day name
-
-def format_working_hours(hours_dict):
-    if not hours_dict:
-        return "Hours not available"
-    current_day = get_current_day()
-    if current_day in hours_dict:
-        return f"Today: {hours_dict[current_day]}"
-    return "Hours not available"
-
-def extract_price_range(about):
-    if pd.isna(about):
-        return '1'  # Default to budget-friendly for fast food
-    try:
-        # Parse the JSON
-        about_dict = json.loads(about) if isinstance(about, str) else about
-        
-        # Check if it's a fast food restaurant
-        category = about_dict.get('category', '').lower()
-        if 'fast food' in category or 'fastfood' in category:
-            return '1'  # Fast food is typically budget-friendly
-            
-        # Look for price level in the JSON
-        price_info = about_dict.get('Price', {})
-        if isinstance(price_info, dict):
-            # Count how many price options are true
-            price_level = sum(1 for key, value in price_info.items() if value and '₱' in key)
-            return str(price_level) if price_level > 0 else '1'
-        return '1'
-    except:
-        # If JSON parsing fails, try the old method
-        about_str = str(about).lower()
-        if 'fast food' in about_str or 'fastfood' in about_str:
-            return '1'
-        count = about_str.count('₱')
-        return str(count) if count > 0 else '1'
-
 def extract_cuisine(subtypes):
-    if pd.isna(subtypes):
+    if is_missing(subtypes):
         return None
     try:
         cuisines = json.loads(subtypes)
@@ -484,528 +323,171 @@ def extract_cuisine(subtypes):
     except:
         return None
 
-def extract_main_cuisine(type_value):
-    if pd.isna(type_value) or not type_value or str(type_value).strip() == '':
-        return None
-    # Print debug info
-    print(f"Debug - Processing type: {type_value}")
-    
-    # Clean up and standardize the cuisine name
-    cuisine = str(type_value).strip()
-    cuisine = cuisine.replace(' Restaurant', '').strip()
-    cuisine = cuisine.replace('Restaurant', '').strip()
-    
-    # Skip if it's just "Restaurant"
-    if cuisine.lower() == 'restaurant':
-        return None
-        
-    print(f"Debug - Extracted cuisine: {cuisine}")
-    return cuisine
-
-def is_currently_open(hours_dict):
-    if not hours_dict:
-        return False
-    
-    # Use Filipino time (UTC+8)
-    ph_time = datetime.utcnow().replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=8)))
-    current_day = ph_time.strftime('%A')
-    
-
-    
-    if current_day not in hours_dict:
-        return False
-        
-    try:
-        hours = hours_dict[current_day]
-        
-        # Check if it's open 24 hours
-        if hours.lower().strip() == 'open 24 hours':
-            return True
-            
-        # Handle multiple time ranges (e.g., "11AM-3PM,5-9PM")
-        time_ranges = [range_str.strip() for range_str in hours.split(',')]
-        
-        current_time = ph_time.strftime('%I:%M%p')  # Format: 11:00AM
-        current_time = current_time.upper()
-        
-        # Convert times to comparable format (minutes since midnight)
-        def time_to_minutes(time_str):
-            # Remove any spaces and ensure AM/PM is at the end
-            time_str = re.sub(r'\s+', '', time_str).upper()
-            # Handle cases where there's no minutes specified (e.g., "11AM" -> "11:00AM")
-            if 'AM' in time_str or 'PM' in time_str:
-                if ':' not in time_str:
-                    time_str = time_str.replace('AM', ':00AM').replace('PM', ':00PM')
-            
-            try:
-                return datetime.strptime(time_str, '%I:%M%p').hour * 60 + datetime.strptime(time_str, '%I:%M%p').minute
-            except ValueError:
-                try:
-                    return datetime.strptime(time_str, '%I%p').hour * 60
-                except ValueError:
-                    return 0
-
-        current_minutes = time_to_minutes(current_time)
-        
-        # Check each time range
-        for time_range in time_ranges:
-            if '-' not in time_range:
-                continue
-                
-            open_time, close_time = time_range.split('-')
-            open_time = re.sub(r'\s+', '', open_time).upper()
-            close_time = re.sub(r'\s+', '', close_time).upper()
-            
-            open_minutes = time_to_minutes(open_time)
-            close_minutes = time_to_minutes(close_time)
-            
-            # Handle cases where closing time is past midnight
-            if close_minutes < open_minutes:
-                close_minutes += 24 * 60
-                if current_minutes < open_minutes:
-                    current_minutes += 24 * 60
-                    
-            # If current time falls within this range, restaurant is open
-            if open_minutes <= current_minutes <= close_minutes:
-                return True
-        
-        # If we get here, restaurant is not open in any time range
-        return False
-    except Exception as e:
-        print(f"Error checking if restaurant is open: {str(e)}")
-        return False
+def load_catalog(source, photo_version=None):
+    """Build a catalog snapshot from the master list CSV contents"""
+    # Ingestion is the only part of the app that needs pandas; workers that map a snapshot never import it
+    from services.ingest import process_dataframe
+    from services.schema import read_master_list
+
+    restaurants_df = read_master_list(source)
+    # Detail-page data is built from the raw columns, before process_dataframe rewrites them,
+    # and follows each row into score order so the catalog resolves slugs to the same row
+    details = build_restaurant_details(restaurants_df)
+    restaurants_df['source_row'] = np.arange(len(restaurants_df))
+    df, all_cuisines, area_counts = process_dataframe(restaurants_df, photo_version=photo_version)
+    details = [details[row] for row in df.pop('source_row').tolist()]
+    # Work out every card image now rather than on the first page view
+    images = IMAGE_MANIFEST.get()
+    for column in ('name', 'name_for_emails'):
+        if column in df.columns:
+            images.precompute(df[column])
+    return RestaurantCatalog(df, all_cuisines, area_counts, details=details, list_backend=LIST_BACKEND)
+
+# Processed restaurant data is built once per worker and shared by every route.
+# The watcher hot-swaps a new snapshot when the master list changes (QC_CATALOG_RELOAD_SECONDS=0 disables it).
+# Built catalogs are also written to a snapshot file keyed by the master list digest and this code, so fresh
+# workers map that instead of re-parsing the CSV (QC_CATALOG_SNAPSHOT_DIR='' disables it).
+# List pages slice lists materialized in every worker by default; QC_LIST_BACKEND=store queries the SQLite store instead.
+LIST_BACKEND = os.environ.get('QC_LIST_BACKEND', 'views')
+if LIST_BACKEND not in ('views', 'store'):
+    raise ValueError(f"QC_LIST_BACKEND must be 'views' or 'store', not {LIST_BACKEND!r}")
+CATALOG_SNAPSHOT_DIR = os.environ.get('QC_CATALOG_SNAPSHOT_DIR', os.path.join(BASE_DIR, 'data', 'catalog_snapshots'))
+CATALOG_SNAPSHOTS = None
+if CATALOG_SNAPSHOT_DIR:
+    CATALOG_SNAPSHOTS = SnapshotCache(CATALOG_SNAPSHOT_DIR, code_fingerprint(
+        [os.path.abspath(__file__)] + glob.glob(os.path.join(BASE_DIR, 'services', '*.py')), LIST_BACKEND))
+CATALOG = CatalogStore(DATA_FILE, load_catalog, snapshots=CATALOG_SNAPSHOTS)
+CATALOG_RELOAD_SECONDS = int(os.environ.get('QC_CATALOG_RELOAD_SECONDS', 30))
+
+def watch_catalog():
+    """Start polling the master list from this process, unless QC_CATALOG_RELOAD_SECONDS is 0."""
+    if CATALOG_RELOAD_SECONDS > 0:
+        CATALOG.watch(CATALOG_RELOAD_SECONDS)
+
+# A preloading gunicorn master serves no requests, so it leaves the watcher to each worker (post_fork in gunicorn.conf.py)
+if not os.environ.get('QC_CATALOG_WATCH_IN_WORKERS'):
+    watch_catalog()
+
+def with_live_open_status(restaurants):
+    """Refresh open/closed status on the rows about to be rendered, since the catalog outlives the current minute"""
+    current_day = get_current_day()
+    for restaurant in restaurants:
+        restaurant['is_open'] = is_currently_open(restaurant.get('hours'))
+        restaurant['current_day'] = current_day
+    return restaurants
 
-def get_time_until_open(hours_dict):
-    """Calculate time until restaurant opens next"""
-    if not hours_dict:
-        return None
-    
-    # Use Filipino time (UTC+8)
-    ph_time = datetime.utcnow().replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=8)))
-    current_day = ph_time.strftime('%A')
-    current_time = ph_time
-    
-    # First check if currently open
-    if is_currently_open(hours_dict):
-        return "Open Now"
-    
-    # Get list of days in order
-    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    
-    # Start from current day and check next 7 days
-    for i in range(7):
-        check_day = days[(days.index(current_day) + i) % 7]
-        
-        if check_day in hours_dict:
-            hours = hours_dict[check_day]
-            if hours and '-' in hours:
-                try:
-                    # Handle multiple time ranges (e.g., "11AM-3PM,5-9PM")
-                    time_ranges = [range_str.strip() for range_str in hours.split(',')]
-                    
-                    # Find the next opening time from any range
-                    next_open_time = None
-                    for time_range in time_ranges:
-                        if '-' not in time_range:
-                            continue
-                            
-                        open_time_str = time_range.split('-')[0].strip()
-                        
-                        # Convert opening time to datetime
-                        if ':' in open_time_str:
-                            time_format = '%I:%M%p'
-                        else:
-                            time_format = '%I%p'
-                            open_time_str = open_time_str.replace('AM', ':00AM').replace('PM', ':00PM')
-                        
-                        # Parse the opening time
-                        open_time = datetime.strptime(open_time_str, time_format)
-                        
-                        # Create datetime for the check day
-                        if i == 0:  # Same day
-                            check_datetime = current_time.replace(hour=open_time.hour, minute=open_time.minute, second=0, microsecond=0)
-                            if check_datetime > current_time:
-                                # This opening time is still today and in the future
-                                if next_open_time is None or check_datetime < next_open_time:
-                                    next_open_time = check_datetime
-                        else:  # Future day
-                            # Find the next occurrence of this day
-                            days_ahead = i
-                            check_datetime = current_time + timedelta(days=days_ahead)
-                            check_datetime = check_datetime.replace(hour=open_time.hour, minute=open_time.minute, second=0, microsecond=0)
-                            
-                            if next_open_time is None or check_datetime < next_open_time:
-                                next_open_time = check_datetime
-                    
-                    # If we found a next opening time, calculate the difference
-                    if next_open_time:
-                        time_diff = next_open_time - current_time
-                        hours_until = int(time_diff.total_seconds() // 3600)
-                        minutes_until = int((time_diff.total_seconds() % 3600) // 60)
-                        
-                        if hours_until > 0:
-                            if minutes_until > 0:
-                                return f"Opens in {hours_until}h {minutes_until}m"
-                            else:
-                                return f"Opens in {hours_until}h"
-                        else:
-                            return f"Opens in {minutes_until}m"
-                        
-                except Exception as e:
-                    print(f"Error calculating time until open: {str(e)}")
-                    continue
-    
-    return None
+# Rendered pages per worker, keyed by endpoint and arguments; a new master list drops the pages it changed,
+# new card images drop them all (QC_PAGE_CACHE_MB bounds the bodies held, 0 disables it)
+PAGE_CACHE_MB = float(os.environ.get('QC_PAGE_CACHE_MB', 64))
+PAGE_CACHE = PageCache(int(PAGE_CACHE_MB * 1e6)) if PAGE_CACHE_MB > 0 else None
 
-def process_dataframe(df):
-    # Process subtypes - handle as comma-separated string if not JSON
-    def parse_subtypes(x):
-        if pd.isna(x):
-            return []
-        try:
-            # Try parsing as JSON first
-            subtypes = json.loads(x)
-            if isinstance(subtypes, list):
-                return [s.strip() for s in subtypes if s.strip().lower() != 'restaurant']
-            return []
-        except:
-            # If not JSON, try splitting by comma
-            return [s.strip() for s in str(x).split(',') if s.strip() and s.strip().lower() != 'restaurant']
-
-    # Process photos
-    def is_valid_image_url(url):
-        if pd.isna(url) or not str(url).strip() or url == 'nan' or url == 'None':
-            return False
-        url = str(url).strip()
-        # Accept Google Photos URLs and other common image hosting services
-        valid_domains = ['googleusercontent.com', 'photos.app.goo.gl', 'lh3.googleusercontent.com']
-        return (url.startswith('http://') or url.startswith('https://')) and any(domain in url.lower() for domain in valid_domains)
-
-    def process_photo_url(url):
-        # Return default SVG for missing/empty URLs
-        if pd.isna(url) or not url or url == 'nan' or url == 'None':
-            return '/static/cuisine-images/default.svg'
-        
-        # If it's already a local path, return as is
-        if url.startswith('/static/images/'):
-            return url
-        
-        # Handle Google Photos URLs
-        if 'photos.google.com' in url or 'photos.app.goo.gl' in url:
-            return '/static/cuisine-images/default.svg'
-        
-        # Check for problematic Google image URLs and test accessibility
-        if 'lh3.googleusercontent.com' in url and 'gps-cs-s' in url:
-            # Use the Google Photos URL directly - it should work in browsers
-            return url
-        
-        # For all other URLs, add cache-busting parameter to force refresh
-        if url and isinstance(url, str) and url.startswith('http'):
-            # Add CSV file modification time as version to force browser to reload image
-            try:
-                csv_mtime = os.path.getmtime(OUTSCRAPER_FILE)
-                timestamp = int(csv_mtime)
-                separator = '&' if '?' in url else '?'
-                return f"{url}{separator}v={timestamp}"
-            except:
-                # Fallback to current timestamp if file access fails
-                timestamp = int(datetime.now().timestamp())
-                separator = '&' if '?' in url else '?'
-                return f"{url}{separator}v={timestamp}"
-        
-        # For all other URLs, return as is - the img tag's onerror will handle any invalid images
-        return url
+def expire_page_at(expires):
+    """Let the page being rendered be cached only until `expires` (epoch seconds)."""
+    g.page_expires = min(g.get('page_expires', expires), expires)
 
-    # Clean phone numbers and website URLs
-    def clean_field(value):
-        if pd.isna(value) or value == 'nan' or value == 'None' or str(value).strip() == '':
-            return None
-        return str(value).strip()
-    
-    # Format phone numbers to local Philippine format
+def page_reads(*keys):
+    """
+    Record what the page being rendered was built from (services/dependencies.py keys), so a new
+    master list only drops it from the page cache when one of them changed. A page that records
+    nothing is dropped with every new master list.
+    """
+    g.page_reads = g.get('page_reads', frozenset()).union(keys)
 
+def skip_page_cache():
+    """Keep the page being rendered out of the page cache (it depends on more than its URL and the dataset)."""
+    g.skip_page_cache = True
 
-    # Convert reviews to integer - handle missing reviews column gracefully
-    if 'reviews' in df.columns:
-        df['reviews'] = df['reviews'].fillna(0).astype(int)
-    else:
-        df['reviews'] = [0 for _ in range(len(df))]
-    
-    # Handle phone and site columns gracefully
-    if '+63' in df.columns:
-        df['phone'] = df['+63'].apply(format_phone_number)
-    elif 'phone' in df.columns:
-        df['phone'] = df['phone'].apply(format_phone_number)
-    else:
-        df['phone'] = [None for _ in range(len(df))]
-        
-    if 'site' in df.columns:
-        df['site'] = df['site'].apply(clean_field)
-    else:
-        df['site'] = [None for _ in range(len(df))]
-    
-    # Process type column for cuisines - handle missing type column gracefully
-    print("\nDebug - Processing type column for cuisines:")
-    if 'type' in df.columns:
-        df['cuisine'] = df['type'].apply(extract_main_cuisine)
-    else:
-        # Create default cuisine if type column doesn't exist
-        df['cuisine'] = ['Restaurant' for _ in range(len(df))]
-    
-    # Process working hours - handle missing working_hours column gracefully
-    if 'working_hours' in df.columns:
-        df['working_hours_dict'] = df['working_hours'].apply(parse_working_hours)
-        current_day = get_current_day()
-        df['current_day'] = current_day
-        df['is_open'] = df['working_hours_dict'].apply(is_currently_open)
-        df['hours'] = df['working_hours_dict']
-    else:
-        # Create empty working hours data if column doesn't exist
-        df['working_hours_dict'] = [{} for _ in range(len(df))]
-        df['current_day'] = current_day
-        df['is_open'] = [False for _ in range(len(df))]
-        df['hours'] = [{} for _ in range(len(df))]
-    
-    # Print unique cuisines after processing
-    print("\nDebug - Unique cuisines after processing:")
-    print(df['cuisine'].unique())
-    
-    # Process photos after cuisine is extracted - handle missing photo column gracefully
-    if 'photo' in df.columns:
-        df['photo_url'] = df.apply(lambda x: process_photo_url(x.get('photo', None)), axis=1)
-    else:
-        df['photo_url'] = ['/static/cuisine-images/default.svg' for _ in range(len(df))]
-    
-    # Process about data
-    def process_about(about):
-        if pd.isna(about):
-            return {}
-        try:
-            # Try parsing as JSON first
-            if isinstance(about, str):
-                return json.loads(about)
-            return about
-        except:
-            return {}
-
-    # Process about data - handle missing about column gracefully
-    if 'about' in df.columns:
-        df['about'] = df['about'].apply(process_about)
-    else:
-        # Create empty about data if column doesn't exist
-        df['about'] = [{} for _ in range(len(df))]
-    
-    # Extract service options, highlights, and accessibility from about field
-    def extract_about_info(about):
-        if not about:
-            return False, False, [], False, False
-        try:
-            # Extract accessibility information
-            accessibility = about.get('Accessibility', {})
-            wheelchair_accessible = (
-                accessibility.get('Wheelchair accessible entrance', False) and 
-                accessibility.get('Wheelchair accessible seating', False)
-            )
-            
-            # Extract children information
-            children = about.get('Children', {})
-            good_for_kids = children.get('Good for kids', False)
-            has_high_chairs = children.get('High chairs', False)
-            
-            # Extract service options
-            service_options = about.get('Service options', {})
-            features = []
-            # Check all delivery-related options
-            if service_options.get('Delivery', False) or service_options.get('No-contact delivery', False):
-                features.append('Delivery')
-            if service_options.get('Takeout', False):
-                features.append('Takeout')
-            if service_options.get('Dine-in', False) or service_options.get('Onsite services', False):
-                features.append('Dine-in')
-            
-            # Extract amenities
-            amenities = about.get('Amenities', {})
-            has_wifi = amenities.get('Wi-Fi', False)
-            
-            return wheelchair_accessible, good_for_kids, features, has_wifi, has_high_chairs
-        except:
-            return False, False, [], False, False
-    
-    # Apply the about info extraction
-    print("Processing row 27:")
-    print(df.iloc[26]['about'])  # 26 because 0-based indexing
-    about_info = df['about'].apply(extract_about_info)
-    df['wheelchair_accessible'] = about_info.apply(lambda x: x[0])
-    df['good_for_kids'] = about_info.apply(lambda x: x[1])
-    df['features'] = about_info.apply(lambda x: x[2])  # Add features from about info
-    df['has_wifi'] = about_info.apply(lambda x: x[3])  # Add Wi-Fi status
-    df['has_high_chairs'] = about_info.apply(lambda x: x[4])  # Add High chairs status
-    
-    # Add empty lists for features and highlights since they're still referenced in the template
-    df['highlights'] = [[] for _ in range(len(df))]
-    
-    # Convert latitude and longitude to float - handle missing columns gracefully
-    if 'latitude' in df.columns:
-        df['latitude'] = pd.to_numeric(df['latitude'], errors='coerce')
-    else:
-        df['latitude'] = [None for _ in range(len(df))]
-        
-    if 'longitude' in df.columns:
-        df['longitude'] = pd.to_numeric(df['longitude'], errors='coerce')
-    else:
-        df['longitude'] = [None for _ in range(len(df))]
-    
-    # Process price range - prioritize 'range' column if available, fallback to 'about'
-    if 'range' in df.columns:
-        df['price'] = df['range'].apply(lambda x: str(x).count('₱') if pd.notna(x) else '1')
-    else:
-        df['price'] = df['about'].apply(extract_price_range)
-    
-    # Process top pick status from 'top pick' column if it exists
-    if 'top pick' in df.columns:
-        df['top_pick'] = df['top pick'].fillna(False).astype(bool)
-    elif 'top_pick' in df.columns:
-        df['top_pick'] = df['top_pick'].fillna(False).astype(bool)
-    else:
-        df['top_pick'] = False
-    
-    # Calculate score and sort - handle missing rating column gracefully
-    if 'rating' in df.columns:
-        df['score'] = df['rating'] * df['reviews']
-    else:
-        df['score'] = [0 for _ in range(len(df))]
-    df = df.sort_values('score', ascending=False).reset_index(drop=True)
-    
-    # Get unique cuisine types for filter and only include those that have at least one restaurant
-    cuisine_counts = {}
-    if 'type' in df.columns:
-        for cuisine_type in df['type']:
-            if pd.notna(cuisine_type):  # Only count non-null cuisine types
-                cuisine_type = cuisine_type.strip()
-                if cuisine_type.lower() != 'restaurant':
-                    cuisine_counts[cuisine_type] = cuisine_counts.get(cuisine_type, 0) + 1
-    else:
-        # Fallback to old cuisine column if type column doesn't exist
-        for cuisine in df['cuisine']:
-            if pd.notna(cuisine):  # Only count non-null cuisines
-                cuisine = cuisine.strip()
-                if cuisine.lower() != 'restaurant':
-                    cuisine_counts[cuisine] = cuisine_counts.get(cuisine, 0) + 1
-    
-    # Print cuisine counts for debugging
-    print("\nCuisine counts:")
-    for cuisine, count in sorted(cuisine_counts.items()):
-        print(f"{cuisine}: {count} restaurants")
-    
-    # Only include cuisines that have at least one restaurant
-    all_cuisines = sorted([cuisine for cuisine, count in cuisine_counts.items() if count > 0])
-    
-    # Get area counts from SEO Area column
-    area_counts = {}
-    if 'SEO Area' in df.columns:
-        for area in df['SEO Area'].dropna().unique():
-            if pd.notna(area) and area:
-                count = len(df[df['SEO Area'] == area])
-                area_counts[area] = count
-        # Sort areas by restaurant count (highest first)
-        area_counts = dict(sorted(area_counts.items(), key=lambda x: x[1], reverse=True))
-    else:
-        # Fallback: create default area counts if SEO Area column doesn't exist
-        area_counts = {'Quezon City': len(df)}
-    
-    return df, all_cuisines, area_counts
-
-## Cache processed restaurant data at startup (after function definitions)
-#try:
-#    print("Loading and processing restaurant data at startup...")
-#    start_time = time.time()
-#    restaurants_df = pd.read_csv(OUTSCRAPER_FILE)
-#    PROCESSED_DF, ALL_CUISINES, AREA_COUNTS = process_dataframe(restaurants_df)
-#    print(f"Restaurant data processed in {time.time() - start_time:.2f} seconds")
-#    
-#    # Pre-calculate cuisine counts
-#    CUISINE_COUNTS = {}
-#    if 'type' in PROCESSED_DF.columns:
-#        for cuisine_type in PROCESSED_DF['type'].dropna().unique():
-#            count = len(PROCESSED_DF[PROCESSED_DF['type'] == cuisine_type])
-#            CUISINE_COUNTS[cuisine_type] = count
-#    else:
-#        for cuisine in PROCESSED_DF['cuisine'].dropna().unique():
-#            count = len(PROCESSED_DF[PROCESSED_DF['cuisine'] == cuisine])
-#            CUISINE_COUNTS[cuisine] = count
-#    
-#    print("Startup caching completed successfully!")
-#except Exception as e:
-###    print(f"ERROR: Failed to load restaurant data at startup: {e}")
-#    # Create empty defaults so app can still start
-#    PROCESSED_DF = pd.DataFrame()
-#    ALL_CUISINES = []
-#    AREA_COUNTS = {}
-#    CUISINE_COUNTS = {}
+def cached_page(view):
+    """
+    Serve a GET page from PAGE_CACHE when it has a fresh copy, otherwise render and store it.
+    Cacheable responses carry a strong ETag and a matching If-None-Match gets a 304.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if PAGE_CACHE is None or request.method != 'GET':
+            return view(*args, **kwargs)
+        start = time.perf_counter()
+        catalog = CATALOG.get()
+        generation = (catalog.dataset_version, IMAGE_MANIFEST.get().version)
+        PAGE_CACHE.use_generation(generation, catalog.changes)
+        key = (request.host_url, request.endpoint, tuple(sorted(kwargs.items())), normalize_args(request.args))
+        page = PAGE_CACHE.get(key)
+        if page is not None:
+            outcome = 'hit'
+            response = app.response_class(page.body, mimetype=page.mimetype)
+        else:
+            response = make_response(view(*args, **kwargs))
+            outcome = 'bypass'
+            if response.status_code == 200 and not response.direct_passthrough and not g.get('skip_page_cache'):
+                outcome = 'miss'
+                page = CachedPage(response.get_data(), response.mimetype, g.get('page_expires'), g.get('page_reads'))
+                PAGE_CACHE.put(key, page, generation)
+        if page is not None:
+            response.set_etag(page.etag)
+            response.make_conditional(request)
+        PAGE_CACHE.record(request.endpoint, outcome, time.perf_counter() - start, response.status_code == 304)
+        return response
+    return wrapper
+
+# home.html shows the first dozen top picks
+HOME_CARDS = 12
+# Cards per page on all restaurants, cuisine and neighbourhood pages (3 rows of 4)
+LIST_PAGE_SIZE = 12
+
+# Rendered 404 page per dataset version - it only depends on the navigation data,
+# so crawler probes don't pay for a template render each
+NOT_FOUND_PAGES = {}
+
+def not_found():
+    """404 response with the site navigation"""
+    catalog = CATALOG.get()
+    body = NOT_FOUND_PAGES.get(catalog.dataset_version)
+    if body is None:
+        body = render_template('404.html', all_cuisines=catalog.all_cuisines, area_counts=catalog.area_counts)
+        NOT_FOUND_PAGES.clear()
+        NOT_FOUND_PAGES[catalog.dataset_version] = body
+    return body, 404
+
+@app.errorhandler(404)
+def page_not_found(error):
+    return not_found()
 
 @app.route('/')
+@cached_page
 def home():
     try:
-        # Read and process restaurant data
-        restaurants_df = pd.read_csv(OUTSCRAPER_FILE)
-        df, all_cuisines, area_counts = process_dataframe(restaurants_df)
-        
-        # Filter out permanently closed restaurants
-        if 'business_status' in df.columns:
-            closed_mask = df['business_status'].str.contains('CLOSED_PERMANENTLY', case=False, na=False)
-            df = df[~closed_mask]
-        
-        # Pre-calculate cuisine counts
-        cuisine_counts = {}
-        if 'type' in df.columns:
-            for cuisine_type in df['type'].dropna().unique():
-                count = len(df[df['type'] == cuisine_type])
-                cuisine_counts[cuisine_type] = count
-        else:
-            for cuisine in df['cuisine'].dropna().unique():
-                count = len(df[df['cuisine'] == cuisine])
-                cuisine_counts[cuisine] = count
-        
-        # Filter for top pick restaurants for display
-        df = df[df['top_pick'] == True]
-        
-        return render_template('home.html', df=df.to_dict('records'), cuisine_counts=cuisine_counts, area_counts=area_counts, all_cuisines=all_cuisines)
+        # Processed data, without permanently closed restaurants, comes from the shared catalog
+        catalog = CATALOG.get()
+        all_cuisines, area_counts = catalog.all_cuisines, catalog.area_counts
+        cuisine_counts = catalog.cuisine_counts
+        
+        # Top pick restaurants for display - the template shows the first 12, so only build those cards
+        top_picks = catalog.listings.top_picks[:HOME_CARDS]
+        expire_page_at(catalog.status_expires(top_picks))
+        page_reads(facet_key('navigation'), facet_key('cuisine-counts'), list_key('top-picks', 0, HOME_CARDS),
+                   *catalog.dependencies.row_keys(top_picks))
+        
+        return render_template('home.html', df=catalog.page_cards(top_picks), cuisine_counts=cuisine_counts, area_counts=area_counts, all_cuisines=all_cuisines)
     except Exception as e:
         print(f"Error in home route: {e}")
+        skip_page_cache()
         return render_template('home.html', df=[], cuisine_counts={}, area_counts={}, all_cuisines=[])
 
 @app.route('/all-restaurants')
+@cached_page
 def all_restaurants_page():
     # Get page number from query parameter, default to 1
     page = request.args.get('page', 1, type=int)
-    per_page = 12
+    per_page = LIST_PAGE_SIZE
 
     try:
-        # Read and process restaurant data
-        restaurants_df = pd.read_csv(OUTSCRAPER_FILE)
-        df, all_cuisines, area_counts = process_dataframe(restaurants_df)
-        
-        # Filter out permanently closed restaurants
-        if 'business_status' in df.columns:
-            closed_mask = df['business_status'].str.contains('CLOSED_PERMANENTLY', case=False, na=False)
-            df = df[~closed_mask]
-        
-        # Pre-calculate cuisine counts
-        cuisine_counts = {}
-        if 'type' in df.columns:
-            for cuisine_type in df['type'].dropna().unique():
-                count = len(df[df['type'] == cuisine_type])
-                cuisine_counts[cuisine_type] = count
-        else:
-            for cuisine in df['cuisine'].dropna().unique():
-                count = len(df[df['cuisine'] == cuisine])
-                cuisine_counts[cuisine] = count
-
-        # Sort by rating and reviews (high to low)
-        if 'rating' in df.columns and 'reviews' in df.columns:
-            df = df.sort_values(by=['rating', 'reviews'], ascending=[False, False]).reset_index(drop=True)
+        # Processed data, without permanently closed restaurants, comes from the shared catalog
+        catalog = CATALOG.get()
+        all_cuisines, area_counts = catalog.all_cuisines, catalog.area_counts
+        cuisine_counts = catalog.cuisine_counts
 
-        total_count = len(df)
+        ranked = catalog.listings.ranked
+        total_count = len(ranked)
 
         # Ensure page bounds
         total_pages = (total_count + per_page - 1) // per_page if total_count else 1
@@ -1014,10 +496,14 @@ def all_restaurants_page():
         elif page > total_pages:
             page = total_pages
 
-        # Slice current page
+        # Current page only, sorted by rating and reviews (high to low)
         start_idx = (page - 1) * per_page
         end_idx = min(start_idx + per_page, total_count)
-        paginated = df.iloc[start_idx:end_idx].to_dict('records')
+        page_rows = ranked[start_idx:end_idx]
+        paginated = catalog.page_cards(page_rows)
+        expire_page_at(catalog.status_expires(page_rows))
+        page_reads(facet_key('navigation'), facet_key('cuisine-counts'), list_key('ranked', start_idx, end_idx),
+                   *catalog.dependencies.row_keys(page_rows))
 
         # Simple pagination helper (same structure as cuisine pages)
         class Pagination:
@@ -1056,6 +542,7 @@ def all_restaurants_page():
         )
     except Exception as e:
         print(f"Error in all_restaurants route: {e}")
+        skip_page_cache()
         return render_template('all_restaurants_new.html', df=[], pagination={}, cuisine_counts={}, area_counts={}, all_cuisines=[])
 
 # Accept trailing-slash URL and redirect to canonical without slash
@@ -1064,222 +551,61 @@ def all_restaurants_page_slash():
     return redirect(url_for('all_restaurants_page'), code=301)
 
 @app.route('/cuisine/<cuisine>')
+@cached_page
 def cuisine_page(cuisine):
     # Get page number from query parameter, default to 1
     page = request.args.get('page', 1, type=int)
-    per_page = 12  # Show 12 restaurants per page (3 rows of 4 cards)
+    per_page = LIST_PAGE_SIZE
     # Get area filter from query parameter
     area_filter = request.args.get('area', None)
     
 
     
     # Read and process the data
-    df = pd.read_csv(DATA_FILE)
-    df, all_cuisines, area_counts = process_dataframe(df)
+    catalog = CATALOG.get()
+    all_cuisines, area_counts = catalog.all_cuisines, catalog.area_counts
     
     # Convert URL-friendly name back to display name
     cuisine_name = cuisine.replace('-', ' ').title()
     print(f"\nDebug - Requested cuisine: {cuisine_name}")
     
-    # Filter restaurants by cuisine type
-    if 'type' in df.columns:
-        mask = df['type'].str.lower() == cuisine_name.lower()
-        cuisine_restaurants = df[mask].copy() if pd.notna(df['type']).any() else pd.DataFrame()
-    else:
-        # Fallback to old cuisine column if type column doesn't exist
-        mask = df['cuisine'].str.lower() == cuisine_name.lower()
-        cuisine_restaurants = df[mask].copy() if pd.notna(df['cuisine']).any() else pd.DataFrame()
+    # Unknown cuisines are rejected with one lookup, before any filtering
+    cuisine_types = catalog.cuisine_slugs.get(cuisine_slug(cuisine))
+    if not cuisine_types:
+        return not_found()
     
-    # Filter out permanently closed restaurants
-    if 'business_status' in cuisine_restaurants.columns:
-        closed_mask = cuisine_restaurants['business_status'].str.contains('CLOSED_PERMANENTLY', case=False, na=False)
-        cuisine_restaurants = cuisine_restaurants[~closed_mask]
-        print(f"Debug - Filtered out permanently closed restaurants, remaining: {len(cuisine_restaurants)} restaurants")
+    # Restaurants of this cuisine type, without permanently closed ones (precomputed per catalog)
+    listings = catalog.listings
+    slug = cuisine_slug(cuisine)
+    view = slug
     
     # Apply area filter if specified
+    area_name = None
     if area_filter:
         # Find the area name from the slug
-        area_name = None
-        for area in df['SEO Area'].dropna().unique():
-            if pd.notna(area) and area:
-                area_slug = area.lower().replace(' ', '-').replace('/', '-').replace('.', '').replace('(', '').replace(')', '')
-                if area_slug == area_filter:
-                    area_name = area
-                    break
+        area_name = catalog.area_slugs.get(area_filter)
         
         if area_name:
             # Filter by both cuisine and area
-            area_mask = df['SEO Area'] == area_name
-            cuisine_restaurants = cuisine_restaurants[area_mask]
-            print(f"Debug - Filtered by area: {area_name}, found {len(cuisine_restaurants)} restaurants")
-    
-    # Ensure price and features are properly formatted first
-    if 'range' in cuisine_restaurants.columns:
-        cuisine_restaurants['price'] = cuisine_restaurants['range'].apply(
-            lambda x: str(x).count('₱') if pd.notna(x) else '1'
-        )
-    else:
-        cuisine_restaurants['price'] = cuisine_restaurants.apply(
-            lambda row: '1' if cuisine_name.lower() == 'fast food' else extract_price_range(row['about']),
-            axis=1
-        )
+            view = (slug, area_name)
+            print(f"Debug - Filtered by area: {area_name}")
     
-    # Extract and format features
-    cuisine_restaurants['features'] = cuisine_restaurants['about'].apply(extract_service_options_from_about)
-    
-
-    
-
-    
-
-    
-    if cuisine_restaurants.empty:
+    rows = listings.cuisine(slug, area_name)
+    filtered_count = len(rows)
+    if not filtered_count:
         print(f"Debug - No restaurants found for cuisine: {cuisine_name}")
-        # Get basic data for 404 template
-        df = pd.read_csv(DATA_FILE)
-        df, all_cuisines, area_counts = process_dataframe(df)
-        return render_template('404.html', 
-                             all_cuisines=all_cuisines,
-                             area_counts=area_counts), 404
-    
-
+        return not_found()
     
     # Get cuisine counts for display
-    if 'type' in df.columns:
-        cuisine_counts = df['type'].value_counts().to_dict()
-    else:
-        cuisine_counts = df['cuisine'].value_counts().to_dict()
+    cuisine_counts = catalog.type_counts
     
     # Price range labels
     price_labels = ['Budget-friendly', 'Mid-range', 'High-end', 'Fine dining']
     
-    # Get all possible features
-    all_features = set()
-    for features in cuisine_restaurants['features']:
-        if isinstance(features, list):
-            all_features.update(features)
-    features = sorted(list(all_features))
-    
-
-    
-    # Convert restaurant data to dict and ensure proper formatting
-    restaurant_data = []
-    for _, row in cuisine_restaurants.iterrows():
-        restaurant = row.to_dict()
-        # Ensure price is a string
-        restaurant['price'] = str(restaurant['price']) if restaurant['price'] is not None else '1'
-        # Ensure features is a list
-        restaurant['features'] = list(restaurant['features']) if isinstance(restaurant['features'], list) else ['Takeout', 'Dine-in']
-        # Ensure about data is properly formatted as a JSON string
-        try:
-            if isinstance(restaurant['about'], dict):
-                restaurant['about'] = json.dumps(restaurant['about'])
-            elif isinstance(restaurant['about'], str):
-                # If it's already a string, try to parse and re-stringify to ensure it's valid JSON
-                parsed = json.loads(restaurant['about'])
-                restaurant['about'] = json.dumps(restaurant['about'])
-            else:
-                restaurant['about'] = '{}'
-        except:
-            restaurant['about'] = '{}'
-        
-        # Map display name correctly (use name_for_emails if available)
-        if 'name_for_emails' in restaurant:
-            restaurant['display_name'] = restaurant['name_for_emails']
-            restaurant['name'] = restaurant['name_for_emails']  # Also update the name field for compatibility
-        else:
-            restaurant['display_name'] = restaurant.get('name', 'Unknown Restaurant')
-            restaurant['name'] = restaurant.get('name', 'Unknown Restaurant')  # Keep name field consistent
-        
-        # Map photo field correctly
-        if 'photo_url' in restaurant and restaurant['photo_url']:
-            restaurant['photo_url'] = restaurant['photo_url'].strip()
-        elif 'photo' in restaurant and restaurant['photo']:
-            restaurant['photo_url'] = restaurant['photo'].strip()
-
-        else:
-            restaurant['photo_url'] = url_for('static', filename='cuisine-images/default.svg', _external=True)
-            print(f"DEBUG: No photo for {restaurant.get('name', 'Unknown')}, using default")
-        
-        # Map address field correctly
-        if 'street' in restaurant:
-            restaurant['street'] = restaurant['street']
-        elif 'address' in restaurant:
-            restaurant['street'] = restaurant['address']
-        else:
-            restaurant['street'] = 'Address not available'
-        
-        # Map hours field correctly
-        if 'working_hours_dict' in restaurant:
-            restaurant['hours'] = restaurant['working_hours_dict']
-        elif 'hours' in restaurant:
-            restaurant['hours'] = restaurant['hours']
-        else:
-            restaurant['hours'] = {}
-        
-        # Map phone field correctly
-        if 'phone' in restaurant:
-            restaurant['phone'] = restaurant['phone']
-        elif '+63' in restaurant:
-            restaurant['phone'] = restaurant['+63']
-        else:
-            restaurant['phone'] = None
-        
-        # Map website field correctly
-        if 'site' in restaurant:
-            restaurant['site'] = restaurant['site']
-        else:
-            restaurant['site'] = None
-        
-        # Map accessibility features
-        if 'wheelchair_accessible' in restaurant:
-            restaurant['wheelchair_accessible'] = restaurant['wheelchair_accessible']
-        else:
-            restaurant['wheelchair_accessible'] = False
-            
-        if 'good_for_kids' in restaurant:
-            restaurant['good_for_kids'] = restaurant['good_for_kids']
-        else:
-            restaurant['good_for_kids'] = False
-            
-        if 'has_wifi' in restaurant:
-            restaurant['has_wifi'] = restaurant['has_wifi']
-        else:
-            restaurant['has_wifi'] = False
-            
-        if 'has_high_chairs' in restaurant:
-            restaurant['has_high_chairs'] = restaurant['has_high_chairs']
-        else:
-            restaurant['has_high_chairs'] = False
-        
-        # Map open/closed status
-        if 'is_open' in restaurant:
-            restaurant['is_open'] = restaurant['is_open']
-        else:
-            restaurant['is_open'] = False
-        
-        # Map current day
-        if 'current_day' in restaurant:
-            restaurant['current_day'] = restaurant['current_day']
-        else:
-            restaurant['current_day'] = 'Monday'  # Default fallback
-        
-        # Map jacky_pick field
-        if 'jacky_pick' in restaurant:
-            restaurant['jacky_pick'] = restaurant['jacky_pick']
-        else:
-            restaurant['jacky_pick'] = False
-        
-        # Map top_pick field
-        if 'top_pick' in restaurant:
-            restaurant['top_pick'] = restaurant['top_pick']
-        else:
-            restaurant['top_pick'] = False
-        
-        restaurant_data.append(restaurant)
+    # Get all possible features (the service options any matching restaurant offers)
+    features = list(listings.features.get(view, ()))
     
     # Implement pagination
-    filtered_count = len(cuisine_restaurants)
     total_pages = (filtered_count + per_page - 1) // per_page
     
     # Ensure page is within valid range
@@ -1292,10 +618,13 @@ def cuisine_page(cuisine):
     start_idx = (page - 1) * per_page
     end_idx = min(start_idx + per_page, filtered_count)
     
-    # Get restaurants for current page
-    paginated_restaurants = restaurant_data[start_idx:end_idx]
-    
-
+    # Cards for the current page only
+    page_rows = rows[start_idx:end_idx]
+    paginated_restaurants = catalog.page_cards(page_rows)
+    expire_page_at(catalog.status_expires(page_rows))
+    page_reads(facet_key('navigation'), facet_key('type-counts'), facet_key('sidebar', slug, area_name),
+               list_key(list_name('cuisine', slug, area_name), start_idx, end_idx),
+               *catalog.dependencies.row_keys(page_rows))
     
     # Create pagination object
     class Pagination:
@@ -1325,31 +654,16 @@ def cuisine_page(cuisine):
     
     pagination = Pagination(page, per_page, filtered_count)
     
-    # Get popular areas for this cuisine using actual SEO Area values
+    # Get popular areas for this cuisine using actual SEO Area values (top 4 by restaurant count)
     popular_areas = []
-    popular_area_counts = {}
-    
-    # Count restaurants by their actual SEO Area
-    for _, row in cuisine_restaurants.iterrows():
-        seo_area = row.get('SEO Area', '')
-        if pd.notna(seo_area) and seo_area:
-            popular_area_counts[seo_area] = popular_area_counts.get(seo_area, 0) + 1
-    
-    # Sort areas by restaurant count and take top 4
-    popular_areas = sorted(popular_area_counts.items(), key=lambda x: x[1], reverse=True)[:4]
-    
-    # Get similar cuisines (cuisines with similar names or categories)
-    similar_cuisines = []
-    for other_cuisine in all_cuisines:
-        if other_cuisine != cuisine_name and pd.notna(other_cuisine):
-            # Simple similarity logic - can be enhanced later
-            if any(word in other_cuisine.lower() for word in cuisine_name.lower().split()):
-                similar_cuisines.append(other_cuisine)
-            elif any(word in cuisine_name.lower() for word in other_cuisine.lower().split()):
-                similar_cuisines.append(other_cuisine)
-    
-    # Limit to 3 similar cuisines
-    similar_cuisines = similar_cuisines[:3]
+    if 'SEO Area' in catalog.table:
+        if area_name:
+            popular_areas = [(area_name, filtered_count)]
+        else:
+            popular_areas = list(listings.popular_areas.get(slug, ()))
+    
+    # Get similar cuisines (cuisines sharing a word with this one, precomputed per catalog)
+    similar_cuisines = list(listings.similar_cuisines.get(slug, ()))
     
     # Get current date for "Last Updated"
     current_date = datetime.now().strftime("%B %Y")
@@ -1370,76 +684,50 @@ def cuisine_page(cuisine):
                          pagination=pagination)
 
 @app.route('/<neighbourhood_slug>/')
+@cached_page
 def neighbourhood_page(neighbourhood_slug):
+    # This catch-all route sees every crawler probe - turn those away before any data work
+    if not is_plausible_area_slug(neighbourhood_slug):
+        return not_found()
+    
     try:
-        # Read the CSV file
-        df = pd.read_csv(DATA_FILE)
-        
-        # Process the dataframe
-        df, all_cuisines, area_counts = process_dataframe(df)
-        
-        # Find the neighbourhood by slug
-        neighbourhood_name = None
-        
-        # Check if SEO Area column exists
-        if 'SEO Area' not in df.columns:
-            return render_template('404.html', 
-                                 all_cuisines=all_cuisines,
-                                 area_counts=area_counts), 404
+        # Processed data comes from the shared catalog
+        catalog = CATALOG.get()
+        table, all_cuisines, area_counts = catalog.table, catalog.all_cuisines, catalog.area_counts
         
         # Find the neighbourhood by slug
-        for area in df['SEO Area'].dropna().unique():
-            if pd.notna(area) and area:
-                # Use the exact same slug generation as the home template
-                area_slug = area.lower().replace(' ', '-').replace('/', '-').replace('.', '').replace('(', '').replace(')', '')
-                if area_slug == neighbourhood_slug:
-                    neighbourhood_name = area
-                    break
-        
+        neighbourhood_name = catalog.area_slugs.get(neighbourhood_slug)
         if not neighbourhood_name:
-            return render_template('404.html', 
-                                 all_cuisines=all_cuisines,
-                                 area_counts=area_counts), 404
-        
-        # Filter restaurants for this neighbourhood
-        neighbourhood_restaurants = df[df['SEO Area'] == neighbourhood_name]
-        
-        # Filter out permanently closed restaurants
-        if 'business_status' in neighbourhood_restaurants.columns:
-            closed_mask = neighbourhood_restaurants['business_status'].str.contains('CLOSED_PERMANENTLY', case=False, na=False)
-            neighbourhood_restaurants = neighbourhood_restaurants[~closed_mask]
+            return not_found()
         
-        # Get cuisine counts for this neighbourhood
+        # Cuisine counts for this neighbourhood (open restaurants, highest first), counted with the catalog
         neighbourhood_cuisine_counts = {}
-        if 'type' in neighbourhood_restaurants.columns:
-            for cuisine in neighbourhood_restaurants['type'].dropna().unique():
-                count = len(neighbourhood_restaurants[neighbourhood_restaurants['type'] == cuisine])
-                neighbourhood_cuisine_counts[cuisine] = count
+        if 'type' in table:
+            neighbourhood_cuisine_counts = catalog.counts.area_cuisines.get(neighbourhood_name, {})
         
-        # Sort cuisines by count (highest first)
-        neighbourhood_cuisine_counts = dict(sorted(neighbourhood_cuisine_counts.items(), key=lambda x: x[1], reverse=True))
-        
-        # Get all areas for nearby neighbourhoods
-        all_areas = df['SEO Area'].dropna().value_counts().to_dict()
-        
-        # Find nearby neighbourhoods (exclude current one)
+        # Nearby neighbourhoods: the closest areas by distance between their restaurants' centroids
         nearby_areas = []
-        for area, count in all_areas.items():
-            if area != neighbourhood_name and pd.notna(area) and area:
-                nearby_areas.append({'name': area, 'count': count, 'slug': area.lower().replace(' ', '-').replace('/', '-').replace('.', '').replace('(', '').replace(')', '')})
+        for area, distance in catalog.area_neighbours.get(neighbourhood_name, ()):
+            nearby_areas.append({'name': area, 'count': catalog.seo_area_counts.get(area, 0),
+                                 'slug': area_slug(area), 'distance_km': round(distance / 1000, 1)})
         
-        # Sort by restaurant count and take top 3
-        nearby_areas.sort(key=lambda x: x['count'], reverse=True)
-        nearby_areas = nearby_areas[:3]
+        # Pagination: a slice of the neighbourhood's rows, sorted by rating (highest first) per catalog
+        page = request.args.get('page', 1, type=int)
+        per_page = LIST_PAGE_SIZE
+        area_rows = catalog.listings.area(neighbourhood_name)
+        total_restaurants = len(area_rows)
+        total_pages = (total_restaurants + per_page - 1) // per_page
+        start_idx = max((page - 1) * per_page, 0)
+        positions = area_rows[start_idx:start_idx + per_page]
         
         # Process restaurant data for display
         restaurants_data = []
-        for _, row in neighbourhood_restaurants.iterrows():
+        for row in table.rows(positions):
             try:
                 restaurant = {}
                 
                 # Map display name
-                if pd.notna(row.get('name_for_emails')) and row.get('name_for_emails'):
+                if not is_missing(row.get('name_for_emails')) and row.get('name_for_emails'):
                     restaurant['display_name'] = row['name_for_emails']
                 else:
                     restaurant['display_name'] = row.get('name', 'Unknown Restaurant')
@@ -1467,12 +755,12 @@ def neighbourhood_page(neighbourhood_slug):
                     restaurant['price'] = 1
                 restaurant['rating'] = row.get('rating', 0)
                 restaurant['reviews'] = row.get('reviews', 0)
-                restaurant['photo_url'] = row.get('photo_url') if pd.notna(row.get('photo_url')) and row.get('photo_url') else row.get('photo', '')
-                restaurant['street'] = row.get('street') if pd.notna(row.get('street')) and row.get('street') else row.get('address', '')
+                restaurant['photo_url'] = row.get('photo_url') if not is_missing(row.get('photo_url')) and row.get('photo_url') else row.get('photo', '')
+                restaurant['street'] = row.get('street') if not is_missing(row.get('street')) and row.get('street') else row.get('address', '')
                 
                 # Handle hours field properly - ensure it's a dictionary or None
-                hours_data = row.get('hours') if pd.notna(row.get('hours')) and row.get('hours') else row.get('working_hours', '')
-                if pd.isna(hours_data) or not hours_data:
+                hours_data = row.get('hours') if not is_missing(row.get('hours')) and row.get('hours') else row.get('working_hours', '')
+                if is_missing(hours_data) or not hours_data:
                     restaurant['hours'] = None
                 elif isinstance(hours_data, str):
                     try:
@@ -1486,8 +774,8 @@ def neighbourhood_page(neighbourhood_slug):
                 else:
                     restaurant['hours'] = None
                 
-                restaurant['phone'] = format_phone_number(row.get('+63')) if pd.notna(row.get('+63')) and row.get('+63') else None
-                restaurant['site'] = row.get('site') if pd.notna(row.get('site')) and row.get('site') else None
+                restaurant['phone'] = format_phone_number(row.get('+63')) if not is_missing(row.get('+63')) and row.get('+63') else None
+                restaurant['site'] = row.get('site') if not is_missing(row.get('site')) and row.get('site') else None
                 restaurant['features'] = row.get('features', [])
                 restaurant['is_open'] = row.get('is_open', False)
                 restaurant['current_day'] = row.get('current_day', '')
@@ -1508,17 +796,12 @@ def neighbourhood_page(neighbourhood_slug):
             except Exception as e:
                 continue
         
-        # Sort restaurants by rating (highest first)
-        restaurants_data.sort(key=lambda x: float(x['rating']) if x['rating'] else 0, reverse=True)
-        
-        # Pagination
-        page = request.args.get('page', 1, type=int)
-        per_page = 12
-        total_pages = (len(restaurants_data) + per_page - 1) // per_page
-        
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_restaurants = restaurants_data[start_idx:end_idx]
+        paginated_restaurants = with_live_open_status(restaurants_data)
+        expire_page_at(catalog.status_expires(positions))
+        page_reads(facet_key('navigation'), facet_key('area-counts'), facet_key('area-cuisines', neighbourhood_name),
+                   facet_key('area-neighbours', neighbourhood_name),
+                   list_key(list_name('area', neighbourhood_name), start_idx, start_idx + len(positions)),
+                   *catalog.dependencies.row_keys(positions))
         
         return render_template('neighbourhood.html',
                              neighbourhood_name=neighbourhood_name,
@@ -1526,7 +809,7 @@ def neighbourhood_page(neighbourhood_slug):
                              restaurants=paginated_restaurants,
                              cuisine_counts=neighbourhood_cuisine_counts,
                              nearby_areas=nearby_areas,
-                             total_restaurants=len(restaurants_data),
+                             total_restaurants=total_restaurants,
                              current_page=page,
                              total_pages=total_pages,
                              has_prev=page > 1,
@@ -1534,43 +817,57 @@ def neighbourhood_page(neighbourhood_slug):
                              all_cuisines=all_cuisines,
                              area_counts=area_counts)
     except Exception as e:
-        return render_template('404.html', 
-                             all_cuisines=all_cuisines,
-                             area_counts=area_counts), 404
+        return not_found()
 
 @app.route('/about')
+@cached_page
 def about():
     # Get all unique cuisines for the navigation
-    df = pd.read_csv(DATA_FILE)
-    df, all_cuisines, area_counts = process_dataframe(df)
+    catalog = CATALOG.get()
+    all_cuisines, area_counts = catalog.all_cuisines, catalog.area_counts
+    page_reads(facet_key('navigation'))
     return render_template('about.html', all_cuisines=all_cuisines, area_counts=area_counts)
 
 @app.route('/how-we-rate')
+@cached_page
 def how_we_rate():
+    page_reads()  # No catalog data
     return render_template('how-we-rate.html')
 
 @app.route('/subscribe')
+@cached_page
 def subscribe():
+    page_reads()  # No catalog data
     return render_template('subscribe.html')
 
 @app.route('/senior-friendly')
+@cached_page
 def senior_friendly():
+    page_reads()  # No catalog data
     return render_template('senior-friendly.html')
 
 @app.route('/saved')
+@cached_page
 def saved_restaurants():
+    page_reads()  # No catalog data
     return render_template('saved.html')
 
 @app.route('/contact')
+@cached_page
 def contact():
+    page_reads()  # No catalog data
     return render_template('contact.html')
 
 @app.route('/quiz/perfect-spot')
+@cached_page
 def quiz_perfect_spot():
+    page_reads()  # No catalog data
     return render_template('quiz/perfect-spot.html')
 
 @app.route('/quiz/personality')
+@cached_page
 def quiz_personality():
+    page_reads()  # No catalog data
     return render_template('quiz/personality.html')
 
 @app.route('/api/quiz/perfect-spot', methods=['POST'])
@@ -1584,59 +881,14 @@ def api_quiz_perfect_spot():
         area = data.get('4', '')  # Question 4: north, east, center, any
         senior = data.get('5', '')  # Question 5: wheelchair, quiet, parking, none
         
-        # Load restaurant data
-        df = pd.read_csv(DATA_FILE)
-        df = process_dataframe_no_output(df)[0]
-        
-        # Build query
-        query = pd.Series([True] * len(df))
-        
-        # Filter by cuisine
-        if cuisine and cuisine != 'anything':
-            cuisine_map = {
-                'filipino': ['Filipino', 'Pinoy', 'Pinoy'],
-                'asian': ['Japanese', 'Thai', 'Vietnamese', 'Korean', 'Chinese', 'Asian'],
-                'western': ['American', 'Italian', 'Spanish', 'Western', 'European']
-            }
-            if cuisine in cuisine_map:
-                cuisine_query = df['type'].fillna('').apply(
-                    lambda x: any(c.lower() in x.lower() for c in cuisine_map[cuisine]))
-                query = query & cuisine_query
-        
-        # Filter by price/budget
-        if budget:
-            budget_map = {'budget': 1, 'mid': 2, 'splurge': 3}
-            if budget in budget_map:
-                query = query & df['prices'].fillna(0).apply(lambda x: len(str(x).replace('₱', '').strip()) <= budget_map[budget])
-        
-        # Filter by area
-        if area and area != 'any':
-            area_map = {
-                'north': ['SM North', 'North EDSA', 'Trinoma', 'Fairview', 'Quezon City North'],
-                'east': ['Eastwood', 'Ortigas', 'Taguig'],
-                'center': ['Timog', 'Tomas Morato', 'Maginhawa', 'Scout']
-            }
-            if area in area_map:
-                area_query = df['SEO Area'].fillna('').apply(
-                    lambda x: any(a.lower() in x.lower() for a in area_map[area]))
-                query = query & area_query
-        
-        # Filter by senior needs
-        if senior and senior != 'none':
-            if senior == 'wheelchair':
-                query = query & (df['wheelchair_accessible'].fillna(False) == True)
-            elif senior == 'parking':
-                query = query & (df['features'].fillna('[]').str.contains('Parking|Park', case=False, na=False))
-        
-        # Get matching restaurants
-        results = df[query].copy()
-        
-        # Sort by rating and limit to top 3
-        results = results.sort_values('rating', ascending=False).head(3)
+        # Every answer combination is precomputed with the catalog
+        catalog = CATALOG.get()
+        table = catalog.table
+        results, scores = catalog.quiz.answer(vibe=vibe, cuisine=cuisine, budget=budget, area=area, senior=senior)
         
         # Format results
         restaurants = []
-        for _, row in results.iterrows():
+        for match_score, row in zip(scores.tolist(), table.rows(results)):
             restaurants.append({
                 'id': row.get('id', 0),
                 'name': row.get('name_for_emails', row.get('name', 'Unknown')),
@@ -1646,7 +898,7 @@ def api_quiz_perfect_spot():
                 'price_range': row.get('prices', '₱₱'),
                 'photo': row.get('photo', ''),
                 'slug': row.get('slug', ''),
-                'match_score': min(99, 70 + int(row.get('rating', 0) * 5))
+                'match_score': match_score
             })
         
         return jsonify({
@@ -1661,31 +913,183 @@ def api_quiz_perfect_spot():
             'error': str(e)
         }), 400
 
+def parse_minutes(value):
+    """Parse a duration like '30m', '2h', '1h30m' or '45' (minutes) into minutes; None if invalid"""
+    match = re.fullmatch(r'\s*(?:(\d+)\s*h)?\s*(?:(\d+)\s*m?)?\s*', value.lower())
+    if not match or not any(match.groups()):
+        return None
+    return int(match.group(1) or 0) * 60 + int(match.group(2) or 0)
+
+@app.route('/api/open-now')
+def api_open_now():
+    """
+    Restaurants open now, plus (with ?within=30m) those closing or opening within that window,
+    soonest change first. Optional ?area=<area-slug>, ?cuisine=<cuisine-slug> and ?limit=.
+    """
+    within = parse_minutes(request.args.get('within', '0m'))
+    if within is None:
+        return jsonify({'error': 'within must look like 30m, 2h or 1h30m'}), 400
+    limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+
+    catalog = CATALOG.get()
+    table = catalog.table
+    now = ph_now()
+    is_open, minutes = catalog.transitions_now(now)
+    mask = catalog.active_mask & (is_open | (minutes <= within))
+
+    area = request.args.get('area')
+    if area:
+        area_name = catalog.area_slugs.get(area)
+        if area_name is None or 'SEO Area' not in table:
+            return jsonify({'error': f'Unknown area: {area}'}), 404
+        mask &= table.equals('SEO Area', area_name)
+
+    cuisine = request.args.get('cuisine')
+    if cuisine:
+        column = 'type' if 'type' in table else 'cuisine'
+        cuisine_types = catalog.cuisine_slugs.get(cuisine_slug(cuisine))
+        if not cuisine_types:
+            return jsonify({'error': f'Unknown cuisine: {cuisine}'}), 404
+        mask &= table.isin(column, cuisine_types)
+
+    rows = np.flatnonzero(mask)
+    rows = rows[np.argsort(minutes[rows], kind='stable')]
+
+    restaurants = []
+    page = rows[:limit]
+    for i, row in zip(page, table.rows(page)):
+        if is_open[i]:
+            status = 'closing_soon' if minutes[i] <= within else 'open'
+        else:
+            status = 'opening_soon'
+        restaurants.append({
+            'name': row.get('name', ''),
+            'slug': generate_restaurant_slug(row.get('name', '')),
+            'cuisine': row.get('type', 'Restaurant'),
+            'area': row.get('SEO Area', 'Quezon City'),
+            'rating': float(row['rating']) if not is_missing(row.get('rating')) else None,
+            'status': status,
+            'minutes_until_change': None if minutes[i] == NO_TRANSITION else int(minutes[i]),
+        })
+
+    return jsonify({
+        'now': now.isoformat(timespec='minutes'),
+        'within_minutes': within,
+        'dataset_version': catalog.dataset_version,
+        'total_found': int(len(rows)),
+        'restaurants': restaurants,
+    })
+
+@app.route('/api/nearby')
+def api_nearby():
+    """
+    Restaurants near ?lat=&lng=, nearest first: every one within ?radius= metres (default 1000),
+    or with ?k= the k nearest (within ?radius= only when it is given). Optional ?cuisine=<cuisine-slug>
+    and ?limit=.
+    """
+    lat = request.args.get('lat', type=float)
+    lng = request.args.get('lng', type=float)
+    if lat is None or lng is None or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return jsonify({'error': 'lat and lng must be valid coordinates'}), 400
+    radius = request.args.get('radius', type=float)
+    if 'radius' in request.args and (radius is None or not 0 < radius <= 50000):
+        return jsonify({'error': 'radius must be between 0 and 50000 metres'}), 400
+    k = request.args.get('k', type=int)
+    if 'k' in request.args and k is None:
+        return jsonify({'error': 'k must be a whole number'}), 400
+    limit = max(1, min(request.args.get('limit', 50, type=int), 200))
+
+    catalog = CATALOG.get()
+    table = catalog.table
+    mask = catalog.active_mask
+
+    cuisine = request.args.get('cuisine')
+    if cuisine:
+        column = 'type' if 'type' in table else 'cuisine'
+        cuisine_types = catalog.cuisine_slugs.get(cuisine_slug(cuisine))
+        if not cuisine_types:
+            return jsonify({'error': f'Unknown cuisine: {cuisine}'}), 404
+        mask = mask & table.isin(column, cuisine_types)
+
+    if k is not None:
+        k = max(1, min(k, 200))
+        positions, distances = catalog.geo.nearest(lat, lng, k, mask, radius)
+    else:
+        radius = radius or 1000
+        positions, distances = catalog.geo.within(lat, lng, radius, mask)
+
+    restaurants = []
+    page = positions[:limit]
+    for distance, row in zip(distances[:limit].tolist(), table.rows(page)):
+        restaurants.append({
+            'name': row.get('name', ''),
+            'slug': generate_restaurant_slug(row.get('name', '')),
+            'cuisine': row.get('type', 'Restaurant'),
+            'area': row.get('SEO Area', 'Quezon City'),
+            'rating': float(row['rating']) if not is_missing(row.get('rating')) else None,
+            'latitude': round(float(row['latitude']), 6),
+            'longitude': round(float(row['longitude']), 6),
+            'distance_m': round(distance),
+        })
+
+    return jsonify({
+        'lat': lat,
+        'lng': lng,
+        'radius_m': radius,
+        'k': k,
+        'dataset_version': catalog.dataset_version,
+        'total_found': int(len(positions)),
+        'restaurants': restaurants,
+    })
+
+@app.route('/api/suggest')
+def api_suggest():
+    """
+    Typeahead: restaurants, areas and cuisines whose name (or a later word of it) starts with
+    ?q=, most reviewed first. Optional ?kind=restaurant|area|cuisine (repeatable) and ?limit=.
+    """
+    kinds = request.args.getlist('kind') or list(SUGGEST_KINDS)
+    unknown = [kind for kind in kinds if kind not in SUGGEST_KINDS]
+    if unknown:
+        return jsonify({'error': f"Unknown kind: {unknown[0]} (use {', '.join(SUGGEST_KINDS)})"}), 400
+    limit = max(1, min(request.args.get('limit', SUGGEST_LIMIT, type=int), SUGGEST_LIMIT))
+
+    catalog = CATALOG.get()
+    query = request.args.get('q', '')
+    return jsonify({
+        'query': query,
+        'dataset_version': catalog.dataset_version,
+        'suggestions': catalog.suggest.suggest(query, limit, kinds),
+    })
+
 @app.route('/robots.txt')
 def robots():
     return send_from_directory(app.static_folder, 'robots.txt')
 
 @app.route('/blog')
+@cached_page
 def blog_index():
     # Get all unique cuisines for the navigation
-    df = pd.read_csv(DATA_FILE)
-    df, all_cuisines, area_counts = process_dataframe(df)
+    catalog = CATALOG.get()
+    all_cuisines, area_counts = catalog.all_cuisines, catalog.area_counts
+    page_reads(facet_key('navigation'))
     return render_template('blog/index.html', posts=blog_posts, all_cuisines=all_cuisines, area_counts=area_counts)
 
 @app.route('/blog/<slug>')
+@cached_page
 def blog_post(slug):
     # Get all unique cuisines for the navigation
-    df = pd.read_csv(DATA_FILE)
-    df, all_cuisines, area_counts = process_dataframe(df)
+    catalog = CATALOG.get()
+    table, all_cuisines, area_counts = catalog.table, catalog.all_cuisines, catalog.area_counts
     
     # Special route for Tomas Morato article - use simple template
     if slug == 'tomas-morato-restaurants-2025':
         # Get Tomas Morato restaurants from the new CSV data
         tomas_morato_restaurants = []
-        tomas_morato_mask = df['SEO Area'].str.contains('Tomas Morato', case=False, na=False)
-        tomas_morato_df = df[tomas_morato_mask]
+        tomas_morato_mask = table.contains('SEO Area', 'Tomas Morato')
+        tomas_morato_rows = table.rows(np.flatnonzero(tomas_morato_mask))
         
-        for _, row in tomas_morato_df.iterrows():
+        for row in tomas_morato_rows:
             restaurant = {
                 'name': row.get('name_for_emails', row.get('name', 'Unknown Restaurant')),
                 'cuisine': row.get('type', 'Unknown Cuisine'),
@@ -1693,7 +1097,7 @@ def blog_post(slug):
                 'reviews': row.get('reviews', 0),
                 'address': row.get('street', row.get('address', '')),
                 'photo': row.get('photo', ''),
-                'phone': format_phone_number(row.get('+63', '')) if pd.notna(row.get('+63', '')) and row.get('+63', '') else '',
+                'phone': format_phone_number(row.get('+63', '')) if not is_missing(row.get('+63', '')) and row.get('+63', '') else '',
                 'site': row.get('site', ''),
                 'price_range': row.get('prices', '₱₱'),
                 'hours': row.get('working_hours', ''),
@@ -1749,10 +1153,10 @@ def blog_post(slug):
     if slug == 'sm-fairview-restaurants-2025':
         # Get Fairview restaurants from the new CSV data
         fairview_restaurants = []
-        fairview_mask = df['SEO Area'].str.contains('Fairview', case=False, na=False)
-        fairview_df = df[fairview_mask]
+        fairview_mask = table.contains('SEO Area', 'Fairview')
+        fairview_rows = table.rows(np.flatnonzero(fairview_mask))
         
-        for _, row in fairview_df.iterrows():
+        for row in fairview_rows:
             restaurant = {
                 'name': row.get('name_for_emails', row.get('name', 'Unknown Restaurant')),
                 'cuisine': row.get('type', 'Unknown Cuisine'),
@@ -1760,7 +1164,7 @@ def blog_post(slug):
                 'reviews': row.get('reviews', 0),
                 'address': row.get('street', row.get('address', '')),
                 'photo_url': row.get('photo', ''),
-                'phone': format_phone_number(row.get('+63', '')) if pd.notna(row.get('+63', '')) and row.get('+63', '') else '',
+                'phone': format_phone_number(row.get('+63', '')) if not is_missing(row.get('+63', '')) and row.get('+63', '') else '',
                 'site': row.get('site', ''),
                 'price_range': row.get('prices', '₱₱'),
                 'hours': row.get('working_hours', ''),
@@ -1786,13 +1190,14 @@ def blog_post(slug):
     if slug == 'sm-north-edsa-restaurants-2025':
         # Get SM North EDSA restaurants from the new CSV data
         sm_north_restaurants = []
-        sm_north_mask = df['SEO Area'].str.contains('SM North', case=False, na=False)
-        sm_north_df = df[sm_north_mask]
+        sm_north_mask = table.contains('SEO Area', 'SM North')
+        expire_page_at(catalog.status_expires(np.flatnonzero(sm_north_mask)))
+        sm_north_rows = table.rows(np.flatnonzero(sm_north_mask))
         
-        for _, row in sm_north_df.iterrows():
+        for row in sm_north_rows:
             # Handle address - ensure it's a string, not NaN
             address = row.get('street', row.get('address', ''))
-            if pd.isna(address) or address == 'nan' or str(address).strip() == '':
+            if is_missing(address) or address == 'nan' or str(address).strip() == '':
                 address = ''
             else:
                 address = str(address).strip()
@@ -1800,7 +1205,7 @@ def blog_post(slug):
             # Handle hours - parse JSON string to dict
             hours_raw = row.get('working_hours', '')
             hours_dict = {}
-            if hours_raw and not pd.isna(hours_raw) and str(hours_raw).strip() != '':
+            if hours_raw and not is_missing(hours_raw) and str(hours_raw).strip() != '':
                 if isinstance(hours_raw, dict):
                     hours_dict = hours_raw
                 elif isinstance(hours_raw, str) and hours_raw.startswith('{'):
@@ -1822,7 +1227,7 @@ def blog_post(slug):
                 'reviews': row.get('reviews', 0),
                 'address': address,
                 'photo_url': row.get('photo', ''),
-                'phone': format_phone_number(row.get('+63', '')) if pd.notna(row.get('+63', '')) and row.get('+63', '') else '',
+                'phone': format_phone_number(row.get('+63', '')) if not is_missing(row.get('+63', '')) and row.get('+63', '') else '',
                 'site': row.get('site', ''),
                 'price_range': row.get('prices', '₱₱'),
                 'hours': hours,
@@ -1853,10 +1258,10 @@ def blog_post(slug):
     if slug == 'banawe-restaurants-2025':
         # Get Banawe restaurants from the new CSV data
         banawe_restaurants = []
-        banawe_mask = df['SEO Area'].str.contains('Banawe', case=False, na=False)
-        banawe_df = df[banawe_mask]
+        banawe_mask = table.contains('SEO Area', 'Banawe')
+        banawe_rows = table.rows(np.flatnonzero(banawe_mask))
         
-        for _, row in banawe_df.iterrows():
+        for row in banawe_rows:
             restaurant = {
                 'name': row.get('name_for_emails', row.get('name', 'Unknown Restaurant')),
                 'cuisine': row.get('type', 'Unknown Cuisine'),
@@ -1864,7 +1269,7 @@ def blog_post(slug):
                 'reviews': row.get('reviews', 0),
                 'address': row.get('street', row.get('address', '')),
                 'photo': row.get('photo', ''),
-                'phone': format_phone_number(row.get('+63', '')) if pd.notna(row.get('+63', '')) and row.get('+63', '') else '',
+                'phone': format_phone_number(row.get('+63', '')) if not is_missing(row.get('+63', '')) and row.get('+63', '') else '',
                 'site': row.get('site', ''),
                 'price_range': row.get('prices', '₱₱'),
                 'hours': row.get('working_hours', ''),
@@ -1890,10 +1295,10 @@ def blog_post(slug):
     if slug == 'trinoma-restaurants-2025':
         # Get Trinoma restaurants from the new CSV data
         trinoma_restaurants = []
-        trinoma_mask = df['SEO Area'].str.contains('Trinoma', case=False, na=False)
-        trinoma_df = df[trinoma_mask]
+        trinoma_mask = table.contains('SEO Area', 'Trinoma')
+        trinoma_rows = table.rows(np.flatnonzero(trinoma_mask))
         
-        for _, row in trinoma_df.iterrows():
+        for row in trinoma_rows:
             restaurant = {
                 'name': row.get('name_for_emails', row.get('name', 'Unknown Restaurant')),
                 'cuisine': row.get('type', 'Unknown Cuisine'),
@@ -1901,7 +1306,7 @@ def blog_post(slug):
                 'reviews': row.get('reviews', 0),
                 'address': row.get('street', row.get('address', '')),
                 'photo': row.get('photo', ''),
-                'phone': format_phone_number(row.get('+63', '')) if pd.notna(row.get('+63', '')) and row.get('+63', '') else '',
+                'phone': format_phone_number(row.get('+63', '')) if not is_missing(row.get('+63', '')) and row.get('+63', '') else '',
                 'site': row.get('site', ''),
                 'price_range': row.get('prices', '₱₱'),
                 'hours': row.get('working_hours', ''),
@@ -1927,10 +1332,10 @@ def blog_post(slug):
     if slug == 'maginhawa-restaurants-2025':
         # Get Maginhawa restaurants from the new CSV data
         maginhawa_restaurants = []
-        maginhawa_mask = df['SEO Area'].str.contains('Maginhawa', case=False, na=False)
-        maginhawa_df = df[maginhawa_mask]
+        maginhawa_mask = table.contains('SEO Area', 'Maginhawa')
+        maginhawa_rows = table.rows(np.flatnonzero(maginhawa_mask))
         
-        for _, row in maginhawa_df.iterrows():
+        for row in maginhawa_rows:
             restaurant = {
                 'name': row.get('name_for_emails', row.get('name', 'Unknown Restaurant')),
                 'cuisine': row.get('type', 'Unknown Cuisine'),
@@ -1938,7 +1343,7 @@ def blog_post(slug):
                 'reviews': row.get('reviews', 0),
                 'address': row.get('street', row.get('address', '')),
                 'photo': row.get('photo', ''),
-                'phone': format_phone_number(row.get('+63', '')) if pd.notna(row.get('+63', '')) and row.get('+63', '') else '',
+                'phone': format_phone_number(row.get('+63', '')) if not is_missing(row.get('+63', '')) and row.get('+63', '') else '',
                 'site': row.get('site', ''),
                 'price_range': row.get('prices', '₱₱'),
                 'hours': row.get('working_hours', ''),
@@ -1964,10 +1369,10 @@ def blog_post(slug):
     if slug == 'cubao-restaurants-2025':
         # Get Cubao restaurants from the new CSV data
         cubao_restaurants = []
-        cubao_mask = df['SEO Area'].str.contains('Cubao', case=False, na=False)
-        cubao_df = df[cubao_mask]
+        cubao_mask = table.contains('SEO Area', 'Cubao')
+        cubao_rows = table.rows(np.flatnonzero(cubao_mask))
         
-        for _, row in cubao_df.iterrows():
+        for row in cubao_rows:
             restaurant = {
                 'name': row.get('name_for_emails', row.get('name', 'Unknown Restaurant')),
                 'cuisine': row.get('type', 'Unknown Cuisine'),
@@ -1975,7 +1380,7 @@ def blog_post(slug):
                 'reviews': row.get('reviews', 0),
                 'address': row.get('street', row.get('address', '')),
                 'photo': row.get('photo', ''),
-                'phone': format_phone_number(row.get('+63', '')) if pd.notna(row.get('+63', '')) and row.get('+63', '') else '',
+                'phone': format_phone_number(row.get('+63', '')) if not is_missing(row.get('+63', '')) and row.get('+63', '') else '',
                 'site': row.get('site', ''),
                 'price_range': row.get('prices', '₱₱'),
                 'hours': row.get('working_hours', ''),
@@ -2001,14 +1406,15 @@ def blog_post(slug):
     if slug == 'eastwood-restaurants-2025':
         # Get Eastwood restaurants from the new CSV data
         eastwood_restaurants = []
-        eastwood_mask = df['SEO Area'].str.contains('Eastwood', case=False, na=False)
-        eastwood_df = df[eastwood_mask]
+        eastwood_mask = table.contains('SEO Area', 'Eastwood')
+        expire_page_at(catalog.status_expires(np.flatnonzero(eastwood_mask)))
+        eastwood_rows = table.rows(np.flatnonzero(eastwood_mask))
         
         # Get current day for highlighting
         ph_time = datetime.utcnow().replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=8)))
         current_day = ph_time.strftime('%A')
         
-        for _, row in eastwood_df.iterrows():
+        for row in eastwood_rows:
             # Parse hours from JSON string
             hours_raw = row.get('working_hours', '')
             hours_dict = {}
@@ -2025,7 +1431,7 @@ def blog_post(slug):
                 'reviews': row.get('reviews', 0),
                 'address': row.get('street', row.get('address', '')),
                 'photo': row.get('photo', ''),
-                'phone': format_phone_number(row.get('+63', '')) if pd.notna(row.get('+63', '')) and row.get('+63', '') else '',
+                'phone': format_phone_number(row.get('+63', '')) if not is_missing(row.get('+63', '')) and row.get('+63', '') else '',
                 'site': row.get('site', ''),
                 'price_range': row.get('prices', '₱₱'),
                 'hours': hours_dict,
@@ -2061,10 +1467,10 @@ def blog_post(slug):
     if slug == 'timog-restaurants-2025':
         # Get Timog restaurants from the new CSV data
         timog_restaurants = []
-        timog_mask = df['SEO Area'].str.contains('Timog', case=False, na=False)
-        timog_df = df[timog_mask]
+        timog_mask = table.contains('SEO Area', 'Timog')
+        timog_rows = table.rows(np.flatnonzero(timog_mask))
         
-        for _, row in timog_df.iterrows():
+        for row in timog_rows:
             restaurant = {
                 'name': row.get('name_for_emails', row.get('name', 'Unknown Restaurant')),
                 'cuisine': row.get('type', 'Unknown Cuisine'),
@@ -2072,7 +1478,7 @@ def blog_post(slug):
                 'reviews': row.get('reviews', 0),
                 'address': row.get('street', row.get('address', '')),
                 'photo_url': row.get('photo', ''),
-                'phone': format_phone_number(row.get('+63', '')) if pd.notna(row.get('+63', '')) and row.get('+63', '') else '',
+                'phone': format_phone_number(row.get('+63', '')) if not is_missing(row.get('+63', '')) and row.get('+63', '') else '',
                 'site': row.get('site', ''),
                 'price_range': row.get('prices', '₱₱'),
                 'hours': row.get('working_hours', ''),
@@ -2095,9 +1501,11 @@ def blog_post(slug):
     
     # Special route for Filipino Restaurants article
     if slug == 'filipino-restaurants-quezon-city':
+        # Open status and time until opening are worked out per view from the hours strings
+        skip_page_cache()
         # Read and process the data exactly like the main page
-        df = pd.read_csv(DATA_FILE)
-        df, all_cuisines, area_counts = process_dataframe(df)
+        catalog = CATALOG.get()
+        table, all_cuisines, area_counts = catalog.table, catalog.all_cuisines, catalog.area_counts
         
         # Use the specific 10 Filipino restaurants from the article
         specific_restaurant_names = [
@@ -2117,23 +1525,21 @@ def blog_post(slug):
         filipino_restaurants = []
         for restaurant_name in specific_restaurant_names:
             # Search for exact name match first
-            mask = df['name'].str.contains(restaurant_name, case=False, na=False)
+            mask = table.contains('name', restaurant_name)
             
             # If no exact match, try to find the closest match
             if not mask.any():
                 # Try to find restaurants that contain key words from the name
                 key_words = [word for word in restaurant_name.split() if len(word) > 2]
                 for word in key_words:
-                    mask = df['name'].str.contains(word, case=False, na=False)
+                    mask = table.contains('name', word)
                     if mask.any():
                         break
             
             if mask.any():
-                # Get all matches and find the best one
-                matches = df[mask]
-                # Sort by rating to get the best match
-                matches = matches.sort_values('rating', ascending=False)
-                row = matches.iloc[0]  # Take the highest rated match
+                # Get all matches and sort by rating to get the best one
+                matches = table.sort_desc('rating', np.flatnonzero(mask))
+                row = table.rows(matches[:1])[0]  # Take the highest rated match
                 
                 # Debug: Print what we found
                 print(f"Found restaurant: {row.get('name')} for search: {restaurant_name}")
@@ -2210,12 +1616,14 @@ def blog_post(slug):
     return render_template('blog/post.html', post=post, related_posts=related_posts, request=request, all_cuisines=all_cuisines, area_counts=area_counts)
 
 @app.route('/restaurant/<slug>')
+@cached_page
 def restaurant_details(slug):
     # Get all unique cuisines for the navigation
-    df = pd.read_csv(DATA_FILE)
-    df, all_cuisines, area_counts = process_dataframe(df)
+    catalog = CATALOG.get()
+    all_cuisines, area_counts = catalog.all_cuisines, catalog.area_counts
     
     # Get restaurant data
+    restaurants_data = catalog.restaurants_data
     restaurant = restaurants_data.get(slug)
     if not restaurant:
         abort(404)
@@ -2234,29 +1642,20 @@ def restaurant_details(slug):
     elif restaurant.get('address'):
         maps_url = f"https://www.google.com/maps/search/{restaurant['address'].replace(' ', '+')}"
     
-    # Find similar restaurants (same cuisine or area, excluding current)
+    # Similar restaurants (same cuisine, closest by subtypes, area, price, amenities and distance), precomputed per catalog
     similar_restaurants = []
-    if restaurant.get('cuisine') or restaurant.get('area'):
-        for slug_key, other_rest in restaurants_data.items():
-            if slug_key == slug:
-                continue
-            score = 0
-            if other_rest.get('cuisine') == restaurant.get('cuisine'):
-                score += 2
-            if other_rest.get('area') == restaurant.get('area'):
-                score += 1
-            if other_rest.get('rating', 0) >= 4.0:
-                score += 0.5
-            if score >= 2:
-                similar_restaurants.append({
-                    'name': other_rest.get('name', 'Unknown'),
-                    'slug': slug_key,
-                    'cuisine': other_rest.get('cuisine', ''),
-                    'rating': other_rest.get('rating', 0),
-                    'photo': other_rest.get('photo_url', '')
-                })
-        # Sort by rating and limit to 5
-        similar_restaurants = sorted(similar_restaurants, key=lambda x: x['rating'], reverse=True)[:5]
+    position = catalog.slug_rows.get(slug)
+    page_reads(facet_key('navigation'), *catalog.dependencies.restaurant_keys(slug, position))
+    if position is not None:
+        page_reads(*catalog.dependencies.row_keys(catalog.similar.similar(position)))
+        for row in catalog.table.rows(catalog.similar.similar(position)):
+            similar_restaurants.append({
+                'name': row.get('name_for_emails') if not is_missing(row.get('name_for_emails')) and row.get('name_for_emails') else row.get('name', 'Unknown'),
+                'slug': generate_restaurant_slug(row.get('name', '')),
+                'cuisine': row.get('type', ''),
+                'rating': row['rating'] if not is_missing(row.get('rating')) else 0,
+                'photo': row.get('photo_url', '')
+            })
     
     return render_template('restaurant.html', 
                          restaurant=restaurant,
@@ -2271,8 +1670,9 @@ def restaurant_details(slug):
 def food_tour():
     """Food Tour Builder - Generate a mini food tour based on cuisine, budget, and area"""
     # Get all unique cuisines for the navigation
-    df = pd.read_csv(DATA_FILE)
-    df, all_cuisines, area_counts = process_dataframe(df)
+    catalog = CATALOG.get()
+    table, all_cuisines, area_counts = catalog.table, catalog.all_cuisines, catalog.area_counts
+    facets = catalog.facets
     
     tour = []
     premium_tour_data = None
@@ -2304,13 +1704,9 @@ def food_tour():
         # Build tour if we have valid inputs
         if cuisine and budget > 0:
             try:
-                # Load fresh restaurant data
-                restaurants_df = pd.read_csv(DATA_FILE)
-                
                 # Use premium tour builder for enhanced experience
                 try:
                     premium_tour_data = build_premium_tour(
-                        restaurants_df=restaurants_df,
                         cuisine=cuisine,
                         budget=budget,
                         area=area if area else None,
@@ -2342,14 +1738,14 @@ def food_tour():
                         # premium_tour_data is kept for template - don't set to None
                     else:
                         # Fallback to basic tour builder if premium fails
-                        tour = build_food_tour(restaurants_df, cuisine, budget, area if area else None)
+                        tour = build_food_tour(table, facets, cuisine, budget, area if area else None)
                         premium_tour_data = None
                 except Exception as e:
                     print(f"Error in premium tour builder: {e}")
                     import traceback
                     traceback.print_exc()
                     # Fallback to basic tour builder
-                    tour = build_food_tour(restaurants_df, cuisine, budget, area if area else None)
+                    tour = build_food_tour(table, facets, cuisine, budget, area if area else None)
                     premium_tour_data = None
                 
                 # Log the tour request (fail silently if logging fails)
@@ -2398,10 +1794,12 @@ def food_tour():
                          area_counts=area_counts)
 
 @app.route('/blog/best-coffee-shops-quezon-city')
+@cached_page
 def coffee_shops_blog():
     # Get all unique cuisines for the navigation
-    df = pd.read_csv(DATA_FILE)
-    df, all_cuisines, area_counts = process_dataframe(df)
+    catalog = CATALOG.get()
+    all_cuisines, area_counts = catalog.all_cuisines, catalog.area_counts
+    page_reads(facet_key('navigation'))
     return render_template('blog/best-coffee-shops-quezon-city.html', 
                          all_cuisines=all_cuisines, 
                          area_counts=area_counts)
@@ -2462,10 +1860,6 @@ def contribute_menu():
     import json
     import os
     
-    # Load restaurant names for autocomplete
-    df = pd.read_csv(DATA_FILE)
-    restaurants = df['name'].dropna().unique().tolist()
-    
     # Load current menu stats
     menu_file = os.path.join(os.path.dirname(__file__), 'data', 'menus.json')
     stats = {'restaurants_with_menus': 0, 'total_items': 0, 'contributors': 0}
@@ -2523,12 +1917,13 @@ def contribute_menu():
         
         success = True
     
+    # Restaurant names are suggested as the user types (/api/suggest)
     return render_template('contribute/menu.html',
-                         restaurants=restaurants[:50],
                          stats=stats,
                          success=success)
 
 @app.route('/search')
+@cached_page
 def search():
     """Search page for restaurants."""
     query = request.args.get('q', '').strip()
@@ -2537,56 +1932,23 @@ def search():
     budget_filter = request.args.get('budget', '').strip()
     
     # Load restaurant data
-    df = pd.read_csv(DATA_FILE)
-    df, all_cuisines, area_counts = process_dataframe(df)
+    catalog = CATALOG.get()
+    table, all_cuisines, area_counts = catalog.table, catalog.all_cuisines, catalog.area_counts
     
     results = []
     
-    if query or cuisine_filter or area_filter:
-        # Start with all restaurants
-        filtered = df.copy()
-        
-        # Filter by search query (name, type, area)
+    if query or cuisine_filter or area_filter or budget_filter:
         if query:
-            query_lower = query.lower()
-            name_filter = df['name'].fillna('').apply(lambda x: query_lower in str(x).lower())
-            type_filter = df['type'].fillna('').apply(lambda x: query_lower in str(x).lower())
-            area_filter_search = df['SEO Area'].fillna('').apply(lambda x: query_lower in str(x).lower())
-            filtered = filtered[name_filter | type_filter | area_filter_search]
-        
-        # Filter by cuisine
-        if cuisine_filter:
-            cuisine_map = {
-                'filipino': ['Filipino', 'Pinoy'],
-                'asian': ['Japanese', 'Thai', 'Vietnamese', 'Korean', 'Chinese', 'Asian', 'Thai', 'Singaporean'],
-                'western': ['American', 'Italian', 'Spanish', 'Western', 'European'],
-                'coffee': ['Cafe', 'Coffee', 'Bakery']
-            }
-            if cuisine_filter in cuisine_map:
-                c_filter = filtered['type'].fillna('').apply(
-                    lambda x: any(c.lower() in str(x).lower() for c in cuisine_map[cuisine_filter])
-                )
-                filtered = filtered[c_filter]
-        
-        # Filter by area
-        if area_filter:
-            area_map = {
-                'timog': ['Timog', 'Scout'],
-                'tomas morato': ['Tomas Morato', 'Morato'],
-                'north': ['SM North', 'North EDSA', 'Trinoma', 'North'],
-                'east': ['Eastwood', 'Ortigas'],
-                'maginhawa': ['Maginhawa', 'Teacher\'s Village'],
-                'cubao': ['Cubao', 'Araneta']
-            }
-            area_key = area_filter.lower()
-            if area_key in area_map:
-                a_filter = filtered['SEO Area'].fillna('').apply(
-                    lambda x: any(a.lower() in str(x).lower() for a in area_map[area_key])
-                )
-                filtered = filtered[a_filter]
+            # Best matches first from the catalog's search index (BM25, typo tolerant), within the facet filters
+            mask = catalog.facets.match(cuisine=cuisine_filter, area=area_filter, budget=budget_filter)
+            positions = catalog.search.search(query, mask, limit=20)
+        else:
+            # Filters only: cuisine, area and budget groups come from the catalog's facets
+            conditions = sqlstore.facet_match(cuisine=cuisine_filter, area=area_filter, budget=budget_filter)
+            positions = catalog.db.positions(conditions, limit=20)
         
         # Build results
-        for _, row in filtered.head(20).iterrows():
+        for row in table.rows(positions):
             results.append({
                 'id': row.get('place_id', ''),
                 'name': row.get('name', 'Unknown'),
@@ -2599,11 +1961,14 @@ def search():
                 'highlight': query if query in str(row.get('name', '')).lower() else ''
             })
     
+    # The template lists `restaurants` and offers `areas` in its area filter
     return render_template('search.html',
                          query=query,
                          cuisine_filter=cuisine_filter,
                          area_filter=area_filter,
                          results=results,
+                         restaurants=results,
+                         areas=list(area_counts),
                          all_cuisines=all_cuisines)
 
 # ========== ADMIN ROUTES ==========
@@ -2641,14 +2006,16 @@ def admin_dashboard():
         pass
     
     # Get total restaurants
-    df = pd.read_csv(DATA_FILE)
+    table = CATALOG.get().table
     
     stats = {
-        'total_restaurants': len(df),
+        'total_restaurants': len(table),
         'menus_with_data': menu_stats['menus_with_data'],
         'total_menu_items': menu_stats['total_items'],
         'pending_contributions': pending_count,
-        'menu_coverage': round((menu_stats['menus_with_data'] / len(df) * 100), 1) if len(df) > 0 else 0
+        'menu_coverage': round((menu_stats['menus_with_data'] / len(table) * 100), 1) if len(table) > 0 else 0,
+        # This worker's rendered-page cache: hit rate, size, latency by outcome and per endpoint
+        'page_cache': PAGE_CACHE.stats() if PAGE_CACHE is not None else None
     }
     
     # Show first contribution details if requested
@@ -2772,43 +2139,68 @@ def admin_run_scraper():
         'message': 'Scraper would run here in production (requires Celery/task queue)'
     })
 
+@app.route('/admin/memory')
+def admin_memory():
+    """This worker's memory: how many pages are still shared with the preloading master and other workers."""
+    import gc
+    catalog = CATALOG.get()
+    usage = memory_usage()
+    return jsonify({
+        'pid': os.getpid(),
+        'preloaded': PRELOAD_STATE['preloaded_at'] is not None,
+        'forked_from': PRELOAD_STATE['master_pid'] if PRELOAD_STATE['master_pid'] != os.getpid() else None,
+        'frozen_objects': gc.get_freeze_count(),
+        'dataset_version': catalog.dataset_version,
+        'catalog_built_at': catalog.built_at,
+        'memory': usage if usage is not None else 'unavailable (needs /proc/self/smaps_rollup)',
+    })
+
 @app.route('/admin/analytics')
 def admin_analytics():
     """Analytics overview."""
-    df = pd.read_csv(DATA_FILE)
+    catalog = CATALOG.get()
+    table = catalog.table
+    ratings = table.array('rating')
     
     # Calculate some stats
     stats = {
-        'total_restaurants': len(df),
-        'with_photos': df['photo'].notna().sum(),
-        'with_ratings': df['rating'].notna().sum(),
-        'avg_rating': round(df['rating'].mean(), 1) if df['rating'].notna().any() else 0,
-        'cuisine_counts': df['type'].value_counts().head(10).to_dict(),
-        'area_counts': df['SEO Area'].value_counts().head(10).to_dict()
+        'total_restaurants': len(table),
+        'with_photos': np.count_nonzero(table.matches('photo', lambda x: not is_missing(x))),
+        'with_ratings': np.count_nonzero(~np.isnan(ratings)),
+        'avg_rating': round(np.nanmean(ratings), 1) if not np.isnan(ratings).all() else 0,
+        'cuisine_counts': dict(list(catalog.type_counts.items())[:10]),
+        'area_counts': dict(list(catalog.seo_area_counts.items())[:10])
     }
     
     return render_template('admin/analytics.html', stats=stats)
 
 @app.route('/best-of')
+@cached_page
 def best_of():
     """Best of Quezon City restaurants by category."""
-    df = pd.read_csv(DATA_FILE)
-    df = process_dataframe(df)[0]
+    catalog = CATALOG.get()
+    table = catalog.table
     
     # Stats
     stats = {
-        'total': len(df),
-        'high_rated': len(df[df['rating'] >= 4.0]) if 'rating' in df.columns else 0,
-        'cuisines': df['type'].nunique() if 'type' in df.columns else 0,
-        'areas': df['SEO Area'].nunique() if 'SEO Area' in df.columns else 0,
-        'cafes': len(df[df['type'].fillna('').str.contains('Cafe|Coffee', case=False)]) if 'type' in df.columns else 0
+        'total': len(table),
+        'high_rated': len(catalog.listings.best('top-rated')),
+        'cuisines': sum(1 for count in catalog.type_counts.values() if count) if 'type' in table else 0,
+        'areas': sum(1 for count in catalog.seo_area_counts.values() if count) if 'SEO Area' in table else 0,
+        # From the per-type totals: a few dozen names to check instead of every row
+        'cafes': sum(count for name, count in catalog.type_counts.items()
+                     if re.search('cafe|coffee', str(name), re.IGNORECASE)) if 'type' in table else 0
     }
     
+    # by-rating covers every row, so its first rows also stand for the total; top-rated only for its length
+    top_rows = catalog.listings.by_rating[:4]
+    page_reads(facet_key('type-counts'), facet_key('area-counts'), list_key('by-rating', 0, 4),
+               list_key(list_name('best', 'top-rated'), 0, 0), *catalog.dependencies.row_keys(top_rows))
+    
     # Featured (top rated)
     featured = []
-    if 'rating' in df.columns:
-        top_rated = df.sort_values('rating', ascending=False).head(4)
-        for _, row in top_rated.iterrows():
+    if 'rating' in table:
+        for row in table.rows(top_rows):
             featured.append({
                 'name': row.get('name', 'Unknown'),
                 'slug': row.get('slug', generate_restaurant_slug(row.get('name', ''))),
@@ -2820,8 +2212,8 @@ def best_of():
     
     # Cuisines
     cuisines = []
-    if 'type' in df.columns:
-        for cuisine in df['type'].value_counts().head(12).items():
+    if 'type' in table:
+        for cuisine in list(catalog.type_counts.items())[:12]:
             icon = '🍽️'
             if 'Filipino' in cuisine[0]: icon = '🇵🇭'
             elif 'Thai' in cuisine[0]: icon = '🍜'
@@ -2835,8 +2227,8 @@ def best_of():
     
     # Areas
     areas = []
-    if 'SEO Area' in df.columns:
-        for area in df['SEO Area'].value_counts().head(12).items():
+    if 'SEO Area' in table:
+        for area in list(catalog.seo_area_counts.items())[:12]:
             areas.append({'name': area[0], 'count': area[1]})
     
     return render_template('best-of.html',
@@ -2846,40 +2238,20 @@ def best_of():
                          areas=areas)
 
 @app.route('/best-of/<category>')
+@cached_page
 def best_of_category(category):
     """Best of by specific category."""
-    df = pd.read_csv(DATA_FILE)
-    df = process_dataframe(df)[0]
-    
-    # Filter by category
-    filtered = df.copy()
-    
-    if category == 'top-rated':
-        filtered = filtered[filtered['rating'] >= 4.0] if 'rating' in df.columns else filtered.head(0)
-    elif category == 'budget':
-        # Budget: assume lower price range
-        filtered = filtered.head(50)  # Just show first 50
-    elif category == 'romantic':
-        # Romantic: look for keywords
-        if 'about' in df.columns:
-            mask = filtered['about'].fillna('').str.contains('romantic|date|cozy|intimate', case=False)
-            filtered = filtered[mask]
-    elif category == 'family':
-        # Family: look for family-friendly keywords
-        if 'about' in df.columns:
-            mask = filtered['about'].fillna('').str.contains('family|children|kids', case=False)
-            filtered = filtered[mask]
-    elif category == 'senior':
-        # Senior: wheelchair accessible
-        if 'wheelchair_accessible' in df.columns:
-            filtered = filtered[filtered['wheelchair_accessible'] == True]
-    elif category == 'coffee':
-        if 'type' in df.columns:
-            filtered = filtered[filtered['type'].fillna('').str.contains('Cafe|Coffee', case=False)]
+    catalog = CATALOG.get()
+    table = catalog.table
+    
+    # Top-rated, budget, romantic, family, senior or coffee rows, precomputed per catalog
+    rows = catalog.listings.best(category)[:30]
+    if category in catalog.listings.best_of:
+        page_reads(list_key(list_name('best', category), 0, 30), *catalog.dependencies.row_keys(rows))
     
     # Build restaurant list
     restaurants = []
-    for _, row in filtered.head(30).iterrows():
+    for row in table.rows(rows):
         restaurants.append({
             'name': row.get('name', 'Unknown'),
             'slug': row.get('slug', generate_restaurant_slug(row.get('name', ''))),
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+404 Benchmark
+Throughput of crawler-style probes that end in a 404 (the catch-all /<neighbourhood_slug>/
+route, unknown cuisines and restaurants), with the rendered 404 page cached per dataset
+version versus rendered on every probe. Also times the old slug resolution (scan the
+distinct areas, slugify each) against the catalog's slug map.
+
+Usage: python benchmarks/bench_404.py [--rows 2000] [--requests 500]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import legacy_cards
+from synthetic import write_master_list
+
+PROBES = ['/wp-admin/', '/.env/', '/xmlrpc.php/', '/phpmyadmin/', '/no-such-area/',
+          '/cuisine/no-such-cuisine', '/restaurant/no-such-place']
+
+
+def throughput(client, urls, requests, before_each=None):
+    start = time.perf_counter()
+    for i in range(requests):
+        if before_each:
+            before_each()
+        response = client.get(urls[i % len(urls)])
+        assert response.status_code == 404, (urls[i % len(urls)], response.status_code)
+    return requests / (time.perf_counter() - start)
+
+
+def legacy_area_lookup(df, slug):
+    """How neighbourhood_page and cuisine_page used to resolve an area slug."""
+    for area in df['SEO Area'].dropna().unique():
+        if area and area.lower().replace(' ', '-').replace('/', '-').replace('.', '').replace('(', '').replace(')', '') == slug:
+            return area
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    os.environ['QC_DATA_FILE'] = write_master_list(os.path.join(workdir, 'master.csv'), args.rows)
+    os.environ['QC_CATALOG_RELOAD_SECONDS'] = '0'
+    os.environ['QC_CATALOG_SNAPSHOT_DIR'] = ''
+    os.chdir(APP_DIR)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import app, CATALOG, NOT_FOUND_PAGES
+        catalog = CATALOG.get()
+    client = app.test_client()
+
+    # cuisine_page prints debug output - keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        rendered = throughput(client, PROBES, args.requests, before_each=NOT_FOUND_PAGES.clear)
+        cached = throughput(client, PROBES, args.requests)
+    print(f"{args.rows} rows, {args.requests} probes across {len(PROBES)} URLs")
+    print(f"404 rendered per probe: {rendered:10.0f} req/s")
+    print(f"404 cached per version: {cached:10.0f} req/s ({cached / rendered:.1f}x)")
+
+    repeat = 1000
+    df = legacy_cards.catalog_frame(catalog)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        legacy_area_lookup(df, 'no-such-area')
+    legacy_us = (time.perf_counter() - start) / repeat * 1e6
+    start = time.perf_counter()
+    for _ in range(repeat):
+        catalog.area_slugs.get('no-such-area')
+    map_us = (time.perf_counter() - start) / repeat * 1e6
+    print(f"area slug miss, unique() scan: {legacy_us:10.2f} us")
+    print(f"area slug miss, slug map:      {map_us:10.2f} us")
+
+
+if __name__ == '__main__':
+    main()
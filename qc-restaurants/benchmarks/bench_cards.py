@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Card Benchmark
+Compares building the home and cuisine page data as the old full-row dicts and as
+RestaurantCards (time and peak allocation via tracemalloc), then times the rendered routes.
+tests/test_cards.py checks the cards carry the same values as the dicts.
+
+Usage: python benchmarks/bench_cards.py [--rows 20000] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+import legacy_cards
+from synthetic import write_master_list
+
+
+def measure(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    os.environ['QC_DATA_FILE'] = write_master_list(os.path.join(workdir, 'master.csv'), args.rows)
+    os.environ['QC_CATALOG_RELOAD_SECONDS'] = '0'
+    os.environ['QC_CATALOG_SNAPSHOT_DIR'] = ''
+    os.chdir(APP_DIR)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import app, CATALOG, HOME_CARDS
+        catalog = CATALOG.get()
+
+    # Home: the template shows the first dozen top picks
+    # The old code read a processed frame; rebuild it once, outside the timings
+    df = legacy_cards.catalog_frame(catalog)
+    active_df = df[catalog.active_mask]
+    top_picks = np.flatnonzero(catalog.active_mask & catalog.table.equals('top_pick', True))[:HOME_CARDS]
+
+    # Cuisine pages: the biggest cuisine
+    cuisine_type = max(catalog.cuisine_counts, key=catalog.cuisine_counts.get)
+    cuisine_types = catalog.cuisine_slugs[cuisine_type.lower().replace(' ', '-')]
+    positions = np.flatnonzero(catalog.table.isin('type', cuisine_types) & catalog.active_mask)
+    print(f"{args.rows} rows; home and '{cuisine_type}' ({len(positions)} matches)")
+
+    print(f"{'page data':28} {'time':>10} {'peak alloc':>12}")
+    cases = [
+        ('home, all top-pick dicts', lambda: legacy_cards.home_records(active_df)),
+        ('home, 12 cards', lambda: catalog.page_cards(top_picks)),
+        ('cuisine, dicts for matches', lambda: legacy_cards.cuisine_records(df, cuisine_types, cuisine_type, 1)),
+        ('cuisine, 12 cards', lambda: catalog.page_cards(positions[:12])),
+    ]
+    for label, fn in cases:
+        seconds, peak = measure(fn, args.repeat)
+        print(f"{label:28} {seconds * 1000:8.2f}ms {peak / 1024:9.0f} KiB")
+
+    client = app.test_client()
+    slug = cuisine_type.lower().replace(' ', '-')
+    for url in ('/', f'/cuisine/{slug}', f'/cuisine/{slug}?page=2'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            seconds, peak = measure(lambda: client.get(url), args.repeat)
+        print(f"GET {url:40} {seconds * 1000:8.2f}ms {peak / 1024:9.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
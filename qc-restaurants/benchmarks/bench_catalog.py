@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Catalog Benchmark
+Per-request latency with the catalog rebuilt on every request (the old read_csv +
+process_dataframe behaviour) versus the shared, built-once catalog.
+
+Usage: python benchmarks/bench_catalog.py [--rows 2000] [--requests 20]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import write_master_list
+
+ROUTES = ['/', '/about', '/cuisine/filipino-restaurant', '/search?q=lola', '/contribute/menu', '/blog', '/api/open-now?within=30m']
+
+
+def time_route(client, url, requests, before_each=None):
+    timings = []
+    status = None
+    for _ in range(requests):
+        if before_each:
+            before_each()
+        start = time.perf_counter()
+        # process_dataframe and some routes print debug output - keep it out of the report
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            status = client.get(url).status_code
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=20)
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore')
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    os.environ['QC_DATA_FILE'] = write_master_list(os.path.join(workdir, 'master.csv'), args.rows)
+    os.environ['QC_CATALOG_SNAPSHOT_DIR'] = ''  # time the CSV build, not a snapshot load
+    os.chdir(APP_DIR)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import app, CATALOG
+    client = app.test_client()
+
+    print(f"{args.rows} rows, median of {args.requests} requests per route")
+    print(f"{'route':36} {'status':>6} {'per-request build':>18} {'shared catalog':>16} {'speedup':>8}")
+    for url in ROUTES:
+        before, status = time_route(client, url, args.requests, before_each=CATALOG.invalidate)
+        with contextlib.redirect_stdout(io.StringIO()):
+            CATALOG.get()
+        after, _ = time_route(client, url, args.requests)
+        print(f"{url:36} {status:>6} {before:15.1f} ms {after:13.1f} ms {before / after:7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
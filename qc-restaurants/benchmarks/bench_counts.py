@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Facet Counts Benchmark
+Checks the catalog's bincount-based counts (open restaurants per type, rows per type and SEO
+Area, open restaurants per type in each area, the cuisine page's popular areas) against the
+per-value mask loops they replace, and that update() on changed rows ends up where a rebuild
+does, dictionary order included. Then times the old loops against one bincount and an update.
+
+Usage: python benchmarks/bench_counts.py [--rows 100000] [--changes 500]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from services.counts import FacetCounts
+from services.ingest import process_dataframe
+from services.schema import read_master_list
+from synthetic import write_master_list
+
+
+def old_cuisine_counts(df):
+    """home / all-restaurants: one full-frame mask per cuisine type."""
+    counts = {}
+    for cuisine_type in df['type'].dropna().unique():
+        counts[cuisine_type] = len(df[df['type'] == cuisine_type])
+    return counts
+
+def old_area_cuisines(df, active):
+    """The neighbourhood page's per-area counts, for every area."""
+    counts = {}
+    for area in df['SEO Area'].dropna().unique():
+        types = df['type'][active & (df['SEO Area'] == area).to_numpy()].dropna()
+        totals = {cuisine_type: len(types[types == cuisine_type]) for cuisine_type in types.unique()}
+        if totals:
+            counts[area] = dict(sorted(totals.items(), key=lambda x: x[1], reverse=True))
+    return counts
+
+def same_totals(counts, expected):
+    """Same values and counts, most common first (value_counts breaks ties in no fixed order)."""
+    return counts == expected and list(counts.values()) == sorted(counts.values(), reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--changes', type=int, default=500)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    with contextlib.redirect_stdout(io.StringIO()):
+        df, _, _ = process_dataframe(read_master_list(write_master_list(os.path.join(workdir, 'master.csv'), args.rows)))
+    active = ~df['business_status'].str.contains('CLOSED_PERMANENTLY', case=False, na=False).to_numpy()
+
+    start = time.perf_counter()
+    counts = FacetCounts(df, active)
+    build_seconds = time.perf_counter() - start
+
+    assert list(counts.cuisine_counts.items()) == list(old_cuisine_counts(df[active]).items())
+    assert same_totals(counts.type_counts, df['type'].value_counts().to_dict())
+    assert same_totals(counts.seo_area_counts, df['SEO Area'].value_counts().to_dict())
+    area_cuisines = old_area_cuisines(df, active)
+    assert {area: list(totals.items()) for area, totals in counts.area_cuisines.items()} == \
+        {area: list(totals.items()) for area, totals in area_cuisines.items()}
+    for cuisine_type in counts.types:
+        areas = df['SEO Area'][active & (df['type'] == cuisine_type).to_numpy()].dropna()
+        totals = {area: len(areas[areas == area]) for area in areas.unique()}
+        assert list(counts.cuisine_areas([cuisine_type]).items()) == sorted(totals.items(), key=lambda x: x[1], reverse=True)
+    print(f"{args.rows} rows; {len(counts.types)} types and {len(counts.areas)} areas match the mask loops")
+
+    # Change some rows (re-typed, moved, closed, a new type and area) and compare update() with a rebuild.
+    # The first open row of a type and the first open row of an area are always among them, as
+    # their cells' first[] has to move on to the next row
+    rng = random.Random(5)
+    changed = df.copy()
+    changed['type'] = changed['type'].cat.add_categories(['Fusion restaurant'])
+    changed['SEO Area'] = changed['SEO Area'].cat.add_categories(['New Manila'])
+    changed_active = active.copy()
+    first_open = np.flatnonzero(active)[0]
+    first_in_area = np.flatnonzero(active & (df['SEO Area'] != df['SEO Area'].iat[first_open]).to_numpy())[0]
+    picked = [first_open, first_in_area] + rng.sample(range(len(df)), args.changes)
+    for row in picked:
+        kind = rng.randrange(4) if row not in (first_open, first_in_area) else (0 if row == first_open else 1)
+        if kind == 0:
+            changed.iat[row, changed.columns.get_loc('type')] = rng.choice(counts.types[1:] + ['Fusion restaurant'])
+        elif kind == 1:
+            changed.iat[row, changed.columns.get_loc('SEO Area')] = rng.choice(counts.areas[1:] + ['New Manila'])
+        elif kind == 2:
+            changed_active[row] = not changed_active[row]
+        else:
+            changed.iat[row, changed.columns.get_loc('type')] = None
+    rows = {int(row): (changed['type'].iat[row], changed['SEO Area'].iat[row], changed_active[row]) for row in picked}
+    start = time.perf_counter()
+    counts.update(rows)
+    update_seconds = time.perf_counter() - start
+    rebuilt = FacetCounts(changed, changed_active)
+    for name in ('cuisine_counts', 'type_counts', 'seo_area_counts'):
+        assert list(getattr(counts, name).items()) == list(getattr(rebuilt, name).items()), name
+    assert {area: list(totals.items()) for area, totals in counts.area_cuisines.items()} == \
+        {area: list(totals.items()) for area, totals in rebuilt.area_cuisines.items()}
+    for cuisine_type in rebuilt.types:
+        assert list(counts.cuisine_areas([cuisine_type]).items()) == list(rebuilt.cuisine_areas([cuisine_type]).items())
+    print(f"update() with {len(rows)} changed rows matches a rebuild")
+
+    timings = []
+    for label, fn in [('cuisine_counts: mask per type (old)', lambda: old_cuisine_counts(df[active])),
+                      ('per-area counts: masks per area (old)', lambda: old_area_cuisines(df, active)),
+                      ('FacetCounts: every count, one bincount', lambda: FacetCounts(df, active))]:
+        start = time.perf_counter()
+        fn()
+        timings.append((label, time.perf_counter() - start))
+    timings.append((f'update() with {len(rows)} changed rows', update_seconds))
+    print(f"{'counting':42} {'time':>10}")
+    for label, seconds in timings:
+        print(f"{label:42} {seconds * 1000:8.1f}ms")
+    print(f"(first build {build_seconds * 1000:.1f}ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Page Dependencies Benchmark
+Edits some rows of the master list the way a weekly refresh does (new ratings and review
+counts, a closed business), reloads the catalog and times the dependency build and diff.
+tests/test_dependencies.py checks that the reload only drops the pages whose rows, lists or
+counts changed.
+
+Usage: python benchmarks/bench_dependencies.py [--rows 5000] [--changes 20]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def weekly_refresh(path, changes, seed=11):
+    """
+    Edit the master list the way a weekly refresh does: new ratings and review counts, one
+    closed business. The file keeps its modification time, so pages rendered before and
+    after share the photo cache-busting version.
+    """
+    import pandas as pd
+    stat = os.stat(path)
+    raw = pd.read_csv(path, dtype=str, keep_default_na=False)
+    rng = random.Random(seed)
+    for row in rng.sample(range(len(raw)), changes):
+        raw.loc[row, 'reviews'] = str(int(float(raw.loc[row, 'reviews'] or 0)) + rng.randint(1, 40))
+        if rng.random() < 0.5:
+            raw.loc[row, 'rating'] = f"{rng.uniform(3.0, 5.0):.1f}"
+    raw.loc[rng.randrange(len(raw)), 'business_status'] = 'CLOSED_PERMANENTLY'
+    raw.to_csv(path, index=False)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--changes', type=int, default=20)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    from synthetic import write_master_list
+
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    path = write_master_list(os.path.join(workdir, 'master.csv'), args.rows)
+    os.environ['QC_DATA_FILE'] = path
+    os.environ['QC_CATALOG_RELOAD_SECONDS'] = '0'
+    os.environ['QC_CATALOG_SNAPSHOT_DIR'] = ''
+    os.chdir(APP_DIR)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as site
+        from services.dependencies import PageDependencies
+        site.CATALOG.get()
+
+    weekly_refresh(path, args.changes)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        site.CATALOG.reload(force=True)
+    reload_seconds = time.perf_counter() - start
+    catalog = site.CATALOG.get()
+    changes = catalog.changes[1]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        rebuilt = site.load_catalog(io.BytesIO(open(path, 'rb').read()), photo_version=1)
+    print(f"{args.rows} rows, {args.changes} edited and 1 closed ({changes.summary()})")
+
+    from services.ingest import process_dataframe
+    from services.schema import read_master_list
+    with contextlib.redirect_stdout(io.StringIO()):
+        df, all_cuisines, area_counts = process_dataframe(read_master_list(path))
+    start = time.perf_counter()
+    PageDependencies(df, catalog.listings, catalog.counts, catalog.similar, catalog.area_neighbours, all_cuisines, area_counts)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    catalog.dependencies.changes(rebuilt.dependencies)
+    diff_seconds = time.perf_counter() - start
+    print(f"{'dependencies':34} {'time':>10}")
+    print(f"{'build (with the catalog)':34} {build_seconds * 1000:8.1f}ms")
+    print(f"{'diff against the last snapshot':34} {diff_seconds * 1000:8.1f}ms")
+    print(f"{'whole reload (build + diff)':34} {reload_seconds * 1000:8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
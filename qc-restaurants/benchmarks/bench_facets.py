@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Facet Benchmark
+Times a search/quiz style filter (cuisine group + area group + wheelchair) done the old way,
+with a per-row keyword apply over the whole frame, against ANDing the catalog's precomputed
+facet bitmaps, after checking both select the same rows.
+
+Usage: python benchmarks/bench_facets.py [--rows 100000] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from services.facets import AREA_GROUPS, CUISINE_GROUPS, FacetIndex
+from services.ingest import process_dataframe
+from synthetic import make_master_list
+
+COMBINATIONS = [('asian', 'north'), ('filipino', 'cubao'), ('coffee', 'center'), ('western', 'east')]
+
+
+def apply_filter(df, cuisine, area):
+    """The per-request masks search and the quiz used to build."""
+    cuisine_query = df['type'].fillna('').apply(lambda x: any(c.lower() in x.lower() for c in CUISINE_GROUPS[cuisine]))
+    area_query = df['SEO Area'].fillna('').apply(lambda x: any(a.lower() in x.lower() for a in AREA_GROUPS[area]))
+    return (cuisine_query & area_query & (df['wheelchair_accessible'].fillna(False) == True)).to_numpy()
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df, _, _ = process_dataframe(make_master_list(args.rows, filler_columns=0))
+
+    start = time.perf_counter()
+    facets = FacetIndex(df)
+    build_seconds = time.perf_counter() - start
+
+    def facet_filter(cuisine, area):
+        return facets.match(cuisine=cuisine, area=area, amenities=['wheelchair'])
+
+    for cuisine, area in COMBINATIONS:
+        assert np.array_equal(apply_filter(df, cuisine, area), facet_filter(cuisine, area)), (cuisine, area)
+
+    apply_seconds = best_of(args.repeat, lambda: [apply_filter(df, c, a) for c, a in COMBINATIONS]) / len(COMBINATIONS)
+    facet_seconds = best_of(args.repeat, lambda: [facet_filter(c, a) for c, a in COMBINATIONS]) / len(COMBINATIONS)
+
+    print(f"{args.rows} rows, {len(COMBINATIONS)} filter combinations, same rows selected")
+    print(f"build FacetIndex (once per snapshot): {build_seconds * 1000:10.2f} ms")
+    print(f"per-row apply filter:                 {apply_seconds * 1000:10.3f} ms")
+    print(f"facet bitmap filter:                  {facet_seconds * 1000:10.3f} ms")
+    print(f"speedup:                              {apply_seconds / facet_seconds:10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
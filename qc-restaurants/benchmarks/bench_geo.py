@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Geo Benchmark
+Builds the catalog's coordinate grid over synthetic restaurants and compares radius and
+k-nearest query latency against a haversine scan of every row. tests/test_geo.py checks
+both return the same rows in the same order.
+
+Usage: python benchmarks/bench_geo.py [--rows 100000] [--queries 500]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from services.geo import GeoIndex, haversine
+from services.ingest import process_dataframe
+from synthetic import make_master_list
+
+
+def full_scan(lats, lngs, lat, lng, radius=np.inf, k=None, mask=None):
+    """(positions, metres) by measuring every row: within radius, nearest first, ties in row order."""
+    distances = haversine(lat, lng, lats, lngs)
+    keep = distances <= radius
+    if mask is not None:
+        keep &= mask
+    positions = np.flatnonzero(keep)
+    order = np.lexsort([positions, distances[positions]])
+    positions = positions[order][:k]
+    return positions, distances[positions]
+
+
+def percentiles(timings):
+    return np.percentile(timings, 50) * 1e6, np.percentile(timings, 99) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=500)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df, _, _ = process_dataframe(make_master_list(args.rows, filler_columns=0))
+    start = time.perf_counter()
+    index = GeoIndex(df)
+    build_seconds = time.perf_counter() - start
+
+    lats = df['latitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+    lngs = df['longitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+    rng = random.Random(5)
+    # Points around the restaurants, plus a few far outside Quezon City
+    points = [(rng.uniform(14.60, 14.72), rng.uniform(121.00, 121.10)) for _ in range(args.queries)]
+    points += [(10.3, 123.9), (14.65, -60.0), (-33.9, 151.2)]
+
+    timings = {'haversine full scan, 1 km': [], 'grid radius, 1 km': [], 'grid 10 nearest': []}
+    for lat, lng in points:
+        for name, query in (('haversine full scan, 1 km', lambda: full_scan(lats, lngs, lat, lng, 1000)),
+                            ('grid radius, 1 km', lambda: index.within(lat, lng, 1000)),
+                            ('grid 10 nearest', lambda: index.nearest(lat, lng, 10))):
+            start = time.perf_counter()
+            query()
+            timings[name].append(time.perf_counter() - start)
+    print(f"{args.rows} rows; build GeoIndex (once per snapshot): {build_seconds * 1000:9.0f} ms, "
+          f"{index.height}x{index.width} cells")
+    print(f"{'per query':30} {'p50':>10} {'p99':>10}")
+    for name, values in timings.items():
+        p50, p99 = percentiles(values)
+        print(f"{name:30} {p50:8.0f}us {p99:8.0f}us")
+
+
+if __name__ == '__main__':
+    main()
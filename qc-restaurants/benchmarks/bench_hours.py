@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Opening Hours Benchmark
+Times the compiled minute-of-week engine in services/hours.py against the legacy
+string-parsing functions. tests/test_hours.py checks it against hand-worked schedules
+(24 hours, split shifts, overnight, Sunday into Monday).
+
+Usage: python benchmarks/bench_hours.py [--rows 100000] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+import legacy_hours
+from services.hours import WeeklyHours, get_time_until_open, is_currently_open, parse_working_hours
+from synthetic import make_master_list
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    raw_df = make_master_list(args.rows, filler_columns=0)
+    parsed = {}
+    hours_dicts = [parsed.setdefault(raw, parse_working_hours(raw)) for raw in raw_df['working_hours']]
+    print(f"{args.rows} rows, {len(parsed)} distinct schedules, best of {args.repeat}")
+
+    def legacy_open():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [legacy_hours.is_currently_open(h) for h in hours_dicts]
+
+    def legacy_until():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [legacy_hours.get_time_until_open(h) for h in hours_dicts]
+
+    table = WeeklyHours.from_dicts(hours_dicts)
+    print(f"{'compile WeeklyHours (once per snapshot)':40} {best_of(1, lambda: WeeklyHours.from_dicts(hours_dicts)) * 1000:10.2f} ms")
+
+    legacy_open_seconds = best_of(args.repeat, legacy_open)
+    legacy_until_seconds = best_of(args.repeat, legacy_until)
+    rows = [
+        ('legacy is_currently_open, per row', legacy_open_seconds, legacy_open_seconds),
+        ('compiled is_currently_open, per row', best_of(args.repeat, lambda: [is_currently_open(h) for h in hours_dicts]), legacy_open_seconds),
+        ('compiled open_now, whole catalog', best_of(args.repeat, table.open_now), legacy_open_seconds),
+        ('compiled transitions_now, whole catalog', best_of(args.repeat, table.transitions_now), legacy_open_seconds),
+        ('legacy get_time_until_open, per row', legacy_until_seconds, legacy_until_seconds),
+        ('compiled get_time_until_open, per row', best_of(args.repeat, lambda: [get_time_until_open(h) for h in hours_dicts]), legacy_until_seconds),
+    ]
+    for label, seconds, baseline in rows:
+        print(f"{label:40} {seconds * 1000:10.2f} ms {baseline / seconds:9.1f}x")
+
+    agree = np.mean(np.array(legacy_open()) == table.open_now())
+    print(f"legacy and compiled open/closed agree on {agree:.1%} of rows at the current time")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Image Lookup Benchmark
+Builds a throwaway static folder (card images by sanitized name, name variations, street
+webps, a photo mapping CSV and unrelated files) and times the manifest-backed
+get_restaurant_image_url against the legacy per-card filesystem lookup.
+tests/test_images.py checks both pick the same image and alt text on the same layout.
+
+Usage: python benchmarks/bench_images.py [--rows 2000] [--extra-files 3000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from flask import Flask, url_for
+
+import legacy_images
+from services.images import CARDS_FOLDER, STREET_WEBP_FOLDER, ImageManifestStore, sanitize_filename_for_lookup
+from synthetic import make_master_list
+
+
+def touch(path):
+    with open(path, 'wb'):
+        pass
+
+
+def build_static(root, restaurants, extra_files):
+    """Lay out images the way the scraper does, for a mix of restaurants; returns the mapping."""
+    cards = os.path.join(root, 'static', CARDS_FOLDER)
+    webps = os.path.join(root, 'static', STREET_WEBP_FOLDER)
+    os.makedirs(cards)
+    os.makedirs(webps)
+    mapping = {}
+    for i, (name, street) in enumerate(restaurants):
+        kind = i % 6
+        if kind == 0:
+            mapping[name.upper() if i % 12 == 0 else name] = f'mapped_{i}.jpg'
+            touch(os.path.join(cards, f'mapped_{i}.jpg'))
+        elif kind == 1:
+            touch(os.path.join(cards, sanitize_filename_for_lookup(name) + ('.webp' if i % 2 else '.png')))
+        elif kind == 2:
+            touch(os.path.join(cards, 'card_' + name.lower().replace(' ', '_') + '_exterior.jpg'))
+        elif kind == 3:
+            touch(os.path.join(webps, sanitize_filename_for_lookup(street) + '.webp'))
+        # kinds 4 and 5 fall back to the CSV photo
+    for i in range(extra_files):
+        touch(os.path.join(cards, f'zz_unrelated_{i:05d}.txt' if i % 3 == 0 else f'zz_photo_{i:05d}.jpg'))
+    pd.DataFrame({'restaurant_name': list(mapping), 'filename': list(mapping.values()),
+                  'download_status': 'downloaded'}).to_csv(os.path.join(root, 'photo_results.csv'), index=False)
+    return mapping
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--extra-files', type=int, default=3000)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    raw_df = make_master_list(args.rows, filler_columns=0).drop_duplicates('name')
+    restaurants = list(zip(raw_df['name'], raw_df['street']))
+    root = tempfile.mkdtemp(prefix='qc-images-')
+    legacy_images.RESTAURANT_IMAGE_MAPPING = build_static(root, restaurants, args.extra_files)
+    os.chdir(root)  # the legacy lookup uses paths relative to the working directory
+
+    store = ImageManifestStore(os.path.join(root, 'static'), os.path.join(root, 'photo_results.csv'))
+    flask_app = Flask(__name__, static_folder=os.path.join(root, 'static'))
+
+    def manifest_lookup(name, photo, street):
+        static_path, kind = store.get().resolve(name, street)
+        if kind == 'card':
+            return url_for('static', filename=static_path), f"{name} restaurant in Quezon City - exterior view and dining atmosphere"
+        if kind == 'street':
+            return url_for('static', filename=static_path), f"{name} restaurant in Quezon City"
+        return photo or '', f"{name or 'Restaurant'} restaurant in Quezon City"
+
+    with flask_app.test_request_context(), contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        [legacy_images.get_restaurant_image_url(name, 'photo.jpg', street=street) for name, street in restaurants]
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.get()
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        [manifest_lookup(name, 'photo.jpg', street) for name, street in restaurants]
+        first_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        [manifest_lookup(name, 'photo.jpg', street) for name, street in restaurants]
+        again_seconds = time.perf_counter() - start
+
+    files = len(os.listdir(os.path.join(root, 'static', CARDS_FOLDER)))
+    per_card = lambda seconds: seconds / len(restaurants) * 1e6
+    print(f"{len(restaurants)} restaurants, {files} card files")
+    print(f"legacy filesystem lookup:     {per_card(legacy_seconds):10.1f} us/card")
+    print(f"manifest build (once):        {build_seconds * 1000:10.1f} ms")
+    print(f"manifest, first lookup:       {per_card(first_seconds):10.1f} us/card")
+    print(f"manifest, memoised lookup:    {per_card(again_seconds):10.1f} us/card ({legacy_seconds / again_seconds:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Ingestion Benchmark
+Times the row-at-a-time legacy process_dataframe against the vectorized one in
+services/ingest.py on a synthetic Outscraper-shaped frame. tests/test_ingest.py checks
+both produce the same frame.
+
+Usage: python benchmarks/bench_ingest.py [--rows 100000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import legacy_ingest
+from services.ingest import process_dataframe
+from synthetic import make_master_list
+
+PHOTO_VERSION = 1700000000
+
+
+def run(process, raw_df):
+    df = raw_df.copy()
+    start = time.perf_counter()
+    # The legacy version prints debug output for every row - keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = process(df, photo_version=PHOTO_VERSION)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    raw_df = make_master_list(args.rows)
+    print(f"{args.rows} rows x {len(raw_df.columns)} columns")
+
+    _, new_seconds = run(process_dataframe, raw_df)
+    _, old_seconds = run(legacy_ingest.process_dataframe, raw_df)
+
+    print(f"legacy process_dataframe:     {old_seconds:8.2f} s")
+    print(f"vectorized process_dataframe: {new_seconds:8.2f} s")
+    print(f"speedup:                      {old_seconds / new_seconds:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Listing Views Benchmark
+Checks the catalog's materialized page lists (QC_LIST_BACKEND=views) against the store-backed
+ones (QC_LIST_BACKEND=store): every cuisine, area, cuisine-in-area and best-of list (same rows,
+same order), and the popular areas, service options and similar cuisines in the cuisine
+sidebar. Then times a page of each: store query plus count against a slice of the list.
+
+Usage: python benchmarks/bench_listings.py [--rows 100000] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from services.listings import BEST_OF_CATEGORIES
+
+PER_PAGE = 12
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def old_similar_cuisines(cuisine_name, all_cuisines):
+    """The cuisine page's word-overlap loop before it was precomputed."""
+    similar = []
+    for other_cuisine in all_cuisines:
+        if other_cuisine != cuisine_name and isinstance(other_cuisine, str):
+            if any(word in other_cuisine.lower() for word in cuisine_name.lower().split()):
+                similar.append(other_cuisine)
+            elif any(word in cuisine_name.lower() for word in other_cuisine.lower().split()):
+                similar.append(other_cuisine)
+    return similar[:3]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    from synthetic import write_master_list
+
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    os.environ['QC_DATA_FILE'] = write_master_list(os.path.join(workdir, 'master.csv'), args.rows)
+    os.environ['QC_CATALOG_RELOAD_SECONDS'] = '0'
+    os.environ['QC_CATALOG_SNAPSHOT_DIR'] = os.path.join(workdir, 'snapshots')
+    os.chdir(APP_DIR)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import CATALOG
+        from services import sqlstore
+        catalog = CATALOG.get()
+    listings, db = catalog.listings, catalog.db
+    store = sqlstore.StoreListings(db, catalog.cuisine_slugs, catalog.all_cuisines)
+    active = [sqlstore.active()]
+
+    for name in ('ranked', 'top_picks', 'by_rating'):
+        assert np.array_equal(getattr(listings, name), np.asarray(getattr(store, name))), name
+    for slug in catalog.cuisine_slugs:
+        assert np.array_equal(listings.cuisine(slug), np.asarray(store.cuisine(slug))), slug
+        assert listings.features.get(slug) == store.features.get(slug), slug
+        assert listings.popular_areas.get(slug) == store.popular_areas.get(slug), slug
+        name = slug.replace('-', ' ').title()
+        assert list(listings.similar_cuisines.get(slug, ())) == old_similar_cuisines(name, catalog.all_cuisines), slug
+        assert listings.similar_cuisines.get(slug) == store.similar_cuisines.get(slug), slug
+        for area in catalog.area_slugs.values():
+            rows = listings.cuisine(slug, area)
+            assert np.array_equal(rows, np.asarray(store.cuisine(slug, area))), (slug, area)
+            if len(rows):
+                assert listings.features[(slug, area)] == store.features[(slug, area)], (slug, area)
+    for area in catalog.area_slugs.values():
+        assert np.array_equal(listings.area(area), np.asarray(store.area(area))), area
+    categories = BEST_OF_CATEGORIES + ('anything-else',)
+    for category in categories:
+        assert np.array_equal(listings.best(category), np.asarray(store.best(category))), category
+    # Pages slice the store's lists as they slice the arrays
+    for start, end in ((0, PER_PAGE), (PER_PAGE, 2 * PER_PAGE), (len(listings.ranked) - 5, len(listings.ranked) + PER_PAGE)):
+        assert np.array_equal(listings.ranked[start:end], store.ranked[start:end]), (start, end)
+    assert len(store.ranked) == len(listings.ranked) and store.cuisine('no-such-cuisine')[:PER_PAGE].size == 0
+    print(f"{args.rows} rows; {len(listings.cuisines)} cuisines, {len(listings.areas)} areas, {len(listings.pairs)} "
+          f"cuisine-area pairs and {len(categories)} best-of lists match the store-backed listings")
+
+    cuisine = max(listings.cuisines, key=lambda slug: listings.cuisines[slug][1] - listings.cuisines[slug][0])
+    types = catalog.cuisine_slugs[cuisine]
+    area = max(listings.areas, key=lambda name: listings.areas[name][1] - listings.areas[name][0])
+    middle = lambda rows: (len(rows) // PER_PAGE // 2) * PER_PAGE
+    cases = [
+        ('all restaurants, middle page', [sqlstore.active()], sqlstore.BY_RANK, listings.ranked),
+        (f'cuisine {cuisine}, middle page', [sqlstore.one_of('type', types)] + active, sqlstore.BY_POSITION,
+         listings.cuisine(cuisine)),
+        (f'area {area}, middle page', [sqlstore.equals('seo_area', area)] + active, sqlstore.BY_RATING,
+         listings.area(area)),
+        ('best-of family, first 30', sqlstore.facet_match(amenities=['kids']), sqlstore.BY_POSITION,
+         listings.best('family')),
+    ]
+    print(f"{'per page':40} {'store query':>12} {'views slice':>12}")
+    for label, conditions, order, rows in cases:
+        if 'middle' in label:
+            # A numbered page needs the total for its pagination too
+            offset = middle(rows)
+            query = best_of(args.repeat, lambda: (db.count(conditions), db.positions(conditions, order, limit=PER_PAGE, offset=offset)))
+            sliced = best_of(args.repeat, lambda: (len(rows), rows[offset:offset + PER_PAGE]))
+        else:
+            query = best_of(args.repeat, lambda: db.positions(conditions, order, limit=30))
+            sliced = best_of(args.repeat, lambda: rows[:30])
+        print(f"{label:40} {query * 1000:10.2f}ms {sliced * 1e6:10.1f}us")
+    sidebar = best_of(args.repeat, lambda: old_similar_cuisines(cuisine.replace('-', ' ').title(), catalog.all_cuisines))
+    print(f"{'similar cuisines loop (old)':40} {sidebar * 1000:10.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Memory Benchmark
+Per-worker resident memory after loading the catalog from a ~100-column master list, read
+the old way (pd.read_csv of every column, default dtypes) and through the declared schema in
+services/schema.py (usecols plus compact dtypes). Each variant runs in a fresh process, the
+way a gunicorn/Passenger worker would, and reports RSS before and after the load together
+with the size of the catalog's packed column arrays.
+
+Usage: python benchmarks/bench_memory.py [--rows 20000]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_master_list
+
+FILLER_COLUMNS = 75
+
+
+def rss_kib():
+    """Resident set size of this process from /proc (Linux)."""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def write_wide_master_list(path, rows):
+    """Synthetic master list padded with text columns, like the Outscraper enrichment fields."""
+    df = make_master_list(rows, filler_columns=0)
+    for n in range(FILLER_COLUMNS):
+        if n % 3 == 0:
+            df[f'email_{n}'] = [f'contact{i}.{n}@example.com' if i % 4 else None for i in range(rows)]
+        else:
+            df[f'email_{n}.emails_validator.status'] = ['RECEIVING' if (i + n) % 3 else 'UNKNOWN' for i in range(rows)]
+    df.to_csv(path, index=False)
+    return path, len(df.columns)
+
+
+def table_kib(table):
+    """KiB held in the NumPy arrays behind the catalog's columns."""
+    return sum(value.nbytes for column in table.columns.values() for value in vars(column).values()
+               if hasattr(value, 'nbytes')) // 1024
+
+
+def child(mode):
+    """Load the catalog the way a worker does and report memory as JSON."""
+    warnings.simplefilter('ignore')
+    os.chdir(APP_DIR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import pandas as pd
+        import app
+        if mode == 'full':
+            # load_catalog imports the loader when it runs, so this replaces it there
+            import services.schema
+            services.schema.read_master_list = lambda source: pd.read_csv(source)
+        gc.collect()
+        before = rss_kib()
+        catalog = app.CATALOG.get()
+        gc.collect()
+        after = rss_kib()
+    print(json.dumps({
+        'before': before,
+        'after': after,
+        'columns': len(catalog.table.columns),
+        'arrays': table_kib(catalog.table),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--child', choices=['full', 'schema'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child)
+        return
+
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    path, columns = write_wide_master_list(os.path.join(workdir, 'master.csv'), args.rows)
+    env = dict(os.environ, QC_DATA_FILE=path, QC_CATALOG_RELOAD_SECONDS='0', QC_CATALOG_SNAPSHOT_DIR='')
+
+    results = {}
+    for mode in ('full', 'schema'):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode],
+                                env=env, check=True, capture_output=True, text=True).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{args.rows} rows, {columns} columns in the master list; one fresh worker process per variant")
+    print(f"{'loader':26} {'columns':>8} {'arrays':>10} {'RSS added':>11} {'worker RSS':>11}")
+    for mode, label in (('full', 'read_csv, every column'), ('schema', 'declared schema')):
+        r = results[mode]
+        print(f"{label:26} {r['columns']:8d} {r['arrays'] / 1024:8.1f}MB {(r['after'] - r['before']) / 1024:9.1f}MB {r['after'] / 1024:9.1f}MB")
+    saved = results['full']['after'] - results['schema']['after']
+    print(f"saved per worker: {saved / 1024:.1f} MB RSS, {(results['full']['arrays'] - results['schema']['arrays']) / 1024:.1f} MB of column arrays")
+
+
+if __name__ == '__main__':
+    main()
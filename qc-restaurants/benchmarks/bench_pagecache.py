@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Page Cache Benchmark
+Times each page through the test client uncached, as a rendered-page cache hit and as a
+304 for If-None-Match with its ETag. tests/test_pagecache.py checks cached pages against
+fresh renders, expiry and the LRU bound.
+
+Usage: python benchmarks/bench_pagecache.py [--rows 20000] [--repeat 20]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def median_ms(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    from synthetic import write_master_list
+
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    os.environ['QC_DATA_FILE'] = write_master_list(os.path.join(workdir, 'master.csv'), args.rows)
+    os.environ['QC_CATALOG_RELOAD_SECONDS'] = '0'
+    os.environ['QC_CATALOG_SNAPSHOT_DIR'] = os.path.join(workdir, 'snapshots')
+    os.chdir(APP_DIR)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app as site
+        catalog = site.CATALOG.get()
+    client = site.app.test_client()
+    cache = site.PAGE_CACHE
+    cuisine = max(catalog.listings.cuisines, key=lambda slug: catalog.listings.cuisines[slug][1] - catalog.listings.cuisines[slug][0])
+    restaurant = next(iter(catalog.restaurants_data.keys()))
+    urls = ['/', f'/cuisine/{cuisine}', f'/cuisine/{cuisine}?page=3', f'/restaurant/{restaurant}',
+            '/blog', '/blog/eastwood-restaurants-2025', '/about', '/how-we-rate', '/search?q=ramen']
+
+    def get(url, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return client.get(url, **kwargs)
+
+    def uncached(url):
+        site.PAGE_CACHE = None
+        try:
+            return get(url)
+        finally:
+            site.PAGE_CACHE = cache
+
+    print(f"{args.rows} rows, {len(urls)} pages")
+    print(f"{'page (median)':34} {'uncached':>10} {'cache hit':>10} {'304':>10}")
+    for url in urls:
+        etag = get(url).headers['ETag']
+        render = median_ms(max(args.repeat // 4, 3), lambda: uncached(url))
+        hit = median_ms(args.repeat, lambda: get(url))
+        not_modified = median_ms(args.repeat, lambda: get(url, headers={'If-None-Match': etag}))
+        print(f"{url[:34]:34} {render:8.2f}ms {hit:8.2f}ms {not_modified:8.2f}ms")
+    stats = cache.stats()
+    print(f"hit rate {stats['hit_rate']}%, {stats['pages']} pages in {stats['megabytes']} MB")
+
+
+if __name__ == '__main__':
+    main()
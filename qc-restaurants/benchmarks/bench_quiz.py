@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Quiz Benchmark
+Load-tests POST /api/quiz/perfect-spot over synthetic restaurants: random submissions per
+second through the test client, the old per-request store query against the catalog's
+answer table. tests/test_quiz.py checks the table against a full scan.
+
+Usage: python benchmarks/bench_quiz.py [--rows 100000] [--submissions 2000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from services import sqlstore
+
+VIBES = ['casual', 'romantic', 'family', 'celebration']
+CUISINES = ['filipino', 'asian', 'western', 'anything']
+BUDGETS = ['budget', 'mid', 'splurge']
+AREAS = ['north', 'east', 'center', 'any']
+SENIOR = ['wheelchair', 'quiet', 'parking', 'none']
+
+
+def old_query(answers, vibe=True):
+    """The filters the old endpoint queried the store with (vibe=False: it ignored question 1)."""
+    return sqlstore.facet_match(
+        cuisine=answers['2'] if answers['2'] != 'anything' else None,
+        area=answers['4'] if answers['4'] != 'any' else None,
+        budget=answers['3'],
+        amenities=[answers['5']] if answers['5'] in ('wheelchair', 'parking') else [],
+    ) + ([sqlstore.facet('amenity:kids')] if vibe and answers['1'] == 'family' else [])
+
+
+def random_submissions(count, seed=11):
+    rng = random.Random(seed)
+    return [{'1': rng.choice(VIBES), '2': rng.choice(CUISINES), '3': rng.choice(BUDGETS),
+             '4': rng.choice(AREAS), '5': rng.choice(SENIOR)} for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--submissions', type=int, default=2000)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    from synthetic import write_master_list
+
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    os.environ['QC_DATA_FILE'] = write_master_list(os.path.join(workdir, 'master.csv'), args.rows)
+    os.environ['QC_CATALOG_RELOAD_SECONDS'] = '0'
+    os.environ['QC_CATALOG_SNAPSHOT_DIR'] = os.path.join(workdir, 'snapshots')
+    os.chdir(APP_DIR)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import app, CATALOG
+        from services.quiz import QuizTable
+        catalog = CATALOG.get()
+    facets, quiz = catalog.facets, catalog.quiz
+    ratings = catalog.table.array('rating').astype(np.float64)
+    start = time.perf_counter()
+    QuizTable(facets, ratings, catalog.active_mask)
+    build_seconds = time.perf_counter() - start
+
+    submissions = random_submissions(args.submissions)
+    print(f"{args.rows} rows, {len(quiz.keys)} answer combinations")
+
+    def old_endpoint(answers):
+        # The endpoint before the answer table: one store query per submission
+        results = catalog.db.positions(old_query(answers, vibe=False), sqlstore.BY_RATING, limit=3)
+        return list(catalog.table.rows(results))
+
+    start = time.perf_counter()
+    for answers in submissions:
+        old_endpoint(answers)
+    old_seconds = time.perf_counter() - start
+
+    client = app.test_client()
+    start = time.perf_counter()
+    for answers in submissions:
+        client.post('/api/quiz/perfect-spot', json=answers)
+    routed_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for answers in submissions:
+        quiz.answer(answers['1'], answers['2'], answers['3'], answers['4'], answers['5'])
+    lookup_seconds = time.perf_counter() - start
+
+    print(f"build QuizTable (once per snapshot): {build_seconds * 1000:9.0f} ms")
+    print(f"{'quiz submissions':40} {'per second':>12}")
+    print(f"{'store query per submission (old, no HTTP)':40} {len(submissions) / old_seconds:12.0f}")
+    print(f"{'answer table lookup (no HTTP)':40} {len(submissions) / lookup_seconds:12.0f}")
+    print(f"{'POST /api/quiz/perfect-spot (in-process)':40} {len(submissions) / routed_seconds:12.0f}")
+
+
+if __name__ == '__main__':
+    main()
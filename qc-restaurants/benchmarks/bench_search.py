@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Search Benchmark
+Builds the catalog's BM25 search index over synthetic restaurants and compares query
+latency against the old per-query substring scan over name, type and area. The ranking
+and matching checks are in tests/test_search.py.
+
+Usage: python benchmarks/bench_search.py [--rows 100000] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from services.columns import ColumnTable
+from services.fields import is_missing
+from services.ingest import process_dataframe
+from services.search import SearchIndex
+from synthetic import make_master_list
+
+QUERIES = ['cafe', 'ramen', 'samgyeopsal', 'samgyupsal', 'cubao', 'kare kare', 'lola kusina', 'yakinku grill',
+           'tomas morato bistro', 'japanese restaurant timog']
+
+
+def substring_scan(table, query):
+    """The old /search filter: the whole query as a substring of name, type or area, first 20 rows."""
+    query_lower = query.lower()
+    matches_query = lambda x: not is_missing(x) and query_lower in str(x).lower()
+    mask = table.matches('name', matches_query) | table.matches('type', matches_query) | table.matches('SEO Area', matches_query)
+    return np.flatnonzero(mask)[:20]
+
+
+def percentiles(repeat, fn, queries):
+    timings = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            fn(query)
+            timings.append(time.perf_counter() - start)
+    return np.percentile(timings, 50), np.percentile(timings, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df, _, _ = process_dataframe(make_master_list(args.rows, filler_columns=0))
+    table = ColumnTable.from_frame(df)
+
+    start = time.perf_counter()
+    index = SearchIndex(df)
+    build_seconds = time.perf_counter() - start
+    index_bytes = sum(getattr(index, name).nbytes for name in vars(index) if isinstance(getattr(index, name), np.ndarray))
+
+    scan = percentiles(args.repeat, lambda q: substring_scan(table, q), QUERIES)
+    ranked = percentiles(args.repeat, lambda q: index.search(q, limit=20), QUERIES)
+    print(f"build SearchIndex (once per snapshot): {build_seconds * 1000:9.0f} ms, "
+          f"{len(index.terms)} words, {len(index.docs)} postings, {index_bytes / 1e6:.1f} MB")
+    print(f"{'per query':30} {'p50':>10} {'p95':>10}")
+    print(f"{'substring scan (old)':30} {scan[0] * 1000:8.2f}ms {scan[1] * 1000:8.2f}ms")
+    print(f"{'BM25 index, top 20':30} {ranked[0] * 1000:8.2f}ms {ranked[1] * 1000:8.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Similar Restaurants Benchmark
+Builds the catalog's similar-restaurants table over synthetic restaurants and compares the
+detail page's old per-view loop over every restaurant with the table lookup. The table is
+checked against scoring every pair in tests/test_similar.py.
+
+Usage: python benchmarks/bench_similar.py [--rows 20000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.facets import FacetIndex
+from services.ingest import process_dataframe
+from services.similar import SimilarTable
+from synthetic import make_master_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df, _, _ = process_dataframe(make_master_list(args.rows, filler_columns=0))
+    facets = FacetIndex(df)
+    active = ~df['business_status'].str.contains('CLOSED_PERMANENTLY', na=False).to_numpy()
+
+    start = time.perf_counter()
+    table = SimilarTable(df, facets, active)
+    build_seconds = time.perf_counter() - start
+
+    rng = random.Random(7)
+    types = df['type'].astype(object).to_numpy()
+
+    # The old detail-page loop, over records keyed by slug with the cuisine and area it compared
+    records = {f'r{position}': {'cuisine': types[position], 'area': df['SEO Area'].iat[position],
+                                'rating': df['rating'].iat[position], 'name': df['name'].iat[position]}
+               for position in range(len(df))}
+    views = rng.sample(sorted(records), 20)
+    start = time.perf_counter()
+    for slug in views:
+        restaurant, similar = records[slug], []
+        for slug_key, other in records.items():
+            if slug_key == slug:
+                continue
+            score = 2 * (other['cuisine'] == restaurant['cuisine']) + (other['area'] == restaurant['area']) + 0.5 * (other['rating'] >= 4.0)
+            if score >= 2:
+                similar.append(other)
+        sorted(similar, key=lambda x: x['rating'], reverse=True)[:5]
+    loop_seconds = (time.perf_counter() - start) / len(views)
+    start = time.perf_counter()
+    for slug in views:
+        table.similar(int(slug[1:]))
+    lookup_seconds = (time.perf_counter() - start) / len(views)
+
+    print(f"{args.rows} rows; build SimilarTable (once per snapshot): {build_seconds * 1000:9.0f} ms, "
+          f"{table.neighbours.nbytes / 1e6:.1f} MB table")
+    print(f"{'per detail-page view':30} {'time':>10}")
+    print(f"{'loop over every restaurant':30} {loop_seconds * 1000:8.2f}ms")
+    print(f"{'table lookup':30} {lookup_seconds * 1e6:8.1f}us")
+
+
+if __name__ == '__main__':
+    main()
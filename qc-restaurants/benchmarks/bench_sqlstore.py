@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+SQLite Store Benchmark
+Checks the catalog's SQLite store returns the same rows, in the same order, as filtering the
+packed columns in memory for every list page (all restaurants, cuisine, search, quiz,
+best-of), then times a page of each both ways: in-memory masks and sorts over every row
+against an indexed query that only returns the page.
+
+Usage: python benchmarks/bench_sqlstore.py [--rows 100000] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+PER_PAGE = 12
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    from synthetic import write_master_list
+
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    os.environ['QC_DATA_FILE'] = write_master_list(os.path.join(workdir, 'master.csv'), args.rows)
+    os.environ['QC_CATALOG_RELOAD_SECONDS'] = '0'
+    os.environ['QC_CATALOG_SNAPSHOT_DIR'] = os.path.join(workdir, 'snapshots')
+    os.chdir(APP_DIR)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import CATALOG
+        from services import sqlstore
+        catalog = CATALOG.get()
+    table, facets, db = catalog.table, catalog.facets, catalog.db
+    ratings = table.array('rating')
+
+    def by_rating(mask):
+        # Single-key sorts in the store break ties by position
+        rows = np.flatnonzero(mask)
+        return rows[np.lexsort([-ratings[rows]])]
+
+    cuisine_type = max(catalog.cuisine_counts, key=catalog.cuisine_counts.get)
+    cuisine_types = catalog.cuisine_slugs[cuisine_type.lower().replace(' ', '-')]
+
+    # (label, in-memory positions in page order, store conditions, store order)
+    cases = [
+        ('all restaurants', lambda: table.sort_desc(['rating', 'reviews'], np.flatnonzero(catalog.active_mask)),
+         [sqlstore.active()], sqlstore.BY_RANK),
+        (f'cuisine {cuisine_type}', lambda: np.flatnonzero(table.isin('type', cuisine_types) & catalog.active_mask),
+         [sqlstore.one_of('type', cuisine_types), sqlstore.active()], sqlstore.BY_POSITION),
+        ('search filters asian in north', lambda: np.flatnonzero(facets.match(cuisine='asian', area='north')),
+         sqlstore.facet_match(cuisine='asian', area='north'), sqlstore.BY_POSITION),
+        ('quiz asian/budget/wheelchair', lambda: by_rating(facets.match(cuisine='asian', budget='budget',
+                                                                        amenities=['wheelchair'])),
+         sqlstore.facet_match(cuisine='asian', budget='budget', amenities=['wheelchair']), sqlstore.BY_RATING),
+        ('best-of cafes', lambda: np.flatnonzero(table.contains('type', 'Cafe|Coffee')),
+         [sqlstore.contains_any('type', ['Cafe', 'Coffee'])], sqlstore.BY_POSITION),
+        ('best-of family', lambda: np.flatnonzero(facets.amenities['kids']),
+         sqlstore.facet_match(amenities=['kids']), sqlstore.BY_POSITION),
+        ('best-of top-rated', lambda: np.flatnonzero(ratings >= 4.0),
+         [sqlstore.rating_at_least(4.0)], sqlstore.BY_POSITION),
+    ]
+
+    for label, in_memory, conditions, order in cases:
+        expected = in_memory()
+        assert len(expected), label
+        assert db.count(conditions) == len(expected), label
+        assert np.array_equal(db.positions(conditions, order), expected), label
+        offset = (len(expected) // PER_PAGE // 2) * PER_PAGE
+        assert np.array_equal(db.positions(conditions, order, limit=PER_PAGE, offset=offset),
+                              expected[offset:offset + PER_PAGE]), label
+
+    # Aggregates the cuisine and neighbourhood pages show
+    cuisine_conditions = cases[1][2]
+    rows = cases[1][1]()
+    services = catalog.cards.columns['service_options'].take(rows)
+    assert sorted(db.facet_values('service', cuisine_conditions)) == sorted(set().union(*services))
+    assert db.counts('seo_area', cuisine_conditions) == table.counts('SEO Area', rows)
+    print(f"{args.rows} rows; {len(cases)} list filters return the same pages from SQLite as from memory")
+
+    # Quiz, search and best-of only ask for their first page; paginated lists also count the matches
+    print(f"{'one page of':30} {'in memory':>10} {'first page':>11} {'middle page + count':>20}")
+    for label, in_memory, conditions, order in cases:
+        offset = (db.count(conditions) // PER_PAGE // 2) * PER_PAGE
+        memory_seconds = best_of(args.repeat, lambda: in_memory()[:PER_PAGE])
+        first_seconds = best_of(args.repeat, lambda: db.positions(conditions, order, limit=PER_PAGE))
+        middle_seconds = best_of(args.repeat, lambda: (db.count(conditions),
+                                                       db.positions(conditions, order, limit=PER_PAGE, offset=offset)))
+        print(f"{label:30} {memory_seconds * 1000:8.2f}ms {first_seconds * 1000:9.2f}ms {middle_seconds * 1000:18.2f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Cold start of a fresh worker process: importing the app, then getting the catalog either by
+parsing and processing the master list CSV or by mapping the catalog snapshot. Each run is a
+new Python process, as when gunicorn/Passenger recycles a worker. Also checks a snapshot-loaded
+catalog renders the same pages as a CSV-built one, and that a snapshot-loaded worker serves
+them without ever importing pandas (only building from the CSV needs it); reports each
+worker's RSS after serving.
+
+Usage: python benchmarks/bench_startup.py [--rows 2000] [--runs 5]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ['/', '/cuisine/filipino-restaurant', '/search?q=lola', '/api/open-now?within=30m']
+
+
+def rss_kib():
+    """Resident set size of this process from /proc (Linux)."""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def child():
+    """Time the import and the first CATALOG.get() in this fresh process; report as JSON."""
+    warnings.simplefilter('ignore')
+    os.chdir(APP_DIR)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+        imported = time.perf_counter()
+        catalog = app.CATALOG.get()
+        loaded = time.perf_counter()
+        client = app.app.test_client()
+        pages = {url: client.get(url).get_data(as_text=True) for url in PAGES}
+    print(json.dumps({
+        'import': imported - start,
+        'catalog': loaded - imported,
+        'rows': len(catalog.table),
+        'pages': pages,
+        'pandas': 'pandas' in sys.modules,
+        'rss': rss_kib(),
+    }))
+
+
+def run(env):
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child'],
+                            env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    # Not imported at the top: synthetic uses pandas, and the worker processes must not inherit that
+    from synthetic import write_master_list
+
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    snapshot_dir = os.path.join(workdir, 'snapshots')
+    base_env = dict(os.environ, QC_DATA_FILE=write_master_list(os.path.join(workdir, 'master.csv'), args.rows),
+                    QC_CATALOG_RELOAD_SECONDS='0')
+    csv_env = dict(base_env, QC_CATALOG_SNAPSHOT_DIR='')
+    snapshot_env = dict(base_env, QC_CATALOG_SNAPSHOT_DIR=snapshot_dir)
+
+    # First worker with snapshots on builds from the CSV and writes the snapshot
+    writer = run(snapshot_env)
+    files = [name for name in os.listdir(snapshot_dir) if name.endswith('.snapshot')]
+    assert len(files) == 1, files
+    size = os.path.getsize(os.path.join(snapshot_dir, files[0]))
+
+    results = {'csv': [], 'snapshot': []}
+    for _ in range(args.runs):
+        results['csv'].append(run(csv_env))
+        results['snapshot'].append(run(snapshot_env))
+
+    # Open/closed labels depend on the clock, so compare against a CSV run from the same loop
+    for csv_run, snapshot_run in zip(results['csv'], results['snapshot']):
+        for url in PAGES:
+            if csv_run['pages'][url] != snapshot_run['pages'][url]:
+                print(f"MISMATCH {url}: snapshot-loaded page differs from the CSV-built one")
+                sys.exit(1)
+    if any(r['pandas'] for r in results['snapshot']):
+        print("FAIL: a snapshot-loaded worker imported pandas")
+        sys.exit(1)
+    shutil.rmtree(workdir)
+
+    print(f"{writer['rows']} restaurants, snapshot {size / 1e6:.1f} MB; median of {args.runs} fresh processes")
+    print(f"{'catalog source':16} {'import app':>11} {'get catalog':>12} {'total':>10} {'RSS':>9} {'pandas':>7}")
+    for mode in ('csv', 'snapshot'):
+        imports = statistics.median(r['import'] for r in results[mode])
+        catalogs = statistics.median(r['catalog'] for r in results[mode])
+        rss = statistics.median(r['rss'] for r in results[mode])
+        pandas = 'yes' if results[mode][0]['pandas'] else 'no'
+        print(f"{mode:16} {imports * 1000:9.0f}ms {catalogs * 1000:10.0f}ms {(imports + catalogs) * 1000:8.0f}ms "
+              f"{rss / 1024:7.1f}MB {pandas:>7}")
+    speedup = statistics.median(r['catalog'] for r in results['csv']) / statistics.median(r['catalog'] for r in results['snapshot'])
+    print(f"catalog load: {speedup:.0f}x faster from the snapshot; same pages either way")
+
+
+if __name__ == '__main__':
+    main()
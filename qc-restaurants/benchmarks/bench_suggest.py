@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Suggest Benchmark
+Builds the catalog's typeahead index over synthetic restaurants and times lookups for
+random prefixes directly and through GET /api/suggest. The suggestions are checked against
+a full scan in tests/test_suggest.py.
+
+Usage: python benchmarks/bench_suggest.py [--rows 100000] [--queries 2000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+
+def percentiles(timings):
+    return np.percentile(timings, 50) * 1e6, np.percentile(timings, 99) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    from synthetic import write_master_list
+
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    os.environ['QC_DATA_FILE'] = write_master_list(os.path.join(workdir, 'master.csv'), args.rows)
+    os.environ['QC_CATALOG_RELOAD_SECONDS'] = '0'
+    os.environ['QC_CATALOG_SNAPSHOT_DIR'] = ''
+    os.chdir(APP_DIR)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app import app, CATALOG
+        from services.suggest import normalize_key
+        catalog = CATALOG.get()
+    index = catalog.suggest
+    labels = index.labels.take(np.arange(len(index.labels)))
+    normalized = [normalize_key(label).split(' ') for label in labels]
+    rng = random.Random(3)
+
+    # Prefixes people type: the start of a name, area or cuisine, or of a later word of a name
+    queries = []
+    for _ in range(args.queries):
+        words = rng.choice(normalized)
+        text = ' '.join(words[rng.randrange(len(words)):])
+        queries.append(text[:rng.randint(1, min(len(text), 12))])
+
+    print(f"{args.rows} rows, {len(labels)} entries, {len(index.keys)} keys")
+
+    direct = []
+    for prefix in queries:
+        start = time.perf_counter()
+        index.suggest(prefix)
+        direct.append(time.perf_counter() - start)
+
+    client = app.test_client()
+    routed = []
+    for prefix in queries:
+        start = time.perf_counter()
+        client.get('/api/suggest', query_string={'q': prefix})
+        routed.append(time.perf_counter() - start)
+    print(f"{'per lookup':30} {'p50':>10} {'p99':>10}")
+    print(f"{'SuggestIndex.suggest':30} {percentiles(direct)[0]:8.0f}us {percentiles(direct)[1]:8.0f}us")
+    print(f"{'GET /api/suggest (in-process)':30} {percentiles(routed)[0]:8.0f}us {percentiles(routed)[1]:8.0f}us")
+
+
+if __name__ == '__main__':
+    main()
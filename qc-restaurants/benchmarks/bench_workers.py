@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Worker Memory Benchmark
+PSS and USS per worker with 1, 4 and 8 workers running side by side: each building its own
+catalog from the master list CSV, each mapping the shared catalog snapshot read-only, and
+forked from a master that preloaded everything (preload.py, as gunicorn runs it with
+gunicorn.conf.py). Every worker serves a few pages before it is measured, so the parts of
+the catalog a request touches are resident.
+
+USS is the memory only that worker holds (Private_Clean + Private_Dirty); PSS additionally
+charges it an equal share of every page it shares with the other workers, such as the
+snapshot mapping. The preloaded master counts towards the total PSS of the forked variant.
+Reads /proc/<pid>/smaps_rollup, so Linux only.
+
+Usage: python benchmarks/bench_workers.py [--rows 20000] [--workers 1 4 8]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import warnings
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+WARMUP_PAGES = ['/', '/cuisine/filipino-restaurant', '/search?q=lola', '/api/open-now?within=30m']
+DETAIL_PAGES = 5
+
+
+def serve_warmup_pages(app):
+    catalog = app.CATALOG.get()
+    client = app.app.test_client()
+    for url in WARMUP_PAGES + [f'/restaurant/{slug}' for slug in list(catalog.slug_rows)[:DETAIL_PAGES]]:
+        client.get(url)
+    return client
+
+
+def child():
+    """Load the catalog, serve a few pages, report ready, then stay alive until stdin closes."""
+    warnings.simplefilter('ignore')
+    os.chdir(APP_DIR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+        serve_warmup_pages(app)
+    print(f'ready {os.getpid()}', flush=True)
+    sys.stdin.read()
+
+
+def preforking_master(workers):
+    """Preload like gunicorn's master, then fork the workers; each reports ready and waits for stdin to close."""
+    warnings.simplefilter('ignore')
+    os.chdir(APP_DIR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+        import preload  # noqa: F401 - warms up and freezes on import
+    print(f'master {os.getpid()}', flush=True)
+    pids = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            with contextlib.redirect_stdout(io.StringIO()):
+                client = serve_warmup_pages(app)
+                memory = client.get('/admin/memory').get_json()
+            assert memory['preloaded'] and memory['forked_from'] == os.getppid(), memory
+            # One write per line: the workers share the pipe
+            os.write(sys.stdout.fileno(), f'ready {os.getpid()}\n'.encode())
+            sys.stdin.read()
+            os._exit(0)
+        pids.append(pid)
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+
+def smaps_rollup(pid):
+    """{field: kB} from /proc/<pid>/smaps_rollup."""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return fields
+
+
+def start(args, env):
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__)] + args, env=env, stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+
+
+def read_pid(proc, tag):
+    line = proc.stdout.readline().split()
+    if len(line) != 2 or line[0] != tag:
+        raise RuntimeError(f"process {proc.pid} failed to start")
+    return int(line[1])
+
+
+def measure(env, workers, fork=False):
+    """
+    Start `workers` workers together; returns (one smaps_rollup dict per worker, the
+    master's smaps_rollup dict or None).
+    """
+    if fork:
+        procs = [start(['--child', '--fork', str(workers)], env)]
+    else:
+        procs = [start(['--child'], env) for _ in range(workers)]
+    try:
+        master = read_pid(procs[0], 'master') if fork else None
+        pids = [read_pid(procs[0] if fork else proc, 'ready') for proc in (range(workers) if fork else procs)]
+        # Measure while every worker is alive, so PSS splits the shared pages between all of them
+        return [smaps_rollup(pid) for pid in pids], smaps_rollup(master) if fork else None
+    finally:
+        for proc in procs:
+            proc.stdin.close()
+            proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--fork', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        if args.fork:
+            preforking_master(args.fork)
+        else:
+            child()
+        return
+
+    # Imported here: synthetic uses pandas, which the worker processes should not load
+    from synthetic import write_master_list
+
+    workdir = tempfile.mkdtemp(prefix='qc-bench-')
+    snapshot_dir = os.path.join(workdir, 'snapshots')
+    base_env = dict(os.environ, QC_DATA_FILE=write_master_list(os.path.join(workdir, 'master.csv'), args.rows),
+                    QC_CATALOG_RELOAD_SECONDS='0')
+    variants = {
+        'per-worker build': (dict(base_env, QC_CATALOG_SNAPSHOT_DIR=''), False),
+        'shared snapshot': (dict(base_env, QC_CATALOG_SNAPSHOT_DIR=snapshot_dir), False),
+        'preloaded fork': (dict(base_env, QC_CATALOG_SNAPSHOT_DIR=''), True),
+    }
+    # Write the snapshot up front, as build_catalog_snapshot.py does on deploy
+    measure(variants['shared snapshot'][0], 1)
+    snapshot_size = sum(os.path.getsize(os.path.join(snapshot_dir, name)) for name in os.listdir(snapshot_dir))
+
+    print(f"{args.rows} restaurants, snapshot {snapshot_size / 1e6:.1f} MB; MB per worker (mean), total PSS across workers")
+    print(f"{'workers':>7} {'catalog':18} {'RSS':>8} {'PSS':>8} {'USS':>8} {'shared':>8} {'total PSS':>10}")
+    totals = {}
+    for workers in args.workers:
+        for label, (env, fork) in variants.items():
+            stats, master = measure(env, workers, fork)
+
+            def mean(*fields):
+                return sum(sum(s[field] for field in fields) for s in stats) / len(stats) / 1024
+
+            total = (sum(s['Pss'] for s in stats) + (master['Pss'] if master else 0)) / 1024
+            totals[workers, label] = total
+            print(f"{workers:7d} {label:18} {mean('Rss'):8.1f} {mean('Pss'):8.1f} "
+                  f"{mean('Private_Clean', 'Private_Dirty'):8.1f} {mean('Shared_Clean', 'Shared_Dirty'):8.1f} {total:10.1f}")
+    shutil.rmtree(workdir)
+
+    for workers in args.workers:
+        build = totals[workers, 'per-worker build']
+        print(f"{workers} workers: total PSS saved vs per-worker build: shared snapshot {build - totals[workers, 'shared snapshot']:.1f} MB, "
+              f"preloaded fork {build - totals[workers, 'preloaded fork']:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
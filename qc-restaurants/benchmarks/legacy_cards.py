@@ -0,0 +1,99 @@
+"""
+Legacy Card Data
+How the home and cuisine pages built their restaurant dicts before services/cards.py: every
+column of every matching row, with the cuisine page's field mapping run over all matches
+before slicing to the current page. Kept only as the baseline for benchmarks/bench_cards.py.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from services.columns import ArrayColumn
+from services.ingest import DEFAULT_PHOTO_URL, extract_price_range
+
+
+def catalog_frame(catalog):
+    """The processed frame the catalog used to keep, rebuilt from its table for the old code paths."""
+    positions = np.arange(len(catalog.table))
+    return pd.DataFrame({
+        field: column.values if isinstance(column, ArrayColumn) else pd.Series(column.take(positions), dtype=object)
+        for field, column in catalog.table.columns.items()
+    })
+
+
+def extract_service_options_from_about(about_data):
+    if not isinstance(about_data, dict):
+        about_data = {}
+    service_options = about_data.get('Service options', {})
+    options = []
+    if service_options.get('Delivery', False):
+        options.append('Delivery')
+    if service_options.get('Takeout', False):
+        options.append('Takeout')
+    if service_options.get('Dine-in', False):
+        options.append('Dine-in')
+    if service_options.get('No-contact delivery', False):
+        options.append('No-contact delivery')
+    return options
+
+
+def home_records(active_df):
+    df = active_df[active_df['top_pick'] == True]
+    return df.to_dict('records')
+
+
+def cuisine_records(df, cuisine_types, cuisine_name, page, per_page=12):
+    cuisine_column = 'type' if 'type' in df.columns else 'cuisine'
+    cuisine_restaurants = df[df[cuisine_column].isin(cuisine_types)].copy()
+    if 'business_status' in cuisine_restaurants.columns:
+        closed_mask = cuisine_restaurants['business_status'].str.contains('CLOSED_PERMANENTLY', case=False, na=False)
+        cuisine_restaurants = cuisine_restaurants[~closed_mask]
+
+    if 'range' in cuisine_restaurants.columns:
+        # range was plain text before the schema loader made it categorical
+        cuisine_restaurants['price'] = cuisine_restaurants['range'].astype(object).apply(
+            lambda x: str(x).count('₱') if pd.notna(x) else '1'
+        )
+    else:
+        cuisine_restaurants['price'] = cuisine_restaurants.apply(
+            lambda row: '1' if cuisine_name.lower() == 'fast food' else extract_price_range(row['about']),
+            axis=1
+        )
+    cuisine_restaurants['features'] = cuisine_restaurants['about'].apply(extract_service_options_from_about)
+
+    all_features = set()
+    for features in cuisine_restaurants['features']:
+        if isinstance(features, list):
+            all_features.update(features)
+
+    restaurant_data = []
+    for _, row in cuisine_restaurants.iterrows():
+        restaurant = row.to_dict()
+        restaurant['price'] = str(restaurant['price']) if restaurant['price'] is not None else '1'
+        restaurant['features'] = list(restaurant['features']) if isinstance(restaurant['features'], list) else ['Takeout', 'Dine-in']
+        try:
+            if isinstance(restaurant['about'], dict):
+                restaurant['about'] = json.dumps(restaurant['about'])
+            else:
+                restaurant['about'] = '{}'
+        except:
+            restaurant['about'] = '{}'
+        if 'name_for_emails' in restaurant:
+            restaurant['display_name'] = restaurant['name_for_emails']
+            restaurant['name'] = restaurant['name_for_emails']
+        else:
+            restaurant['display_name'] = restaurant.get('name', 'Unknown Restaurant')
+        if 'photo_url' in restaurant and restaurant['photo_url']:
+            restaurant['photo_url'] = restaurant['photo_url'].strip()
+        else:
+            restaurant['photo_url'] = DEFAULT_PHOTO_URL
+        restaurant['street'] = restaurant['street'] if 'street' in restaurant else restaurant.get('address', 'Address not available')
+        restaurant['hours'] = restaurant.get('working_hours_dict', restaurant.get('hours', {}))
+        for flag in ('wheelchair_accessible', 'good_for_kids', 'has_wifi', 'has_high_chairs', 'jacky_pick', 'top_pick'):
+            restaurant[flag] = restaurant.get(flag, False)
+        restaurant_data.append(restaurant)
+
+    start_idx = (page - 1) * per_page
+    return restaurant_data[start_idx:start_idx + per_page], sorted(all_features)
@@ -0,0 +1,165 @@
+"""
+Legacy Opening Hours
+String-parsing is_currently_open / get_time_until_open as they shipped before the compiled
+minute-of-week engine in services/hours.py. Kept only as the baseline for benchmarks/bench_hours.py.
+"""
+
+import re
+from datetime import datetime, timezone, timedelta
+
+
+def is_currently_open(hours_dict):
+    if not hours_dict:
+        return False
+    
+    # Use Filipino time (UTC+8)
+    ph_time = datetime.utcnow().replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=8)))
+    current_day = ph_time.strftime('%A')
+    
+
+    
+    if current_day not in hours_dict:
+        return False
+        
+    try:
+        hours = hours_dict[current_day]
+        
+        # Check if it's open 24 hours
+        if hours.lower().strip() == 'open 24 hours':
+            return True
+            
+        # Handle multiple time ranges (e.g., "11AM-3PM,5-9PM")
+        time_ranges = [range_str.strip() for range_str in hours.split(',')]
+        
+        current_time = ph_time.strftime('%I:%M%p')  # Format: 11:00AM
+        current_time = current_time.upper()
+        
+        # Convert times to comparable format (minutes since midnight)
+        def time_to_minutes(time_str):
+            # Remove any spaces and ensure AM/PM is at the end
+            time_str = re.sub(r'\s+', '', time_str).upper()
+            # Handle cases where there's no minutes specified (e.g., "11AM" -> "11:00AM")
+            if 'AM' in time_str or 'PM' in time_str:
+                if ':' not in time_str:
+                    time_str = time_str.replace('AM', ':00AM').replace('PM', ':00PM')
+            
+            try:
+                return datetime.strptime(time_str, '%I:%M%p').hour * 60 + datetime.strptime(time_str, '%I:%M%p').minute
+            except ValueError:
+                try:
+                    return datetime.strptime(time_str, '%I%p').hour * 60
+                except ValueError:
+                    return 0
+
+        current_minutes = time_to_minutes(current_time)
+        
+        # Check each time range
+        for time_range in time_ranges:
+            if '-' not in time_range:
+                continue
+                
+            open_time, close_time = time_range.split('-')
+            open_time = re.sub(r'\s+', '', open_time).upper()
+            close_time = re.sub(r'\s+', '', close_time).upper()
+            
+            open_minutes = time_to_minutes(open_time)
+            close_minutes = time_to_minutes(close_time)
+            
+            # Handle cases where closing time is past midnight
+            if close_minutes < open_minutes:
+                close_minutes += 24 * 60
+                if current_minutes < open_minutes:
+                    current_minutes += 24 * 60
+                    
+            # If current time falls within this range, restaurant is open
+            if open_minutes <= current_minutes <= close_minutes:
+                return True
+        
+        # If we get here, restaurant is not open in any time range
+        return False
+    except Exception as e:
+        print(f"Error checking if restaurant is open: {str(e)}")
+        return False
+
+
+def get_time_until_open(hours_dict):
+    """Calculate time until restaurant opens next"""
+    if not hours_dict:
+        return None
+    
+    # Use Filipino time (UTC+8)
+    ph_time = datetime.utcnow().replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=8)))
+    current_day = ph_time.strftime('%A')
+    current_time = ph_time
+    
+    # First check if currently open
+    if is_currently_open(hours_dict):
+        return "Open Now"
+    
+    # Get list of days in order
+    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    
+    # Start from current day and check next 7 days
+    for i in range(7):
+        check_day = days[(days.index(current_day) + i) % 7]
+        
+        if check_day in hours_dict:
+            hours = hours_dict[check_day]
+            if hours and '-' in hours:
+                try:
+                    # Handle multiple time ranges (e.g., "11AM-3PM,5-9PM")
+                    time_ranges = [range_str.strip() for range_str in hours.split(',')]
+                    
+                    # Find the next opening time from any range
+                    next_open_time = None
+                    for time_range in time_ranges:
+                        if '-' not in time_range:
+                            continue
+                            
+                        open_time_str = time_range.split('-')[0].strip()
+                        
+                        # Convert opening time to datetime
+                        if ':' in open_time_str:
+                            time_format = '%I:%M%p'
+                        else:
+                            time_format = '%I%p'
+                            open_time_str = open_time_str.replace('AM', ':00AM').replace('PM', ':00PM')
+                        
+                        # Parse the opening time
+                        open_time = datetime.strptime(open_time_str, time_format)
+                        
+                        # Create datetime for the check day
+                        if i == 0:  # Same day
+                            check_datetime = current_time.replace(hour=open_time.hour, minute=open_time.minute, second=0, microsecond=0)
+                            if check_datetime > current_time:
+                                # This opening time is still today and in the future
+                                if next_open_time is None or check_datetime < next_open_time:
+                                    next_open_time = check_datetime
+                        else:  # Future day
+                            # Find the next occurrence of this day
+                            days_ahead = i
+                            check_datetime = current_time + timedelta(days=days_ahead)
+                            check_datetime = check_datetime.replace(hour=open_time.hour, minute=open_time.minute, second=0, microsecond=0)
+                            
+                            if next_open_time is None or check_datetime < next_open_time:
+                                next_open_time = check_datetime
+                    
+                    # If we found a next opening time, calculate the difference
+                    if next_open_time:
+                        time_diff = next_open_time - current_time
+                        hours_until = int(time_diff.total_seconds() // 3600)
+                        minutes_until = int((time_diff.total_seconds() % 3600) // 60)
+                        
+                        if hours_until > 0:
+                            if minutes_until > 0:
+                                return f"Opens in {hours_until}h {minutes_until}m"
+                            else:
+                                return f"Opens in {hours_until}h"
+                        else:
+                            return f"Opens in {minutes_until}m"
+                        
+                except Exception as e:
+                    print(f"Error calculating time until open: {str(e)}")
+                    continue
+    
+    return None
@@ -0,0 +1,124 @@
+"""
+Legacy Restaurant Images
+Per-card filesystem lookup as get_restaurant_image_url shipped before the image manifest in
+services/images.py. Kept only as the baseline for benchmarks/bench_images.py.
+
+Paths are relative to the working directory, as they were in app.py.
+"""
+
+import os
+
+from flask import url_for
+
+RESTAURANT_IMAGE_MAPPING = {}
+
+
+def get_restaurant_image_url(restaurant_name, fallback_photo_url, alt_tag=None, street=None):
+    """
+    Get the best available image URL for a restaurant.
+    Priority:
+    1. Check local downloaded image by restaurant name in restaurant_cards (most specific)
+    2. Check for webp image using sanitized street address in restaurant_cards_webp (fallback)
+    3. Fall back to original photo URL
+    
+    Args:
+        restaurant_name: Name of the restaurant
+        fallback_photo_url: Original photo URL from CSV
+        alt_tag: Optional alt tag override
+        street: Street address for webp image lookup
+    
+    Returns:
+        tuple: (image_url, alt_tag)
+    """
+    try:
+        # Priority 1: Check if we have a local downloaded image by restaurant name (most specific)
+        if restaurant_name:
+            # Try exact match first
+            if restaurant_name in RESTAURANT_IMAGE_MAPPING:
+                local_filename = RESTAURANT_IMAGE_MAPPING[restaurant_name]
+                local_url = url_for('static', filename=f'images/restaurant_cards/{local_filename}')
+                
+                # Generate alt tag if not provided
+                if not alt_tag:
+                    alt_tag = f"{restaurant_name} restaurant in Quezon City - exterior view and dining atmosphere"
+                
+                return local_url, alt_tag
+            
+            # Try case-insensitive match
+            restaurant_name_lower = restaurant_name.lower().strip()
+            for mapped_name, local_filename in RESTAURANT_IMAGE_MAPPING.items():
+                if mapped_name.lower().strip() == restaurant_name_lower:
+                    local_url = url_for('static', filename=f'images/restaurant_cards/{local_filename}')
+                    
+                    # Generate alt tag if not provided
+                    if not alt_tag:
+                        alt_tag = f"{restaurant_name} restaurant in Quezon City - exterior view and dining atmosphere"
+                    
+                    return local_url, alt_tag
+        
+        # Priority 2: Check restaurant_cards folder directly by sanitized restaurant name
+        if restaurant_name:
+            sanitized_name = sanitize_filename_for_lookup(restaurant_name)
+            # Try common extensions
+            for ext in ['.webp', '.jpg', '.png', '.jpeg']:
+                potential_filename = sanitized_name + ext
+                potential_path = os.path.join('static', 'images', 'restaurant_cards', potential_filename)
+                if os.path.exists(potential_path):
+                    local_url = url_for('static', filename=f'images/restaurant_cards/{potential_filename}')
+                    if not alt_tag:
+                        alt_tag = f"{restaurant_name} restaurant in Quezon City - exterior view and dining atmosphere"
+                    return local_url, alt_tag
+            
+            # Also try checking if any file contains the restaurant name (for variations)
+            try:
+                restaurant_cards_dir = os.path.join('static', 'images', 'restaurant_cards')
+                if os.path.exists(restaurant_cards_dir):
+                    restaurant_name_lower = restaurant_name.lower().replace(' ', '_').replace('-', '_')
+                    for filename in os.listdir(restaurant_cards_dir):
+                        filename_lower = filename.lower()
+                        # Check if filename contains key parts of restaurant name
+                        name_parts = [part for part in restaurant_name_lower.split() if len(part) > 3]
+                        if any(part in filename_lower for part in name_parts):
+                            # Additional check: make sure it's a reasonable match
+                            if filename_lower.endswith(('.webp', '.jpg', '.png', '.jpeg')):
+                                local_url = url_for('static', filename=f'images/restaurant_cards/{filename}')
+                                if not alt_tag:
+                                    alt_tag = f"{restaurant_name} restaurant in Quezon City - exterior view and dining atmosphere"
+                                return local_url, alt_tag
+            except Exception as e:
+                pass  # Continue to next priority
+        
+        # Priority 3: Check for street-based webp in restaurant_cards_webp (fallback if no name match)
+        if street:
+            street_filename = sanitize_filename_for_lookup(street) + '.webp'
+            street_path = os.path.join('static', 'images', 'restaurant_cards_webp', street_filename)
+            
+            if os.path.exists(street_path):
+                local_url = url_for('static', filename=f'images/restaurant_cards_webp/{street_filename}')
+                if not alt_tag:
+                    alt_tag = f"{restaurant_name} restaurant in Quezon City"
+                print(f"✓ Found webp for {restaurant_name}: {street_filename}")
+                return local_url, alt_tag
+    except Exception as e:
+        print(f"Warning: Error in get_restaurant_image_url for {restaurant_name}: {e}")
+    
+    # Priority 3: Fallback to original photo URL
+    if not alt_tag:
+        alt_tag = f"{restaurant_name or 'Restaurant'} restaurant in Quezon City"
+    
+    return fallback_photo_url or '', alt_tag
+
+def sanitize_filename_for_lookup(name):
+    """Convert restaurant name to the same format used in image filenames"""
+    import re
+    # Remove special characters and spaces
+    name = re.sub(r'[^\w\s-]', '', name)
+    # Replace spaces with underscores
+    name = re.sub(r'\s+', '_', name)
+    # Convert to lowercase
+    name = name.lower()
+    # Remove multiple underscores
+    name = re.sub(r'_+', '_', name)
+    # Remove leading/trailing underscores
+    name = name.strip('_')
+    return name
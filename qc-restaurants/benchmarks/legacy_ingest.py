@@ -0,0 +1,374 @@
+"""
+Legacy Ingestion
+Row-at-a-time process_dataframe as it shipped before the vectorized rewrite in services/ingest.py.
+Kept only as the reference implementation for benchmarks/bench_ingest.py and the golden file.
+"""
+
+import json
+import os
+import re
+from datetime import datetime, timezone, timedelta
+
+import pandas as pd
+
+from legacy_hours import is_currently_open
+
+OUTSCRAPER_FILE = 'New Master List - Sheet1.csv'
+
+
+def format_phone_number(phone):
+    if not phone or pd.isna(phone):
+        return None
+    
+    # Convert to string and remove any non-digit characters
+    phone_str = str(phone).strip()
+    digits = ''.join(filter(str.isdigit, phone_str))
+    
+    # Case 1: 12 digits (mobile numbers with country code 63)
+    if len(digits) == 12:
+        # +63 966 627 1522 → 0966 627 1522
+        local_digits = digits[2:]  # Remove 63, get 9666271522
+        return f"0{local_digits[:3]} {local_digits[3:6]} {local_digits[6:]}"
+    
+    # Case 2: 11 digits (Metro Manila landlines with country code 63)
+    elif len(digits) == 11:
+        # +63283746879 → (02) 8374 6879
+        local_digits = digits[2:]  # Remove 63, get 283746879
+        return f"(02) {local_digits[1:5]} {local_digits[5:]}"
+    
+    # For any other format, return as is
+    else:
+        return phone_str
+
+
+def parse_working_hours(hours_str):
+    if pd.isna(hours_str):
+        return {}
+    try:
+        # Convert string to proper JSON format if needed
+        if isinstance(hours_str, str):
+            hours_str = hours_str.replace("'", '"')
+        hours_dict = json.loads(hours_str)
+        
+        # Clean up the hours format
+        cleaned_hours = {}
+        for day, hours in hours_dict.items():
+            if hours and isinstance(hours, str):
+                # Remove any spaces between time and AM/PM
+                hours = re.sub(r'(\d)(?:\s+)(AM|PM)', r'\1\2', hours)
+                cleaned_hours[day] = hours
+        return cleaned_hours
+    except:
+        return {}
+
+
+def get_current_day():
+    # Use Filipino time (UTC+8)
+    ph_time = datetime.utcnow().replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=8)))
+    return ph_time.strftime('%A')  # Returns the current day name
+
+
+def extract_price_range(about):
+    if pd.isna(about):
+        return '1'  # Default to budget-friendly for fast food
+    try:
+        # Parse the JSON
+        about_dict = json.loads(about) if isinstance(about, str) else about
+        
+        # Check if it's a fast food restaurant
+        category = about_dict.get('category', '').lower()
+        if 'fast food' in category or 'fastfood' in category:
+            return '1'  # Fast food is typically budget-friendly
+            
+        # Look for price level in the JSON
+        price_info = about_dict.get('Price', {})
+        if isinstance(price_info, dict):
+            # Count how many price options are true
+            price_level = sum(1 for key, value in price_info.items() if value and '₱' in key)
+            return str(price_level) if price_level > 0 else '1'
+        return '1'
+    except:
+        # If JSON parsing fails, try the old method
+        about_str = str(about).lower()
+        if 'fast food' in about_str or 'fastfood' in about_str:
+            return '1'
+        count = about_str.count('₱')
+        return str(count) if count > 0 else '1'
+
+
+def extract_main_cuisine(type_value):
+    if pd.isna(type_value) or not type_value or str(type_value).strip() == '':
+        return None
+    # Print debug info
+    print(f"Debug - Processing type: {type_value}")
+    
+    # Clean up and standardize the cuisine name
+    cuisine = str(type_value).strip()
+    cuisine = cuisine.replace(' Restaurant', '').strip()
+    cuisine = cuisine.replace('Restaurant', '').strip()
+    
+    # Skip if it's just "Restaurant"
+    if cuisine.lower() == 'restaurant':
+        return None
+        
+    print(f"Debug - Extracted cuisine: {cuisine}")
+    return cuisine
+
+
+def process_dataframe(df, photo_version=None):
+    # Process subtypes - handle as comma-separated string if not JSON
+    def parse_subtypes(x):
+        if pd.isna(x):
+            return []
+        try:
+            # Try parsing as JSON first
+            subtypes = json.loads(x)
+            if isinstance(subtypes, list):
+                return [s.strip() for s in subtypes if s.strip().lower() != 'restaurant']
+            return []
+        except:
+            # If not JSON, try splitting by comma
+            return [s.strip() for s in str(x).split(',') if s.strip() and s.strip().lower() != 'restaurant']
+
+    # Process photos
+    def is_valid_image_url(url):
+        if pd.isna(url) or not str(url).strip() or url == 'nan' or url == 'None':
+            return False
+        url = str(url).strip()
+        # Accept Google Photos URLs and other common image hosting services
+        valid_domains = ['googleusercontent.com', 'photos.app.goo.gl', 'lh3.googleusercontent.com']
+        return (url.startswith('http://') or url.startswith('https://')) and any(domain in url.lower() for domain in valid_domains)
+
+    def process_photo_url(url):
+        # Return default SVG for missing/empty URLs
+        if pd.isna(url) or not url or url == 'nan' or url == 'None':
+            return '/static/cuisine-images/default.svg'
+        
+        # If it's already a local path, return as is
+        if url.startswith('/static/images/'):
+            return url
+        
+        # Handle Google Photos URLs
+        if 'photos.google.com' in url or 'photos.app.goo.gl' in url:
+            return '/static/cuisine-images/default.svg'
+        
+        # Check for problematic Google image URLs and test accessibility
+        if 'lh3.googleusercontent.com' in url and 'gps-cs-s' in url:
+            # Use the Google Photos URL directly - it should work in browsers
+            return url
+        
+        # For all other URLs, add cache-busting parameter to force refresh
+        if url and isinstance(url, str) and url.startswith('http'):
+            # CSV file modification time as version to force browser to reload image
+            separator = '&' if '?' in url else '?'
+            return f"{url}{separator}v={photo_version}"
+        
+        # For all other URLs, return as is - the img tag's onerror will handle any invalid images
+        return url
+
+    # Image cache-busting version, computed once per dataset rather than once per row
+    if photo_version is None:
+        try:
+            photo_version = int(os.path.getmtime(OUTSCRAPER_FILE))
+        except OSError:
+            # Fallback to current timestamp if file access fails
+            photo_version = int(datetime.now().timestamp())
+
+    # Clean phone numbers and website URLs
+    def clean_field(value):
+        if pd.isna(value) or value == 'nan' or value == 'None' or str(value).strip() == '':
+            return None
+        return str(value).strip()
+    
+    # Format phone numbers to local Philippine format
+
+
+    # Convert reviews to integer - handle missing reviews column gracefully
+    if 'reviews' in df.columns:
+        df['reviews'] = df['reviews'].fillna(0).astype(int)
+    else:
+        df['reviews'] = [0 for _ in range(len(df))]
+    
+    # Handle phone and site columns gracefully
+    if '+63' in df.columns:
+        df['phone'] = df['+63'].apply(format_phone_number)
+    elif 'phone' in df.columns:
+        df['phone'] = df['phone'].apply(format_phone_number)
+    else:
+        df['phone'] = [None for _ in range(len(df))]
+        
+    if 'site' in df.columns:
+        df['site'] = df['site'].apply(clean_field)
+    else:
+        df['site'] = [None for _ in range(len(df))]
+    
+    # Process type column for cuisines - handle missing type column gracefully
+    print("\nDebug - Processing type column for cuisines:")
+    if 'type' in df.columns:
+        df['cuisine'] = df['type'].apply(extract_main_cuisine)
+    else:
+        # Create default cuisine if type column doesn't exist
+        df['cuisine'] = ['Restaurant' for _ in range(len(df))]
+    
+    # Process working hours - handle missing working_hours column gracefully
+    if 'working_hours' in df.columns:
+        df['working_hours_dict'] = df['working_hours'].apply(parse_working_hours)
+        current_day = get_current_day()
+        df['current_day'] = current_day
+        df['is_open'] = df['working_hours_dict'].apply(is_currently_open)
+        df['hours'] = df['working_hours_dict']
+    else:
+        # Create empty working hours data if column doesn't exist
+        df['working_hours_dict'] = [{} for _ in range(len(df))]
+        df['current_day'] = current_day
+        df['is_open'] = [False for _ in range(len(df))]
+        df['hours'] = [{} for _ in range(len(df))]
+    
+    # Print unique cuisines after processing
+    print("\nDebug - Unique cuisines after processing:")
+    print(df['cuisine'].unique())
+    
+    # Process photos after cuisine is extracted - handle missing photo column gracefully
+    if 'photo' in df.columns:
+        df['photo_url'] = df.apply(lambda x: process_photo_url(x.get('photo', None)), axis=1)
+    else:
+        df['photo_url'] = ['/static/cuisine-images/default.svg' for _ in range(len(df))]
+    
+    # Process about data
+    def process_about(about):
+        if pd.isna(about):
+            return {}
+        try:
+            # Try parsing as JSON first
+            if isinstance(about, str):
+                return json.loads(about)
+            return about
+        except:
+            return {}
+
+    # Process about data - handle missing about column gracefully
+    if 'about' in df.columns:
+        df['about'] = df['about'].apply(process_about)
+    else:
+        # Create empty about data if column doesn't exist
+        df['about'] = [{} for _ in range(len(df))]
+    
+    # Extract service options, highlights, and accessibility from about field
+    def extract_about_info(about):
+        if not about:
+            return False, False, [], False, False
+        try:
+            # Extract accessibility information
+            accessibility = about.get('Accessibility', {})
+            wheelchair_accessible = (
+                accessibility.get('Wheelchair accessible entrance', False) and 
+                accessibility.get('Wheelchair accessible seating', False)
+            )
+            
+            # Extract children information
+            children = about.get('Children', {})
+            good_for_kids = children.get('Good for kids', False)
+            has_high_chairs = children.get('High chairs', False)
+            
+            # Extract service options
+            service_options = about.get('Service options', {})
+            features = []
+            # Check all delivery-related options
+            if service_options.get('Delivery', False) or service_options.get('No-contact delivery', False):
+                features.append('Delivery')
+            if service_options.get('Takeout', False):
+                features.append('Takeout')
+            if service_options.get('Dine-in', False) or service_options.get('Onsite services', False):
+                features.append('Dine-in')
+            
+            # Extract amenities
+            amenities = about.get('Amenities', {})
+            has_wifi = amenities.get('Wi-Fi', False)
+            
+            return wheelchair_accessible, good_for_kids, features, has_wifi, has_high_chairs
+        except:
+            return False, False, [], False, False
+    
+    # Apply the about info extraction
+    print("Processing row 27:")
+    print(df.iloc[26]['about'])  # 26 because 0-based indexing
+    about_info = df['about'].apply(extract_about_info)
+    df['wheelchair_accessible'] = about_info.apply(lambda x: x[0])
+    df['good_for_kids'] = about_info.apply(lambda x: x[1])
+    df['features'] = about_info.apply(lambda x: x[2])  # Add features from about info
+    df['has_wifi'] = about_info.apply(lambda x: x[3])  # Add Wi-Fi status
+    df['has_high_chairs'] = about_info.apply(lambda x: x[4])  # Add High chairs status
+    
+    # Add empty lists for features and highlights since they're still referenced in the template
+    df['highlights'] = [[] for _ in range(len(df))]
+    
+    # Convert latitude and longitude to float - handle missing columns gracefully
+    if 'latitude' in df.columns:
+        df['latitude'] = pd.to_numeric(df['latitude'], errors='coerce')
+    else:
+        df['latitude'] = [None for _ in range(len(df))]
+        
+    if 'longitude' in df.columns:
+        df['longitude'] = pd.to_numeric(df['longitude'], errors='coerce')
+    else:
+        df['longitude'] = [None for _ in range(len(df))]
+    
+    # Process price range - prioritize 'range' column if available, fallback to 'about'
+    if 'range' in df.columns:
+        df['price'] = df['range'].apply(lambda x: str(x).count('₱') if pd.notna(x) else '1')
+    else:
+        df['price'] = df['about'].apply(extract_price_range)
+    
+    # Process top pick status from 'top pick' column if it exists
+    if 'top pick' in df.columns:
+        df['top_pick'] = df['top pick'].fillna(False).astype(bool)
+    elif 'top_pick' in df.columns:
+        df['top_pick'] = df['top_pick'].fillna(False).astype(bool)
+    else:
+        df['top_pick'] = False
+    
+    # Calculate score and sort - handle missing rating column gracefully
+    if 'rating' in df.columns:
+        df['score'] = df['rating'] * df['reviews']
+    else:
+        df['score'] = [0 for _ in range(len(df))]
+    df = df.sort_values('score', ascending=False).reset_index(drop=True)
+    
+    # Get unique cuisine types for filter and only include those that have at least one restaurant
+    cuisine_counts = {}
+    if 'type' in df.columns:
+        for cuisine_type in df['type']:
+            if pd.notna(cuisine_type):  # Only count non-null cuisine types
+                cuisine_type = cuisine_type.strip()
+                if cuisine_type.lower() != 'restaurant':
+                    cuisine_counts[cuisine_type] = cuisine_counts.get(cuisine_type, 0) + 1
+    else:
+        # Fallback to old cuisine column if type column doesn't exist
+        for cuisine in df['cuisine']:
+            if pd.notna(cuisine):  # Only count non-null cuisines
+                cuisine = cuisine.strip()
+                if cuisine.lower() != 'restaurant':
+                    cuisine_counts[cuisine] = cuisine_counts.get(cuisine, 0) + 1
+    
+    # Print cuisine counts for debugging
+    print("\nCuisine counts:")
+    for cuisine, count in sorted(cuisine_counts.items()):
+        print(f"{cuisine}: {count} restaurants")
+    
+    # Only include cuisines that have at least one restaurant
+    all_cuisines = sorted([cuisine for cuisine, count in cuisine_counts.items() if count > 0])
+    
+    # Get area counts from SEO Area column
+    area_counts = {}
+    if 'SEO Area' in df.columns:
+        for area in df['SEO Area'].dropna().unique():
+            if pd.notna(area) and area:
+                count = len(df[df['SEO Area'] == area])
+                area_counts[area] = count
+        # Sort areas by restaurant count (highest first)
+        area_counts = dict(sorted(area_counts.items(), key=lambda x: x[1], reverse=True))
+    else:
+        # Fallback: create default area counts if SEO Area column doesn't exist
+        area_counts = {'Quezon City': len(df)}
+    
+    return df, all_cuisines, area_counts
@@ -0,0 +1,111 @@
+"""
+Synthetic Master List
+Generates Outscraper-shaped restaurant rows so benchmarks can run without the real CSV.
+"""
+
+import json
+import os
+import random
+
+import pandas as pd
+
+AREAS = [
+    'Tomas Morato', 'Timog', 'Maginhawa', 'Cubao', 'Eastwood', 'SM North EDSA',
+    'Trinoma', 'Banawe', 'Fairview', 'UP Town Center', 'Katipunan', 'Scout Area',
+    'Kamuning', 'Teacher\'s Village', 'Novaliches', 'Araneta City (Cubao)',
+]
+
+AREA_CENTERS = {area: (14.60 + (i % 6) * 0.02, 121.00 + (i // 6) * 0.025) for i, area in enumerate(AREAS)}
+
+TYPES = [
+    'Filipino restaurant', 'Japanese restaurant', 'Korean barbecue restaurant', 'Chinese restaurant',
+    'Cafe', 'Coffee shop', 'Italian restaurant', 'American restaurant', 'Thai restaurant',
+    'Fast food restaurant', 'Bakery', 'Ramen restaurant', 'Samgyeopsal restaurant',
+    'Vietnamese restaurant', 'Spanish restaurant', 'Steak house', 'Restaurant',
+]
+
+HOURS_PATTERNS = [
+    '11AM-10PM', '10AM-9PM', 'Open 24 hours', '11AM-3PM,5-10PM', '6PM-2AM',
+    '7AM-7PM', '11:30AM-2:30PM,5:30-10PM', 'Closed', '4PM-12AM', '9AM-11PM',
+]
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+NAME_WORDS = [
+    'Lola', 'Kusina', 'Mesa', 'Casa', 'Bahay', 'Sarap', 'Tomo', 'Gubat', 'Yakiniku',
+    'Kanto', 'Paluto', 'Grill', 'Bistro', 'Kitchen', 'Cafe', 'House', 'Express', 'Noodle',
+]
+
+
+def _about(rng, type_value):
+    about = {
+        'Service options': {'Delivery': rng.random() < 0.6, 'Takeout': rng.random() < 0.8, 'Dine-in': rng.random() < 0.9},
+        'Accessibility': {
+            'Wheelchair accessible entrance': rng.random() < 0.5,
+            'Wheelchair accessible seating': rng.random() < 0.4,
+        },
+        'Children': {'Good for kids': rng.random() < 0.6, 'High chairs': rng.random() < 0.3},
+        'Amenities': {'Wi-Fi': rng.random() < 0.4, 'Restroom': True},
+        'Atmosphere': {'Casual': True, 'Cozy': rng.random() < 0.5, 'Romantic': rng.random() < 0.1},
+        'Crowd': {'Family-friendly': rng.random() < 0.5, 'Groups': True},
+        'Parking': {'Free parking lot': rng.random() < 0.3},
+    }
+    if 'Fast food' in type_value:
+        about['category'] = 'Fast food'
+    return json.dumps(about)
+
+
+def make_master_list(rows=2000, seed=7, filler_columns=70):
+    """Build a DataFrame with the columns and value formats of the New Master List export."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        area = rng.choice(AREAS)
+        lat, lng = AREA_CENTERS[area]
+        type_value = rng.choice(TYPES)
+        name = f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} {i}"
+        hours = rng.choice(HOURS_PATTERNS)
+        working_hours = {day: hours for day in DAYS}
+        if rng.random() < 0.2:
+            working_hours['Sunday'] = 'Closed'
+        subtypes = ', '.join([type_value] + rng.sample(TYPES, 2))
+        records.append({
+            'name': name if rng.random() > 0.05 else name + ' - ' + area,
+            'name_for_emails': name,
+            'site': f'https://example.com/{i}' if rng.random() < 0.6 else None,
+            'subtypes': subtypes,
+            'category': 'restaurants',
+            'type': type_value if rng.random() > 0.02 else None,
+            '+63': rng.choice(['+63 917 831 7533', '+63 2 8749 9638', '+63283746879', None, '8-700']),
+            'street': f"{rng.randint(1, 999)} {area} St",
+            'latitude': lat + rng.uniform(-0.01, 0.01),
+            'longitude': lng + rng.uniform(-0.01, 0.01),
+            'h3': f'89694ec{rng.randint(0, 0xfffff):05x}ffff',
+            'rating': round(rng.uniform(3.0, 5.0), 1) if rng.random() > 0.03 else None,
+            'reviews': float(rng.randint(0, 5000)) if rng.random() > 0.03 else None,
+            'reviews_tags': 'sisig, kare kare, samgyeopsal' if rng.random() < 0.3 else None,
+            'photo': rng.choice([
+                f'https://lh5.googleusercontent.com/p/AF1Qip{i}=w800-h500-k-no',
+                f'https://lh3.googleusercontent.com/gps-cs-s/AF1Qip{i}=w800',
+                f'https://photos.app.goo.gl/{i}',
+                None,
+            ]),
+            'working_hours': json.dumps(working_hours) if rng.random() > 0.05 else None,
+            'business_status': 'CLOSED_PERMANENTLY' if rng.random() < 0.03 else 'OPERATIONAL',
+            'about': _about(rng, type_value) if rng.random() > 0.05 else None,
+            'range': rng.choice(['₱', '₱₱', '₱₱₱', '₱₱₱₱', None]),
+            'SEO Area': area,
+            'top pick': True if rng.random() < 0.05 else None,
+            'place_id': f'ChIJ{i:012d}',
+        })
+    df = pd.DataFrame.from_records(records)
+    # Pad with the enrichment columns Outscraper exports but the app never reads
+    for n in range(filler_columns):
+        df[f'email_{n}.emails_validator.status'] = None
+    return df
+
+
+def write_master_list(path, rows=2000, seed=7):
+    """Write a synthetic master list CSV and return its path."""
+    make_master_list(rows, seed).to_csv(path, index=False)
+    return os.path.abspath(path)
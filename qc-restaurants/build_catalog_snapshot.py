@@ -0,0 +1,31 @@
+"""
+Build the catalog snapshot for the current master list, so workers start from it instead
+of parsing the CSV. Run after uploading a new master list or deploying new code; workers
+also write it themselves on their first CSV build.
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault('QC_CATALOG_RELOAD_SECONDS', '0')
+
+from app import CATALOG, CATALOG_SNAPSHOTS
+
+if CATALOG_SNAPSHOTS is None:
+    print("Catalog snapshots are disabled (QC_CATALOG_SNAPSHOT_DIR is empty)")
+    sys.exit(1)
+
+start_time = time.time()
+catalog = CATALOG.get()
+path = CATALOG_SNAPSHOTS.path_for(catalog.source_digest)
+if not os.path.exists(path):
+    # The worker path only warns when it cannot write - here it is an error
+    print(f"Could not write {path}")
+    sys.exit(1)
+db_path = catalog.db.path
+if os.path.dirname(db_path) != os.path.dirname(path):
+    print(f"Could not write the catalog store next to {path}")
+    sys.exit(1)
+print(f"{len(catalog.table)} restaurants -> {path} ({os.path.getsize(path) / 1e6:.1f} MB) "
+      f"and {db_path} ({os.path.getsize(db_path) / 1e6:.1f} MB) in {time.time() - start_time:.2f} seconds")
@@ -0,0 +1,17 @@
+# gunicorn -c gunicorn.conf.py
+# The app is loaded once in the master (see preload.py) and workers are forked from it.
+import multiprocessing
+import os
+
+wsgi_app = 'preload:application'
+preload_app = True
+bind = os.environ.get('QC_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# Set before the master preloads the app: it builds the catalog, but only the workers poll the master list
+os.environ['QC_CATALOG_WATCH_IN_WORKERS'] = '1'
+
+
+def post_fork(server, worker):
+    from app import watch_catalog
+    watch_catalog()
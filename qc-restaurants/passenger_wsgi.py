@@ -22,7 +22,8 @@ if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
 try:
-    from app import app as application
+    # Catalog, templates and image manifest are warmed at load, not on the first request
+    from preload import application
     logging.info("Application loaded successfully")
 except Exception as e:
     logging.error(f"Failed to load application: {str(e)}")
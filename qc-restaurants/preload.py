@@ -0,0 +1,17 @@
+"""
+Preloading WSGI entry point for pre-forking servers.
+
+Builds the catalog, compiles the templates and indexes the card images once, in the master
+process, then freezes the garbage collector, so every forked worker starts warm and shares
+those pages instead of building its own copy. gunicorn.conf.py points gunicorn here with
+preload_app on:
+
+    gunicorn -c gunicorn.conf.py
+
+GET /admin/memory on a worker shows how much of it is still shared.
+"""
+
+from app import CATALOG, IMAGE_MANIFEST, app as application
+from services.preload import warm_up
+
+warm_up(application, CATALOG, IMAGE_MANIFEST)
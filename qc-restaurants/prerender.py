@@ -0,0 +1,222 @@
+"""
+Pre-render the public pages to static files nginx can serve without reaching the app.
+
+Every URL comes from the catalog: the home and fixed pages, every ?page= of all restaurants,
+each cuisine and each neighbourhood, every restaurant, blog post and best-of category. Pages
+are rendered by a pool of worker processes through the Flask app itself and written as HTML
+plus .gz and .br copies (.br needs the brotli package). <path>/index.html holds a page and
+<path>/page-N.html its ?page=N.
+
+manifest.json records what each page was rendered from: the code, templates and card images,
+and the restaurants, page lists and aggregates it read (services/dependencies.py). A later
+run diffs the master list against the one the last run saw (dependencies.pickle) and only
+re-renders the pages whose reads it changed, besides pages whose open/closed badges have
+expired, so it can run from cron every few minutes. A page whose HTML comes out the same
+keeps its files untouched.
+
+Usage: python prerender.py [--out prerendered] [--workers 8] [--base-url URL] [--force]
+"""
+
+import argparse
+import contextlib
+import functools
+import glob
+import gzip
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault('QC_CATALOG_RELOAD_SECONDS', '0')
+# Each page is rendered once per run; a page cache would only hold memory
+os.environ['QC_PAGE_CACHE_MB'] = '0'
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+import app as site
+from flask import g
+from blog_data import blog_posts
+from services.listings import BEST_OF_CATEGORIES
+from services.snapshot import code_fingerprint
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST = 'manifest.json'
+DEPENDENCIES = 'dependencies.pickle'
+BATCH = 64
+FIXED_PAGES = ('/', '/about', '/how-we-rate', '/subscribe', '/senior-friendly', '/saved', '/contact',
+               '/quiz/perfect-spot', '/quiz/personality', '/blog', '/blog/best-coffee-shops-quezon-city', '/best-of')
+
+
+def paged(path, rows):
+    """path and its ?page=2.. URLs for a list of `rows` restaurants."""
+    pages = max((rows + site.LIST_PAGE_SIZE - 1) // site.LIST_PAGE_SIZE, 1)
+    return [path] + [f'{path}?page={page}' for page in range(2, pages + 1)]
+
+def page_urls(catalog):
+    """Every public URL the catalog has a page for."""
+    listings = catalog.listings
+    urls = list(FIXED_PAGES)
+    urls += paged('/all-restaurants', len(listings.ranked))
+    for slug in catalog.cuisine_slugs:
+        if len(listings.cuisine(slug)):
+            urls += paged(f'/cuisine/{slug}', len(listings.cuisine(slug)))
+    for slug, name in catalog.area_slugs.items():
+        urls += paged(f'/{slug}/', len(listings.area(name)))
+    urls += [f"/blog/{post['slug']}" for post in blog_posts]
+    urls += [f'/best-of/{category}' for category in BEST_OF_CATEGORIES]
+    urls += [f'/restaurant/{slug}' for slug in catalog.restaurants_data.keys()]
+    return list(dict.fromkeys(urls))
+
+def page_file(url):
+    """Path of a URL's HTML under the output directory."""
+    path, _, query = url.partition('?')
+    name = f"page-{query[len('page='):]}.html" if query else 'index.html'
+    return os.path.join(path.strip('/'), name)
+
+def input_digest():
+    """Digest of everything a page is rendered from besides the master list and the clock."""
+    sources = [os.path.join(BASE_DIR, 'app.py'), os.path.join(BASE_DIR, 'blog_data.py')]
+    sources += glob.glob(os.path.join(BASE_DIR, 'services', '*.py'))
+    sources += glob.glob(os.path.join(BASE_DIR, 'templates', '**', '*.html'), recursive=True)
+    digest = hashlib.sha1(code_fingerprint(sources).encode())
+    digest.update(repr(site.IMAGE_MANIFEST.signature()).encode())
+    return digest.hexdigest()
+
+def load_dependencies(out, inputs):
+    """The PageDependencies of the master list the last run rendered, or None (also when the code changed since)."""
+    try:
+        with open(os.path.join(out, DEPENDENCIES), 'rb') as f:
+            saved_inputs, dependencies = pickle.load(f)
+    except (FileNotFoundError, pickle.UnpicklingError, EOFError, AttributeError, TypeError, ValueError):
+        return None
+    return dependencies if saved_inputs == inputs else None
+
+
+def write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+def write_page(out, relative, body):
+    """The HTML and its precompressed copies, for nginx's gzip_static / brotli_static."""
+    path = os.path.join(out, relative)
+    write_atomic(path, body)
+    write_atomic(path + '.gz', gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli is not None:
+        write_atomic(path + '.br', brotli.compress(body, quality=11))
+
+def render(url, base_url):
+    """(status, body, expires, skipped, reads) for one URL, rendered the way the app serves it."""
+    # The with block keeps the request context open, so the route's page-cache hints can be read from g
+    with site.app.test_client() as client:
+        # Route debug output and error tracebacks stay out of the run summary; failures are listed there
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            response = client.get(url, base_url=base_url)
+        reads = g.get('page_reads')
+        return (response.status_code, response.get_data(), g.get('page_expires'), bool(g.get('skip_page_cache')),
+                sorted(reads) if reads is not None else None)
+
+def render_batch(out, base_url, inputs, batch):
+    """Render a batch of (url, previous etag) in a worker; returns their manifest entries."""
+    entries = {}
+    for url, previous in batch:
+        status, body, expires, skipped, reads = render(url, base_url)
+        # Failed pages and pages left to the app are also only retried once their inputs change
+        # (any change to the master list, for failed pages, since what they read is unknown)
+        entry = {'status': status, 'inputs': inputs, 'reads': reads if status == 200 else None}
+        if status == 200 and not skipped:
+            relative = page_file(url)
+            etag = hashlib.sha1(body).hexdigest()
+            if etag != previous or not os.path.exists(os.path.join(out, relative)):
+                write_page(out, relative, body)
+            entry.update(file=relative, etag=etag, expires=expires)
+        entries[url] = entry
+    return entries
+
+def remove_page(out, relative):
+    for suffix in ('', '.gz', '.br'):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(out, relative + suffix))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--out', default=os.path.join(BASE_DIR, 'prerendered'))
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--base-url', default=os.environ.get('QC_SITE_URL', 'https://www.restaurantsquezoncity.com'),
+                        help='scheme and host used for absolute links in the pages')
+    parser.add_argument('--force', action='store_true', help='re-render every page')
+    args = parser.parse_args()
+    if brotli is None:
+        print("brotli is not installed: writing .gz copies only (pip install brotli for .br)")
+
+    start_time = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        catalog = site.CATALOG.get()
+    inputs = input_digest()
+    manifest_path = os.path.join(args.out, MANIFEST)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        pages, source_digest = manifest['pages'], manifest.get('source_digest')
+    except (FileNotFoundError, ValueError, KeyError):
+        pages, source_digest = {}, None
+    now = time.time()
+    # What the master list changed since the last run; without the last run's state, every page read it
+    changes = None
+    if source_digest != catalog.source_digest:
+        previous = load_dependencies(args.out, inputs)
+        changes = catalog.dependencies.changes(previous) if previous is not None else None
+
+    def is_stale(entry):
+        if args.force or entry is None or entry.get('inputs') != inputs:
+            return True
+        if entry.get('expires') is not None and entry['expires'] <= now:
+            return True
+        return source_digest != catalog.source_digest and (changes is None or changes.touches(entry.get('reads')))
+
+    urls = page_urls(catalog)
+    stale = [url for url in urls if is_stale(pages.get(url))]
+    # Pages whose restaurant, cuisine or area is gone
+    removed = set(pages) - set(urls)
+    for url in removed:
+        if pages[url].get('file'):
+            remove_page(args.out, pages[url]['file'])
+        del pages[url]
+
+    batches = [[(url, pages.get(url, {}).get('etag')) for url in stale[i:i + BATCH]] for i in range(0, len(stale), BATCH)]
+    # Forked workers share the catalog this process has loaded
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=max(args.workers, 1), mp_context=context) as pool:
+        for entries in pool.map(functools.partial(render_batch, args.out, args.base_url, inputs), batches):
+            for url, entry in entries.items():
+                if 'file' not in entry and pages.get(url, {}).get('file'):
+                    remove_page(args.out, pages[url]['file'])
+                pages[url] = entry
+
+    os.makedirs(args.out, exist_ok=True)
+    write_atomic(os.path.join(args.out, DEPENDENCIES), pickle.dumps((inputs, catalog.dependencies)))
+    write_atomic(manifest_path, json.dumps({'inputs': inputs, 'source_digest': catalog.source_digest, 'rendered_at': now,
+                                            'pages': pages}, indent=1).encode())
+    written = sum(1 for url in stale if pages[url].get('file'))
+    failed = sorted(url for url in stale if pages[url]['status'] != 200)
+    dynamic = sum(1 for url in stale if pages[url]['status'] == 200 and not pages[url].get('file'))
+    if changes is not None:
+        print(f"Master list: {changes.summary()}")
+    print(f"{len(urls)} pages: {written} rendered, {len(urls) - len(stale)} up to date, {len(removed)} removed, "
+          f"{dynamic} left to the app, {len(failed)} failed in {time.time() - start_time:.1f} seconds -> {args.out}")
+    for url in failed[:20]:
+        print(f"  {pages[url]['status']} {url}")
+
+
+if __name__ == '__main__':
+    main()
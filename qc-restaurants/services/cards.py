@@ -0,0 +1,137 @@
+"""
+Restaurant Cards
+Slim view model for the listing cards on the home, all-restaurants and cuisine pages.
+
+The processed frame carries the whole Outscraper export (emails, phone carriers, review
+histograms, popular times...), but a card only shows a couple of dozen fields. CardTable
+pulls those columns out once per catalog snapshot, and pages build RestaurantCard objects
+for the rows they actually render - usually a dozen - instead of converting every
+matching row to a dict.
+"""
+
+import json
+
+import numpy as np
+
+from services.columns import ArrayColumn, pack_column
+from services.fields import DEFAULT_PHOTO_URL
+
+# Everything the card templates read; is_open and current_day are filled in per request
+CARD_FIELDS = (
+    'position', 'name', 'display_name', 'name_for_emails', 'cuisine', 'area', 'street',
+    'phone', 'site', 'photo_url', 'price', 'rating', 'reviews', 'latitude', 'longitude',
+    'hours', 'features', 'service_options', 'about', 'wheelchair_accessible', 'good_for_kids',
+    'has_wifi', 'has_high_chairs', 'top_pick', 'jacky_pick', 'is_open', 'current_day',
+)
+
+
+class RestaurantCard:
+    """One rendered restaurant card. Attribute access only; get() mirrors dict.get for the templates."""
+
+    __slots__ = CARD_FIELDS
+
+    def __init__(self, values):
+        for field, value in zip(CARD_FIELDS, values):
+            setattr(self, field, value)
+
+    def get(self, field, default=None):
+        return getattr(self, field, default)
+
+    def __repr__(self):
+        return f"RestaurantCard({self.position}, {self.name!r})"
+
+
+def service_options(about):
+    """Delivery/Takeout/Dine-in/No-contact delivery labels, as extract_service_options_from_about gives them"""
+    options_data = about.get('Service options', {}) if isinstance(about, dict) else {}
+    if not isinstance(options_data, dict):
+        return []
+    return [label for label in ('Delivery', 'Takeout', 'Dine-in', 'No-contact delivery') if options_data.get(label, False)]
+
+def about_json(about):
+    """The about dict as the JSON string the cuisine page filters read"""
+    try:
+        return json.dumps(about) if isinstance(about, dict) else '{}'
+    except (TypeError, ValueError):
+        return '{}'
+
+def per_object(values, transform):
+    """transform() once per distinct object (parsed about dicts are shared between rows), broadcast back"""
+    ids = np.fromiter((id(value) for value in values), dtype=np.int64, count=len(values))
+    _, first, inverse = np.unique(ids, return_index=True, return_inverse=True)
+    result = np.empty(len(first), dtype=object)
+    for slot, position in enumerate(first):
+        result[slot] = transform(values[position])
+    return result[inverse.reshape(-1)]
+
+
+class CardTable:
+    """
+    Card fields for every row of a catalog frame, as aligned packed columns.
+
+    Built once per catalog snapshot. Text, numbers and flags live in flat arrays
+    (services/columns.py) that a snapshot-loaded worker maps from the shared file, and
+    cards(positions) materializes just the requested rows, so a page of twelve costs
+    twelve small objects however many rows matched.
+    """
+
+    def __init__(self, df):
+        n = len(df)
+
+        def column(name, default=None):
+            if name in df.columns:
+                return df[name].to_numpy(dtype=object)
+            values = np.empty(n, dtype=object)
+            values.fill(default)
+            return values
+
+        names = column('name', 'Unknown Restaurant')
+        display_names = column('name_for_emails') if 'name_for_emails' in df.columns else names
+        if 'street' in df.columns:
+            streets = column('street')
+        else:
+            streets = column('address', 'Address not available')
+        photos = column('photo_url', DEFAULT_PHOTO_URL)
+        photos = np.array([photo.strip() if isinstance(photo, str) and photo else DEFAULT_PHOTO_URL for photo in photos], dtype=object)
+        prices = np.array(['1' if price is None else price for price in column('price', '1')], dtype=object)
+        abouts = column('about', {})
+
+        columns = {
+            'name': names,
+            'display_name': display_names,
+            'name_for_emails': column('name_for_emails'),
+            'cuisine': column('cuisine'),
+            'area': column('SEO Area'),
+            'street': streets,
+            'phone': column('phone'),
+            'site': column('site'),
+            'photo_url': photos,
+            'price': prices,
+            'rating': column('rating'),
+            'reviews': column('reviews', 0),
+            'latitude': column('latitude'),
+            'longitude': column('longitude'),
+            'hours': column('working_hours_dict', {}),
+            'features': column('features', []),
+            'service_options': per_object(abouts, service_options),
+            'about': per_object(abouts, about_json),
+            'wheelchair_accessible': column('wheelchair_accessible', False),
+            'good_for_kids': column('good_for_kids', False),
+            'has_wifi': column('has_wifi', False),
+            'has_high_chairs': column('has_high_chairs', False),
+            'top_pick': column('top_pick', False),
+            'jacky_pick': column('jacky_pick', False),
+        }
+        self.columns = {'position': ArrayColumn(np.arange(n))}
+        self.columns.update((field, pack_column(values)) for field, values in columns.items())
+
+    def __len__(self):
+        return len(self.columns['position'])
+
+    def cards(self, positions, is_open, current_day):
+        """RestaurantCards for the given frame positions; is_open is aligned with positions."""
+        positions = np.asarray(positions, dtype=np.intp)
+        fields = [self.columns[field].take(positions) for field in CARD_FIELDS[:-2]]
+        fields.append(np.asarray(is_open, dtype=bool).tolist())
+        fields.append([current_day] * len(positions))
+        return [RestaurantCard(values) for values in zip(*fields)]
@@ -0,0 +1,326 @@
+"""
+Restaurant Catalog
+Process-wide view of the master list, built once per worker and shared by every route.
+Edits to the master list are picked up by a background watcher that builds a new
+snapshot off the request path and swaps it in with a single reference assignment.
+"""
+
+import hashlib
+import io
+import os
+import threading
+import time
+
+import numpy as np
+
+from services.cards import CardTable
+from services.columns import ColumnTable, PackedRecords
+from services.counts import FacetCounts
+from services.dependencies import DatasetChanges, PageDependencies
+from services.facets import FacetIndex
+from services.geo import GeoIndex
+from services.hours import MINUTES_PER_DAY, NO_TRANSITION, PH_TIMEZONE, WeeklyHours, get_current_day, ph_now
+from services.listings import ListingViews
+from services.quiz import QuizTable
+from services.search import SearchIndex
+from services.similar import SimilarTable
+from services.suggest import SuggestIndex
+from services.slugs import area_slug, cuisine_slug, generate_restaurant_slug
+from services.sqlstore import StoreListings, write_private_db
+
+
+def slug_positions(names):
+    """{restaurant slug: position in the frame}; the first (highest-scored) row wins on collisions."""
+    positions = {}
+    for position, name in enumerate(names):
+        if isinstance(name, str):
+            positions.setdefault(generate_restaurant_slug(name), position)
+    return positions
+
+def name_slugs(values, slugify):
+    """{slug: (names...)} for the distinct non-empty names in a column, in frame order."""
+    slugs = {}
+    for name in values.dropna().unique():
+        if isinstance(name, str) and name:
+            slugs.setdefault(slugify(name), []).append(name)
+    return {slug: tuple(names) for slug, names in slugs.items()}
+
+
+# Hex digits of the master list's SHA-1 in its dataset version
+DATASET_VERSION_CHARS = 12
+
+
+def file_signature(path):
+    """Cheap change check: modification time and size of the file."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def read_source(path):
+    """(signature, contents) of the master list, read again if it changed while being read."""
+    while True:
+        signature = file_signature(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+        if file_signature(path) == signature:
+            return signature, data
+
+def dataset_version(signature, digest):
+    """
+    Version of a master list: its modification time in nanoseconds, zero-padded so versions
+    also sort as strings, then the start of its SHA-1 to tell apart lists saved in the same tick.
+    """
+    return f'{signature[0]:020d}-{digest[:DATASET_VERSION_CHARS]}'
+
+
+class RestaurantCatalog:
+    """
+    Immutable snapshot of the processed restaurant data plus the aggregates every page needs.
+
+    Built from the processed frame, but the frame itself is not kept: routes read rows
+    from `table` (a pandas-free ColumnTable with the same columns and row order) and must
+    treat it as read-only. dataset_version names the master list the snapshot was built
+    from (its modification time, then the start of its SHA-1), so every worker reports the
+    same version for the same file, later saves get later versions, and downstream caches
+    can key on it; `changes` says what differs from the snapshot
+    it replaced, so they can keep what the new master list did not touch.
+    """
+
+    def __init__(self, df, all_cuisines, area_counts, details=None, list_backend='views'):
+        self.table = ColumnTable.from_frame(df)
+        self.all_cuisines = all_cuisines
+        self.area_counts = area_counts
+
+        # Permanently closed restaurants are hidden from the listing pages
+        if 'business_status' in df.columns:
+            closed_mask = df['business_status'].str.contains('CLOSED_PERMANENTLY', case=False, na=False)
+            self.active_mask = ~closed_mask.to_numpy()
+        else:
+            self.active_mask = np.ones(len(df), dtype=bool)
+
+        # Restaurants per type and SEO Area (whole list, open ones, open ones per area) from one bincount
+        self.counts = FacetCounts(df, self.active_mask)
+
+        # Opening hours compiled once per snapshot; open/closed is a lookup per request
+        hours_column = df['working_hours_dict'] if 'working_hours_dict' in df.columns else [{}] * len(df)
+        self.hours = WeeklyHours.from_dicts(hours_column)
+
+        # O(1) slug lookups for the detail, neighbourhood and cuisine routes
+        self.slug_rows = slug_positions(df['name']) if 'name' in df.columns else {}
+        # Detail-page records (`details` has one per row, in frame order) of the row each slug resolves to, so
+        # the page and its Similar box describe the same restaurant; packed into flat columns, each view builds one dict
+        self.restaurants_data = PackedRecords({slug: details[position] for slug, position in self.slug_rows.items()}
+                                              if details is not None else {})
+        # area slug -> area name (first spelling wins); cuisine slug -> every type spelled that way
+        area_names = name_slugs(df['SEO Area'], area_slug) if 'SEO Area' in df.columns else {}
+        self.area_slugs = {slug: names[0] for slug, names in area_names.items()}
+        cuisine_column = 'type' if 'type' in df.columns else 'cuisine'
+        self.cuisine_slugs = name_slugs(df[cuisine_column], cuisine_slug) if cuisine_column in df.columns else {}
+
+        # Cuisine/area/price/amenity bitmaps shared by search, quiz, best-of and the tour builder
+        self.facets = FacetIndex(df)
+        # Best spots for every answer combination of the perfect-spot quiz
+        ratings = df['rating'].to_numpy(dtype=np.float64, na_value=np.nan) if 'rating' in df.columns else np.full(len(df), np.nan)
+        self.quiz = QuizTable(self.facets, ratings, self.active_mask)
+        # BM25 + trigram full-text index for /search
+        self.search = SearchIndex(df)
+        # Name/area/cuisine prefix index for /api/suggest typeahead
+        self.suggest = SuggestIndex(df, self.active_mask)
+        # Coordinate grid for /api/nearby, and each SEO Area's closest areas by centroid distance
+        self.geo = GeoIndex(df)
+        self.area_neighbours = self.geo.area_neighbours(df['SEO Area'], self.active_mask) if 'SEO Area' in df.columns else {}
+        # Top similar restaurants of every row, for the detail page's "Similar Restaurants" box
+        self.similar = SimilarTable(df, self.facets, self.active_mask)
+        # Listing-card fields pulled out of the wide frame; pages materialize only the rows they show
+        self.cards = CardTable(df)
+        # Ordered row lists (and sidebars) of every cuisine, area, cuisine-in-area and best-of page; with the
+        # 'store' backend they are queries against the SQLite store instead, set up by use_db()
+        self.list_backend = list_backend
+        self.listings = None
+        if list_backend == 'views':
+            services = self.cards.columns['service_options'].take(np.arange(len(df)))
+            self.listings = ListingViews(df, self.facets, self.counts, self.active_mask, all_cuisines, services)
+        # What pages can depend on (rows by place_id, page lists, aggregates), to diff against the next snapshot
+        self.dependencies = PageDependencies(df, self.listings, self.counts, self.similar, self.area_neighbours,
+                                             all_cuisines, area_counts)
+        # SQLite store behind filter-only search and store-backed listings (services/sqlstore.py); see use_db()
+        self.db = None
+        self.built_at = time.time()
+
+        # Filled in by CatalogStore when the snapshot is published
+        self.dataset_version = None
+        self.source_signature = None
+        self.source_digest = None
+        # (dataset version, DatasetChanges) against the snapshot this one replaced
+        self.changes = None
+
+    @property
+    def cuisine_counts(self):
+        """{type: open restaurants}, in order of first appearance."""
+        return self.counts.cuisine_counts
+
+    @property
+    def type_counts(self):
+        """{type: restaurants} over the whole list, most common first."""
+        return self.counts.type_counts
+
+    @property
+    def seo_area_counts(self):
+        """{SEO Area: restaurants} over the whole list, most common first."""
+        return self.counts.seo_area_counts
+
+    def use_db(self, db):
+        """Attach the SQLite store written for this snapshot; store-backed listings query it."""
+        self.db = db
+        if self.list_backend == 'store':
+            self.listings = StoreListings(db, self.cuisine_slugs, self.all_cuisines)
+
+    def open_now(self, now=None):
+        """Boolean array aligned with the table: which restaurants are open right now (Philippine time)."""
+        return self.hours.open_now(now)
+
+    def transitions_now(self, now=None):
+        """(is_open, minutes until the next open/close) arrays aligned with the table."""
+        return self.hours.transitions_now(now)
+
+    def status_expires(self, positions, now=None):
+        """
+        Epoch seconds at which cards for these rows go stale: the next time one of them opens
+        or closes, or Philippine midnight, when the day the cards highlight changes.
+        """
+        now = (now or ph_now()).astimezone(PH_TIMEZONE)
+        _, minutes = self.transitions_now(now)
+        minutes = minutes[np.asarray(positions, dtype=np.intp)]
+        until = MINUTES_PER_DAY - (now.hour * 60 + now.minute)
+        changing = minutes[minutes != NO_TRANSITION]
+        if len(changing):
+            until = min(until, int(changing.min()))
+        return (int(now.timestamp()) // 60 + until) * 60
+
+    def page_cards(self, positions, now=None):
+        """RestaurantCards for the given rows with live open/closed status."""
+        positions = np.asarray(positions, dtype=np.intp)
+        return self.cards.cards(positions, self.open_now(now)[positions], get_current_day())
+
+
+class CatalogStore:
+    """
+    Holds the current catalog snapshot and replaces it when the master list changes.
+
+    build(source, photo_version) receives the file contents as a buffer (so the digest
+    and the parsed data always describe the same bytes) and the file's modification time
+    in seconds, which is used as the image cache-busting version.
+    """
+
+    def __init__(self, path, build, snapshots=None):
+        self.path = path
+        self.build = build
+        self.snapshots = snapshots  # optional SnapshotCache; skips the CSV build when it has this version
+        self._catalog = None
+        self._lock = threading.Lock()  # serialises builds; readers never take it once published
+        self._watcher = None
+        self._watch_interval = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def get(self):
+        catalog = self._catalog
+        if catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    self._publish(self._build_snapshot())
+                catalog = self._catalog
+        return catalog
+
+    @property
+    def dataset_version(self):
+        return self.get().dataset_version
+
+    def reload(self, force=False):
+        """
+        Rebuild the catalog if the master list changed on disk.
+
+        Returns True when a new snapshot was swapped in. Requests keep being served from
+        the previous snapshot while the new one is built.
+        """
+        with self._lock:
+            current = self._catalog
+            if current is not None and not force:
+                if file_signature(self.path) == current.source_signature:
+                    return False
+                signature, data = read_source(self.path)
+                digest = hashlib.sha1(data).hexdigest()
+                if digest == current.source_digest:
+                    # Touched but not edited - keep the snapshot, under the version a fresh worker would give
+                    # the file now; nothing changed (set before the version, which readers check first)
+                    current.source_signature = signature
+                    current.changes = (current.dataset_version, DatasetChanges(set(), {}))
+                    current.dataset_version = dataset_version(signature, digest)
+                    return False
+            self._publish(self._build_snapshot())
+            return True
+
+    def invalidate(self):
+        """Drop the cached catalog so the next request rebuilds it from disk."""
+        with self._lock:
+            self._catalog = None
+
+    def watch(self, interval=30):
+        """Poll the master list every `interval` seconds from a daemon thread and hot-swap on change."""
+        self._watch_interval = interval
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    if self.reload():
+                        catalog = self._catalog
+                        changed = f" ({catalog.changes[1].summary()})" if catalog.changes else ''
+                        print(f"Restaurant catalog reloaded: dataset version {catalog.dataset_version}{changed}")
+                except Exception as e:
+                    # Keep serving the last good snapshot (e.g. the CSV is mid-upload)
+                    print(f"Warning: Could not reload restaurant catalog: {e}")
+
+        self._watcher = threading.Thread(target=run, name='catalog-watcher', daemon=True)
+        self._watcher.start()
+
+    def _after_fork(self):
+        # A worker forked from a preloaded master keeps the published snapshot, but the lock
+        # may have been held by the master's watcher and threads do not survive fork
+        self._lock = threading.Lock()
+        self._watcher = None
+        if self._watch_interval:
+            self.watch(self._watch_interval)
+
+    def _build_snapshot(self):
+        start_time = time.time()
+        signature, data = read_source(self.path)
+        digest = hashlib.sha1(data).hexdigest()
+        catalog = self.snapshots.load(digest) if self.snapshots is not None else None
+        built = catalog is None
+        if built:
+            catalog = self.build(io.BytesIO(data), photo_version=int(signature[0] // 1_000_000_000))
+            print(f"Restaurant catalog built in {time.time() - start_time:.2f} seconds")
+        else:
+            print(f"Restaurant catalog loaded from snapshot in {time.time() - start_time:.2f} seconds")
+        if catalog.db is None or not catalog.db.exists():
+            # The store goes next to the snapshot; without a snapshot directory this process keeps a private one
+            catalog.use_db((self.snapshots.save_db(digest, catalog) if self.snapshots is not None else None)
+                           or write_private_db(catalog))
+        if built and self.snapshots is not None:
+            self.snapshots.save(digest, catalog)
+        catalog.source_signature = signature
+        catalog.source_digest = digest
+        return catalog
+
+    def _publish(self, catalog):
+        previous = self._catalog
+        # Derived from the file rather than counted, so workers that reload at different times agree;
+        # the digest alone decides whether the contents changed
+        catalog.dataset_version = dataset_version(catalog.source_signature, catalog.source_digest)
+        if previous is not None:
+            # Worked out here, off the request path, so page caches only drop what changed
+            catalog.changes = (previous.dataset_version, catalog.dependencies.changes(previous.dependencies))
+        # Single reference assignment: a request sees the old snapshot or the new one, never a mix
+        self._catalog = catalog
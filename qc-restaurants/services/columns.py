@@ -0,0 +1,382 @@
+"""
+Packed Columns
+Column types that keep catalog data in a few flat NumPy arrays instead of one Python
+object per value. Pickled into a catalog snapshot, those arrays are stored out of band and
+memory-mapped read-only (services/snapshot.py), so every worker that loads the same
+snapshot shares one copy through the page cache; only the values a request touches are
+turned back into Python objects.
+
+take(positions) returns a list of plain Python values for the given rows, and
+column[position] a single value, for every column type here. ColumnTable puts them
+together as the catalog's row store, so the request path never needs pandas.
+"""
+
+import math
+import re
+
+import numpy as np
+
+from services.fields import is_missing
+
+# StringTable kinds: how a row's value is stored
+TEXT, NONE, NAN, OTHER = 0, 1, 2, 3
+
+
+class StringTable:
+    """
+    Text column as one UTF-8 blob plus int64 offsets.
+
+    Missing values keep their identity (None or NaN), and anything that is not text lands
+    in a small private `others` dict, so take() gives back exactly what went in.
+    """
+
+    def __init__(self, blob, offsets, kinds, others):
+        self.blob = blob
+        self.offsets = offsets
+        self.kinds = kinds
+        self.others = others
+
+    @classmethod
+    def from_values(cls, values):
+        encoded = []
+        kinds = np.zeros(len(values), dtype=np.uint8)
+        others = {}
+        for position, value in enumerate(values):
+            if isinstance(value, str):
+                encoded.append(value.encode('utf-8'))
+                continue
+            encoded.append(b'')
+            if value is None:
+                kinds[position] = NONE
+            elif isinstance(value, float) and math.isnan(value):
+                kinds[position] = NAN
+            else:
+                kinds[position] = OTHER
+                others[position] = value
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(blob, offsets, kinds, others)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, position):
+        kind = self.kinds[position]
+        if kind == TEXT:
+            return self.blob[self.offsets[position]:self.offsets[position + 1]].tobytes().decode('utf-8')
+        if kind == NONE:
+            return None
+        if kind == NAN:
+            return float('nan')
+        return self.others[position]
+
+    def take(self, positions):
+        positions = np.asarray(positions, dtype=np.intp)
+        data = memoryview(self.blob)
+        starts = self.offsets[positions].tolist()
+        ends = self.offsets[positions + 1].tolist()
+        values = []
+        for position, kind, start, end in zip(positions.tolist(), self.kinds[positions].tolist(), starts, ends):
+            if kind == TEXT:
+                values.append(str(data[start:end], 'utf-8'))
+            elif kind == NONE:
+                values.append(None)
+            elif kind == NAN:
+                values.append(float('nan'))
+            else:
+                values.append(self.others[position])
+        return values
+
+    def matches(self, predicate):
+        return np.fromiter((bool(predicate(value)) for value in self.take(np.arange(len(self)))), dtype=bool, count=len(self))
+
+
+def distinct_key(value):
+    """Text and missing values dedupe by value; anything else by identity, so shared parsed objects stay shared."""
+    if isinstance(value, str):
+        return value
+    if value is None:
+        return (None,)
+    if is_missing(value):
+        return (float,)
+    return id(value)
+
+
+class DistinctColumn:
+    """
+    Column of a few distinct values (categories, parsed hours, about dicts, feature lists):
+    int32 codes into a small list. Rows that shared an object still share it, and
+    matches() checks each distinct value once.
+    """
+
+    def __init__(self, codes, distinct):
+        self.codes = codes
+        self.distinct = distinct
+
+    @classmethod
+    def from_values(cls, values):
+        slots = {}
+        distinct = []
+        codes = np.empty(len(values), dtype=np.int32)
+        for position, value in enumerate(values):
+            key = distinct_key(value)
+            slot = slots.get(key)
+            if slot is None:
+                slot = slots[key] = len(distinct)
+                distinct.append(value)
+            codes[position] = slot
+        return cls(codes, distinct)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, position):
+        return self.distinct[self.codes[position]]
+
+    def take(self, positions):
+        distinct = self.distinct
+        return [distinct[code] for code in self.codes[positions].tolist()]
+
+    def distinct_in(self, positions):
+        """The distinct objects the given rows use, each once."""
+        return [self.distinct[code] for code in np.unique(self.codes[positions]).tolist()]
+
+    def matches(self, predicate):
+        hits = np.array([bool(predicate(value)) for value in self.distinct], dtype=bool)
+        return hits[self.codes] if len(hits) else np.zeros(len(self), dtype=bool)
+
+    def counts(self, positions):
+        """[(value, rows)] over the given rows in order of first appearance, missing values left out."""
+        codes = self.codes[positions]
+        slots, first, rows = np.unique(codes, return_index=True, return_counts=True)
+        order = np.argsort(first, kind='stable')
+        return [(self.distinct[slot], count) for slot, count in zip(slots[order].tolist(), rows[order].tolist())
+                if not is_missing(self.distinct[slot])]
+
+
+class ArrayColumn:
+    """Numeric or boolean column as a plain NumPy array."""
+
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, position):
+        return self.values[position].item()
+
+    def take(self, positions):
+        return self.values[positions].tolist()
+
+    def matches(self, predicate):
+        return np.fromiter((bool(predicate(value)) for value in self.values.tolist()), dtype=bool, count=len(self))
+
+
+def pack_column(values):
+    """
+    The most compact column type that round-trips values exactly: numbers and booleans
+    become arrays, mostly-unique text a StringTable, and repetitive text or anything else
+    (dicts, lists) a DistinctColumn.
+    """
+    values = list(values)
+    types = {type(value) for value in values}
+    if types and types <= {bool}:
+        return ArrayColumn(np.array(values, dtype=bool))
+    if types and types <= {int}:
+        return ArrayColumn(np.array(values, dtype=np.int64))
+    if types and types <= {float}:
+        return ArrayColumn(np.array(values, dtype=np.float64))
+    if types <= {str, type(None), float} and str in types:
+        if len({value for value in values if isinstance(value, str)}) > len(values) // 2:
+            return StringTable.from_values(values)
+    return DistinctColumn.from_values(values)
+
+
+class PackedRecords:
+    """
+    Read-only {key: record dict} mapping stored as packed columns, one per record field.
+
+    Only the key -> row index is a Python dict; get() builds a record from the columns
+    when it is asked for, so a detail page costs one small dict instead of the whole
+    mapping living on every worker's heap.
+    """
+
+    def __init__(self, records):
+        self.fields = []
+        for record in records.values():
+            for field in record:
+                if field not in self.fields:
+                    self.fields.append(field)
+        missing = object()
+        rows = list(records.values())
+        self.rows = {key: position for position, key in enumerate(records)}
+        self.columns = {}
+        self.present = {}
+        for field in self.fields:
+            values = [record.get(field, missing) for record in rows]
+            has_field = np.array([value is not missing for value in values], dtype=bool)
+            if not has_field.all():
+                # Keep per-record field sets exact: absent stays absent, not None
+                self.present[field] = has_field
+                values = [None if value is missing else value for value in values]
+            self.columns[field] = pack_column(values)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def keys(self):
+        return self.rows.keys()
+
+    def record(self, position):
+        return {field: column[position] for field, column in self.columns.items()
+                if field not in self.present or self.present[field][position]}
+
+    def get(self, key, default=None):
+        position = self.rows.get(key)
+        return default if position is None else self.record(position)
+
+    def __getitem__(self, key):
+        return self.record(self.rows[key])
+
+    def items(self):
+        for key, position in self.rows.items():
+            yield key, self.record(position)
+
+    def values(self):
+        for position in self.rows.values():
+            yield self.record(position)
+
+
+def nargsort(values, ascending=True):
+    """
+    argsort with NaN last, in exactly the order pandas' sort_values(kind='quicksort') puts
+    rows, ties included, so pages list restaurants as they did when sorted through a frame.
+    """
+    values = np.asarray(values)
+    missing = np.isnan(values) if values.dtype.kind == 'f' else np.zeros(len(values), dtype=bool)
+    index = np.arange(len(values))
+    present, present_index = values[~missing], index[~missing]
+    if not ascending:
+        present, present_index = present[::-1], present_index[::-1]
+    order = present_index[present.argsort(kind='quicksort')]
+    if not ascending:
+        order = order[::-1]
+    return np.concatenate([order, index[missing]])
+
+
+class Record:
+    """
+    One catalog row, read from the table's columns on access. get() and [] mirror a
+    pandas row (Series), so per-row code reads the same values without building one.
+    """
+
+    __slots__ = ('table', 'position')
+
+    def __init__(self, table, position):
+        self.table = table
+        self.position = position
+
+    def get(self, field, default=None):
+        column = self.table.columns.get(field)
+        return default if column is None else column[self.position]
+
+    def __getitem__(self, field):
+        return self.table.columns[field][self.position]
+
+    def __repr__(self):
+        return f"Record({self.position}, {self.get('name')!r})"
+
+
+class ColumnTable:
+    """
+    The processed catalog frame as packed columns, in the frame's column and row order.
+
+    The request path filters with boolean masks (equals/isin/contains/matches), orders
+    row positions with sort_desc(), and reads the rows it renders through rows(). Column
+    values are exactly what the frame held, so no pandas is needed to serve it.
+    """
+
+    def __init__(self, columns, size):
+        self.columns = columns
+        self.size = size
+
+    @classmethod
+    def from_frame(cls, df):
+        columns = {}
+        for field in df.columns:
+            series = df[field]
+            if str(series.dtype) == 'category':
+                # Category codes as they are; missing (-1) points at a NaN slot at the end
+                distinct = list(series.cat.categories.astype(object)) + [float('nan')]
+                codes = series.cat.codes.to_numpy().astype(np.int32)
+                columns[field] = DistinctColumn(np.where(codes < 0, len(distinct) - 1, codes).astype(np.int32), distinct)
+            elif series.dtype.kind in 'biuf':
+                columns[field] = ArrayColumn(series.to_numpy())
+            else:
+                columns[field] = pack_column(series.to_numpy(dtype=object))
+        return cls(columns, len(df))
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, field):
+        return field in self.columns
+
+    def array(self, field):
+        """The NumPy array behind a numeric or boolean column."""
+        return self.columns[field].values
+
+    def values(self, field, positions):
+        return self.columns[field].take(positions)
+
+    def rows(self, positions):
+        return [Record(self, position) for position in np.asarray(positions).tolist()]
+
+    def matches(self, field, predicate):
+        """Boolean mask of the rows whose value satisfies predicate."""
+        return self.columns[field].matches(predicate)
+
+    def equals(self, field, value):
+        column = self.columns[field]
+        if isinstance(column, ArrayColumn):
+            return column.values == value
+        return self.matches(field, lambda v: v == value)
+
+    def isin(self, field, values):
+        values = set(values)
+        return self.matches(field, lambda v: not is_missing(v) and v in values)
+
+    def contains(self, field, pattern, case=False):
+        """Series.str.contains(pattern, case=case, na=False): a regex search over the text values."""
+        regex = re.compile(pattern, 0 if case else re.IGNORECASE)
+        return self.matches(field, lambda v: isinstance(v, str) and regex.search(v) is not None)
+
+    def sort_desc(self, fields, positions):
+        """
+        positions ordered by one numeric column, or by several in turn, high to low with NaN
+        last - the order sort_values(fields, ascending=False) gives the same rows.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        if isinstance(fields, str):
+            return positions[nargsort(self.array(fields)[positions], ascending=False)]
+        # Several keys: pandas sorts those stably, as lexsort does (last key first)
+        return positions[np.lexsort([-self.array(field)[positions] for field in reversed(fields)])]
+
+    def counts(self, field, positions):
+        """[(value, rows)] for the given rows in order of first appearance, missing values left out."""
+        column = self.columns[field]
+        if isinstance(column, DistinctColumn):
+            return column.counts(positions)
+        totals = {}
+        for value in column.take(positions):
+            if not is_missing(value):
+                totals[value] = totals.get(value, 0) + 1
+        return list(totals.items())
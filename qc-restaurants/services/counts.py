@@ -0,0 +1,140 @@
+"""
+Facet Counts
+Restaurant counts per cuisine type and SEO Area for the home, all-restaurants, cuisine and
+neighbourhood pages. Every row is reduced to one joint code (open for business, area, type)
+and a single np.bincount over those codes gives the whole open x area x type cube; the
+global, per-area and per-cuisine dictionaries the pages show are read off the cube.
+
+update() applies changed rows to the cube and rebuilds the dictionaries from it, without
+going back over the rows that did not change.
+"""
+
+import numpy as np
+
+
+def encode(values):
+    """(codes, names) for a column: codes index names, missing values get code len(names)."""
+    import pandas as pd
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, names = values.cat.codes.to_numpy(dtype=np.int64), list(values.cat.categories)
+    else:
+        codes, names = pd.factorize(values)
+        codes, names = codes.astype(np.int64), list(names)
+    codes[codes < 0] = len(names)
+    return codes, names
+
+def first_seen(codes, size):
+    """Position of the first row with each code (len(codes) where there is none)."""
+    first = np.full(size, len(codes), dtype=np.int64)
+    np.minimum.at(first, codes, np.arange(len(codes), dtype=np.int64))
+    return first
+
+def ranked(names, counts, first):
+    """{name: count} for the non-zero counts, most first, ties in order of first appearance."""
+    order = np.lexsort([first, -counts])
+    return {names[code]: int(counts[code]) for code in order.tolist() if counts[code]}
+
+def ranked_counts(values):
+    """{value: rows} for a column, most common first, ties in order of first appearance; missing left out."""
+    codes, names = encode(values)
+    counts = np.bincount(codes, minlength=len(names) + 1)[:len(names)]
+    return ranked(names, counts, first_seen(codes, len(names) + 1)[:len(names)])
+
+
+class FacetCounts:
+    """
+    cube[open, area, type] row counts, plus first[open, area, type], the position of the
+    first row in each cell (dictionary order follows it). The last area and type code of
+    each axis stands for a missing value. Each row's own cell is kept too (row_open,
+    row_areas, row_types; -1 for a missing value) so update() can move it.
+    """
+
+    def __init__(self, df, active_mask):
+        size = len(df)
+        column = 'type' if 'type' in df.columns else 'cuisine'
+        type_codes, self.types = encode(df[column]) if column in df.columns else (np.zeros(size, dtype=np.int64), [])
+        area_codes, self.areas = encode(df['SEO Area']) if 'SEO Area' in df.columns else (np.zeros(size, dtype=np.int64), [])
+        self.type_codes = {name: code for code, name in enumerate(self.types)}
+        self.area_codes = {name: code for code, name in enumerate(self.areas)}
+
+        shape = (2, len(self.areas) + 1, len(self.types) + 1)
+        joint = np.ravel_multi_index((np.asarray(active_mask, dtype=np.int64), area_codes, type_codes), shape)
+        self.cube = np.bincount(joint, minlength=np.prod(shape)).reshape(shape)
+        self.first = first_seen(joint, np.prod(shape)).reshape(shape)
+        self.size = size
+        self.row_open = np.asarray(active_mask, dtype=bool).copy()
+        self.row_areas = np.where(area_codes < len(self.areas), area_codes, -1).astype(np.int32)
+        self.row_types = np.where(type_codes < len(self.types), type_codes, -1).astype(np.int32)
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the count dictionaries from the cube."""
+        cube, first = self.cube[:, :-1, :], self.first[:, :-1, :]
+        types, areas = self.types, self.areas
+        # Every row, type and SEO Area on their own; every declared value is listed, zero or not
+        type_totals, area_totals = self.cube.sum(axis=(0, 1))[:-1], self.cube.sum(axis=(0, 2))[:-1]
+        order = np.lexsort([np.arange(len(types)), -type_totals])
+        self.type_counts = {types[code]: int(type_totals[code]) for code in order.tolist()}
+        order = np.lexsort([np.arange(len(areas)), -area_totals])
+        self.seo_area_counts = {areas[code]: int(area_totals[code]) for code in order.tolist()}
+
+        # Open restaurants per type, in order of first appearance
+        open_types, open_first = self.cube[1].sum(axis=0)[:-1], self.first[1].min(axis=0)[:-1]
+        self.cuisine_counts = {types[code]: int(open_types[code]) for code in np.argsort(open_first, kind='stable').tolist()
+                               if open_types[code]}
+
+        # Open restaurants per type within each area, most first
+        self.area_cuisines = {areas[code]: ranked(types, cube[1, code, :-1], first[1, code, :-1])
+                              for code in range(len(areas)) if cube[1, code, :-1].any()}
+
+    def cuisine_areas(self, cuisine_types):
+        """{area: open restaurants} over one or more types, most first, ties in order of first appearance."""
+        codes = [self.type_codes[name] for name in cuisine_types if name in self.type_codes]
+        counts = self.cube[1, :-1][:, codes].sum(axis=1)
+        first = self.first[1, :-1][:, codes].min(axis=1, initial=self.size)
+        return ranked(self.areas, counts, first)
+
+    def code(self, names, lookup, value):
+        """Code of a type or area value (-1 when missing), adding it to its axis if it is new."""
+        if not isinstance(value, str):
+            return -1
+        if value not in lookup:
+            lookup[value] = len(names)
+            names.append(value)
+            axis = 2 if names is self.types else 1
+            # The new value's slot goes just before the missing-value slot at the end of the axis
+            self.cube = np.insert(self.cube, len(names) - 1, 0, axis=axis)
+            self.first = np.insert(self.first, len(names) - 1, self.size, axis=axis)
+        return lookup[value]
+
+    def cells(self, positions):
+        """Cube index (open, area, type) of the rows at these positions."""
+        areas, types = self.row_areas[positions], self.row_types[positions]
+        return (self.row_open[positions].astype(np.intp), np.where(areas < 0, len(self.areas), areas),
+                np.where(types < 0, len(self.types), types))
+
+    def update(self, rows):
+        """
+        Apply changed rows, given as {position: (type, area, is_open)} with each row's new
+        values. Values not seen before are added; they sort after every value from the build.
+        """
+        positions = np.fromiter(rows, dtype=np.intp, count=len(rows))
+        areas = [self.code(self.areas, self.area_codes, area) for _, area, _ in rows.values()]
+        types = [self.code(self.types, self.type_codes, cuisine_type) for cuisine_type, _, _ in rows.values()]
+        old = self.cells(positions)
+        np.subtract.at(self.cube, old, 1)
+        # The cells whose first row is leaving them need their next row looked up
+        leaving = {cell for cell, first in zip(zip(*(axis.tolist() for axis in old)), self.first[old].tolist())
+                   if first in rows}
+        self.row_open[positions] = [bool(is_open) for _, _, is_open in rows.values()]
+        self.row_areas[positions], self.row_types[positions] = areas, types
+        new = self.cells(positions)
+        np.add.at(self.cube, new, 1)
+        np.minimum.at(self.first, new, positions)
+        for cell in leaving:
+            is_open, area, cuisine_type = cell
+            area = area if area < len(self.areas) else -1
+            cuisine_type = cuisine_type if cuisine_type < len(self.types) else -1
+            members = np.flatnonzero((self.row_open == is_open) & (self.row_areas == area) & (self.row_types == cuisine_type))
+            self.first[cell] = members[0] if len(members) else self.size
+        self.refresh()
@@ -0,0 +1,210 @@
+"""
+Page Dependencies
+What each rendered page was built from, so a new master list only invalidates the pages it
+changes. While it renders, a page records the keys it read:
+
+    row:<place_id>             one restaurant's row of the master list (a card, a detail page)
+    similar:<place_id>         the restaurants a detail page lists as similar
+    restaurant:<slug>          the rows sharing a detail-page slug (branches share a name)
+    list:<name>@<start>:<end>  rows start..end of a page list, e.g. list:cuisine:thai@12:24
+                               (start = end: only how many rows it has)
+    facet:<name>               an aggregate: the navigation, type or area counts, a sidebar
+
+PageDependencies holds the state of every key for one catalog snapshot. changes() compares
+two snapshots, matching rows by place_id (a new rating reorders the frame, so positions
+mean nothing across snapshots), and DatasetChanges.touches() tells whether a page has to be
+rendered again. A page that recorded nothing depends on the whole dataset.
+"""
+
+import hashlib
+import math
+
+import numpy as np
+
+from services.listings import BEST_OF_CATEGORIES
+from services.slugs import generate_restaurant_slug
+
+
+def list_name(*parts):
+    """Name of a page list: ('ranked'), ('cuisine', slug), ('cuisine', slug, area), ('area', name), ('best', category); None parts are left out."""
+    return ':'.join(part for part in parts if part is not None)
+
+def list_key(name, start, end):
+    """Key of a page that shows rows start..end of a page list."""
+    return f'list:{name}@{start}:{end}'
+
+def facet_key(*parts):
+    return 'facet:' + list_name(*parts)
+
+SIDEBAR = facet_key('sidebar') + ':'
+
+def digest(value):
+    """Short stable digest of a value's repr (names, counts and tuples of them)."""
+    return hashlib.blake2b(repr(value).encode(), digest_size=8).hexdigest()
+
+# Odd 64-bit multiplier that spreads each folded value over the whole word
+MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def row_states(keys, values):
+    """One uint64 per row for (hashed id, uint64 values...), so rows compare across snapshots as sets."""
+    states = keys.copy()
+    for column in values.reshape(len(keys), -1).T:
+        states = (states ^ column) * MIX
+    return states
+
+def changed_ids(prefix, previous_ids, previous_states, ids, states):
+    """<prefix>:<id> for the rows whose state only one of the two snapshots has (duplicated ids included)."""
+    gone = previous_ids[~np.isin(previous_states, states)]
+    added = ids[~np.isin(states, previous_states)]
+    return {f'{prefix}:{place_id}' for place_id in gone.tolist() + added.tolist()}
+
+def changed_keys(prefix, old, new):
+    """<prefix>:<key> for the keys whose values differ, or that only one side has."""
+    return {f'{prefix}:{key}' for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+def changed_span(old, new):
+    """
+    (start, end) of the positions where two versions of a list differ, None when they are
+    the same. A list that changed length changes every one of its pages, as they show the total.
+    """
+    if old is None or new is None or len(old) != len(new):
+        return 0, math.inf
+    differ = np.flatnonzero(old != new)
+    return (int(differ[0]), int(differ[-1]) + 1) if len(differ) else None
+
+
+class DatasetChanges:
+    """The dependency keys two catalog snapshots disagree on."""
+
+    def __init__(self, keys, spans):
+        self.keys = keys    # row, similar, restaurant and facet keys
+        self.spans = spans  # {list name: (start, end) of the positions that differ}; None: every list, and sidebar
+
+    def touches(self, reads):
+        """Whether a page that read these keys (None: the whole dataset) has to be rendered again."""
+        if reads is None:
+            return True
+        for key in reads:
+            if self.spans is None and (key.startswith('list:') or key.startswith(SIDEBAR)):
+                return True
+            if key.startswith('list:'):
+                name, _, shown = key[len('list:'):].rpartition('@')
+                span = self.spans.get(name)
+                if span is not None:
+                    start, end = (int(bound) for bound in shown.split(':'))
+                    if span[1] == math.inf or (start < span[1] and span[0] < end):
+                        return True
+            elif key in self.keys:
+                return True
+        return False
+
+    def summary(self):
+        rows = sum(1 for key in self.keys if key.startswith('row:'))
+        facets = sum(1 for key in self.keys if key.startswith('facet:'))
+        lists = len(self.spans) if self.spans is not None else 'all'
+        return f"{rows} restaurants, {lists} page lists and {facets} aggregates changed"
+
+
+class PageDependencies:
+    """
+    State of every dependency key of one catalog snapshot: per row, its place_id folded with a
+    digest of its master-list columns, and with the ids of its similar restaurants; the hashed
+    place_ids of each page list in page order; and a digest of each aggregate. Built with the catalog.
+    Store-backed listings (listings=None) are not materialized, so their lists and the cuisine
+    sidebars count as changed in every new snapshot.
+    """
+
+    def __init__(self, df, listings, counts, similar, area_neighbours, all_cuisines, area_counts):
+        import pandas as pd  # built with the catalog from the processed frame
+        from services.schema import MASTER_LIST_SCHEMA
+        size = len(df)
+        names = df['name'].to_numpy(dtype=object) if 'name' in df.columns else np.full(size, None, dtype=object)
+        ids = df['place_id'].to_numpy(dtype=object) if 'place_id' in df.columns else np.full(size, None, dtype=object)
+        # Rows without a place_id are matched by name
+        self.ids = np.array([place_id if isinstance(place_id, str) and place_id else f'name:{name}'
+                             for place_id, name in zip(ids.tolist(), names.tolist())], dtype=object)
+        hashed = pd.util.hash_array(self.ids)
+
+        # Each row's master-list columns only: the rest is derived from them, apart from the photo
+        # cache-busting version, and a new version of an unchanged photo is the same image.
+        # Text columns go in as text, since ingest parses some of them (about) into dicts
+        columns = {column: df[column].astype(str) if df[column].dtype == object else df[column]
+                   for column in MASTER_LIST_SCHEMA if column in df.columns}
+        digests = pd.util.hash_pandas_object(pd.DataFrame(columns), index=False).to_numpy() if columns else np.zeros(size, dtype=np.uint64)
+        self.rows = row_states(hashed, digests)
+        # The ids of each row's similar restaurants
+        self.similar = row_states(hashed, np.where(similar.neighbours >= 0, hashed[similar.neighbours], 0).astype(np.uint64))
+        slugs = {}
+        for place_id, name in zip(self.ids.tolist(), names.tolist()):
+            if isinstance(name, str):
+                slugs.setdefault(generate_restaurant_slug(name), []).append(place_id)
+        self.slugs = {slug: tuple(sorted(group)) for slug, group in slugs.items()}
+
+        self.lists = None
+        if listings is not None:
+            self.lists = self.list_states(listings, hashed)
+
+        self.facets = {
+            facet_key('navigation'): digest((all_cuisines, area_counts)),
+            facet_key('cuisine-counts'): digest(counts.cuisine_counts),
+            facet_key('type-counts'): digest(counts.type_counts),
+            facet_key('area-counts'): digest(counts.seo_area_counts),
+        }
+        for area, totals in counts.area_cuisines.items():
+            self.facets[facet_key('area-cuisines', area)] = digest(totals)
+        for area, neighbours in area_neighbours.items():
+            self.facets[facet_key('area-neighbours', area)] = digest(neighbours)
+        if listings is not None:
+            self.facets.update(self.sidebars(listings))
+
+    @staticmethod
+    def list_states(listings, hashed):
+        """{list name: hashed place_ids of its rows, in page order}."""
+        lists = {'ranked': listings.ranked, 'top-picks': listings.top_picks, 'by-rating': listings.by_rating}
+        for slug in listings.cuisines:
+            lists[list_name('cuisine', slug)] = listings.cuisine(slug)
+        for slug, area in listings.pairs:
+            lists[list_name('cuisine', slug, area)] = listings.cuisine(slug, area)
+        for area in listings.areas:
+            lists[list_name('area', area)] = listings.area(area)
+        for category in BEST_OF_CATEGORIES:
+            lists[list_name('best', category)] = listings.best(category)
+        return {name: hashed[rows] for name, rows in lists.items()}
+
+    @staticmethod
+    def sidebars(listings):
+        """Digests of the cuisine page sidebars: service options, popular areas, similar cuisines."""
+        facets = {}
+        for slug in listings.cuisines:
+            facets[facet_key('sidebar', slug)] = digest((listings.features.get(slug), listings.popular_areas.get(slug),
+                                                        listings.similar_cuisines.get(slug)))
+        for slug, area in listings.pairs:
+            facets[facet_key('sidebar', slug, area)] = digest(listings.features.get((slug, area)))
+        return facets
+
+    def row_keys(self, positions):
+        """row:<place_id> of the rows at these frame positions."""
+        return [f'row:{place_id}' for place_id in self.ids[np.asarray(positions, dtype=np.intp)].tolist()]
+
+    def restaurant_keys(self, slug, position=None):
+        """Keys of a detail page: every row with its slug and, given its frame position, its similar restaurants."""
+        keys = [f'restaurant:{slug}'] + [f'row:{place_id}' for place_id in self.slugs.get(slug, ())]
+        if position is not None:
+            keys.append(f'similar:{self.ids[position]}')
+        return keys
+
+    def changes(self, previous):
+        """DatasetChanges from the `previous` snapshot's dependencies to these."""
+        keys = changed_ids('row', previous.ids, previous.rows, self.ids, self.rows)
+        keys |= changed_ids('similar', previous.ids, previous.similar, self.ids, self.similar)
+        keys |= changed_keys('restaurant', previous.slugs, self.slugs)
+        keys |= {key for key in previous.facets.keys() | self.facets.keys() if previous.facets.get(key) != self.facets.get(key)}
+        if previous.lists is None or self.lists is None:
+            return DatasetChanges(keys, None)
+        spans = {}
+        for name in previous.lists.keys() | self.lists.keys():
+            span = changed_span(previous.lists.get(name), self.lists.get(name))
+            if span is not None:
+                spans[name] = span
+        return DatasetChanges(keys, spans)
@@ -0,0 +1,144 @@
+"""
+Facet Index
+Filter vocabularies shared by search, the quiz, best-of and the food tour builder, and a
+per-catalog index of precomputed boolean bitmaps for them. Any filter combination is a
+few bitwise ANDs instead of a string scan over the whole frame.
+"""
+
+import numpy as np
+
+# Keyword groups matched (case-insensitively, as substrings) against the type column
+CUISINE_GROUPS = {
+    'filipino': ['Filipino', 'Pinoy'],
+    'asian': ['Japanese', 'Thai', 'Vietnamese', 'Korean', 'Chinese', 'Asian', 'Singaporean'],
+    'western': ['American', 'Italian', 'Spanish', 'Western', 'European'],
+    'coffee': ['Cafe', 'Coffee', 'Bakery'],
+}
+
+# Keyword groups matched against the SEO Area column
+AREA_GROUPS = {
+    'timog': ['Timog', 'Scout'],
+    'tomas morato': ['Tomas Morato', 'Morato'],
+    'north': ['SM North', 'North EDSA', 'Trinoma', 'Fairview', 'North'],
+    'east': ['Eastwood', 'Ortigas', 'Taguig'],
+    'center': ['Timog', 'Tomas Morato', 'Maginhawa', 'Scout'],
+    'maginhawa': ['Maginhawa', 'Teacher\'s Village'],
+    'cubao': ['Cubao', 'Araneta'],
+}
+
+# Budget answers -> most peso signs allowed (the price column holds the peso-sign count)
+PRICE_TIERS = {'budget': 1, 'mid': 2, 'splurge': 3}
+MAX_PRICE_TIER = 4
+
+# Amenity -> (column, value): boolean columns, or a value that must appear in the features list
+AMENITIES = {
+    'wheelchair': ('wheelchair_accessible', True),
+    'kids': ('good_for_kids', True),
+    'wifi': ('has_wifi', True),
+    'delivery': ('features', 'Delivery'),
+    'takeout': ('features', 'Takeout'),
+    'dine_in': ('features', 'Dine-in'),
+}
+# plus 'parking', read from the about data's Parking section
+
+
+def keyword_masks(values, groups):
+    """
+    {group: rows whose value contains any of the group's keywords (case-insensitive)}.
+    The column is factorized once and each distinct value is checked once.
+    """
+    import pandas as pd  # built with the catalog; a snapshot-loaded worker never gets here
+    codes, uniques = pd.factorize(values)
+    # Missing values (code -1) read as '' and land on the extra slot at the end
+    lowered = [str(value).lower() for value in uniques] + ['']
+    masks = {}
+    for group, keywords in groups.items():
+        keywords = [keyword.lower() for keyword in keywords]
+        hits = np.fromiter((any(k in value for k in keywords) for value in lowered), dtype=bool, count=len(lowered))
+        masks[group] = hits[codes]
+    return masks
+
+def object_mask(values, predicate):
+    """
+    predicate() over an object column, evaluated once per distinct object. Ingestion shares
+    one parsed list/dict between rows with the same source value, so this is per schedule
+    or about blob rather than per row.
+    """
+    values = np.asarray(values, dtype=object)
+    if len(values) == 0:
+        return np.zeros(0, dtype=bool)
+    ids = np.fromiter(map(id, values), dtype=np.int64, count=len(values))
+    _, first_rows, codes = np.unique(ids, return_index=True, return_inverse=True)
+    hits = np.fromiter((predicate(values[i]) for i in first_rows), dtype=bool, count=len(first_rows))
+    return hits[codes]
+
+def flag_mask(values):
+    """Rows where a boolean-ish column is True (missing counts as False)."""
+    return (values.fillna(False) == True).to_numpy(dtype=bool)
+
+def has_parking(about):
+    """Whether parsed about data lists any parking option."""
+    parking = about.get('Parking') if isinstance(about, dict) else None
+    return isinstance(parking, dict) and any(parking.values())
+
+
+class FacetIndex:
+    """
+    Boolean bitmaps aligned with the catalog frame's rows, one per cuisine group, area group,
+    price tier and amenity. Built once per catalog snapshot; treat the arrays as read-only.
+    """
+
+    def __init__(self, df):
+        import pandas as pd  # built with the catalog from the processed frame
+        self.size = len(df)
+        empty = np.zeros(self.size, dtype=bool)
+
+        types = df['type'] if 'type' in df.columns else df.get('cuisine', pd.Series([''] * self.size))
+        self.cuisines = keyword_masks(types, CUISINE_GROUPS)
+
+        areas = df['SEO Area'] if 'SEO Area' in df.columns else pd.Series([''] * self.size)
+        self.areas = keyword_masks(areas, AREA_GROUPS)
+
+        # Exact peso-sign count per row; tier 0 holds ranges without any peso sign
+        if 'price' in df.columns:
+            prices = pd.to_numeric(df['price'], errors='coerce').fillna(1).astype(int).clip(0, MAX_PRICE_TIER).to_numpy()
+        else:
+            prices = np.ones(self.size, dtype=int)
+        self.prices = [prices == tier for tier in range(MAX_PRICE_TIER + 1)]
+
+        self.amenities = {}
+        for name, (column, value) in AMENITIES.items():
+            if column not in df.columns:
+                self.amenities[name] = empty
+            elif value is True:
+                self.amenities[name] = flag_mask(df[column])
+            else:
+                self.amenities[name] = object_mask(df[column], lambda items, value=value: isinstance(items, list) and value in items)
+        self.amenities['parking'] = object_mask(df['about'], has_parking) if 'about' in df.columns else empty
+
+        self.has_rating = df['rating'].notna().to_numpy() if 'rating' in df.columns else empty
+
+    def all(self):
+        return np.ones(self.size, dtype=bool)
+
+    def price_at_most(self, tier):
+        """Rows with at most `tier` peso signs ('budget', 'mid', 'splurge' or a number)."""
+        tier = PRICE_TIERS.get(tier, tier)
+        return np.logical_or.reduce(self.prices[:int(tier) + 1])
+
+    def match(self, cuisine=None, area=None, budget=None, amenities=()):
+        """
+        Rows matching every given facet. Unknown group names are ignored, as the filters
+        always have been, so a stale query string still returns results.
+        """
+        mask = self.all()
+        if cuisine in self.cuisines:
+            mask &= self.cuisines[cuisine]
+        if area and area.lower() in self.areas:
+            mask &= self.areas[area.lower()]
+        if budget in PRICE_TIERS:
+            mask &= self.price_at_most(budget)
+        for amenity in amenities:
+            if amenity in self.amenities:
+                mask &= self.amenities[amenity]
+        return mask
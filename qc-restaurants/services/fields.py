@@ -0,0 +1,41 @@
+"""
+Field Helpers
+Small value helpers shared by ingestion and the request path. Nothing here imports pandas,
+so the serving side can use them without loading it.
+"""
+
+import math
+
+import numpy as np
+
+DEFAULT_PHOTO_URL = '/static/cuisine-images/default.svg'
+
+
+def is_missing(value):
+    """True for None and NaN - the missing values a catalog cell can hold (pd.isna for scalars)."""
+    return value is None or (isinstance(value, (float, np.floating)) and math.isnan(value))
+
+# Format phone numbers to local Philippine format
+def format_phone_number(phone):
+    if not phone or is_missing(phone):
+        return None
+
+    # Convert to string and remove any non-digit characters
+    phone_str = str(phone).strip()
+    digits = ''.join(filter(str.isdigit, phone_str))
+
+    # Case 1: 12 digits (mobile numbers with country code 63)
+    if len(digits) == 12:
+        # +63 966 627 1522 → 0966 627 1522
+        local_digits = digits[2:]  # Remove 63, get 9666271522
+        return f"0{local_digits[:3]} {local_digits[3:6]} {local_digits[6:]}"
+
+    # Case 2: 11 digits (Metro Manila landlines with country code 63)
+    elif len(digits) == 11:
+        # +63283746879 → (02) 8374 6879
+        local_digits = digits[2:]  # Remove 63, get 283746879
+        return f"(02) {local_digits[1:5]} {local_digits[5:]}"
+
+    # For any other format, return as is
+    else:
+        return phone_str
@@ -0,0 +1,159 @@
+"""
+Geospatial Index
+Uniform latitude/longitude grid over every restaurant with coordinates, built once per
+catalog, for /api/nearby: radius and k-nearest queries read the few grid cells around a
+point and then measure the candidates exactly with a vectorized haversine. The same
+coordinates give each SEO Area's centroid, so neighbourhood pages can link the areas
+that are actually next door.
+
+Points are kept sorted by cell in flat NumPy arrays, so the index is memory-mapped from
+the catalog snapshot like the rest of the catalog.
+"""
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+# Grid cell size in degrees of latitude and longitude (about 550 m by 530 m in Quezon City)
+CELL_DEGREES = 0.005
+# Neighbouring areas kept per SEO Area
+AREA_NEIGHBOURS = 3
+# Share of the points a k-nearest search box may hold before one full scan is cheaper than widening further
+FULL_SCAN_SHARE = 0.25
+
+
+def haversine(lat, lng, lats, lngs):
+    """Great-circle distance in metres from one point to arrays of points."""
+    lat, lng = np.radians(lat), np.radians(lng)
+    lats, lngs = np.radians(lats), np.radians(lngs)
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lngs - lng) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GeoIndex:
+    """
+    Grid index over the rows of the catalog frame with valid coordinates. Positions returned
+    are rows of the frame; treat the arrays as read-only.
+    """
+
+    def __init__(self, df):
+        size = len(df)
+        if 'latitude' in df.columns and 'longitude' in df.columns:
+            lats = df['latitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+            lngs = df['longitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            lats = lngs = np.full(size, np.nan)
+        # Blank or 0,0 coordinates would put a restaurant in the Gulf of Guinea
+        valid = (np.abs(lats) <= 90) & (np.abs(lngs) <= 180) & ~((lats == 0) & (lngs == 0))
+        self.size = size
+
+        rows = np.flatnonzero(valid)
+        cell_rows, cell_cols = self.cell(lats[rows], lngs[rows])
+        self.row_base = int(cell_rows.min()) if len(rows) else 0
+        self.col_base = int(cell_cols.min()) if len(rows) else 0
+        self.width = int(cell_cols.max()) - self.col_base + 1 if len(rows) else 1
+        # Cell key = grid row * width + grid column: the cells of one grid row are a contiguous key range
+        keys = (cell_rows - self.row_base) * self.width + (cell_cols - self.col_base)
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.positions = rows[order].astype(np.int32)
+        self.lats = lats[rows][order]
+        self.lngs = lngs[rows][order]
+        self.height = int(self.keys[-1] // self.width) + 1 if len(rows) else 0
+
+    def cell(self, lats, lngs):
+        return (np.floor(np.asarray(lats) / CELL_DEGREES).astype(np.int64),
+                np.floor(np.asarray(lngs) / CELL_DEGREES).astype(np.int64))
+
+    def candidates(self, lat, lng, radius):
+        """Indexes into the sorted points of every cell within the bounding box of a circle."""
+        if not len(self.keys):
+            return np.zeros(0, dtype=np.int64)
+        dlat = np.degrees(radius / EARTH_RADIUS_M)
+        # Longitude degrees shrink towards the poles: size the box for its widest latitude
+        widest = min(abs(lat) + dlat, 89.9)
+        dlng = np.degrees(radius / (EARTH_RADIUS_M * np.cos(np.radians(widest))))
+        (row_lo, row_hi), (col_lo, col_hi) = self.cell([lat - dlat, lat + dlat], [lng - dlng, lng + dlng])
+        row_lo, row_hi = max(row_lo - self.row_base, 0), min(row_hi - self.row_base, self.height - 1)
+        col_lo, col_hi = max(col_lo - self.col_base, 0), min(col_hi - self.col_base, self.width - 1)
+        if row_lo > row_hi or col_lo > col_hi:
+            return np.zeros(0, dtype=np.int64)
+        grid_rows = np.arange(row_lo, row_hi + 1) * self.width
+        starts = np.searchsorted(self.keys, grid_rows + col_lo, side='left')
+        ends = np.searchsorted(self.keys, grid_rows + col_hi, side='right')
+        lengths = ends - starts
+        # Concatenated ranges starts[i]:ends[i] without a Python loop over grid rows
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return np.repeat(starts, lengths) + within
+
+    def measure(self, lat, lng, radius, mask=None, points=None, k=None):
+        """
+        (positions, metres) of the given sorted points (None: all of them) within radius metres,
+        nearest first; given k, only the k nearest (and any tied with the last) are sorted.
+        """
+        if points is None:
+            positions, distances = self.positions, haversine(lat, lng, self.lats, self.lngs)
+        else:
+            positions, distances = self.positions[points], haversine(lat, lng, self.lats[points], self.lngs[points])
+        keep = distances <= radius
+        if mask is not None:
+            keep &= mask[positions]
+        positions, distances = positions[keep], distances[keep]
+        if k is not None and len(distances) > k:
+            keep = distances <= np.partition(distances, k - 1)[k - 1]
+            positions, distances = positions[keep], distances[keep]
+        order = np.lexsort([positions, distances])
+        return positions[order], distances[order]
+
+    def within(self, lat, lng, radius, mask=None):
+        """(positions, metres) of the rows within radius metres, nearest first (ties in row order)."""
+        return self.measure(lat, lng, radius, mask, self.candidates(lat, lng, radius))
+
+    def nearest(self, lat, lng, k, mask=None, radius=None):
+        """(positions, metres) of the k nearest rows, optionally no further than radius metres."""
+        if k <= 0 or not len(self.keys):
+            return np.zeros(0, dtype=np.int32), np.zeros(0)
+        limit = radius if radius is not None else np.inf
+        # Past the furthest corner of the grid every point is a candidate anyway
+        corners = haversine(lat, lng, np.array([self.lats.min(), self.lats.min(), self.lats.max(), self.lats.max()]),
+                            np.array([self.lngs.min(), self.lngs.max(), self.lngs.min(), self.lngs.max()]))
+        reach = corners.max() + CELL_DEGREES * EARTH_RADIUS_M * np.pi / 180
+        # Widen the circle from one cell until it holds k points
+        search = CELL_DEGREES * EARTH_RADIUS_M * np.pi / 180
+        while True:
+            search = min(search, limit)
+            points = self.candidates(lat, lng, search) if search < reach else None
+            if points is None or len(points) > FULL_SCAN_SHARE * len(self.keys):
+                # The circle covers most of the grid, or the query point is far from the restaurants:
+                # measuring every point once beats re-measuring the same cells on each wider step
+                positions, distances = self.measure(lat, lng, limit, mask, k=k)
+                break
+            positions, distances = self.measure(lat, lng, search, mask, points, k)
+            if len(positions) >= k or search >= limit:
+                break
+            search *= 4
+        return positions[:k], distances[:k]
+
+    def area_neighbours(self, areas, mask=None, count=AREA_NEIGHBOURS):
+        """
+        {area: ((area, metres), ...)} - the count closest other areas by distance between
+        centroids of their restaurants, nearest first. areas is the area name of each row.
+        """
+        areas = np.asarray(areas, dtype=object)[self.positions]
+        usable = np.array([isinstance(area, str) and bool(area) for area in areas], dtype=bool)
+        if mask is not None:
+            usable &= mask[self.positions]
+        names, codes = np.unique(areas[usable].astype(str), return_inverse=True)
+        if not len(names):
+            return {}
+        totals = np.bincount(codes, minlength=len(names))
+        lat_centres = np.bincount(codes, weights=self.lats[usable], minlength=len(names)) / totals
+        lng_centres = np.bincount(codes, weights=self.lngs[usable], minlength=len(names)) / totals
+        # Areas number in the dozens, so every pair is measured
+        distances = np.stack([haversine(lat, lng, lat_centres, lng_centres) for lat, lng in zip(lat_centres, lng_centres)])
+        np.fill_diagonal(distances, np.inf)
+        closest = np.argsort(distances, axis=1, kind='stable')[:, :count]
+        return {
+            names[area]: tuple((names[other], float(distances[area, other]))
+                               for other in closest[area].tolist() if np.isfinite(distances[area, other]))
+            for area in range(len(names))
+        }
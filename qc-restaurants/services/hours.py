@@ -0,0 +1,313 @@
+"""
+Opening Hours
+Parsing and open/closed checks for the Outscraper working_hours column (Philippine time).
+Each schedule is compiled once into minute-of-week intervals; checks are lookups, not string parsing.
+"""
+
+import json
+import re
+from bisect import bisect_right
+from datetime import datetime, timezone, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+from services.fields import is_missing
+
+
+def get_current_day():
+    # Use Filipino time (UTC+8)
+    ph_time = datetime.utcnow().replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=8)))
+    return ph_time.strftime('%A')  # Returns the current day name
+
+def format_working_hours(hours_dict):
+    if not hours_dict:
+        return "Hours not available"
+    current_day = get_current_day()
+    if current_day in hours_dict:
+        return f"Today: {hours_dict[current_day]}"
+    return "Hours not available"
+
+def parse_working_hours(hours_str):
+    if is_missing(hours_str):
+        return {}
+    try:
+        # Convert string to proper JSON format if needed
+        if isinstance(hours_str, str):
+            hours_str = hours_str.replace("'", '"')
+        hours_dict = json.loads(hours_str)
+        
+        # Clean up the hours format
+        cleaned_hours = {}
+        for day, hours in hours_dict.items():
+            if hours and isinstance(hours, str):
+                # Remove any spaces between time and AM/PM
+                hours = re.sub(r'(\d)(?:\s+)(AM|PM)', r'\1\2', hours)
+                cleaned_hours[day] = hours
+        return cleaned_hours
+    except:
+        return {}
+
+
+# ---------------------------------------------------------------------------
+# Compiled weekly hours
+#
+# A restaurant's week is compiled once into sorted, non-overlapping [start, end)
+# intervals of minute-of-week (Monday 00:00 = 0, Sunday 23:59 = 10079). Ranges that run
+# past midnight spill into the next day, and Sunday-night ranges wrap to Monday morning.
+# ---------------------------------------------------------------------------
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+DAY_INDEX = {day.lower(): i for i, day in enumerate(DAY_NAMES)}
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+PH_TIMEZONE = timezone(timedelta(hours=8))  # Asia/Manila, no DST
+
+_CLOCK_RE = re.compile(r'^(\d{1,2})(?::(\d{2}))?(AM|PM)?$')
+_DASHES = str.maketrans({'–': '-', '—': '-', '‑': '-', '−': '-'})
+_NO_INTERVALS = np.empty((0, 2), dtype=np.int32)
+NO_TRANSITION = np.iinfo(np.int32).max  # open 24/7 or never open: the state never changes
+
+
+def ph_now():
+    return datetime.now(PH_TIMEZONE)
+
+def minute_of_week(moment=None):
+    """Minute-of-week of `moment` (default: now) in Philippine time."""
+    if moment is None:
+        moment = ph_now()
+    elif moment.tzinfo is not None:
+        moment = moment.astimezone(PH_TIMEZONE)
+    return moment.weekday() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+def _clock_minutes(hour, minute, meridiem):
+    if meridiem is None:  # 24-hour clock, e.g. "17:30"
+        return hour * 60 + minute
+    hour = hour % 12
+    if meridiem == 'PM':
+        hour += 12
+    return hour * 60 + minute
+
+def parse_time_range(text):
+    """
+    Parse one range such as "11AM-3PM", "5-9PM", "6PM-2AM" or "17:00-22:00" into
+    (open, close) minutes after midnight. close > open; overnight ranges end past 1440.
+    Returns None for anything unparseable.
+    """
+    if '-' not in text:
+        return None
+    open_text, close_text = text.split('-', 1)
+    open_match, close_match = _CLOCK_RE.match(open_text), _CLOCK_RE.match(close_text)
+    if not open_match or not close_match:
+        return None
+
+    open_hour, open_minute, open_meridiem = int(open_match.group(1)), int(open_match.group(2) or 0), open_match.group(3)
+    close_hour, close_minute, close_meridiem = int(close_match.group(1)), int(close_match.group(2) or 0), close_match.group(3)
+    if open_minute > 59 or close_minute > 59:
+        return None
+
+    # Google shortens "5PM-9PM" to "5-9PM": the opening time takes the closing meridiem,
+    # unless that would put it after the close ("11-2PM" is 11AM, "10-2AM" is 10PM)
+    if open_meridiem is None and close_meridiem is not None:
+        open_meridiem = close_meridiem
+        if _clock_minutes(open_hour, open_minute, open_meridiem) > _clock_minutes(close_hour, close_minute, close_meridiem):
+            open_meridiem = 'AM' if close_meridiem == 'PM' else 'PM'
+    elif close_meridiem is None and open_meridiem is not None:
+        close_meridiem = open_meridiem
+
+    if (open_meridiem and open_hour > 12) or (close_meridiem and close_hour > 12) or open_hour > 24 or close_hour > 24:
+        return None
+
+    start = _clock_minutes(open_hour, open_minute, open_meridiem)
+    end = _clock_minutes(close_hour, close_minute, close_meridiem)
+    if end <= start:
+        end += MINUTES_PER_DAY  # closes after midnight ("6PM-2AM", "12AM-12AM")
+    return start, end
+
+def compile_hours(hours_dict):
+    """
+    Compile a working_hours dict ({'Monday': '11AM-3PM,5-9PM', ...}) into an int32 array of
+    shape (k, 2) holding sorted, merged [start, end) minute-of-week intervals.
+    """
+    if not hours_dict or not isinstance(hours_dict, dict):
+        return _NO_INTERVALS
+
+    intervals = []
+    for day, hours in hours_dict.items():
+        day_index = DAY_INDEX.get(str(day).strip().lower())
+        if day_index is None or not isinstance(hours, str):
+            continue
+        base = day_index * MINUTES_PER_DAY
+        text = re.sub(r'\s+', '', hours.translate(_DASHES)).upper()
+        if 'OPEN24HOURS' in text:
+            intervals.append((base, base + MINUTES_PER_DAY))
+            continue
+        for time_range in text.split(','):
+            parsed = parse_time_range(time_range)
+            if parsed is None:
+                continue
+            start, end = base + parsed[0], base + parsed[1]
+            if end > MINUTES_PER_WEEK:
+                # Sunday night into Monday morning
+                intervals.append((start, MINUTES_PER_WEEK))
+                intervals.append((0, end - MINUTES_PER_WEEK))
+            else:
+                intervals.append((start, end))
+
+    if not intervals:
+        return _NO_INTERVALS
+
+    intervals.sort()
+    merged = [list(intervals[0])]
+    for start, end in intervals[1:]:
+        if start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return np.array(merged, dtype=np.int32)
+
+@lru_cache(maxsize=4096)
+def _compiled_bounds(hours_items):
+    intervals = compile_hours(dict(hours_items))
+    return tuple(intervals[:, 0].tolist()), tuple(intervals[:, 1].tolist())
+
+def compiled_bounds(hours_dict):
+    """(starts, ends) tuples for a working_hours dict, memoised by its contents."""
+    if not hours_dict:
+        return (), ()
+    try:
+        return _compiled_bounds(tuple(hours_dict.items()))
+    except TypeError:
+        # Unhashable values (raw JSON lists) - compile without the cache
+        intervals = compile_hours(hours_dict)
+        return tuple(intervals[:, 0].tolist()), tuple(intervals[:, 1].tolist())
+
+def is_open_at(starts, ends, minute):
+    """Binary search sorted [start, end) intervals for `minute`."""
+    i = bisect_right(starts, minute) - 1
+    return i >= 0 and minute < ends[i]
+
+def minutes_until_open(starts, ends, minute):
+    """Minutes until the next opening after `minute` (0 if open, None if never open)."""
+    if not starts:
+        return None
+    if is_open_at(starts, ends, minute):
+        return 0
+    i = bisect_right(starts, minute)
+    if i < len(starts):
+        return starts[i] - minute
+    return starts[0] + MINUTES_PER_WEEK - minute
+
+
+class WeeklyHours:
+    """
+    Compiled hours for a whole column of working_hours dicts.
+
+    Rows holding the same dict object share one interval pattern, so the intervals are
+    compiled once per distinct schedule. open_at(minute) answers "open now" for every
+    row with one vectorized comparison over the pattern intervals.
+    """
+
+    def __init__(self, row_pattern, offsets, starts, ends):
+        self.row_pattern = row_pattern  # int32[n_rows] -> pattern id
+        self.offsets = offsets          # int64[n_patterns + 1] into starts/ends
+        self.starts = starts            # int32, sorted within each pattern
+        self.ends = ends
+        self.interval_pattern = np.repeat(np.arange(len(offsets) - 1, dtype=np.int32), np.diff(offsets))
+        # Globally sorted search keys (pattern, start) so one searchsorted covers every pattern
+        self._keys = self.interval_pattern.astype(np.int64) * (2 * MINUTES_PER_WEEK) + starts
+
+    @classmethod
+    def from_dicts(cls, hours_dicts):
+        hours_dicts = list(hours_dicts)
+        ids = np.fromiter((id(d) for d in hours_dicts), dtype=np.int64, count=len(hours_dicts))
+        _, first_rows, row_pattern = np.unique(ids, return_index=True, return_inverse=True)
+        patterns = [compile_hours(hours_dicts[i]) for i in first_rows]
+        lengths = np.fromiter((len(p) for p in patterns), dtype=np.int64, count=len(patterns))
+        offsets = np.zeros(len(patterns) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        intervals = np.concatenate(patterns) if patterns else _NO_INTERVALS
+        return cls(row_pattern.astype(np.int32), offsets, intervals[:, 0].copy(), intervals[:, 1].copy())
+
+    def __len__(self):
+        return len(self.row_pattern)
+
+    def intervals(self, row):
+        pattern = self.row_pattern[row]
+        lo, hi = self.offsets[pattern], self.offsets[pattern + 1]
+        return np.column_stack((self.starts[lo:hi], self.ends[lo:hi]))
+
+    def open_at(self, minute):
+        """Boolean array: which rows are open at `minute` (minute-of-week)."""
+        hit = (self.starts <= minute) & (minute < self.ends)
+        pattern_open = np.zeros(len(self.offsets) - 1, dtype=bool)
+        pattern_open[self.interval_pattern[hit]] = True
+        return pattern_open[self.row_pattern]
+
+    def open_now(self, now=None):
+        return self.open_at(minute_of_week(now))
+
+    def transitions_at(self, minute):
+        """
+        Per-row (is_open, minutes until the state changes) at `minute`: minutes until closing
+        for open rows, until opening for closed ones. Schedules that are open around the clock
+        or never open get NO_TRANSITION.
+
+        Binary search over the compiled intervals, once per distinct schedule.
+        """
+        n_patterns = len(self.offsets) - 1
+        first, stop = self.offsets[:-1], self.offsets[1:]
+        if len(self.starts) == 0:
+            return np.zeros(len(self.row_pattern), dtype=bool), np.full(len(self.row_pattern), NO_TRANSITION, dtype=np.int32)
+
+        patterns = np.arange(n_patterns, dtype=np.int64)
+        current = np.searchsorted(self._keys, patterns * (2 * MINUTES_PER_WEEK) + minute, side='right') - 1
+        last = len(self.starts) - 1
+        current_c = np.clip(current, 0, last)
+        first_c = np.clip(first, 0, last)
+
+        is_open = (current >= first) & (minute < self.ends[current_c])
+
+        # An interval closing at the end of the week carries on if the week starts open
+        closes_at = self.ends[current_c].astype(np.int64)
+        wraps = (closes_at == MINUTES_PER_WEEK) & (self.starts[first_c] == 0)
+        closes_at = np.where(wraps, MINUTES_PER_WEEK + self.ends[first_c], closes_at)
+
+        following = current + 1
+        opens_at = np.where(following < stop,
+                            self.starts[np.clip(following, 0, last)],
+                            self.starts[first_c].astype(np.int64) + MINUTES_PER_WEEK)
+
+        minutes = np.where(is_open, closes_at - minute, opens_at - minute)
+        always_open = (stop - first == 1) & (self.starts[first_c] == 0) & (self.ends[first_c] == MINUTES_PER_WEEK)
+        minutes = np.where(always_open | (stop == first), NO_TRANSITION, minutes).astype(np.int32)
+        return is_open[self.row_pattern], minutes[self.row_pattern]
+
+    def transitions_now(self, now=None):
+        return self.transitions_at(minute_of_week(now))
+
+
+def is_currently_open(hours_dict, now=None):
+    if not hours_dict:
+        return False
+    starts, ends = compiled_bounds(hours_dict)
+    return is_open_at(starts, ends, minute_of_week(now))
+
+def get_time_until_open(hours_dict, now=None):
+    """Calculate time until restaurant opens next"""
+    if not hours_dict:
+        return None
+    starts, ends = compiled_bounds(hours_dict)
+    minutes = minutes_until_open(starts, ends, minute_of_week(now))
+    if minutes is None:
+        return None
+    if minutes == 0:
+        return "Open Now"
+
+    hours_until, minutes_until = divmod(minutes, 60)
+    if hours_until > 0:
+        if minutes_until > 0:
+            return f"Opens in {hours_until}h {minutes_until}m"
+        return f"Opens in {hours_until}h"
+    return f"Opens in {minutes_until}m"
@@ -0,0 +1,175 @@
+"""
+Restaurant Images
+In-memory manifest of the local restaurant card images, so picking a card image is a few
+dictionary lookups instead of os.path.exists/os.listdir calls for every card on a page.
+The manifest is rebuilt when the image folders or the photo mapping change.
+"""
+
+import csv
+import os
+import re
+import threading
+import time
+
+IMAGE_EXTENSIONS = ('.webp', '.jpg', '.png', '.jpeg')  # lookup preference order
+CARDS_FOLDER = 'images/restaurant_cards'
+STREET_WEBP_FOLDER = 'images/restaurant_cards_webp'
+
+
+def sanitize_filename_for_lookup(name):
+    """Convert restaurant name to the same format used in image filenames"""
+    # Remove special characters and spaces
+    name = re.sub(r'[^\w\s-]', '', name)
+    # Replace spaces with underscores
+    name = re.sub(r'\s+', '_', name)
+    # Convert to lowercase
+    name = name.lower()
+    # Remove multiple underscores
+    name = re.sub(r'_+', '_', name)
+    # Remove leading/trailing underscores
+    name = name.strip('_')
+    return name
+
+def load_restaurant_image_mapping(path):
+    """Load the mapping of restaurant names to local image files"""
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            # Create a mapping of restaurant name to local filename
+            return {row['restaurant_name']: row['filename'] for row in csv.DictReader(f)
+                    if row['download_status'] == 'downloaded' and row['restaurant_name'] and row['filename']}
+    except (FileNotFoundError, Exception) as e:
+        print(f"Warning: Could not load restaurant image mapping: {e}")
+        return {}
+
+def list_files(folder):
+    try:
+        return sorted(os.listdir(folder))
+    except OSError:
+        return []
+
+def path_signature(path):
+    try:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return None
+
+
+class ImageManifest:
+    """
+    Snapshot of the card image folders plus the downloaded-photo mapping.
+
+    resolve() returns the static path ('images/restaurant_cards/x.webp') and the kind of
+    match for a restaurant, in the same priority order the per-card filesystem lookup used:
+    mapping (exact, then case-insensitive), sanitized name + extension, a card file whose name
+    contains the restaurant name, then a street-named webp. Results are memoised per
+    restaurant, so each name is worked out once per manifest.
+    """
+
+    def __init__(self, static_dir, mapping):
+        self.mapping = dict(mapping)
+        # Case-insensitive mapping index; the first mapping entry wins, as the old linear scan did
+        self.normalized = {}
+        for name, filename in self.mapping.items():
+            self.normalized.setdefault(str(name).lower().strip(), filename)
+
+        self.card_files = [f for f in list_files(os.path.join(static_dir, CARDS_FOLDER))
+                           if f.lower().endswith(IMAGE_EXTENSIONS)]
+        # Sanitized stem -> filename, honouring the extension preference order
+        self.sanitized = {}
+        for ext in IMAGE_EXTENSIONS:
+            for filename in self.card_files:
+                if filename.endswith(ext):
+                    self.sanitized.setdefault(filename[:-len(ext)], filename)
+        self.card_files_lower = [(f.lower(), f) for f in self.card_files]
+
+        self.street_webp = {f for f in list_files(os.path.join(static_dir, STREET_WEBP_FOLDER)) if f.endswith('.webp')}
+        self._resolved = {}
+        self.version = 0  # set by ImageManifestStore; rendered-page caches key on it
+
+    def __len__(self):
+        return len(self.card_files) + len(self.street_webp)
+
+    def resolve(self, restaurant_name, street=None):
+        """(static path or None, 'card' | 'street' | None) for a restaurant."""
+        key = (restaurant_name, street)
+        found = self._resolved.get(key)
+        if found is None:
+            found = self._resolved[key] = self._find(restaurant_name, street)
+        return found
+
+    def _find(self, restaurant_name, street):
+        if restaurant_name:
+            filename = self.mapping.get(restaurant_name) or self.normalized.get(restaurant_name.lower().strip())
+            if filename:
+                return f'{CARDS_FOLDER}/{filename}', 'card'
+
+            filename = self.sanitized.get(sanitize_filename_for_lookup(restaurant_name))
+            if filename:
+                return f'{CARDS_FOLDER}/{filename}', 'card'
+
+            # Any card file containing the name (for variations)
+            name_lower = restaurant_name.lower().replace(' ', '_').replace('-', '_')
+            if len(name_lower) > 3:
+                for filename_lower, filename in self.card_files_lower:
+                    if name_lower in filename_lower:
+                        return f'{CARDS_FOLDER}/{filename}', 'card'
+
+        if street:
+            filename = sanitize_filename_for_lookup(street) + '.webp'
+            if filename in self.street_webp:
+                return f'{STREET_WEBP_FOLDER}/{filename}', 'street'
+
+        return None, None
+
+    def precompute(self, names):
+        """Resolve a batch of restaurant names up front (e.g. the whole catalog at load)."""
+        for name in names:
+            if isinstance(name, str):
+                self.resolve(name)
+
+
+class ImageManifestStore:
+    """
+    Holds the current manifest and rebuilds it when an image folder or the mapping file
+    changes. Folder signatures are checked at most every `check_interval` seconds, so the
+    request path normally does no filesystem work at all.
+    """
+
+    def __init__(self, static_dir, mapping_path, check_interval=30):
+        self.static_dir = static_dir
+        self.mapping_path = mapping_path
+        self.check_interval = check_interval
+        self._manifest = None
+        self._signature = None
+        self._builds = 0
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            # The lock may be held by another thread of the preloading master at fork time
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def signature(self):
+        """Modification signatures of the image folders and the mapping file."""
+        return (path_signature(os.path.join(self.static_dir, CARDS_FOLDER)),
+                path_signature(os.path.join(self.static_dir, STREET_WEBP_FOLDER)),
+                path_signature(self.mapping_path))
+
+    def get(self):
+        manifest = self._manifest
+        if manifest is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return manifest
+        with self._lock:
+            if self._manifest is None or time.monotonic() - self._checked_at >= self.check_interval:
+                signature = self.signature()
+                if self._manifest is None or signature != self._signature:
+                    self._builds += 1
+                    manifest = ImageManifest(self.static_dir, load_restaurant_image_mapping(self.mapping_path))
+                    manifest.version = self._builds
+                    self._manifest = manifest
+                    self._signature = signature
+                self._checked_at = time.monotonic()
+            return self._manifest
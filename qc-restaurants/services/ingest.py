@@ -0,0 +1,320 @@
+"""
+Master List Ingestion
+Turns the raw Outscraper export into the processed frame the site renders from.
+
+Everything here works on whole columns: string cleanup goes through the pandas .str
+accessors, and the JSON columns (working_hours, about) are parsed once per distinct
+value and broadcast back with NumPy take, since most rows share the same few strings.
+Parsed dicts and lists are shared between rows with identical source text, so treat
+them as read-only.
+"""
+
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from services.counts import ranked_counts
+from services.fields import DEFAULT_PHOTO_URL, format_phone_number
+from services.hours import get_current_day, parse_working_hours
+
+
+def extract_price_range(about):
+    if pd.isna(about):
+        return '1'  # Default to budget-friendly for fast food
+    try:
+        # Parse the JSON
+        about_dict = json.loads(about) if isinstance(about, str) else about
+
+        # Check if it's a fast food restaurant
+        category = about_dict.get('category', '').lower()
+        if 'fast food' in category or 'fastfood' in category:
+            return '1'  # Fast food is typically budget-friendly
+
+        # Look for price level in the JSON
+        price_info = about_dict.get('Price', {})
+        if isinstance(price_info, dict):
+            # Count how many price options are true
+            price_level = sum(1 for key, value in price_info.items() if value and '₱' in key)
+            return str(price_level) if price_level > 0 else '1'
+        return '1'
+    except:
+        # If JSON parsing fails, try the old method
+        about_str = str(about).lower()
+        if 'fast food' in about_str or 'fastfood' in about_str:
+            return '1'
+        count = about_str.count('₱')
+        return str(count) if count > 0 else '1'
+
+def parse_about(about):
+    if pd.isna(about):
+        return {}
+    try:
+        # Try parsing as JSON first
+        if isinstance(about, str):
+            return json.loads(about)
+        return about
+    except:
+        return {}
+
+def extract_about_info(about):
+    """Accessibility, kids, service, Wi-Fi and high chair flags from a parsed about dict"""
+    if not about:
+        return False, False, [], False, False
+    try:
+        # Extract accessibility information
+        accessibility = about.get('Accessibility', {})
+        wheelchair_accessible = (
+            accessibility.get('Wheelchair accessible entrance', False) and
+            accessibility.get('Wheelchair accessible seating', False)
+        )
+
+        # Extract children information
+        children = about.get('Children', {})
+        good_for_kids = children.get('Good for kids', False)
+        has_high_chairs = children.get('High chairs', False)
+
+        # Extract service options
+        service_options = about.get('Service options', {})
+        features = []
+        # Check all delivery-related options
+        if service_options.get('Delivery', False) or service_options.get('No-contact delivery', False):
+            features.append('Delivery')
+        if service_options.get('Takeout', False):
+            features.append('Takeout')
+        if service_options.get('Dine-in', False) or service_options.get('Onsite services', False):
+            features.append('Dine-in')
+
+        # Extract amenities
+        amenities = about.get('Amenities', {})
+        has_wifi = amenities.get('Wi-Fi', False)
+
+        return wheelchair_accessible, good_for_kids, features, has_wifi, has_high_chairs
+    except:
+        return False, False, [], False, False
+
+def object_array(items):
+    """1-D object ndarray of items (lists stay elements instead of becoming a 2-D array)"""
+    items = list(items)
+    values = np.empty(len(items), dtype=object)
+    for position, item in enumerate(items):
+        values[position] = item
+    return values
+
+def parse_distinct(series, parse, missing):
+    """
+    Parse each distinct value of series once.
+
+    Returns (codes, parsed) such that parsed[codes] lines up with series; missing values
+    use the last slot, which holds `missing`.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    parsed = object_array([parse(value) for value in uniques] + [missing])
+    return codes, parsed
+
+def transform_distinct(series, transform):
+    """
+    Run a column transform over the distinct values of series only and broadcast it back.
+
+    Keeps the string work proportional to the number of distinct values (a few dozen
+    cuisine types, price ranges or shared phone lines) instead of the number of rows.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    distinct = pd.Series(list(uniques) + [np.nan], dtype=object)
+    transformed = transform(distinct).to_numpy(dtype=object)
+    return pd.Series(transformed[codes], index=series.index, dtype=object)
+
+def as_column(values, index):
+    """Wrap an object array as a Series with the dtype a per-row apply would have inferred"""
+    return pd.Series(values, index=index, dtype=object).infer_objects()
+
+def format_phone_numbers(phones):
+    """format_phone_number over a whole column"""
+    result = pd.Series(None, index=phones.index, dtype=object)
+    # Falsy values (NaN, '', 0) have no phone number
+    present = phones.notna() & phones.astype(bool)
+    if not present.any():
+        return result
+    phone_str = phones[present].astype(str).str.strip()
+    digits = phone_str.str.replace(r'\D', '', regex=True)
+    lengths = digits.str.len()
+    formatted = phone_str.copy()
+    mobile = lengths == 12
+    formatted[mobile] = '0' + digits[mobile].str[2:5] + ' ' + digits[mobile].str[5:8] + ' ' + digits[mobile].str[8:]
+    landline = lengths == 11
+    formatted[landline] = '(02) ' + digits[landline].str[3:7] + ' ' + digits[landline].str[7:]
+    result[present] = formatted
+    return result
+
+def clean_fields(values):
+    """Blank, 'nan' and 'None' values become None, everything else is stripped text"""
+    result = pd.Series(None, index=values.index, dtype=object)
+    text = values.astype(str)
+    stripped = text.str.strip()
+    keep = values.notna() & (text != 'nan') & (text != 'None') & (stripped != '')
+    result[keep] = stripped[keep]
+    return result
+
+def extract_main_cuisines(types):
+    """Cuisine name from the type column, with the word "Restaurant" dropped (None when nothing is left to show)"""
+    result = pd.Series(None, index=types.index, dtype=object)
+    present = types.notna() & types.astype(bool)
+    text = types[present].astype(str).str.strip()
+    present_text = text != ''
+    cuisine = text[present_text].str.replace(' Restaurant', '', regex=False).str.strip()
+    cuisine = cuisine.str.replace('Restaurant', '', regex=False).str.strip()
+    # Skip if it's just "Restaurant"
+    cuisine = cuisine[cuisine.str.lower() != 'restaurant']
+    result[cuisine.index] = cuisine
+    return result
+
+def process_photo_urls(photos, photo_version):
+    """Display URL for each photo: default image, Google Photos handling and cache-busting version"""
+    result = pd.Series(DEFAULT_PHOTO_URL, index=photos.index, dtype=object)
+    present = photos.notna() & photos.astype(bool)
+    url = photos[present].astype(str)
+    url = url[(url != 'nan') & (url != 'None')]
+
+    # Google Photos share links can't be embedded
+    google_photos = url.str.contains('photos.google.com', regex=False) | url.str.contains('photos.app.goo.gl', regex=False)
+    local = url.str.startswith('/static/images/')
+    # lh3 gps-cs-s URLs work in browsers as-is
+    direct = url.str.contains('lh3.googleusercontent.com', regex=False) & url.str.contains('gps-cs-s', regex=False)
+    versioned = url.str.startswith('http') & ~local & ~google_photos & ~direct
+
+    processed = url.copy()
+    processed[google_photos & ~local] = DEFAULT_PHOTO_URL
+    separator = np.where(url[versioned].str.contains('?', regex=False), '&', '?')
+    processed[versioned] = url[versioned] + separator + f"v={photo_version}"
+    result[processed.index] = processed
+    return result
+
+def count_prices(ranges):
+    """Peso-sign count of the range column, '1' where missing (mixed int/str, as the templates expect)"""
+    counts = ranges.astype(str).str.count('₱').to_numpy(dtype=object)
+    counts[ranges.isna().to_numpy()] = '1'
+    return as_column(counts, ranges.index)
+
+def process_dataframe(df, photo_version=None):
+    """
+    Derive the display columns from the raw master list.
+
+    Returns (df, all_cuisines, area_counts) with df sorted by score (rating x reviews).
+    Open/closed status is not stored - it goes stale; ask the catalog's compiled hours instead.
+    """
+    n = len(df)
+    if photo_version is None:
+        photo_version = int(datetime.now().timestamp())
+
+    # Convert reviews to integer - handle missing reviews column gracefully
+    if 'reviews' in df.columns:
+        df['reviews'] = df['reviews'].fillna(0).astype(int)
+    else:
+        df['reviews'] = [0 for _ in range(n)]
+
+    # Handle phone and site columns gracefully
+    if '+63' in df.columns:
+        df['phone'] = transform_distinct(df['+63'], format_phone_numbers)
+    elif 'phone' in df.columns:
+        df['phone'] = transform_distinct(df['phone'], format_phone_numbers)
+    else:
+        df['phone'] = [None for _ in range(n)]
+
+    if 'site' in df.columns:
+        df['site'] = transform_distinct(df['site'], clean_fields)
+    else:
+        df['site'] = [None for _ in range(n)]
+
+    # Process type column for cuisines - handle missing type column gracefully
+    if 'type' in df.columns:
+        df['cuisine'] = transform_distinct(df['type'], extract_main_cuisines)
+    else:
+        # Create default cuisine if type column doesn't exist
+        df['cuisine'] = ['Restaurant' for _ in range(n)]
+
+    # Process working hours - handle missing working_hours column gracefully
+    current_day = get_current_day()
+    if 'working_hours' in df.columns:
+        codes, hours_dicts = parse_distinct(df['working_hours'], parse_working_hours, {})
+        df['working_hours_dict'] = hours_dicts[codes]
+        df['current_day'] = current_day
+        df['hours'] = df['working_hours_dict']
+    else:
+        # Create empty working hours data if column doesn't exist
+        df['working_hours_dict'] = [{} for _ in range(n)]
+        df['current_day'] = current_day
+        df['hours'] = [{} for _ in range(n)]
+
+    # Process photos after cuisine is extracted - handle missing photo column gracefully
+    if 'photo' in df.columns:
+        df['photo_url'] = process_photo_urls(df['photo'], photo_version)
+    else:
+        df['photo_url'] = [DEFAULT_PHOTO_URL for _ in range(n)]
+
+    # Process about data - handle missing about column gracefully
+    if 'about' in df.columns:
+        about_codes, parsed = parse_distinct(df['about'], parse_about, {})
+        df['about'] = parsed[about_codes]
+    else:
+        # Create empty about data if column doesn't exist
+        about_codes = np.zeros(n, dtype=np.intp)
+        parsed = object_array([{}])
+        df['about'] = [{} for _ in range(n)]
+
+    # Extract service options, highlights, and accessibility from about field (once per distinct about)
+    about_info = [extract_about_info(about) for about in parsed]
+    for position, column in enumerate(['wheelchair_accessible', 'good_for_kids', 'features', 'has_wifi', 'has_high_chairs']):
+        values = object_array(info[position] for info in about_info)
+        df[column] = as_column(values[about_codes], df.index)
+
+    # Add empty lists for features and highlights since they're still referenced in the template
+    df['highlights'] = [[] for _ in range(n)]
+
+    # Convert latitude and longitude to float - handle missing columns gracefully
+    if 'latitude' in df.columns:
+        df['latitude'] = pd.to_numeric(df['latitude'], errors='coerce')
+    else:
+        df['latitude'] = [None for _ in range(n)]
+
+    if 'longitude' in df.columns:
+        df['longitude'] = pd.to_numeric(df['longitude'], errors='coerce')
+    else:
+        df['longitude'] = [None for _ in range(n)]
+
+    # Process price range - prioritize 'range' column if available, fallback to 'about'
+    if 'range' in df.columns:
+        df['price'] = transform_distinct(df['range'], count_prices).infer_objects()
+    else:
+        prices = object_array(extract_price_range(about) for about in parsed)
+        df['price'] = as_column(prices[about_codes], df.index)
+
+    # Process top pick status from 'top pick' column if it exists
+    if 'top pick' in df.columns:
+        df['top_pick'] = df['top pick'].fillna(False).astype(bool)
+    elif 'top_pick' in df.columns:
+        df['top_pick'] = df['top_pick'].fillna(False).astype(bool)
+    else:
+        df['top_pick'] = False
+
+    # Calculate score and sort - handle missing rating column gracefully
+    if 'rating' in df.columns:
+        df['score'] = df['rating'] * df['reviews']
+    else:
+        df['score'] = [0 for _ in range(n)]
+    df = df.sort_values('score', ascending=False, ignore_index=True)
+
+    # Unique cuisine types for the filter (only those that have at least one restaurant)
+    cuisine_column = 'type' if 'type' in df.columns else 'cuisine'
+    cuisines = df[cuisine_column].dropna().astype(str).str.strip()
+    cuisines = cuisines[cuisines.str.lower() != 'restaurant']
+    all_cuisines = sorted(cuisines.unique())
+
+    # Get area counts from SEO Area column, sorted by restaurant count (highest first)
+    if 'SEO Area' in df.columns:
+        area_counts = {area: count for area, count in ranked_counts(df['SEO Area']).items() if area}
+    else:
+        # Fallback: create default area counts if SEO Area column doesn't exist
+        area_counts = {'Quezon City': len(df)}
+
+    return df, all_cuisines, area_counts
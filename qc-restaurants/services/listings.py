@@ -0,0 +1,139 @@
+"""
+Listing Views
+The ordered row lists behind the home, all-restaurants, cuisine, neighbourhood and best-of
+pages, materialized once per catalog. Every cuisine, area and cuisine-in-area list is a
+range of one packed int32 array, already without permanently closed restaurants and in
+the order its page shows, so a page of results is a slice. The popular areas, service
+options and similar cuisines those pages show are worked out here too.
+"""
+
+import numpy as np
+
+from services.slugs import cuisine_slug
+
+# /best-of/<category> pages; any other category lists every restaurant
+BEST_OF_CATEGORIES = ('top-rated', 'budget', 'romantic', 'family', 'senior', 'coffee')
+ROMANTIC_WORDS = ('romantic', 'date', 'cozy', 'intimate')
+TOP_RATED = 4.0
+POPULAR_AREAS = 4
+SIMILAR_CUISINES = 3
+
+
+def by_rating(rows, ratings):
+    """Rows best-rated first, unrated last, ties in row order."""
+    return rows[np.lexsort([rows, -np.nan_to_num(ratings[rows], nan=-np.inf)])]
+
+def group_rows(keys, rows):
+    """
+    (rows grouped by key, {key: (start, end)}) for rows whose key is not None. Keys keep the
+    order they first appear in and rows keep their order within a key.
+    """
+    groups = {}
+    for row in rows.tolist():
+        key = keys[row]
+        if key is not None:
+            groups.setdefault(key, []).append(row)
+    ranges, start = {}, 0
+    for key, members in groups.items():
+        ranges[key] = (start, start + len(members))
+        start += len(members)
+    packed = np.fromiter((row for members in groups.values() for row in members), dtype=np.int32, count=start)
+    return packed, ranges
+
+def similar_cuisines(cuisine_name, all_cuisines, limit=SIMILAR_CUISINES):
+    """Cuisines sharing a word with cuisine_name (either way round, as substrings), in all_cuisines order."""
+    name = cuisine_name.lower()
+    words = name.split()
+    similar = []
+    for other in all_cuisines:
+        if other == cuisine_name or not isinstance(other, str):
+            continue
+        lowered = other.lower()
+        if any(word in lowered for word in words) or any(word in name for word in lowered.split()):
+            similar.append(other)
+            if len(similar) == limit:
+                break
+    return tuple(similar)
+
+
+class ListingViews:
+    """
+    Precomputed page lists for one catalog snapshot, as row positions of the catalog frame.
+    Treat the arrays as read-only.
+    """
+
+    def __init__(self, df, facets, counts, active_mask, all_cuisines, service_options):
+        size = len(df)
+        positions = np.arange(size)
+        active = np.flatnonzero(active_mask)
+        ratings = df['rating'].to_numpy(dtype=np.float64, na_value=np.nan) if 'rating' in df.columns else np.full(size, np.nan)
+        reviews = df['reviews'].to_numpy(dtype=np.float64, na_value=np.nan) if 'reviews' in df.columns else np.zeros(size)
+
+        # All restaurants: rating, then reviews, high to low
+        self.ranked = active[np.lexsort([active, -np.nan_to_num(reviews[active], nan=-np.inf),
+                                         -np.nan_to_num(ratings[active], nan=-np.inf)])].astype(np.int32)
+        self.by_rating = by_rating(positions, ratings).astype(np.int32)
+        top_picks = (df['top_pick'] == True).to_numpy(dtype=bool) if 'top_pick' in df.columns else np.zeros(size, dtype=bool)
+        self.top_picks = np.flatnonzero(top_picks & active_mask).astype(np.int32)
+
+        # Cuisine pages list every type with the same slug, in frame order
+        column = 'type' if 'type' in df.columns else 'cuisine'
+        types = df[column].to_numpy(dtype=object) if column in df.columns else np.full(size, None, dtype=object)
+        slugs = [cuisine_slug(value) if isinstance(value, str) else None for value in types]
+        areas = df['SEO Area'].to_numpy(dtype=object) if 'SEO Area' in df.columns else np.full(size, None, dtype=object)
+        areas = [area if isinstance(area, str) else None for area in areas]
+        self.cuisine_rows, self.cuisines = group_rows(slugs, active)
+        self.pair_rows, self.pairs = group_rows(
+            [(slug, area) if slug is not None and area is not None else None for slug, area in zip(slugs, areas)], active)
+        # Neighbourhood pages are sorted by rating
+        self.area_rows, self.areas = group_rows(areas, by_rating(active, ratings))
+
+        # Sidebars: the most common areas of each cuisine (from the facet counts), and the service
+        # options its restaurants offer
+        slug_types = {}
+        for name in counts.types:
+            if isinstance(name, str):
+                slug_types.setdefault(cuisine_slug(name), []).append(name)
+        self.popular_areas = {}
+        for slug in self.cuisines:
+            totals = [(area, count) for area, count in counts.cuisine_areas(slug_types[slug]).items() if area]
+            self.popular_areas[slug] = tuple(totals[:POPULAR_AREAS])
+        self.features = {}
+        for slug, (start, end) in self.cuisines.items():
+            self.features[slug] = tuple(sorted({option for row in self.cuisine_rows[start:end].tolist()
+                                                for option in service_options[row]}))
+        for pair, (start, end) in self.pairs.items():
+            self.features[pair] = tuple(sorted({option for row in self.pair_rows[start:end].tolist()
+                                                for option in service_options[row]}))
+        self.similar_cuisines = {slug: similar_cuisines(slug.replace('-', ' ').title(), all_cuisines)
+                                 for slug in self.cuisines}
+
+        # Best-of categories, in frame order (closed restaurants included, as those pages always have)
+        abouts = df['about'].to_numpy(dtype=object) if 'about' in df.columns else np.full(size, None, dtype=object)
+        romantic = np.array([isinstance(about, str) and any(word in about.lower() for word in ROMANTIC_WORDS)
+                             for about in abouts], dtype=bool)
+        masks = {
+            'top-rated': np.nan_to_num(ratings, nan=-np.inf) >= TOP_RATED,
+            'budget': facets.price_at_most('budget'),
+            'romantic': romantic,
+            'family': facets.amenities['kids'],
+            'senior': facets.amenities['wheelchair'],
+            'coffee': facets.cuisines['coffee'],
+        }
+        self.best_of = {category: np.flatnonzero(masks[category]).astype(np.int32) for category in BEST_OF_CATEGORIES}
+        self.size = size
+
+    def cuisine(self, slug, area=None):
+        """Rows of a cuisine slug (optionally in one area), frame order; empty when there are none."""
+        start, end = self.pairs.get((slug, area), (0, 0)) if area is not None else self.cuisines.get(slug, (0, 0))
+        return (self.pair_rows if area is not None else self.cuisine_rows)[start:end]
+
+    def area(self, name):
+        """Rows of an SEO Area, best rated first."""
+        start, end = self.areas.get(name, (0, 0))
+        return self.area_rows[start:end]
+
+    def best(self, category):
+        """Rows of a best-of category; every row for an unknown one."""
+        rows = self.best_of.get(category)
+        return rows if rows is not None else np.arange(self.size, dtype=np.int32)
@@ -0,0 +1,172 @@
+"""
+Page Cache
+Rendered pages kept in memory per worker, keyed by the host, the endpoint, its URL arguments
+and its normalized query arguments, so a repeat visit skips the filtering and the template
+render. The key leaves out the dataset version: pages outlive a new master list unless it
+changed something they show.
+The cache is an LRU bounded by the bytes of the bodies it holds. Each page carries a strong
+ETag (a digest of its body) so revisits can be answered with 304 Not Modified.
+
+Pages with live open/closed badges are stored with an expiry: the next time one of the
+restaurants shown opens or closes. Pages that depend on anything else that changes (the
+clock, the visitor) are not stored at all.
+
+Each page also keeps the dependency keys it read (services/dependencies.py). When a new
+master list is swapped in, use_generation() drops only the pages whose keys it changed; new
+card images drop every page.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Query parameters no page reads (campaign tags); they would only split the cache
+TRACKING_ARGS = ('fbclid', 'gclid', 'msclkid')
+LATENCY_SAMPLES = 2000
+OUTCOMES = ('hit', 'miss', 'bypass')
+
+
+def normalize_args(args):
+    """Sorted (name, values) pairs of a request's query MultiDict, tracking parameters left out."""
+    return tuple(sorted((name, tuple(values)) for name, values in args.lists()
+                        if not name.startswith('utm_') and name not in TRACKING_ARGS))
+
+def strong_etag(body):
+    """Digest of the exact response bytes, so equal ETags mean byte-identical bodies."""
+    return hashlib.sha1(body).hexdigest()
+
+def percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(int(fraction * len(ordered)), len(ordered) - 1)], 2)
+
+
+class CachedPage:
+    __slots__ = ('body', 'etag', 'mimetype', 'expires', 'reads')
+
+    def __init__(self, body, mimetype, expires=None, reads=None):
+        self.body = body
+        self.etag = strong_etag(body)
+        self.mimetype = mimetype
+        self.expires = expires  # epoch seconds, or None to keep it until the data it read changes
+        self.reads = reads  # dependency keys, or None for the whole dataset
+
+    def __len__(self):
+        return len(self.body)
+
+
+class PageCache:
+    """
+    LRU of CachedPage by key, holding at most max_bytes of bodies. Also counts hits, misses
+    and bypasses (responses that were not cacheable) per endpoint, with recent latencies.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.pages = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+        self.expired = 0
+        self.invalidated = 0
+        self.not_modified = 0
+        self.generation = None
+        self.endpoints = {}
+        self.latencies = {outcome: deque(maxlen=LATENCY_SAMPLES) for outcome in OUTCOMES}
+        self._lock = threading.Lock()
+
+    def use_generation(self, generation, changes=None):
+        """
+        Move on to the data pages are built from, (dataset version, image version). `changes` is
+        the new catalog's (previous dataset version, DatasetChanges): coming from that version
+        with the same images, only the pages it touches are dropped; otherwise every page is.
+        """
+        if generation != self.generation:
+            with self._lock:
+                if generation != self.generation:
+                    previous = self.generation
+                    if (changes is not None and previous is not None and previous[0] == changes[0]
+                            and previous[1] == generation[1]):
+                        for key in [key for key, page in self.pages.items() if changes[1].touches(page.reads)]:
+                            self._drop(key)
+                            self.invalidated += 1
+                    else:
+                        self.pages.clear()
+                        self.bytes = 0
+                    self.generation = generation
+
+    def get(self, key, now=None):
+        """The cached page for key, or None; expired pages are dropped."""
+        with self._lock:
+            page = self.pages.get(key)
+            if page is None:
+                return None
+            if page.expires is not None and (now if now is not None else time.time()) >= page.expires:
+                self._drop(key)
+                self.expired += 1
+                return None
+            self.pages.move_to_end(key)
+            return page
+
+    def put(self, key, page, generation=None):
+        """
+        Store a page, evicting the least recently used ones to stay within max_bytes. A page
+        rendered for another generation than the current one is not stored.
+        """
+        if len(page) > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self.pages:
+                self._drop(key)
+            self.pages[key] = page
+            self.bytes += len(page)
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self.pages)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        self.bytes -= len(self.pages.pop(key))
+
+    def clear(self):
+        with self._lock:
+            self.pages.clear()
+            self.bytes = 0
+
+    def record(self, endpoint, outcome, seconds, not_modified=False):
+        """Count one response: 'hit', 'miss' or 'bypass', how long it took, and whether it was a 304."""
+        with self._lock:
+            counts = self.endpoints.setdefault(endpoint, dict.fromkeys(OUTCOMES, 0))
+            counts[outcome] += 1
+            self.latencies[outcome].append(seconds)
+            self.not_modified += not_modified
+
+    def stats(self):
+        """Hit rate, size and latency figures for the admin dashboard."""
+        with self._lock:
+            totals = {outcome: sum(counts[outcome] for counts in self.endpoints.values()) for outcome in OUTCOMES}
+            looked_up = totals['hit'] + totals['miss']
+            latency = {}
+            for outcome in OUTCOMES:
+                samples = [seconds * 1000 for seconds in self.latencies[outcome]]
+                latency[outcome] = {'p50_ms': percentile(samples, 0.5), 'p95_ms': percentile(samples, 0.95)}
+            endpoints = sorted(((endpoint, counts) for endpoint, counts in self.endpoints.items()),
+                               key=lambda item: sum(item[1].values()), reverse=True)
+            return {
+                **totals,
+                'hit_rate': round(100 * totals['hit'] / looked_up, 1) if looked_up else 0,
+                'not_modified': self.not_modified,
+                'pages': len(self.pages),
+                'megabytes': round(self.bytes / 1e6, 1),
+                'max_megabytes': round(self.max_bytes / 1e6, 1),
+                'evictions': self.evictions,
+                'expired': self.expired,
+                'invalidated': self.invalidated,
+                'latency': latency,
+                'endpoints': [{'endpoint': endpoint, **counts,
+                               'hit_rate': round(100 * counts['hit'] / (counts['hit'] + counts['miss']), 1)
+                               if counts['hit'] + counts['miss'] else 0}
+                              for endpoint, counts in endpoints],
+            }
@@ -0,0 +1,81 @@
+"""
+Perfect Spot Quiz
+Answers for /api/quiz/perfect-spot, computed once per catalog. The quiz has a few hundred
+distinct answer combinations, so each is evaluated up front against the facet bitmaps
+and the endpoint only looks its answer up.
+
+A restaurant's match score is the share of the asked-for facets it has (cuisine group,
+area group, budget, a senior need, a family vibe). Restaurants matching more facets come
+first, then higher rated ones, so a quiz with no perfect match still gets its closest spots.
+"""
+
+import itertools
+
+import numpy as np
+
+from services.facets import AREA_GROUPS, CUISINE_GROUPS, PRICE_TIERS
+
+QUIZ_RESULTS = 3
+# Answers that map to a facet; anything else (a 'quiet' senior need, a 'casual' vibe) asks for nothing
+SENIOR_AMENITIES = ('wheelchair', 'parking')
+VIBE_AMENITIES = {'family': 'kids'}
+
+
+def quiz_key(vibe=None, cuisine=None, budget=None, area=None, senior=None):
+    """The table key for a submission: the facets it asks for, None where an answer asks for none."""
+    area = area.lower() if isinstance(area, str) else None
+    return (
+        cuisine if cuisine in CUISINE_GROUPS else None,
+        budget if budget in PRICE_TIERS else None,
+        area if area in AREA_GROUPS else None,
+        senior if senior in SENIOR_AMENITIES else None,
+        VIBE_AMENITIES.get(vibe),
+    )
+
+
+class QuizTable:
+    """
+    results[key] holds the QUIZ_RESULTS best rows for every quiz_key(), padded with -1, and
+    scores[key] their match percentages. Only restaurants still open for business are picked.
+    """
+
+    def __init__(self, facets, ratings, active_mask):
+        ratings = np.asarray(ratings, dtype=np.float64)
+        # Candidates best-rated first, unrated last, ties in row order (the listing pages' order)
+        candidates = np.flatnonzero(active_mask)
+        candidates = candidates[np.lexsort([candidates, -np.nan_to_num(ratings[candidates], nan=-np.inf)])]
+        cuisines = {name: mask[candidates] for name, mask in facets.cuisines.items()}
+        areas = {name: mask[candidates] for name, mask in facets.areas.items()}
+        budgets = {name: facets.price_at_most(name)[candidates] for name in PRICE_TIERS}
+        amenities = {name: facets.amenities[name][candidates] for name in set(SENIOR_AMENITIES) | set(VIBE_AMENITIES.values())}
+
+        keys = list(itertools.product(
+            [None, *CUISINE_GROUPS], [None, *PRICE_TIERS], [None, *AREA_GROUPS],
+            [None, *SENIOR_AMENITIES], [None, *VIBE_AMENITIES.values()]))
+        self.keys = {key: row for row, key in enumerate(keys)}
+        self.results = np.full((len(keys), QUIZ_RESULTS), -1, dtype=np.int32)
+        self.scores = np.zeros((len(keys), QUIZ_RESULTS), dtype=np.uint8)
+        for row, (cuisine, budget, area, senior, vibe) in enumerate(keys):
+            masks = [masks[name] for masks, name in ((cuisines, cuisine), (budgets, budget), (areas, area),
+                                                    (amenities, senior), (amenities, vibe)) if name is not None]
+            if not masks:
+                picked = candidates[:QUIZ_RESULTS]
+                self.results[row, :len(picked)] = picked
+                self.scores[row, :len(picked)] = 100
+                continue
+            matched = np.sum(masks, axis=0, dtype=np.int8)
+            filled = 0
+            # Most facets matched first; within a level the candidates are already in rating order
+            for level in range(len(masks), 0, -1):
+                hits = np.flatnonzero(matched == level)[:QUIZ_RESULTS - filled]
+                self.results[row, filled:filled + len(hits)] = candidates[hits]
+                self.scores[row, filled:filled + len(hits)] = round(100 * level / len(masks))
+                filled += len(hits)
+                if filled == QUIZ_RESULTS:
+                    break
+
+    def answer(self, vibe=None, cuisine=None, budget=None, area=None, senior=None):
+        """(positions, match percentages) of the best spots for a quiz submission."""
+        row = self.keys[quiz_key(vibe, cuisine, budget, area, senior)]
+        found = self.results[row] >= 0
+        return self.results[row][found], self.scores[row][found]
@@ -0,0 +1,66 @@
+"""
+Master List Schema
+The columns of the Outscraper export the site actually reads, and the dtypes they are
+loaded with. Everything else in the export (email validators, phone carriers, review
+histograms, popular times...) is skipped at parse time, so no worker ever holds it.
+
+Add a column here before reading it anywhere in the app - anything undeclared is not
+loaded.
+"""
+
+import pandas as pd
+
+# Column -> dtype for pd.read_csv. None keeps pandas' default inference (text is object).
+# Low-cardinality text is categorical; reviews has blanks, so it stays float32 until
+# process_dataframe fills them and casts to int.
+MASTER_LIST_SCHEMA = {
+    # Identity and display
+    'name': None,
+    'name_for_emails': None,
+    'place_id': None,
+    'id': None,
+    'street': None,
+    'address': None,
+    'full_address': None,
+    'city': None,
+    'state': None,
+    'country': None,
+    'site': None,
+    '+63': None,
+    'phone': None,
+    'photo': None,
+    'photos_count': None,
+    'reviews_link': None,
+    # Classification
+    'type': 'category',
+    'subtypes': None,
+    'reviews_tags': None,
+    'category': 'category',
+    'SEO Area': 'category',
+    'area_service': None,
+    'business_status': 'category',
+    'verified': None,
+    # Ratings and location
+    'rating': 'float64',
+    'reviews': 'float32',
+    'latitude': 'float32',
+    'longitude': 'float32',
+    # JSON and pricing
+    'working_hours': None,
+    'about': None,
+    'range': 'category',
+    'prices': None,
+    # Editorial
+    'top pick': None,
+    'top_pick': None,
+    'jacky_pick': None,
+    'why_visit': None,
+    'vibe_tags': None,
+    'dishes': None,
+}
+
+
+def read_master_list(source):
+    """Read the master list CSV with only the declared columns, in their declared dtypes."""
+    dtypes = {column: dtype for column, dtype in MASTER_LIST_SCHEMA.items() if dtype is not None}
+    return pd.read_csv(source, usecols=lambda column: column in MASTER_LIST_SCHEMA, dtype=dtypes)
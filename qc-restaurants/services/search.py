@@ -0,0 +1,197 @@
+"""
+Search Index
+Full-text index for /search, built once per catalog: an inverted index over the name, type,
+area, street and review-tag text of every restaurant, ranked with BM25, plus a trigram
+index over the vocabulary so a misspelt word ("samgyupsal") still finds the restaurants
+using the right one ("samgyeopsal").
+
+Everything is kept in flat NumPy arrays (sorted UTF-8 terms, CSR posting lists), so the
+index is memory-mapped from the catalog snapshot like the rest of the catalog.
+"""
+
+import math
+import re
+import unicodedata
+
+import numpy as np
+
+# Field -> weight: a word in the name counts three times a word in the street
+SEARCH_FIELDS = {
+    'name': 3,
+    'name_for_emails': 1,
+    'type': 2,
+    'subtypes': 1,
+    'SEO Area': 2,
+    'street': 1,
+    'reviews_tags': 1,
+}
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+# Typo tolerance: a query word missing from the vocabulary is replaced by up to this many
+# vocabulary words sharing at least this fraction of their trigrams (Jaccard)
+FUZZY_EXPANSIONS = 3
+FUZZY_SIMILARITY = 0.4
+FUZZY_MIN_LENGTH = 4
+
+WORD = re.compile(r'[^\W_]+')
+
+
+def normalize(text):
+    """Lowercase text without accents, so 'Café' and 'cafe' are the same word."""
+    text = str(text).lower()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+def tokenize(text):
+    return WORD.findall(normalize(text))
+
+def trigrams(word):
+    """The word's distinct trigrams, padded so its first and last letters count too."""
+    padded = f'${word}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def fuzzy_word(word):
+    # Numbers and short words are never typo-corrected
+    return len(word) >= FUZZY_MIN_LENGTH and word.isalpha()
+
+def csr(keys, values, size):
+    """(offsets, values sorted by key) for keys in range(size)."""
+    order = np.argsort(keys, kind='stable')
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=size), out=offsets[1:])
+    return offsets, values[order]
+
+
+class SearchIndex:
+    """
+    BM25 index over SEARCH_FIELDS, aligned with the catalog frame's rows. Built once per
+    catalog snapshot; treat the arrays as read-only.
+    """
+
+    def __init__(self, df):
+        import pandas as pd  # built with the catalog from the processed frame
+        self.size = len(df)
+        vocabulary = {}
+        docs, words, counts = [], [], []
+
+        for field, weight in SEARCH_FIELDS.items():
+            if field not in df.columns:
+                continue
+            # Tokenize each distinct value once, then repeat its words for every row that has it
+            codes, uniques = pd.factorize(df[field])
+            value_words, value_counts, lengths = [], [], np.zeros(len(uniques) + 1, dtype=np.int64)
+            for slot, value in enumerate(uniques):
+                tokens = tokenize(value) if isinstance(value, str) else []
+                distinct = {}
+                for token in tokens:
+                    distinct[token] = distinct.get(token, 0) + 1
+                value_words.extend(vocabulary.setdefault(token, len(vocabulary)) for token in distinct)
+                value_counts.extend(count * weight for count in distinct.values())
+                lengths[slot] = len(distinct)
+            # Missing values (code -1) land on the empty slot at the end
+            codes = np.where(codes < 0, len(uniques), codes)
+            starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+            per_row = lengths[codes]
+            rows = np.repeat(np.arange(self.size), per_row)
+            # Entry index: the row's value start plus 0, 1, ... within the value
+            within = np.arange(per_row.sum()) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+            entries = np.repeat(starts[codes], per_row) + within
+            docs.append(rows)
+            words.append(np.asarray(value_words, dtype=np.int64)[entries])
+            counts.append(np.asarray(value_counts, dtype=np.int64)[entries])
+
+        docs = np.concatenate(docs) if docs else np.zeros(0, dtype=np.int64)
+        words = np.concatenate(words) if words else np.zeros(0, dtype=np.int64)
+        counts = np.concatenate(counts) if counts else np.zeros(0, dtype=np.int64)
+
+        # Vocabulary sorted as UTF-8 bytes, so a word is found with searchsorted
+        terms = sorted(vocabulary, key=lambda term: term.encode('utf-8'))
+        self.terms = np.array([term.encode('utf-8') for term in terms], dtype=bytes) if terms else np.zeros(0, dtype='S1')
+        rank = np.zeros(len(terms), dtype=np.int64)
+        rank[[vocabulary[term] for term in terms]] = np.arange(len(terms))
+        words = rank[words] if len(words) else words
+
+        # One posting per (word, row): the same word in several fields adds up its weighted counts
+        keys, inverse = np.unique(words * max(self.size, 1) + docs, return_inverse=True)
+        frequencies = np.bincount(inverse, weights=counts).astype(np.float32)
+        self.offsets, self.docs = csr(keys // max(self.size, 1), (keys % max(self.size, 1)).astype(np.int32), len(terms))
+        self.frequencies = frequencies  # np.unique sorted the keys, so these are in (word, row) order too
+        self.doc_lengths = np.bincount(docs, weights=counts, minlength=self.size).astype(np.float32)
+        self.average_length = float(self.doc_lengths.mean()) if self.size else 0.0
+
+        # Trigram -> vocabulary words, for the words typo correction may suggest
+        grams = {}
+        gram_terms, gram_ids = [], []
+        self.term_trigrams = np.zeros(len(terms), dtype=np.int16)
+        for term_id, term in enumerate(terms):
+            if not fuzzy_word(term):
+                continue
+            term_grams = trigrams(term)
+            self.term_trigrams[term_id] = len(term_grams)
+            for gram in term_grams:
+                gram_ids.append(grams.setdefault(gram, len(grams)))
+                gram_terms.append(term_id)
+        sorted_grams = sorted(grams, key=lambda gram: gram.encode('utf-8'))
+        self.trigrams = np.array([gram.encode('utf-8') for gram in sorted_grams], dtype=bytes) if grams else np.zeros(0, dtype='S1')
+        gram_rank = np.zeros(len(grams), dtype=np.int64)
+        gram_rank[[grams[gram] for gram in sorted_grams]] = np.arange(len(grams))
+        self.trigram_offsets, self.trigram_terms = csr(gram_rank[np.asarray(gram_ids, dtype=np.int64)],
+                                                       np.asarray(gram_terms, dtype=np.int32), len(grams))
+
+    def lookup(self, keys, key):
+        """Index of key in a sorted bytes array, or None."""
+        encoded = key.encode('utf-8')
+        index = int(np.searchsorted(keys, encoded))
+        if index < len(keys) and keys[index] == encoded:
+            return index
+        return None
+
+    def similar_words(self, word):
+        """[(term id, similarity)] of the vocabulary words closest to a word the index doesn't have."""
+        if not fuzzy_word(word):
+            return []
+        word_grams = trigrams(word)
+        candidates = []
+        for gram in word_grams:
+            index = self.lookup(self.trigrams, gram)
+            if index is not None:
+                candidates.append(self.trigram_terms[self.trigram_offsets[index]:self.trigram_offsets[index + 1]])
+        if not candidates:
+            return []
+        term_ids, shared = np.unique(np.concatenate(candidates), return_counts=True)
+        similarity = shared / (len(word_grams) + self.term_trigrams[term_ids] - shared)
+        best = np.argsort(-similarity, kind='stable')[:FUZZY_EXPANSIONS]
+        return [(int(term_ids[i]), float(similarity[i])) for i in best if similarity[i] >= FUZZY_SIMILARITY]
+
+    def scores(self, query):
+        """BM25 score of every row for the query (0 where no query word matches)."""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for word in dict.fromkeys(tokenize(query)):
+            term_id = self.lookup(self.terms, word)
+            matches = [(term_id, 1.0)] if term_id is not None else self.similar_words(word)
+            for term_id, similarity in matches:
+                start, end = self.offsets[term_id], self.offsets[term_id + 1]
+                docs, frequencies = self.docs[start:end], self.frequencies[start:end]
+                idf = math.log(1 + (self.size - (end - start) + 0.5) / ((end - start) + 0.5))
+                norm = K1 * (1 - B + B * self.doc_lengths[docs] / self.average_length)
+                scores[docs] += similarity * idf * frequencies * (K1 + 1) / (frequencies + norm)
+        return scores
+
+    def search(self, query, mask=None, limit=20):
+        """Positions of the best-scoring rows among those in mask, best first (ties in row order)."""
+        scores = self.scores(query)
+        hits = scores > 0
+        if mask is not None:
+            hits &= mask
+        positions = np.flatnonzero(hits)
+        if limit is not None and len(positions) > limit:
+            # Everything scoring at least the limit-th best, then an exact sort of just those
+            cutoff = np.partition(scores[positions], len(positions) - limit)[len(positions) - limit]
+            positions = positions[scores[positions] >= cutoff]
+        order = np.lexsort([positions, -scores[positions]])
+        return positions[order][:limit]
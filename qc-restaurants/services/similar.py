@@ -0,0 +1,127 @@
+"""
+Similar Restaurants
+The "Similar Restaurants" box of every detail page, computed once per catalog. Each
+restaurant is a feature vector - subtypes, area, price tier, amenities and position -
+and its neighbours are the open restaurants of the same cuisine type with the highest
+dot-product score, found a batch of rows at a time with matrix products. The result is
+one int32 row per restaurant, so a detail page reads its neighbours with one lookup.
+"""
+
+import numpy as np
+
+from services.facets import MAX_PRICE_TIER
+
+SIMILAR_LIMIT = 5
+# Rows scored against their cuisine group at once (BATCH x group size floats per product)
+BATCH = 512
+
+# Feature weights: sharing an area counts as much as sharing every subtype
+AREA_WEIGHT = 1.0
+SUBTYPES_WEIGHT = 1.0
+PRICE_WEIGHT = 0.5
+AMENITIES_WEIGHT = 0.5
+RATING_WEIGHT = 0.25
+# Closeness: minus DISTANCE_WEIGHT per (DISTANCE_SCALE_KM)^2 between the two restaurants
+DISTANCE_WEIGHT = 0.25
+DISTANCE_SCALE_KM = 2.0
+KM_PER_DEGREE = 111.195
+
+
+def split_subtypes(value):
+    return [part.strip().lower() for part in value.split(',') if part.strip()] if isinstance(value, str) else []
+
+def one_hot(codes, size):
+    """float32 [rows, size] with a 1 at each row's code (rows with code -1 stay all zero)."""
+    matrix = np.zeros((len(codes), size), dtype=np.float32)
+    rows = np.flatnonzero(codes >= 0)
+    matrix[rows, codes[rows]] = 1
+    return matrix
+
+
+class SimilarTable:
+    """
+    neighbours[row] holds the SIMILAR_LIMIT most similar rows of the catalog frame, best
+    first, padded with -1. Built once per catalog snapshot; treat the array as read-only.
+    """
+
+    def __init__(self, df, facets, active_mask):
+        import pandas as pd  # built with the catalog from the processed frame
+        size = len(df)
+        self.neighbours = np.full((size, SIMILAR_LIMIT), -1, dtype=np.int32)
+        column = 'type' if 'type' in df.columns else 'cuisine'
+        if not size or column not in df.columns:
+            return
+
+        # Subtypes as a normalized multi-hot, so two rows score their share of subtypes in common
+        codes, uniques = pd.factorize(df['subtypes']) if 'subtypes' in df.columns else (np.full(size, -1), [])
+        vocabulary = {}
+        value_subtypes = [[vocabulary.setdefault(part, len(vocabulary)) for part in split_subtypes(value)] for value in uniques]
+        distinct = np.zeros((len(uniques) + 1, len(vocabulary)), dtype=np.float32)
+        for slot, parts in enumerate(value_subtypes):
+            if parts:
+                distinct[slot, parts] = 1 / np.sqrt(len(set(parts)))
+        subtypes = distinct[np.where(codes < 0, len(uniques), codes)]
+
+        area_codes = pd.factorize(df['SEO Area'])[0] if 'SEO Area' in df.columns else np.full(size, -1)
+        prices = np.argmax(np.stack(facets.prices, axis=1), axis=1)
+        amenities = np.stack(list(facets.amenities.values()), axis=1).astype(np.float32)
+        amenities /= np.sqrt(np.maximum(amenities.sum(axis=1, keepdims=True), 1))
+
+        lats = df['latitude'].to_numpy(dtype=np.float64, na_value=np.nan) if 'latitude' in df.columns else np.full(size, np.nan)
+        lngs = df['longitude'].to_numpy(dtype=np.float64, na_value=np.nan) if 'longitude' in df.columns else np.full(size, np.nan)
+        located = (np.abs(lats) <= 90) & (np.abs(lngs) <= 180) & ~((lats == 0) & (lngs == 0))
+        centre = (lats[located].mean(), lngs[located].mean()) if located.any() else (0.0, 0.0)
+        # Kilometres east and north of the centre, in units of DISTANCE_SCALE_KM; unknown positions add no penalty
+        coordinates = np.zeros((size, 2), dtype=np.float32)
+        coordinates[located, 0] = (lngs[located] - centre[1]) * KM_PER_DEGREE * np.cos(np.radians(centre[0])) / DISTANCE_SCALE_KM
+        coordinates[located, 1] = (lats[located] - centre[0]) * KM_PER_DEGREE / DISTANCE_SCALE_KM
+
+        features = np.concatenate([
+            SUBTYPES_WEIGHT * subtypes,
+            np.sqrt(AREA_WEIGHT) * one_hot(area_codes, int(area_codes.max()) + 1),
+            np.sqrt(PRICE_WEIGHT) * one_hot(prices, MAX_PRICE_TIER + 1),
+            np.sqrt(AMENITIES_WEIGHT) * amenities,
+        ], axis=1).astype(np.float32)
+        ratings = pd.to_numeric(df['rating'], errors='coerce').fillna(0).to_numpy(dtype=np.float32) if 'rating' in df.columns else np.zeros(size, dtype=np.float32)
+
+        # -|a - b|^2 = 2 a.b - |a|^2 - |b|^2: the a.b term rides along in the feature product, |b|^2 goes in a
+        # per-candidate bias, and |a|^2 is the same for every candidate of a row so it is left out
+        located_coordinates = coordinates * located[:, None]
+        row_features = np.concatenate([features, 2 * DISTANCE_WEIGHT * located_coordinates], axis=1)
+        candidate_features = np.concatenate([features, located_coordinates], axis=1)
+        bias = RATING_WEIGHT * ratings / 5 - DISTANCE_WEIGHT * (located_coordinates ** 2).sum(axis=1)
+
+        # Only restaurants of the same cuisine type are similar, and only open ones are suggested
+        type_codes = pd.factorize(df[column])[0]
+        for group in range(int(type_codes.max()) + 1):
+            rows = np.flatnonzero(type_codes == group)
+            candidates = rows[active_mask[rows]]
+            if not len(candidates):
+                continue
+            group_features, group_bias = candidate_features[candidates].T, bias[candidates]
+            for start in range(0, len(rows), BATCH):
+                batch = rows[start:start + BATCH]
+                scores = row_features[batch] @ group_features
+                scores += group_bias
+                # A restaurant is not similar to itself
+                itself = np.minimum(np.searchsorted(candidates, batch), len(candidates) - 1)
+                is_candidate = candidates[itself] == batch
+                scores[np.flatnonzero(is_candidate), itself[is_candidate]] = -np.inf
+                self.neighbours[batch] = self.best(scores, candidates)
+
+    def best(self, scores, candidates):
+        """The SIMILAR_LIMIT best candidates per row of scores, highest first (ties in row order)."""
+        result = np.full((len(scores), SIMILAR_LIMIT), -1, dtype=np.int32)
+        rows = np.arange(len(scores))
+        # A few argmax passes beat a partition for so few picks, and argmax keeps the first of equal scores
+        for rank in range(min(SIMILAR_LIMIT, len(candidates))):
+            picks = scores.argmax(axis=1)
+            found = np.isfinite(scores[rows, picks])
+            result[found, rank] = candidates[picks[found]]
+            scores[rows, picks] = -np.inf
+        return result
+
+    def similar(self, row):
+        """Positions of a row's similar restaurants, most similar first."""
+        neighbours = self.neighbours[row]
+        return neighbours[neighbours >= 0]
@@ -0,0 +1,28 @@
+"""
+URL Slugs
+The slug rules the templates use for restaurant, neighbourhood and cuisine links, so the
+catalog can map slugs back to rows and names with one dictionary lookup.
+"""
+
+# Characters area_slug() always removes or replaces
+AREA_SLUG_STRIPPED = frozenset(' /.()')
+
+
+def generate_restaurant_slug(name):
+    """Generate a clean slug from restaurant name"""
+    slug = name.lower().replace(' ', '-').replace('&', 'and').replace("'", '').replace('"', '').replace(',', '').replace('.', '')
+    # Remove multiple hyphens
+    slug = '-'.join(filter(None, slug.split('-')))
+    return slug
+
+def area_slug(area):
+    """Neighbourhood slug, matching the /<area>/ links in the templates"""
+    return area.lower().replace(' ', '-').replace('/', '-').replace('.', '').replace('(', '').replace(')', '')
+
+def cuisine_slug(cuisine):
+    """Cuisine slug, matching the /cuisine/<cuisine> links in the templates"""
+    return cuisine.lower().replace(' ', '-')
+
+def is_plausible_area_slug(slug):
+    """Cheap check that turns away probes like /xmlrpc.php/ or /.env/ before touching any data"""
+    return bool(slug) and slug == slug.lower() and AREA_SLUG_STRIPPED.isdisjoint(slug)
@@ -0,0 +1,161 @@
+"""
+Catalog Snapshots
+Binary snapshot of a fully built catalog, so a fresh worker can skip CSV parsing and
+processing. Snapshots are keyed by the master list digest plus a fingerprint of the code
+that builds the catalog; anything else is stale and the worker falls back to the CSV.
+
+File layout: magic, header length, JSON header, then the pickled catalog (protocol 5) and
+its out-of-band buffers, each 64-byte aligned. The buffers are every NumPy array in the
+catalog (numeric and categorical columns, hours intervals, facet bitmaps), and load()
+maps them straight from the file instead of copying them, read-only.
+"""
+
+import contextlib
+import hashlib
+import importlib.metadata
+import json
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+
+import numpy as np
+
+from services.sqlstore import SUFFIX as DB_SUFFIX, write_catalog_db
+
+MAGIC = b'QCSNAP01'
+ALIGN = 64
+SUFFIX = '.snapshot'
+
+
+def code_fingerprint(paths, *settings):
+    """
+    Digest of the source files the catalog is built by, the library versions that build and
+    pickle it, and any settings that change what it holds.
+    """
+    # pandas only parses the CSV; its version comes from the package metadata so serving never imports it
+    try:
+        pandas_version = importlib.metadata.version('pandas')
+    except importlib.metadata.PackageNotFoundError:
+        pandas_version = None
+    digest = hashlib.sha1(f"{sys.version_info[:2]} {np.__version__} {pandas_version} {settings}".encode())
+    for path in sorted(paths):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def aligned(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+def write_snapshot(obj, path):
+    """Pickle obj with its arrays out of band and write it atomically to path."""
+    buffers = []
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    raws = [buffer.raw() for buffer in buffers]
+
+    # Offsets are relative to the start of the data section, which follows the header
+    offset = 0
+    sections = []
+    for size in [len(payload)] + [raw.nbytes for raw in raws]:
+        offset = aligned(offset)
+        sections.append((offset, size))
+        offset += size
+    header = json.dumps({'pickle': sections[0], 'buffers': sections[1:]}).encode()
+    data_start = aligned(len(MAGIC) + 8 + len(header))
+
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC + len(header).to_bytes(8, 'little') + header)
+            for (start, _), chunk in zip(sections, [payload] + raws):
+                f.seek(data_start + start)
+                f.write(chunk)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def load_snapshot(path):
+    """Unpickle a snapshot with its arrays backed by a read-only memory map of the file."""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{path} is not a catalog snapshot")
+    header_length = int.from_bytes(view[len(MAGIC):len(MAGIC) + 8], 'little')
+    header = json.loads(bytes(view[len(MAGIC) + 8:len(MAGIC) + 8 + header_length]))
+    data_start = aligned(len(MAGIC) + 8 + header_length)
+
+    def section(start, size):
+        return view[data_start + start:data_start + start + size]
+
+    return pickle.loads(section(*header['pickle']), buffers=[section(*buffer) for buffer in header['buffers']])
+
+
+class SnapshotCache:
+    """
+    Directory of catalog snapshots, one per (master list digest, code fingerprint), and
+    the SQLite store (services/sqlstore.py) built with each.
+
+    load() returns None when there is no usable snapshot; save() replaces older snapshots.
+    They only warn on failure, so a read-only or full disk never stops the CSV path.
+    """
+
+    def __init__(self, directory, fingerprint):
+        self.directory = directory
+        self.fingerprint = fingerprint
+
+    def path_for(self, digest, suffix=SUFFIX):
+        key = hashlib.sha1(f"{digest} {self.fingerprint}".encode()).hexdigest()[:20]
+        return os.path.join(self.directory, f"catalog-{key}{suffix}")
+
+    def remove_stale(self, current, suffix, keep=0):
+        """Delete the files with this suffix other than current, sparing the `keep` newest of them."""
+        def modified(path):
+            try:
+                return os.path.getmtime(path)
+            except OSError:  # another worker removed it first
+                return 0
+
+        stale = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(suffix)]
+        stale = sorted((path for path in stale if path != current), key=modified, reverse=True)
+        for path in stale[keep:]:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+
+    def load(self, digest):
+        path = self.path_for(digest)
+        if not os.path.exists(path):
+            return None
+        try:
+            return load_snapshot(path)
+        except Exception as e:
+            print(f"Warning: Could not load catalog snapshot {path}: {e}")
+            return None
+
+    def save(self, digest, catalog):
+        path = self.path_for(digest)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            write_snapshot(catalog, path)
+            self.remove_stale(path, SUFFIX)
+        except Exception as e:
+            print(f"Warning: Could not write catalog snapshot {path}: {e}")
+            return None
+        return path
+
+    def save_db(self, digest, catalog):
+        """Write the catalog's SQLite store; returns its CatalogDB, or None if it could not be written."""
+        path = self.path_for(digest, DB_SUFFIX)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            db = write_catalog_db(catalog, path)
+            # Workers still serving the previous catalog open their connections lazily, so keep its store
+            self.remove_stale(path, DB_SUFFIX, keep=1)
+        except Exception as e:
+            print(f"Warning: Could not write catalog store {path}: {e}")
+            return None
+        return db
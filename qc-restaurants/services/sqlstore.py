@@ -0,0 +1,365 @@
+"""
+SQLite Catalog Store
+The catalog's listing fields and facet memberships in an embedded SQLite file, so list
+filters run as indexed queries with LIMIT/OFFSET and only get back the row positions of
+the page they show. The rows themselves are then read from the catalog's packed columns.
+
+/search with filters and no text always queries it. With QC_LIST_BACKEND=store the home,
+all-restaurants, cuisine, neighbourhood and best-of pages do too (StoreListings), instead
+of slicing the lists the catalog would otherwise materialize in every worker.
+
+Replaces the MySQL schema in database.sql, which nothing ever used. A file is written once
+per catalog build, next to the catalog snapshot and keyed the same way, and every worker
+opens it read-only.
+"""
+
+import os
+import pathlib
+import sqlite3
+import tempfile
+import threading
+import weakref
+
+import numpy as np
+
+from services.facets import AMENITIES, AREA_GROUPS, CUISINE_GROUPS, PRICE_TIERS
+from services.fields import is_missing
+from services.listings import BEST_OF_CATEGORIES, POPULAR_AREAS, ROMANTIC_WORDS, TOP_RATED, similar_cuisines
+
+SUFFIX = '.sqlite'
+
+SCHEMA = """
+CREATE TABLE restaurants (
+    position INTEGER PRIMARY KEY,  -- row in the catalog's table and card columns
+    name TEXT,
+    type TEXT,
+    seo_area TEXT,
+    rating REAL,
+    reviews REAL,
+    price INTEGER NOT NULL,        -- peso-sign tier, as in the facet index (unindexed: too few values)
+    active INTEGER NOT NULL,       -- not permanently closed
+    top_pick INTEGER NOT NULL,
+    -- Lowercased text for substring search (Python's lower(), not SQLite's ASCII-only one)
+    name_lower TEXT,
+    type_lower TEXT,
+    seo_area_lower TEXT,
+    about_lower TEXT
+);
+CREATE INDEX restaurants_ranked ON restaurants (active, rating DESC, reviews DESC);
+CREATE INDEX restaurants_by_rating ON restaurants (rating DESC);
+CREATE INDEX restaurants_by_type ON restaurants (type, active);
+CREATE INDEX restaurants_by_area ON restaurants (seo_area, active, rating DESC);
+CREATE INDEX restaurants_top_picks ON restaurants (top_pick, active);
+
+-- Facet index bitmaps as (facet, row) pairs: 'cuisine:asian', 'area:north', 'amenity:kids',
+-- plus the card service options ('service:Delivery') the cuisine page offers as filters
+CREATE TABLE facets (
+    facet TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (facet, position)
+) WITHOUT ROWID;
+"""
+
+# ORDER BY clauses; position last keeps ties in catalog order
+BY_POSITION = 'position'
+BY_RATING = 'rating DESC, position'
+BY_RANK = 'rating DESC, reviews DESC, position'
+
+
+def lowered(value):
+    return None if is_missing(value) else str(value).lower()
+
+def column_values(table, field):
+    """A table column as a list with NaN turned into None (NULL)."""
+    if field not in table:
+        return [None] * len(table)
+    return [None if is_missing(value) else value for value in table.values(field, np.arange(len(table)))]
+
+def write_catalog_db(catalog, path):
+    """Write the catalog's listing fields and facets to a new SQLite file at path, atomically."""
+    table, facets = catalog.table, catalog.facets
+    names = column_values(table, 'name')
+    types = column_values(table, 'type' if 'type' in table else 'cuisine')
+    areas = column_values(table, 'SEO Area')
+    # Only text about values are searchable, as with Series.str.contains
+    abouts = [value if isinstance(value, str) else None for value in column_values(table, 'about')]
+    prices = sum(tier * mask.astype(np.int64) for tier, mask in enumerate(facets.prices))
+    top_picks = table.equals('top_pick', True) if 'top_pick' in table else np.zeros(len(table), dtype=bool)
+    rows = zip(
+        range(len(table)), names, types, areas,
+        column_values(table, 'rating'), column_values(table, 'reviews'),
+        prices.tolist(), catalog.active_mask.tolist(), top_picks.tolist(),
+        map(lowered, names), map(lowered, types), map(lowered, areas), map(lowered, abouts),
+    )
+    memberships = [('cuisine:', facets.cuisines), ('area:', facets.areas), ('amenity:', facets.amenities)]
+    services = catalog.cards.columns['service_options'].take(np.arange(len(table)))
+
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(tmp_path)
+        try:
+            connection.executescript(SCHEMA)
+            connection.executemany('INSERT INTO restaurants VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            for prefix, masks in memberships:
+                for name, mask in masks.items():
+                    connection.executemany('INSERT INTO facets VALUES (?, ?)',
+                                           ((prefix + name, position) for position in np.flatnonzero(mask).tolist()))
+            connection.executemany('INSERT OR IGNORE INTO facets VALUES (?, ?)',
+                                   (('service:' + option, position) for position, options in enumerate(services)
+                                    for option in options))
+            connection.commit()
+            connection.execute('ANALYZE')
+            connection.commit()
+        finally:
+            connection.close()
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return CatalogDB(path)
+
+def write_private_db(catalog):
+    """Write the store to a temporary file owned by this process, removed when the returned CatalogDB is."""
+    fd, path = tempfile.mkstemp(prefix='qc-catalog-', suffix=SUFFIX)
+    os.close(fd)
+    db = write_catalog_db(catalog, path)
+    weakref.finalize(db, remove_private_db, path, os.getpid())
+    return db
+
+def remove_private_db(path, owner):
+    # Forked workers inherit the finalizer; only the process that wrote the file removes it
+    if os.getpid() == owner and os.path.exists(path):
+        os.unlink(path)
+
+
+# Conditions are (sql, params) pairs ANDed together by CatalogDB queries
+
+def active():
+    return 'active = 1', ()
+
+def top_pick():
+    return 'top_pick = 1', ()
+
+def equals(column, value):
+    return f'{column} = ?', (value,)
+
+def one_of(column, values):
+    values = tuple(values)
+    return f"{column} IN ({', '.join('?' * len(values))})", values
+
+def rating_at_least(rating):
+    return 'rating >= ?', (rating,)
+
+def price_at_most(tier):
+    return 'price <= ?', (int(tier),)
+
+def facet(name):
+    # A per-row primary key probe, so a first page stops at its LIMIT instead of reading the whole facet
+    return 'EXISTS (SELECT 1 FROM facets WHERE facet = ? AND facets.position = restaurants.position)', (name,)
+
+def contains_any(column, words):
+    """Case-insensitive substring match of any word in one of the lowercased columns."""
+    words = tuple(word.lower() for word in words)
+    return '(' + ' OR '.join(f'instr({column}_lower, ?) > 0' for _ in words) + ')', words
+
+def facet_match(cuisine=None, area=None, budget=None, amenities=()):
+    """
+    Conditions for FacetIndex.match(): the same groups, and unknown names are ignored the
+    same way, so a stale query string still returns results.
+    """
+    conditions = []
+    if cuisine in CUISINE_GROUPS:
+        conditions.append(facet(f'cuisine:{cuisine}'))
+    if area and area.lower() in AREA_GROUPS:
+        conditions.append(facet(f'area:{area.lower()}'))
+    if budget in PRICE_TIERS:
+        conditions.append(price_at_most(PRICE_TIERS[budget]))
+    for amenity in amenities:
+        if amenity in AMENITIES or amenity == 'parking':
+            conditions.append(facet(f'amenity:{amenity}'))
+    return conditions
+
+
+class CatalogDB:
+    """
+    Read-only queries against one catalog's SQLite file.
+
+    Each thread of each process opens its own connection on first use (SQLite handles must
+    not cross a fork). Pickles as just the path, so it travels inside the catalog snapshot.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def connection(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            # immutable: the file is never written after it is published, so skip locking
+            uri = pathlib.Path(self.path).absolute().as_uri() + '?mode=ro&immutable=1'
+            local.connection = sqlite3.connect(uri, uri=True)
+            local.pid = os.getpid()
+        return local.connection
+
+    def where(self, conditions):
+        if not conditions:
+            return '', ()
+        return ' WHERE ' + ' AND '.join(sql for sql, _ in conditions), tuple(p for _, params in conditions for p in params)
+
+    def positions(self, conditions=(), order=BY_POSITION, limit=None, offset=0):
+        """Row positions matching every condition, in `order`; one page of them with limit/offset."""
+        where, params = self.where(conditions)
+        sql = f'SELECT position FROM restaurants{where} ORDER BY {order}'
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            params += (int(limit), int(offset))
+        rows = self.connection().execute(sql, params).fetchall()
+        return np.array([row[0] for row in rows], dtype=np.intp)
+
+    def count(self, conditions=()):
+        where, params = self.where(conditions)
+        return self.connection().execute(f'SELECT COUNT(*) FROM restaurants{where}', params).fetchone()[0]
+
+    def has_rows(self, conditions=()):
+        where, params = self.where(conditions)
+        return bool(self.connection().execute(f'SELECT EXISTS (SELECT 1 FROM restaurants{where})', params).fetchone()[0])
+
+    def facet_values(self, prefix, conditions=()):
+        """Names of the `prefix:` facets any matching row has, e.g. facet_values('service')."""
+        connection = self.connection()
+        values, name = [], prefix + ':'
+        while True:
+            # Next facet name with one index seek (';' sorts right after ':'), then stop at its first matching row
+            name = connection.execute('SELECT MIN(facet) FROM facets WHERE facet > ? AND facet < ?',
+                                      (name, prefix + ';')).fetchone()[0]
+            if name is None:
+                return values
+            if self.has_rows(list(conditions) + [facet(name)]):
+                values.append(name[len(prefix) + 1:])
+
+    def counts(self, column, conditions=()):
+        """[(value, rows)] over the matching rows in order of first appearance, NULL left out."""
+        where, params = self.where(list(conditions) + [(f'{column} IS NOT NULL', ())])
+        sql = f'SELECT {column}, COUNT(*) FROM restaurants{where} GROUP BY {column} ORDER BY MIN(position)'
+        return self.connection().execute(sql, params).fetchall()
+
+
+class QueryRows:
+    """
+    One page list as a store query. len() counts its rows and a slice fetches only the
+    positions it covers (LIMIT/OFFSET), so routes page through it as through an array;
+    np.asarray() reads the whole list.
+    """
+
+    def __init__(self, db, conditions, order=BY_POSITION):
+        self.db = db
+        self.conditions = conditions
+        self.order = order
+        self._count = None
+
+    def __len__(self):
+        if self._count is None:
+            self._count = self.db.count(self.conditions)
+        return self._count
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return np.asarray(self)[index]
+        if index.step not in (None, 1):
+            raise ValueError("QueryRows slices take no step")
+        start, stop, _ = index.indices(len(self))
+        return self.db.positions(self.conditions, self.order, limit=max(stop - start, 0), offset=start)
+
+    def __array__(self, dtype=None, copy=None):
+        rows = self.db.positions(self.conditions, self.order)
+        return rows.astype(dtype) if dtype is not None else rows
+
+
+class QueryMap:
+    """Read-only .get() over keys answered by a query (None: no such key)."""
+
+    def __init__(self, lookup):
+        self.lookup = lookup
+
+    def get(self, key, default=None):
+        value = self.lookup(key)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        value = self.lookup(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+
+class StoreListings:
+    """
+    The ListingViews interface answered by the store: each page list is a QueryRows in the
+    order its page shows, and the cuisine sidebars are counted when asked for. Only the
+    similar cuisines, which need no rows, are worked out up front.
+    """
+
+    def __init__(self, db, cuisine_slugs, all_cuisines):
+        self.db = db
+        self.cuisine_types = cuisine_slugs
+        self.best_of = BEST_OF_CATEGORIES
+        self.ranked = QueryRows(db, [active()], BY_RANK)
+        self.top_picks = QueryRows(db, [active(), top_pick()])
+        self.by_rating = QueryRows(db, [], BY_RATING)
+        self.features = QueryMap(self.offered)
+        self.popular_areas = QueryMap(self.areas_of)
+        self.similar_cuisines = {slug: similar_cuisines(slug.replace('-', ' ').title(), all_cuisines)
+                                 for slug in cuisine_slugs}
+
+    def conditions(self, slug, area=None):
+        types = self.cuisine_types.get(slug)
+        if types is None:
+            return None
+        conditions = [one_of('type', types), active()]
+        return conditions + [equals('seo_area', area)] if area is not None else conditions
+
+    def cuisine(self, slug, area=None):
+        """Rows of a cuisine slug (optionally in one area), frame order."""
+        conditions = self.conditions(slug, area)
+        return QueryRows(self.db, conditions if conditions is not None else [('0', ())])
+
+    def area(self, name):
+        """Rows of an SEO Area, best rated first."""
+        return QueryRows(self.db, [equals('seo_area', name), active()], BY_RATING)
+
+    def best(self, category):
+        """Rows of a best-of category; every row for an unknown one."""
+        conditions = {
+            'top-rated': [rating_at_least(TOP_RATED)],
+            'budget': facet_match(budget='budget'),
+            'romantic': [contains_any('about', ROMANTIC_WORDS)],
+            'family': facet_match(amenities=['kids']),
+            'senior': facet_match(amenities=['wheelchair']),
+            'coffee': facet_match(cuisine='coffee'),
+        }
+        return QueryRows(self.db, conditions.get(category, []))
+
+    def offered(self, view):
+        """Service options of a cuisine slug or (slug, area), sorted."""
+        conditions = self.conditions(*view) if isinstance(view, tuple) else self.conditions(view)
+        return tuple(sorted(self.db.facet_values('service', conditions))) if conditions is not None else None
+
+    def areas_of(self, slug):
+        """A cuisine's most common areas with their counts, ties in order of first appearance."""
+        conditions = self.conditions(slug)
+        if conditions is None:
+            return None
+        totals = [(area, count) for area, count in self.db.counts('seo_area', conditions) if area]
+        return tuple(sorted(totals, key=lambda x: x[1], reverse=True)[:POPULAR_AREAS])
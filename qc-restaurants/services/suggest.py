@@ -0,0 +1,147 @@
+"""
+Typeahead Suggestions
+Prefix index for /api/suggest over restaurant names, areas and cuisines, built once per
+catalog. Keys are the normalized names (and, for restaurants, each later word of the name,
+so "mesa" finds "Lola Mesa") in one sorted packed string table; a prefix is a key range
+found with two bisects. Prefixes shared by many keys - the first letter or two of a
+query - keep their top suggestions precomputed, and any other range is small enough to
+rank when it is asked for.
+"""
+
+import bisect
+
+import numpy as np
+
+from services.columns import StringTable
+from services.search import tokenize
+from services.slugs import area_slug, cuisine_slug, generate_restaurant_slug
+
+SUGGEST_LIMIT = 10
+# Prefix ranges with more keys than this get their top suggestions precomputed
+PRECOMPUTED_RANGE = 64
+# Words of a name indexed as their own keys (the first few are what people type)
+NAME_WORDS = 4
+# Every FENCE-th key is kept as fixed-width bytes too, so a bisect starts with searchsorted
+FENCE = 32
+
+KINDS = ('restaurant', 'area', 'cuisine')
+# Sorts after every character, so prefix + END bounds the keys starting with prefix
+END = chr(0x10FFFF)
+
+
+def normalize_key(text):
+    return ' '.join(tokenize(text))
+
+
+class SuggestIndex:
+    """
+    Sorted prefix keys over suggestion entries, each entry a (kind, label) weighted by
+    review count: a restaurant's own reviews, an area's or cuisine's summed over its
+    restaurants. Only restaurants still open for business are suggested.
+    """
+
+    def __init__(self, df, active_mask):
+        size = len(df)
+        names = df['name'].to_numpy(dtype=object) if 'name' in df.columns else np.full(size, None, dtype=object)
+        reviews = df['reviews'].fillna(0).to_numpy(dtype=np.float64) if 'reviews' in df.columns else np.zeros(size)
+        kinds, labels, weights = [], [], []
+        for row in np.flatnonzero(active_mask).tolist():
+            if isinstance(names[row], str) and names[row].strip():
+                kinds.append(0)
+                labels.append(names[row])
+                weights.append(reviews[row])
+        for kind, column in ((1, 'SEO Area'), (2, 'type')):
+            if column not in df.columns:
+                continue
+            totals = {}
+            for label, count in zip(df[column][active_mask].tolist(), reviews[active_mask].tolist()):
+                if isinstance(label, str) and label.strip():
+                    totals[label] = totals.get(label, 0) + count
+            for label, total in totals.items():
+                kinds.append(kind)
+                labels.append(label)
+                weights.append(total)
+
+        keys = []
+        for entry, label in enumerate(labels):
+            words = normalize_key(label).split(' ')
+            for start in range(min(len(words), NAME_WORDS)):
+                keys.append((' '.join(words[start:]), entry))
+        keys.sort()
+        key_strings = [key for key, _ in keys]
+
+        self.kinds = np.array(kinds, dtype=np.uint8)
+        self.labels = StringTable.from_values(labels)
+        self.weights = np.array(weights, dtype=np.float64)
+        self.keys = StringTable.from_values(key_strings)
+        # UTF-8 bytes sort in code point order, as the str keys do
+        self.fences = np.array([key.encode('utf-8') for key in key_strings[::FENCE]], dtype=bytes)
+        self.key_entries = np.array([entry for _, entry in keys], dtype=np.int32)
+
+        # Top entries of each kind for every prefix matching more than PRECOMPUTED_RANGE keys
+        prefixes, tops = [], []
+        pending = [(0, len(keys), 0)]
+        while pending:
+            lo, hi, depth = pending.pop()
+            start = lo
+            while start < hi:
+                # Keys sharing the next character: one bisect per group, not a pass over the keys
+                prefix = key_strings[start][:depth + 1]
+                end = bisect.bisect_left(key_strings, prefix + END, start, hi)
+                if end - start > PRECOMPUTED_RANGE and len(prefix) == depth + 1:
+                    prefixes.append(prefix)
+                    entries = np.unique(self.key_entries[start:end])
+                    tops.append([self.best(entries[self.kinds[entries] == kind]) for kind in range(len(KINDS))])
+                    pending.append((start, end, depth + 1))
+                start = end
+        order = sorted(range(len(prefixes)), key=prefixes.__getitem__)
+        # Short strings, so plain fixed-width bytes
+        self.prefixes = np.array([prefixes[i].encode('utf-8') for i in order], dtype=bytes)
+        self.tops = np.full((len(order), len(KINDS), SUGGEST_LIMIT), -1, dtype=np.int32)
+        for row, i in enumerate(order):
+            for kind, entries in enumerate(tops[i]):
+                self.tops[row, kind, :len(entries)] = entries
+
+    def find(self, key):
+        """bisect_left(keys, key): searchsorted over the fences, then a bisect inside one block."""
+        block = int(np.searchsorted(self.fences, key.encode('utf-8')))
+        lo, hi = max(block - 1, 0) * FENCE, min(block * FENCE, len(self.keys))
+        return bisect.bisect_left(self.keys, key, lo, hi)
+
+    def best(self, entries):
+        """The SUGGEST_LIMIT best of some distinct entries: most reviews first, then index order."""
+        return entries[np.lexsort([entries, -self.weights[entries]])[:SUGGEST_LIMIT]]
+
+    def rank(self, lo, hi, kinds):
+        """The best entries of the given kinds among keys[lo:hi]."""
+        wanted = np.zeros(len(KINDS), dtype=bool)
+        wanted[kinds] = True
+        entries = np.unique(self.key_entries[lo:hi])
+        return self.best(entries[wanted[self.kinds[entries]]])
+
+    def suggest(self, query, limit=SUGGEST_LIMIT, kinds=KINDS):
+        """[{'label', 'kind', 'url'}] for the entries with a key starting with the query."""
+        prefix = normalize_key(query)
+        if not prefix:
+            return []
+        wanted = [KINDS.index(kind) for kind in kinds]
+        encoded = prefix.encode('utf-8')
+        index = int(np.searchsorted(self.prefixes, encoded))
+        if index < len(self.prefixes) and self.prefixes[index] == encoded:
+            entries = self.tops[index, wanted].ravel()
+            entries = self.best(entries[entries >= 0])
+        else:
+            lo, hi = self.find(prefix), self.find(prefix + END)
+            entries = self.rank(lo, hi, wanted)
+        suggestions = []
+        for entry in entries[:limit].tolist():
+            kind = int(self.kinds[entry])
+            label = self.labels[entry]
+            if kind == 0:
+                url = f'/restaurant/{generate_restaurant_slug(label)}'
+            elif kind == 1:
+                url = f'/{area_slug(label)}/'
+            else:
+                url = f'/cuisine/{cuisine_slug(label)}'
+            suggestions.append({'label': label, 'kind': KINDS[kind], 'url': url})
+        return suggestions
@@ -6,6 +6,10 @@ Creates curated food tour routes based on cuisine, budget, and area preferences.
 import random
 import re
 
+import numpy as np
+
+from services.facets import PRICE_TIERS
+
 def generate_restaurant_slug(name):
     """Generate URL-friendly slug from restaurant name."""
     # Convert to lowercase
@@ -15,12 +19,13 @@ def generate_restaurant_slug(name):
     slug = re.sub(r'[\s-]+', '-', slug)
     return slug.strip('-')
 
-def build_food_tour(restaurants_df, cuisine=None, budget=None, area=None, stops=3):
+def build_food_tour(table, facets, cuisine=None, budget=None, area=None, stops=3):
     """
     Build a food tour based on preferences.
     
     Args:
-        restaurants_df: DataFrame containing restaurant data
+        table: ColumnTable of the catalog's restaurants
+        facets: FacetIndex over the same rows (the catalog's)
         cuisine: Type of cuisine (Filipino, Asian, Western, etc.)
         budget: Budget level (budget, mid, splurge)
         area: Specific area in QC (Timog, Tomas Morato, etc.)
@@ -29,54 +34,21 @@ def build_food_tour(restaurants_df, cuisine=None, budget=None, area=None, stops=
     Returns:
         List of restaurant dictionaries for the tour
     """
-    filtered = restaurants_df.copy()
-    
-    # Filter by cuisine
-    if cuisine and cuisine != 'any':
-        cuisine_map = {
-            'filipino': ['Filipino', 'Pinoy', 'Filipino'],
-            'asian': ['Japanese', 'Thai', 'Vietnamese', 'Korean', 'Chinese', 'Asian', 'Thai', 'Singaporean'],
-            'western': ['American', 'Italian', 'Spanish', 'Western', 'European']
-        }
-        if cuisine in cuisine_map:
-            cuisine_filter = filtered['type'].fillna('').apply(
-                lambda x: any(c.lower() in x.lower() for c in cuisine_map[cuisine])
-            )
-            filtered = filtered[cuisine_filter]
+    # Filter by cuisine and area groups
+    mask = facets.match(
+        cuisine=cuisine if cuisine != 'any' else None,
+        area=area if area != 'any' else None,
+    )
     
-    # Filter by budget
-    if budget:
-        budget_map = {
-            'budget': (0, 200),
-            'mid': (200, 500),
-            'splurge': (500, 1000)
-        }
-        if budget in budget_map:
-            min_price, max_price = budget_map[budget]
-            filtered = filtered[filtered['rating'].notna()]
-    
-    # Filter by area
-    if area and area != 'any':
-        area_keywords = {
-            'timog': ['Timog', 'Scout'],
-            'tomas morato': ['Tomas Morato', 'Morato'],
-            'north': ['SM North', 'North EDSA', 'Trinoma'],
-            'east': ['Eastwood', 'Ortigas'],
-            'cubao': ['Cubao', 'Araneta'],
-            'maginhawa': ['Maginhawa', 'Teacher\'s Village']
-        }
-        if area.lower() in area_keywords:
-            area_filter = filtered['SEO Area'].fillna('').apply(
-                lambda x: any(k.lower() in x.lower() for k in area_keywords[area.lower()])
-            )
-            filtered = filtered[area_filter]
+    # Filter by budget (tours only require a rating; stop prices are estimated later)
+    if budget in PRICE_TIERS:
+        mask &= facets.has_rating
     
     # Sort by rating and take top stops
-    filtered = filtered.sort_values('rating', ascending=False)
-    tour_stops = filtered.head(stops)
+    tour_stops = table.sort_desc('rating', np.flatnonzero(mask))[:stops]
     
     tour = []
-    for _, row in tour_stops.iterrows():
+    for row in table.rows(tour_stops):
         restaurant = {
             'name': row.get('name_for_emails', row.get('name', 'Unknown')),
             'slug': generate_restaurant_slug(row.get('name', '')),
@@ -0,0 +1,52 @@
+/**
+ * Typeahead Suggestions JavaScript
+ * Fills the <datalist> of any input with a data-suggest attribute from /api/suggest.
+ * data-suggest-kind limits it to restaurants, areas or cuisines (e.g. the menu contribution form).
+ */
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('input[data-suggest]').forEach(function(input) {
+        const list = document.getElementById(input.getAttribute('list'));
+        if (!list) {
+            return;
+        }
+        const kind = input.dataset.suggestKind;
+        let latest = 0;
+
+        input.addEventListener('input', debounce(function() {
+            const query = input.value.trim();
+            if (!query) {
+                list.innerHTML = '';
+                return;
+            }
+            const params = new URLSearchParams({q: query});
+            if (kind) {
+                params.append('kind', kind);
+            }
+            const request = ++latest;
+            fetch('/api/suggest?' + params.toString())
+                .then(response => response.json())
+                .then(data => {
+                    // Ignore answers to queries the user has already typed past
+                    if (request !== latest) {
+                        return;
+                    }
+                    list.innerHTML = '';
+                    (data.suggestions || []).forEach(suggestion => {
+                        const option = document.createElement('option');
+                        option.value = suggestion.label;
+                        list.appendChild(option);
+                    });
+                })
+                .catch(() => {});
+        }, 150));
+    });
+
+    function debounce(func, wait) {
+        let timeout;
+        return function(...args) {
+            clearTimeout(timeout);
+            timeout = setTimeout(() => func.apply(this, args), wait);
+        };
+    }
+});
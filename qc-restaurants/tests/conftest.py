@@ -0,0 +1,55 @@
+"""
+Shared test fixtures. The app directory and benchmarks/ (for the synthetic master list
+generator and the legacy implementations the tests compare against) go on sys.path, so
+the tests import modules the same way the benchmarks do.
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(APP_DIR, 'benchmarks')
+sys.path[:0] = [APP_DIR, BENCH_DIR]
+
+# Synthetic restaurants behind the shared fixtures: enough for every cuisine, area and amenity
+ROWS = 2000
+PHOTO_VERSION = 1700000000
+
+
+@pytest.fixture(scope='session')
+def master_list():
+    """A synthetic Outscraper-shaped master list, as read from the CSV; copy it before changing it."""
+    from synthetic import make_master_list
+    return make_master_list(ROWS)
+
+
+@pytest.fixture(scope='session')
+def site(tmp_path_factory):
+    """
+    The app module, serving a catalog built from the synthetic master list. app reads its
+    settings when it is imported, so every test in the run shares this one.
+    """
+    from synthetic import write_master_list
+    workdir = tmp_path_factory.mktemp('site')
+    os.environ['QC_DATA_FILE'] = write_master_list(str(workdir / 'master.csv'), ROWS)
+    os.environ['QC_CATALOG_RELOAD_SECONDS'] = '0'
+    os.environ['QC_CATALOG_SNAPSHOT_DIR'] = str(workdir / 'snapshots')
+    os.chdir(APP_DIR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+        app.CATALOG.get()
+    return app
+
+
+@pytest.fixture(scope='session')
+def catalog(site):
+    return site.CATALOG.get()
+
+
+@pytest.fixture
+def client(site):
+    return site.app.test_client()
@@ -0,0 +1,71 @@
+"""
+The RestaurantCards built for the home and cuisine pages against the old full-row dicts
+(benchmarks/legacy_cards.py), for every field the card templates read.
+"""
+
+import contextlib
+import io
+import math
+
+import numpy as np
+import pytest
+
+import legacy_cards
+
+HOME_FIELDS = ['name', 'name_for_emails', 'cuisine', 'street', 'phone', 'site', 'photo_url', 'price',
+               'rating', 'reviews', 'latitude', 'longitude', 'hours', 'features', 'wheelchair_accessible',
+               'good_for_kids', 'top_pick']
+CUISINE_FIELDS = ['display_name', 'street', 'phone', 'site', 'photo_url', 'rating', 'reviews', 'latitude',
+                  'longitude', 'hours', 'about', 'wheelchair_accessible', 'good_for_kids', 'has_wifi',
+                  'has_high_chairs', 'top_pick']
+
+
+def same(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+def compare(records, cards, fields, renamed=None):
+    assert len(records) == len(cards)
+    for record, card in zip(records, cards):
+        for field in fields:
+            assert same(record[field], getattr(card, field)), (field, record[field], getattr(card, field))
+        for record_field, card_field in (renamed or {}).items():
+            assert same(record[record_field], getattr(card, card_field)), (card_field, record[record_field])
+
+
+@pytest.fixture(scope='module')
+def frame(catalog):
+    """The processed frame the old code read, rebuilt from the catalog."""
+    return legacy_cards.catalog_frame(catalog)
+
+
+@pytest.fixture(scope='module')
+def biggest_cuisine(catalog):
+    cuisine_type = max(catalog.cuisine_counts, key=catalog.cuisine_counts.get)
+    return cuisine_type, catalog.cuisine_slugs[cuisine_type.lower().replace(' ', '-')]
+
+
+def test_home_cards_match_row_dicts(site, catalog, frame):
+    # The template shows the first dozen top picks
+    records = legacy_cards.home_records(frame[catalog.active_mask])[:site.HOME_CARDS]
+    top_picks = np.flatnonzero(catalog.active_mask & catalog.table.equals('top_pick', True))[:site.HOME_CARDS]
+    compare(records, catalog.page_cards(top_picks), HOME_FIELDS)
+
+
+@pytest.mark.parametrize('page', [1, 2])
+def test_cuisine_cards_match_row_dicts(catalog, frame, biggest_cuisine, page):
+    cuisine_type, cuisine_types = biggest_cuisine
+    positions = np.flatnonzero(catalog.table.isin('type', cuisine_types) & catalog.active_mask)
+    records, legacy_features = legacy_cards.cuisine_records(frame, cuisine_types, cuisine_type, page)
+    cards = catalog.page_cards(positions[(page - 1) * 12:page * 12])
+    compare(records, cards, CUISINE_FIELDS, renamed={'features': 'service_options', 'name': 'display_name'})
+    assert [record['price'] for record in records] == [str(card.price) for card in cards]
+    assert sorted(set().union(*catalog.cards.columns['service_options'].take(positions))) == legacy_features
+
+
+def test_card_pages_render(client, biggest_cuisine):
+    slug = biggest_cuisine[0].lower().replace(' ', '-')
+    for url in ('/', f'/cuisine/{slug}', f'/cuisine/{slug}?page=2'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert client.get(url).status_code == 200, url
@@ -0,0 +1,86 @@
+"""
+Page dependencies across a weekly-style refresh of the master list: the reload only drops
+the cached pages whose rows, lists or counts changed, and every page it keeps is
+byte-identical to a fresh render. The app serves a store and page cache of its own here,
+so the shared catalog is never reloaded.
+"""
+
+import contextlib
+import io
+
+import pytest
+
+from bench_dependencies import weekly_refresh
+from services.catalog import CatalogStore
+from services.pagecache import PageCache
+
+ROWS = 1000
+DETAIL_PAGES = 100
+
+
+@pytest.fixture
+def store(site, tmp_path, monkeypatch):
+    """A catalog store over its own master list, served by the app with room for every page."""
+    from synthetic import write_master_list
+    store = CatalogStore(write_master_list(str(tmp_path / 'master.csv'), ROWS), site.load_catalog)
+    monkeypatch.setattr(site, 'CATALOG', store)
+    monkeypatch.setattr(site, 'PAGE_CACHE', PageCache(int(1e9)))
+    with contextlib.redirect_stdout(io.StringIO()):
+        store.get()
+    return store
+
+
+def get(client, url):
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        return client.get(url)
+
+
+def urls(site, catalog):
+    """Home, every page of each cuisine and area, some detail pages and the static pages."""
+    pages = lambda rows: (len(rows) + site.LIST_PAGE_SIZE - 1) // site.LIST_PAGE_SIZE
+    urls = ['/', '/about', '/blog', '/how-we-rate', '/best-of']
+    for slug in catalog.cuisine_slugs:
+        urls += [f'/cuisine/{slug}'] + [f'/cuisine/{slug}?page={page}'
+                                        for page in range(2, pages(catalog.listings.cuisine(slug)) + 1)]
+    for slug, name in catalog.area_slugs.items():
+        urls += [f'/{slug}/'] + [f'/{slug}/?page={page}' for page in range(2, pages(catalog.listings.area(name)) + 1)]
+    return urls + [f'/restaurant/{slug}' for slug in list(catalog.restaurants_data.keys())[:DETAIL_PAGES]]
+
+
+def test_refresh_keeps_only_unchanged_pages(site, client, store, monkeypatch):
+    cache = site.PAGE_CACHE
+    served = [url for url in urls(site, store.get()) if get(client, url).status_code == 200]
+    cached = len(cache.pages)
+    assert cached == len(served)
+
+    weekly_refresh(store.path, 20)
+    with contextlib.redirect_stdout(io.StringIO()):
+        store.reload(force=True)
+    changes = store.get().changes[1]
+    assert changes.keys
+
+    hits = cache.stats()['hit']
+    for url in served:
+        page = get(client, url).data
+        with monkeypatch.context() as uncached:
+            uncached.setattr(site, 'PAGE_CACHE', None)
+            assert page == get(client, url).data, url
+    kept = cache.stats()['hit'] - hits
+    assert cache.invalidated == cached - kept and 0 < kept < cached
+
+
+def test_rebuild_of_same_list_changes_nothing(site, store):
+    """An unchanged master list rebuilds to the same dependencies, whatever its photo version."""
+    with open(store.path, 'rb') as source, contextlib.redirect_stdout(io.StringIO()):
+        rebuilt = site.load_catalog(io.BytesIO(source.read()), photo_version=1)
+    same = rebuilt.dependencies.changes(store.get().dependencies)
+    assert not same.keys and not same.spans
+
+
+def test_unrecorded_reads_depend_on_everything(store):
+    """Cached pages all depend on the whole dataset when nothing is recorded."""
+    weekly_refresh(store.path, 5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        store.reload(force=True)
+    changes = store.get().changes[1]
+    assert changes.touches(None) and not changes.touches(())
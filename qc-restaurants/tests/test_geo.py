@@ -0,0 +1,72 @@
+"""
+The catalog's coordinate grid against a haversine scan of every row: radius and k-nearest
+queries (same rows, same order) and each area's neighbours.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from bench_geo import full_scan
+from services.geo import haversine
+
+RADII = [100, 500, 1000, 3000]
+
+
+@pytest.fixture(scope='module')
+def coordinates(catalog):
+    positions = np.arange(len(catalog.table))
+    return (np.asarray(catalog.table.values('latitude', positions), dtype=np.float64),
+            np.asarray(catalog.table.values('longitude', positions), dtype=np.float64))
+
+
+def points(count=100, seed=5):
+    """Points around the restaurants, plus a few far outside Quezon City."""
+    rng = random.Random(seed)
+    around = [(rng.uniform(14.60, 14.72), rng.uniform(121.00, 121.10), rng.choice(RADII)) for _ in range(count)]
+    return around + [(10.3, 123.9, 1000), (14.65, -60.0, 3000), (-33.9, 151.2, 500)]
+
+
+def same(got, expected):
+    return np.array_equal(got[0], expected[0]) and np.allclose(got[1], expected[1])
+
+
+@pytest.mark.parametrize('masked', [False, True], ids=['all', 'active'])
+def test_within(catalog, coordinates, masked):
+    mask = catalog.active_mask if masked else None
+    for lat, lng, radius in points():
+        expected = full_scan(*coordinates, lat, lng, radius, mask=mask)
+        assert same(catalog.geo.within(lat, lng, radius, mask), expected), (lat, lng, radius)
+
+
+def test_nearest(catalog, coordinates):
+    for lat, lng, _ in points():
+        assert same(catalog.geo.nearest(lat, lng, 10), full_scan(*coordinates, lat, lng, k=10)), (lat, lng)
+
+
+def test_nearest_within_radius(catalog, coordinates):
+    mask = catalog.active_mask
+    for lat, lng, radius in points():
+        expected = full_scan(*coordinates, lat, lng, radius, 25, mask)
+        assert same(catalog.geo.nearest(lat, lng, 25, mask, radius), expected), (lat, lng, radius)
+
+
+def test_nearest_covering_most_rows(catalog, coordinates):
+    """Enough neighbours that the search gives up widening and scans every row."""
+    k = len(catalog.table) // 2
+    for lat, lng, _ in points(10):
+        assert same(catalog.geo.nearest(lat, lng, k), full_scan(*coordinates, lat, lng, k=k)), (lat, lng)
+
+
+def test_area_neighbours(catalog, coordinates):
+    """Each area's neighbours are its closest other areas by centroid."""
+    lats, lngs = coordinates
+    mask = catalog.active_mask
+    areas = np.asarray(catalog.table.values('SEO Area', np.arange(len(catalog.table))), dtype=object)
+    neighbours = catalog.area_neighbours
+    assert neighbours
+    centres = {area: (lats[mask & (areas == area)].mean(), lngs[mask & (areas == area)].mean()) for area in neighbours}
+    for area, closest in neighbours.items():
+        others = sorted((haversine(*centres[area], *centres[other]), other) for other in centres if other != area)
+        assert [name for name, _ in closest] == [name for _, name in others[:len(closest)]], area
@@ -0,0 +1,65 @@
+"""
+The compiled minute-of-week engine in services/hours.py against hand-worked schedules:
+24 hours, split shifts, overnight and Sunday into Monday.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.hours import PH_TIMEZONE, WeeklyHours, compile_hours, get_time_until_open, is_currently_open
+
+MONDAY = datetime(2026, 10, 19, tzinfo=PH_TIMEZONE)
+
+
+def at(day, clock):
+    """Philippine time on the test week: at(0, '13:05') is Monday 1:05PM."""
+    hour, minute = map(int, clock.split(':'))
+    return MONDAY + timedelta(days=day, hours=hour, minutes=minute)
+
+
+# (working_hours, moment, open?, get_time_until_open)
+CASES = [
+    # 24 hours
+    ({'Monday': 'Open 24 hours'}, at(0, '00:00'), True, 'Open Now'),
+    ({'Monday': 'Open 24 hours'}, at(0, '23:59'), True, 'Open Now'),
+    ({'Monday': 'Open 24 hours'}, at(1, '00:00'), False, 'Opens in 144h'),
+    ({day: 'Open 24 hours' for day in ['Saturday', 'Sunday', 'Monday']}, at(6, '23:59'), True, 'Open Now'),
+    # Split shifts, including the shortened "5-9PM" form
+    ({'Monday': '11AM-3PM,5-9PM'}, at(0, '10:59'), False, 'Opens in 1m'),
+    ({'Monday': '11AM-3PM,5-9PM'}, at(0, '11:00'), True, 'Open Now'),
+    ({'Monday': '11AM-3PM,5-9PM'}, at(0, '15:00'), False, 'Opens in 2h'),
+    ({'Monday': '11AM-3PM,5-9PM'}, at(0, '16:30'), False, 'Opens in 30m'),
+    ({'Monday': '11AM-3PM,5-9PM'}, at(0, '17:00'), True, 'Open Now'),
+    ({'Monday': '11AM-3PM,5-9PM'}, at(0, '03:00'), False, 'Opens in 8h'),
+    ({'Monday': '11 AM–3 PM, 5–9:30 PM'}, at(0, '21:15'), True, 'Open Now'),
+    ({'Monday': '11-2PM'}, at(0, '11:30'), True, 'Open Now'),
+    # Overnight: Monday 6PM-2AM covers early Tuesday, not early Monday
+    ({'Monday': '6PM-2AM', 'Tuesday': 'Closed'}, at(1, '01:30'), True, 'Open Now'),
+    ({'Monday': '6PM-2AM', 'Tuesday': 'Closed'}, at(1, '02:00'), False, 'Opens in 160h'),
+    ({'Monday': '6PM-2AM', 'Tuesday': 'Closed'}, at(0, '01:30'), False, 'Opens in 16h 30m'),
+    ({'Monday': '10-2AM'}, at(0, '22:30'), True, 'Open Now'),
+    ({'Monday': '5PM-12AM'}, at(0, '23:59'), True, 'Open Now'),
+    ({'Monday': '5PM-12AM'}, at(1, '00:00'), False, 'Opens in 161h'),
+    # Sunday night wraps into Monday morning
+    ({'Sunday': '8PM-3AM'}, at(0, '02:59'), True, 'Open Now'),
+    ({'Sunday': '8PM-3AM'}, at(0, '03:00'), False, 'Opens in 161h'),
+    ({'Sunday': '8PM-3AM'}, at(6, '19:45'), False, 'Opens in 15m'),
+    ({'Saturday': 'Closed', 'Sunday': 'Closed', 'Monday': '9AM-5PM'}, at(6, '12:00'), False, 'Opens in 21h'),
+    # Nothing to open
+    ({}, at(0, '12:00'), False, None),
+    ({'Monday': 'Closed'}, at(0, '12:00'), False, None),
+]
+
+
+@pytest.mark.parametrize('hours, moment, expected_open, expected_until', CASES)
+def test_open_and_time_until_open(hours, moment, expected_open, expected_until):
+    assert is_currently_open(hours, now=moment) == expected_open
+    assert bool(WeeklyHours.from_dicts([hours]).open_now(moment)[0]) == expected_open
+    assert get_time_until_open(hours, now=moment) == expected_until
+
+
+def test_intervals_are_sorted_merged_and_inside_the_week():
+    intervals = compile_hours({'Monday': '9AM-12PM,11AM-3PM,3PM-5PM', 'Sunday': '10PM-6AM'})
+    assert intervals.tolist() == [[0, 360], [540, 1020], [9960, 10080]]
+
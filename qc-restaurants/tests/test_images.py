@@ -0,0 +1,43 @@
+"""
+The manifest-backed image lookup against the legacy per-card filesystem lookup, over a
+throwaway static folder laid out the way the scraper does (benchmarks/bench_images.py).
+"""
+
+import contextlib
+import io
+import os
+
+from flask import Flask, url_for
+
+import legacy_images
+from bench_images import build_static
+from services.images import ImageManifestStore
+
+
+def test_manifest_picks_the_legacy_image_and_alt_text(master_list, tmp_path, monkeypatch):
+    raw_df = master_list.drop_duplicates('name')
+    restaurants = list(zip(raw_df['name'], raw_df['street']))
+    root = str(tmp_path)
+    monkeypatch.setattr(legacy_images, 'RESTAURANT_IMAGE_MAPPING', build_static(root, restaurants, 300))
+    monkeypatch.chdir(root)  # the legacy lookup uses paths relative to the working directory
+
+    store = ImageManifestStore(os.path.join(root, 'static'), os.path.join(root, 'photo_results.csv'))
+    flask_app = Flask(__name__, static_folder=os.path.join(root, 'static'))
+
+    def manifest_lookup(name, photo, street):
+        static_path, kind = store.get().resolve(name, street)
+        if kind == 'card':
+            return url_for('static', filename=static_path), f"{name} restaurant in Quezon City - exterior view and dining atmosphere"
+        if kind == 'street':
+            return url_for('static', filename=static_path), f"{name} restaurant in Quezon City"
+        return photo or '', f"{name or 'Restaurant'} restaurant in Quezon City"
+
+    with flask_app.test_request_context(), contextlib.redirect_stdout(io.StringIO()):
+        legacy = [legacy_images.get_restaurant_image_url(name, 'photo.jpg', street=street) for name, street in restaurants]
+        first = [manifest_lookup(name, 'photo.jpg', street) for name, street in restaurants]
+        again = [manifest_lookup(name, 'photo.jpg', street) for name, street in restaurants]
+
+    mismatches = [(restaurant, old, new) for restaurant, old, new in zip(restaurants, legacy, first) if old != new]
+    assert not mismatches, mismatches[:5]
+    # Memoised lookups give the same answers
+    assert again == first
@@ -0,0 +1,70 @@
+"""
+WeeklyHours.transitions_at against a walk of the week, and /api/open-now against the
+catalog's open/closed state at a fixed moment.
+"""
+
+import numpy as np
+import pytest
+
+from services.hours import MINUTES_PER_WEEK, NO_TRANSITION, WeeklyHours
+from test_hours import CASES, at
+
+NOW = at(0, '12:00')
+
+
+def test_transitions_match_a_minute_by_minute_walk():
+    schedules = [hours for hours, _, _, _ in CASES] + [{'Sunday': '8PM-3AM', 'Monday': '6AM-11PM'}]
+    table = WeeklyHours.from_dicts(schedules)
+    week = np.array([table.open_at(minute) for minute in range(MINUTES_PER_WEEK)] * 2)
+    for minute in range(0, MINUTES_PER_WEEK, 37):
+        is_open, minutes = table.transitions_at(minute)
+        # The first minute of the following week at which each row's state differs from now
+        differs = week[minute:minute + MINUTES_PER_WEEK] != week[minute]
+        changes = np.where(differs.any(axis=0), differs.argmax(axis=0), NO_TRANSITION)
+        for row, hours in enumerate(schedules):
+            assert (is_open[row], minutes[row]) == (week[minute, row], changes[row]), (hours, minute)
+
+
+@pytest.fixture
+def open_now(site, client, monkeypatch):
+    """GET /api/open-now at NOW."""
+    monkeypatch.setattr(site, 'ph_now', lambda: NOW)
+    return lambda query='': client.get(f'/api/open-now{query}')
+
+
+def test_open_now_within_window(open_now, catalog):
+    response = open_now('?within=30m&limit=200')
+    assert response.status_code == 200
+    data = response.get_json()
+    is_open, minutes = catalog.transitions_now(NOW)
+    expected = catalog.active_mask & (is_open | (minutes <= 30))
+    assert data['within_minutes'] == 30 and data['total_found'] == int(expected.sum())
+    assert data['dataset_version'] == catalog.dataset_version
+
+    assert data['restaurants']
+    changes = [restaurant['minutes_until_change'] for restaurant in data['restaurants']]
+    assert changes == sorted(changes, key=lambda change: NO_TRANSITION if change is None else change)
+    for restaurant in data['restaurants']:
+        change = restaurant['minutes_until_change']
+        if restaurant['status'] == 'open':
+            assert change is None or change > 30
+        else:
+            assert restaurant['status'] in ('closing_soon', 'opening_soon') and change <= 30
+
+
+def test_open_now_filters_by_area_and_cuisine(open_now, catalog):
+    slug, area = next(iter(catalog.area_slugs.items()))
+    data = open_now(f'?area={slug}&limit=200').get_json()
+    is_open, _ = catalog.transitions_now(NOW)
+    assert data['total_found'] == int((catalog.active_mask & is_open & catalog.table.equals('SEO Area', area)).sum())
+    assert {restaurant['area'] for restaurant in data['restaurants']} <= {area}
+
+    cuisine, types = next(iter(catalog.cuisine_slugs.items()))
+    data = open_now(f'?cuisine={cuisine}').get_json()
+    assert {restaurant['cuisine'] for restaurant in data['restaurants']} <= set(types)
+
+
+def test_open_now_rejects_bad_arguments(open_now):
+    assert open_now('?within=soon').status_code == 400
+    assert open_now('?area=atlantis').status_code == 404
+    assert open_now('?cuisine=martian').status_code == 404
@@ -0,0 +1,93 @@
+"""
+The rendered-page cache through the test client: cached pages against fresh renders,
+ETag/304, expiry at the next open/close among a page's cards, and the LRU byte bound.
+"""
+
+import contextlib
+import io
+
+import pytest
+
+from services.pagecache import CachedPage, PageCache
+
+
+@pytest.fixture
+def cache(site):
+    """The app's page cache, emptied so each test sees its own renders."""
+    assert site.PAGE_CACHE is not None
+    site.PAGE_CACHE.clear()
+    return site.PAGE_CACHE
+
+
+@pytest.fixture(scope='module')
+def cuisine(catalog):
+    """The cuisine with the most restaurants, so its listing has a page 3."""
+    return max(catalog.listings.cuisines, key=lambda slug: catalog.listings.cuisines[slug][1] - catalog.listings.cuisines[slug][0])
+
+
+def urls(catalog, cuisine):
+    restaurant = next(iter(catalog.restaurants_data.keys()))
+    return ['/', f'/cuisine/{cuisine}', f'/cuisine/{cuisine}?page=3', f'/restaurant/{restaurant}',
+            '/blog', '/blog/eastwood-restaurants-2025', '/about', '/how-we-rate', '/search?q=ramen']
+
+
+def get(client, url, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return client.get(url, **kwargs)
+
+
+def test_matches_fresh_render(site, client, catalog, cuisine, cache, monkeypatch):
+    for url in urls(catalog, cuisine):
+        with monkeypatch.context() as uncached:
+            uncached.setattr(site, 'PAGE_CACHE', None)
+            fresh = get(client, url)
+        first, second = get(client, url), get(client, url)
+        assert fresh.status_code == first.status_code == second.status_code == 200, url
+        assert fresh.data == first.data == second.data, url
+        assert first.headers['ETag'] == second.headers['ETag'] and 'ETag' not in fresh.headers, url
+
+
+def test_etag_revalidation(client, catalog, cuisine, cache):
+    for url in urls(catalog, cuisine):
+        etag = get(client, url).headers['ETag']
+        revalidated = get(client, url, headers={'If-None-Match': etag})
+        assert revalidated.status_code == 304 and not revalidated.data, url
+        assert get(client, url, headers={'If-None-Match': '"stale"'}).status_code == 200, url
+
+
+def test_tracking_parameters_share_an_entry(client, cuisine, cache):
+    page = get(client, f'/cuisine/{cuisine}?page=3').data
+    hits = cache.stats()['hit']
+    assert get(client, f'/cuisine/{cuisine}?utm_source=newsletter&page=3').data == page
+    assert get(client, f'/cuisine/{cuisine}?page=3').data == page
+    assert cache.stats()['hit'] == hits + 2
+
+
+def test_card_pages_expire(site, client, catalog, cache):
+    """Card pages expire at the next open/close among their cards (or midnight); others keep until a new dataset."""
+    get(client, '/')
+    get(client, '/about')
+    pages = {key[1:4]: page for key, page in cache.pages.items()}
+    home = pages[('home', (), ())]
+    assert home.expires == catalog.status_expires(catalog.listings.top_picks[:site.HOME_CARDS])
+    assert pages[('about', (), ())].expires is None
+    key = next(key for key in cache.pages if key[1] == 'home')
+    assert cache.get(key, now=home.expires - 1) is home and cache.get(key, now=home.expires) is None
+    assert get(client, '/').status_code == 200 and cache.get(key) is not None
+
+
+def test_lru_byte_bound():
+    small = PageCache(max_bytes=1000)
+    for number in range(10):
+        small.put(number, CachedPage(b'x' * 300, 'text/html'))
+    assert small.bytes <= 1000 and list(small.pages) == [7, 8, 9] and small.evictions == 7
+    small.get(7)
+    small.put(10, CachedPage(b'x' * 300, 'text/html'))
+    assert list(small.pages) == [9, 7, 10]
+
+
+def test_new_generation_starts_over():
+    small = PageCache(max_bytes=1000)
+    small.put(1, CachedPage(b'x' * 300, 'text/html'))
+    small.use_generation((2, 1))
+    assert not small.pages and small.bytes == 0
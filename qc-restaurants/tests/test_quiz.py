@@ -0,0 +1,65 @@
+"""
+The perfect-spot answer table against scoring every open restaurant for every answer
+combination and against the old filtered store query, and POST /api/quiz/perfect-spot.
+"""
+
+import numpy as np
+import pytest
+
+from bench_quiz import old_query, random_submissions
+from services import sqlstore
+from services.quiz import QUIZ_RESULTS
+
+
+def full_scan(facets, ratings, active, key):
+    """(positions, scores) for a quiz key by scoring every open restaurant."""
+    cuisine, budget, area, senior, vibe = key
+    masks = []
+    if cuisine:
+        masks.append(facets.cuisines[cuisine])
+    if budget:
+        masks.append(facets.price_at_most(budget))
+    if area:
+        masks.append(facets.areas[area])
+    for amenity in (senior, vibe):
+        if amenity:
+            masks.append(facets.amenities[amenity])
+    matched = np.sum(masks, axis=0) if masks else np.ones(len(active), dtype=int)
+    rows = np.flatnonzero(active & (matched > 0))
+    rows = rows[np.lexsort([rows, -np.nan_to_num(ratings[rows], nan=-np.inf), -matched[rows]])][:QUIZ_RESULTS]
+    scores = np.round(100 * matched[rows] / len(masks)) if masks else np.full(len(rows), 100)
+    return rows, scores
+
+
+def test_matches_full_scan(catalog):
+    quiz = catalog.quiz
+    ratings = catalog.table.array('rating').astype(np.float64)
+    for key, row in quiz.keys.items():
+        found = quiz.results[row] >= 0
+        positions, scores = full_scan(catalog.facets, ratings, catalog.active_mask, key)
+        assert np.array_equal(quiz.results[row][found], positions), key
+        assert np.array_equal(quiz.scores[row][found], scores), key
+
+
+def test_perfect_matches_agree_with_store_query(catalog):
+    """Where three open restaurants match every answer, the old filtered query (minus closed ones) agrees."""
+    compared = 0
+    for answers in random_submissions(200):
+        positions, scores = catalog.quiz.answer(answers['1'], answers['2'], answers['3'], answers['4'], answers['5'])
+        if len(scores) and scores.min() == 100:
+            expected = catalog.db.positions(old_query(answers) + [sqlstore.active()], sqlstore.BY_RATING, limit=3)
+            assert np.array_equal(positions, expected), answers
+            compared += 1
+    assert compared
+
+
+@pytest.mark.parametrize('answers', random_submissions(5, seed=3))
+def test_route(client, catalog, answers):
+    response = client.post('/api/quiz/perfect-spot', json=answers)
+    assert response.status_code == 200
+    body = response.get_json()
+    positions, scores = catalog.quiz.answer(answers['1'], answers['2'], answers['3'], answers['4'], answers['5'])
+    assert body['success'] and body['total_found'] == len(positions)
+    assert [restaurant['match_score'] for restaurant in body['restaurants']] == scores.tolist()
+    assert [restaurant['name'] for restaurant in body['restaurants']] == \
+        [row.get('name_for_emails', row.get('name')) for row in catalog.table.rows(positions)]
@@ -0,0 +1,40 @@
+"""
+The BM25 search index over the catalog: whole names, word matches the old substring scan
+found, misspelt cuisines and facet filters.
+"""
+
+import numpy as np
+import pytest
+
+from services.search import tokenize
+
+
+def test_full_name_ranks_first(catalog):
+    table, index = catalog.table, catalog.search
+    names = table.values('name', np.arange(len(table)))
+    for position in range(0, len(table), max(len(table) // 50, 1)):
+        assert index.search(names[position], limit=1)[0] == position, names[position]
+
+
+@pytest.mark.parametrize('word', ['cafe', 'ramen', 'cubao'])
+def test_keeps_word_matches(catalog, word):
+    table = catalog.table
+    has_word = lambda x: isinstance(x, str) and word in tokenize(x)
+    expected = np.flatnonzero(table.matches('name', has_word) | table.matches('type', has_word)
+                              | table.matches('SEO Area', has_word))
+    found = np.flatnonzero(catalog.search.scores(word) > 0)
+    assert len(expected) and np.isin(expected, found).all()
+
+
+def test_misspelt_cuisine(catalog):
+    results = catalog.search.search('samgyupsal', limit=20)
+    assert len(results)
+    texts = zip(*(catalog.table.values(field, results) for field in ('type', 'subtypes', 'reviews_tags')))
+    for text in (' '.join(map(str, values)) for values in texts):
+        assert 'samgyeopsal' in text.lower(), text
+
+
+def test_facet_filters_hold(catalog):
+    mask = catalog.facets.match(cuisine='asian', area='north', budget='mid')
+    results = catalog.search.search('grill', mask)
+    assert len(results) and mask[results].all()
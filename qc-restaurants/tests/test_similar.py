@@ -0,0 +1,76 @@
+"""
+The similar-restaurants table against scoring every open restaurant of the same cuisine one
+at a time, and the detail page's Similar box when two names share a slug.
+"""
+
+import contextlib
+import io
+import random
+
+import numpy as np
+import pytest
+
+import services.similar as similar
+from services.facets import FacetIndex
+from services.ingest import process_dataframe
+from synthetic import make_master_list
+
+
+@pytest.fixture(scope='module')
+def scored(master_list):
+    """(df, facets, active, SimilarTable) over the shared master list."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        df, _, _ = process_dataframe(master_list.copy())
+    facets = FacetIndex(df)
+    active = ~df['business_status'].str.contains('CLOSED_PERMANENTLY', na=False).to_numpy()
+    return df, facets, active, similar.SimilarTable(df, facets, active)
+
+
+def pair_score(df, facets, lat, lng, row, other):
+    """One pair's score, feature by feature, in float64 (SimilarTable works in float32 batches)."""
+    mine, theirs = set(similar.split_subtypes(df['subtypes'].iat[row])), set(similar.split_subtypes(df['subtypes'].iat[other]))
+    score = similar.SUBTYPES_WEIGHT ** 2 * len(mine & theirs) / np.sqrt(max(len(mine), 1) * max(len(theirs), 1))
+    score += similar.AREA_WEIGHT * (df['SEO Area'].iat[row] == df['SEO Area'].iat[other])
+    tiers = [np.flatnonzero([prices[position] for prices in facets.prices])[0] for position in (row, other)]
+    score += similar.PRICE_WEIGHT * (tiers[0] == tiers[1])
+    amenities = [np.array([mask[position] for mask in facets.amenities.values()], dtype=float) for position in (row, other)]
+    score += similar.AMENITIES_WEIGHT * amenities[0] @ amenities[1] / np.sqrt(max(amenities[0].sum(), 1) * max(amenities[1].sum(), 1))
+    rating = df['rating'].iat[other]
+    score += similar.RATING_WEIGHT * (0 if np.isnan(rating) else rating) / 5
+    east = (lng[row] - lng[other]) * similar.KM_PER_DEGREE * np.cos(np.radians(lat.mean())) / similar.DISTANCE_SCALE_KM
+    north = (lat[row] - lat[other]) * similar.KM_PER_DEGREE / similar.DISTANCE_SCALE_KM
+    return score - similar.DISTANCE_WEIGHT * (east ** 2 + north ** 2)
+
+
+def test_matches_scoring_every_pair(scored):
+    df, facets, active, table = scored
+    lat, lng = df['latitude'].to_numpy(dtype=np.float64), df['longitude'].to_numpy(dtype=np.float64)
+    types = df['type'].astype(object).to_numpy()
+    for row in random.Random(7).sample(range(len(df)), 100):
+        got = table.similar(row)
+        if not isinstance(types[row], str):
+            assert not len(got), row
+            continue
+        candidates = [other for other in np.flatnonzero((types == types[row]) & active) if other != row]
+        scores = {other: pair_score(df, facets, lat, lng, row, other) for other in candidates}
+        best = sorted(scores.values(), reverse=True)[:similar.SIMILAR_LIMIT]
+        assert len(got) == len(best), row
+        # Same cuisine, open, and as good as the best by a full scan (float32 rounding aside)
+        assert all(other in scores for other in got.tolist()), row
+        assert np.allclose([scores[other] for other in got.tolist()], best, atol=1e-4), row
+
+
+def test_slug_collision_resolves_to_one_row(site):
+    """
+    Two names that slugify the same, the higher-scored one first in the file: the detail page
+    shows the row whose neighbours its Similar box lists, not the last row with that slug.
+    """
+    raw = make_master_list(50, filler_columns=0)
+    columns = ['name', 'rating', 'reviews', 'street']
+    raw.loc[0, columns] = ['Kanto Bahay', 4.9, 900.0, '1 First St']
+    raw.loc[1, columns] = ['Kanto Bahay.', 3.1, 2.0, '2 Second St']
+    with contextlib.redirect_stdout(io.StringIO()):
+        catalog = site.load_catalog(io.BytesIO(raw.to_csv(index=False).encode()))
+    position = catalog.slug_rows['kanto-bahay']
+    shown = next(iter(catalog.table.rows([position])))
+    assert shown['street'] == catalog.restaurants_data['kanto-bahay']['address'] == '1 First St'
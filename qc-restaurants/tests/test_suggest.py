@@ -0,0 +1,69 @@
+"""
+The typeahead index against a brute-force scan of every name, area and cuisine, and
+GET /api/suggest over it.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from services.suggest import KINDS, NAME_WORDS, SUGGEST_LIMIT, normalize_key
+
+
+@pytest.fixture(scope='module')
+def entries(catalog):
+    """Every entry's label and its normalized words."""
+    labels = catalog.suggest.labels.take(np.arange(len(catalog.suggest.labels)))
+    return labels, [normalize_key(label).split(' ') for label in labels]
+
+
+def brute_force(index, labels, normalized, prefix, kinds):
+    """The suggestions by checking every entry's keys with startswith."""
+    wanted = [KINDS.index(kind) for kind in kinds]
+    hits = []
+    for entry, words in enumerate(normalized):
+        if index.kinds[entry] in wanted and any(' '.join(words[start:]).startswith(prefix)
+                                                for start in range(min(len(words), NAME_WORDS))):
+            hits.append(entry)
+    hits.sort(key=lambda entry: (-index.weights[entry], entry))
+    return [labels[entry] for entry in hits[:SUGGEST_LIMIT]]
+
+
+def prefixes(normalized, count, seed=3):
+    """Prefixes people type: the start of a name, area or cuisine, or of a later word of a name."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        words = rng.choice(normalized)
+        text = ' '.join(words[rng.randrange(len(words)):])
+        queries.append(text[:rng.randint(1, min(len(text), 12))])
+    return queries
+
+
+@pytest.mark.parametrize('kinds', [KINDS, ('restaurant',)], ids=['all', 'restaurant'])
+def test_matches_full_scan(catalog, entries, kinds):
+    labels, normalized = entries
+    for prefix in prefixes(normalized, 50):
+        got = [suggestion['label'] for suggestion in catalog.suggest.suggest(prefix, kinds=kinds)]
+        assert got == brute_force(catalog.suggest, labels, normalized, normalize_key(prefix), kinds), prefix
+
+
+def test_every_restaurant_reachable_by_name(catalog, entries):
+    labels, _ = entries
+    restaurants = np.flatnonzero(catalog.suggest.kinds == 0)
+    for entry in random.Random(3).sample(restaurants.tolist(), 200):
+        suggested = catalog.suggest.suggest(labels[entry], kinds=('restaurant',))
+        assert labels[entry] in [suggestion['label'] for suggestion in suggested], labels[entry]
+
+
+def test_route(client, catalog):
+    response = client.get('/api/suggest', query_string={'q': 'caf', 'kind': 'restaurant', 'limit': 3})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['dataset_version'] == catalog.dataset_version
+    assert body['suggestions'] == catalog.suggest.suggest('caf', 3, ['restaurant'])
+
+
+def test_route_rejects_unknown_kind(client):
+    assert client.get('/api/suggest', query_string={'q': 'caf', 'kind': 'dish'}).status_code == 400
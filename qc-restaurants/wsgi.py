@@ -1,4 +1,5 @@
-from app import app
+# Warm the catalog, templates and image manifest before the server forks (see preload.py)
+from preload import application as app
 
 if __name__ == "__main__":
     app.run() 
\ No newline at end of file